@@ -1,6 +1,7 @@
 
 import requests
 import json
+import sys
 import time
 
 """
@@ -9,6 +10,7 @@ BFF Server API Test
 BASE_URL = "http://localhost:8080"
 ENDPOINT = "/api/feedback"
 URL = f"{BASE_URL}{ENDPOINT}"
+STREAM_URL = f"{URL}/stream"
 
 # Request Body
 PAYLOAD = {
@@ -72,5 +74,72 @@ def run_test():
     except Exception as e:
         print(f"❌ 알 수 없는 오류 발생: {e}")
 
+def _iter_sse_events(response):
+    """SSE 응답을 (event, data) 쌍으로 읽습니다."""
+    event, data_lines = None, []
+    for raw in response.iter_lines(decode_unicode=True):
+        if raw is None:
+            continue
+        if raw == "":
+            if event is not None:
+                yield event, json.loads("\n".join(data_lines)) if data_lines else {}
+            event, data_lines = None, []
+        elif raw.startswith("event:"):
+            event = raw[len("event:"):].strip()
+        elif raw.startswith("data:"):
+            data_lines.append(raw[len("data:"):].strip())
+
+
+def run_stream_test():
+
+    print(f"🚀 스트리밍 요청 시작: POST {STREAM_URL}")
+    print("─" * 50)
+
+    try:
+        start_time = time.time()
+        timings = {}
+
+        with requests.post(
+            STREAM_URL,
+            headers={"Content-Type": "application/json", "Accept": "text/event-stream"},
+            data=json.dumps(PAYLOAD).encode('utf-8'),
+            stream=True,
+        ) as response:
+            if response.status_code != 200:
+                print(f"❌ 실패 (상태 코드: {response.status_code})")
+                print(response.text)
+                return
+
+            for event, data in _iter_sse_events(response):
+                elapsed = time.time() - start_time
+
+                if event == "sentences":
+                    timings.setdefault("문장 분할", elapsed)
+                    print(f"[{elapsed:6.2f}s] 문장 분할: {len(data['sentences'])}문장")
+                elif event == "sentence":
+                    timings.setdefault("첫 문장 결과", elapsed)
+                    if data.get("is_error"):
+                        timings.setdefault("첫 문법 피드백", elapsed)
+                    mark = "✏️" if data.get("is_error") else "✔️"
+                    print(f"[{elapsed:6.2f}s] {mark} [{data['sentence_id']:02}] {data['original_sentence']}")
+                elif event == "context":
+                    timings.setdefault("문맥 피드백", elapsed)
+                    print(f"[{elapsed:6.2f}s] 📝 문맥 피드백 수신")
+                elif event == "done":
+                    timings.setdefault("전체 완료", elapsed)
+
+        print("─" * 50)
+        print("⏱️ 구간별 도달 시간 (Time-to-first-feedback)")
+        for name, elapsed in timings.items():
+            print(f"  - {name}: {elapsed:.2f}초")
+
+    except requests.exceptions.ConnectionError as e:
+        print(f"❌ 연결 실패: {e}")
+
+
 if __name__ == "__main__":
-    run_test()
+    # python3 api_test.py --stream : 스트리밍 엔드포인트의 첫 피드백 도달 시간 측정
+    if "--stream" in sys.argv:
+        run_stream_test()
+    else:
+        run_test()
@@ -1,16 +1,92 @@
-from fastapi import APIRouter, Depends
+import json
+import re
+import uuid
+from typing import Optional
+from fastapi import APIRouter, Depends, Header, HTTPException, Request, Response, status
+from fastapi.responses import StreamingResponse
 from ..schemas.feedback_request import FeedbackRequest
 from ..schemas.feedback_response import FeedbackResponse
 from ..services.feedback_facade import FeedbackFacade
-from ..core.dependencies import get_feedback_facade
+from ..core.config import settings
+from ..core.dependencies import get_feedback_facade, get_request_profiler
+from ..core.profiling import RequestProfiler
+from ..util.disconnect import CLIENT_CLOSED_REQUEST, run_until_disconnected
 from ..util.security import get_session_id_from_request
 
 router = APIRouter()
 
+REQUEST_ID_HEADER = "X-Request-ID"
+_REQUEST_ID_PATTERN = re.compile(r"^[A-Za-z0-9._-]{1,64}$")
+
+def get_request_id(
+    response: Response,
+    x_request_id: Optional[str] = Header(default=None, description="요청 추적 ID (없으면 서버에서 생성)"),
+) -> str:
+    """X-Request-ID 헤더가 올바른 형식이면 그대로 쓰고, 아니면 새로 만들어 응답 헤더로 돌려줍니다."""
+    request_id = x_request_id if x_request_id and _REQUEST_ID_PATTERN.match(x_request_id) else uuid.uuid4().hex
+    response.headers[REQUEST_ID_HEADER] = request_id
+    return request_id
+
+def get_deadline_seconds(
+    x_request_deadline: Optional[float] = Header(default=None, description="요청 전체 마감 시간(초)")
+) -> float:
+    """X-Request-Deadline 헤더가 있으면 그 값을, 없으면 기본 마감 시간을 사용합니다. (최대값으로 제한)"""
+    if x_request_deadline is None:
+        return settings.FEEDBACK_DEADLINE_SECONDS
+    if x_request_deadline <= 0:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="X-Request-Deadline은 0보다 커야 합니다.")
+    return min(x_request_deadline, settings.FEEDBACK_DEADLINE_MAX_SECONDS)
+
 @router.post("/feedback", response_model=FeedbackResponse)
 async def create_feedback(
     request: FeedbackRequest,
+    http_request: Request,
+    facade: FeedbackFacade = Depends(get_feedback_facade),
+    user_id: str = Depends(get_session_id_from_request),
+    deadline_seconds: float = Depends(get_deadline_seconds),
+    request_id: str = Depends(get_request_id),
+    profiler: RequestProfiler = Depends(get_request_profiler),
+    x_profile: Optional[str] = Header(default=None, description="관리자 프로파일링 토큰"),
+):
+    pipeline = facade.create_feedback(request, user_id=user_id, deadline_seconds=deadline_seconds, request_id=request_id)
+    if profiler.should_profile(x_profile):
+        # 결과는 PROFILE_OUTPUT_DIR/<요청 ID>.collapsed, GET /internal/profiles/<파일 이름>으로 조회
+        # 할당 비교(tracemalloc)는 루프를 멈추므로 관리자 헤더로 요청한 경우에만
+        pipeline = profiler.run(request_id, pipeline, trace_malloc=profiler.is_admin_request(x_profile))
+
+    # 사용자가 탭을 닫으면 남은 검색·LLM 작업을 취소 (이미 끝난 결과는 수집 이벤트로 발행됨)
+    result = await run_until_disconnected(http_request, pipeline)
+    if result is None:
+        return Response(status_code=CLIENT_CLOSED_REQUEST)
+    return result
+
+@router.post("/feedback/stream")
+async def stream_feedback(
+    request: FeedbackRequest,
+    response: Response,
     facade: FeedbackFacade = Depends(get_feedback_facade),
-    user_id: str = Depends(get_session_id_from_request)
+    user_id: str = Depends(get_session_id_from_request),
+    deadline_seconds: float = Depends(get_deadline_seconds),
+    request_id: str = Depends(get_request_id),
 ):
-    return await facade.create_feedback(request, user_id=user_id)
+    """문장별 문법 피드백을 완료되는 순서대로 Server-Sent Events로 전송합니다."""
+    # 스트림이 시작되면 상태 코드를 바꿀 수 없으므로 크기 한도·과부하는 먼저 확인
+    facade.check_request(request)
+
+    async def event_source():
+        async for event, data in facade.stream_feedback(
+            request, user_id=user_id, deadline_seconds=deadline_seconds, request_id=request_id
+        ):
+            yield f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+
+    stream = StreamingResponse(
+        event_source(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+    # 직접 반환하는 Response에는 의존성에서 설정한 세션 쿠키·요청 ID가 자동으로 붙지 않으므로 복사
+    for key, value in response.headers.items():
+        if key == "set-cookie":
+            stream.headers.append(key, value)
+    stream.headers[REQUEST_ID_HEADER] = request_id
+    return stream
@@ -0,0 +1,18 @@
+from fastapi import APIRouter, Depends, status
+from fastapi.responses import JSONResponse
+from ..core.container import AppContainer
+from ..core.dependencies import get_container
+
+router = APIRouter()
+
+@router.get("/health/live")
+async def liveness():
+    # 이벤트 루프가 응답할 수 있으면 살아 있는 것으로 봄 (의존성 상태와 무관)
+    return {"status": "ok"}
+
+@router.get("/health/ready")
+async def readiness(container: AppContainer = Depends(get_container)):
+    # 필수 의존성이 모두 적재되어야 200, 아니면 503과 의존성별 상태
+    body = container.readiness()
+    status_code = status.HTTP_200_OK if body["ready"] else status.HTTP_503_SERVICE_UNAVAILABLE
+    return JSONResponse(status_code=status_code, content=body)
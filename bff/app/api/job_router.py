@@ -0,0 +1,42 @@
+from fastapi import APIRouter, Depends, HTTPException, Response, status
+from ..schemas.feedback_job import FeedbackJob, FeedbackJobAccepted
+from ..schemas.feedback_request import FeedbackRequest
+from ..services.feedback_job_service import FeedbackJobService, JobQueueFullError
+from ..core.config import settings
+from ..core.dependencies import get_feedback_job_service
+from ..util.security import get_session_id_from_request
+
+router = APIRouter()
+
+@router.post("/feedback/jobs", response_model=FeedbackJobAccepted, status_code=status.HTTP_202_ACCEPTED)
+async def submit_feedback_job(
+    request: FeedbackRequest,
+    response: Response,
+    jobs: FeedbackJobService = Depends(get_feedback_job_service),
+    user_id: str = Depends(get_session_id_from_request)
+):
+    """피드백 생성을 대기열에 넣고 작업 ID를 바로 반환합니다."""
+    jobs.facade.admission_controller.check_document(request)
+    try:
+        job_id = await jobs.submit(request, user_id=user_id)
+    except JobQueueFullError as e:
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail=str(e),
+            headers={"Retry-After": str(settings.FEEDBACK_JOB_RETRY_AFTER_SECONDS)},
+        )
+
+    response.headers["Location"] = f"/api/feedback/jobs/{job_id}"
+    return FeedbackJobAccepted(job_id=job_id)
+
+@router.get("/feedback/jobs/{job_id}", response_model=FeedbackJob)
+async def get_feedback_job(
+    job_id: str,
+    jobs: FeedbackJobService = Depends(get_feedback_job_service),
+    user_id: str = Depends(get_session_id_from_request)
+):
+    """작업 상태를 조회합니다. 완료된 작업은 result에 /api/feedback과 같은 형식의 응답이 담깁니다."""
+    job = await jobs.get(job_id, user_id=user_id)
+    if job is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="작업을 찾을 수 없거나 결과가 만료되었습니다.")
+    return job
@@ -0,0 +1,116 @@
+import hmac
+import ipaddress
+import os
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Union
+from fastapi import APIRouter, Depends, Header, HTTPException, Request, Response, status
+from fastapi.responses import PlainTextResponse
+from prometheus_client import CONTENT_TYPE_LATEST, REGISTRY, CollectorRegistry, generate_latest
+from prometheus_client import multiprocess
+from ..llm.clova_client import ClovaStudioClient
+from ..core.config import settings
+from ..core.dependencies import (
+    get_admission_controller,
+    get_feedback_job_service,
+    get_llm_client,
+    get_loop_monitor,
+    get_request_profiler,
+)
+from ..core.loop_monitor import EventLoopMonitor
+from ..core.profiling import RequestProfiler
+from ..services.admission_controller import AdmissionController
+from ..services.feedback_job_service import FeedbackJobService
+
+@lru_cache(maxsize=1)
+def _allowed_networks() -> List[Union[ipaddress.IPv4Network, ipaddress.IPv6Network]]:
+    return [
+        ipaddress.ip_network(network.strip(), strict=False)
+        for network in settings.OPS_ALLOWED_NETWORKS.split(",")
+        if network.strip()
+    ]
+
+def _is_allowed_client(host: Optional[str]) -> bool:
+    if not host:
+        return False
+    try:
+        address = ipaddress.ip_address(host)
+    except ValueError:
+        return False
+    return any(address in network for network in _allowed_networks())
+
+def _has_ops_token(authorization: Optional[str]) -> bool:
+    if not settings.OPS_TOKEN or not authorization:
+        return False
+    scheme, _, token = authorization.partition(" ")
+    return scheme.lower() == "bearer" and hmac.compare_digest(token.strip().encode(), settings.OPS_TOKEN.encode())
+
+def require_ops_access(
+    request: Request,
+    authorization: Optional[str] = Header(default=None),
+) -> None:
+    """
+    지표·대기열 상태·프로파일(스택, 할당 위치)은 내부 구현을 드러내므로
+    OPS_ALLOWED_NETWORKS에서 온 요청이나 OPS_TOKEN을 가진 요청만 허용합니다. (상태 확인 /health는 제외)
+    """
+    if _has_ops_token(authorization):
+        return
+    if _is_allowed_client(request.client.host if request.client else None):
+        return
+    raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="운영 엔드포인트에 접근할 수 없습니다.")
+
+router = APIRouter(dependencies=[Depends(require_ops_access)])
+
+@router.get("/metrics")
+async def get_metrics() -> Response:
+    # gunicorn 등 여러 워커로 실행할 때는 PROMETHEUS_MULTIPROC_DIR에 모인 워커별 값을 합쳐서 노출
+    if "PROMETHEUS_MULTIPROC_DIR" in os.environ:
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    else:
+        registry = REGISTRY
+    return Response(content=generate_latest(registry), media_type=CONTENT_TYPE_LATEST)
+
+@router.get("/internal/limiter")
+async def get_limiter_stats(
+    llm: ClovaStudioClient = Depends(get_llm_client),
+) -> Dict[str, Any]:
+    # 단계별 대기열 길이, 현재 허용 속도, 대기 시간 통계
+    return llm.limiter.snapshot()
+
+@router.get("/internal/jobs")
+async def get_job_queue_stats(
+    jobs: FeedbackJobService = Depends(get_feedback_job_service),
+) -> Dict[str, Any]:
+    # 비동기 피드백 작업 대기열 길이와 워커 수
+    return {"queue_depth": await jobs.queue_depth(), "queue_size": jobs.queue_size, "workers": jobs.workers}
+
+@router.get("/internal/admission")
+async def get_admission_stats(
+    admission: AdmissionController = Depends(get_admission_controller),
+) -> Dict[str, Any]:
+    # 처리 중인 요청 수와 실행 중인 문법 교정 작업 수
+    return admission.snapshot()
+
+@router.get("/internal/loop")
+async def get_loop_stats(
+    monitor: EventLoopMonitor = Depends(get_loop_monitor),
+) -> Dict[str, Any]:
+    # 최대 이벤트 루프 지연과 최근 감지한 루프 차단 (LOOP_BLOCK_DEBUG)
+    return monitor.snapshot()
+
+@router.get("/internal/profiles")
+async def list_profiles(
+    profiler: RequestProfiler = Depends(get_request_profiler),
+) -> Dict[str, Any]:
+    # 저장된 요청 프로파일 파일 (최근 순)
+    return {"profiles": profiler.list_profiles()}
+
+@router.get("/internal/profiles/{name}", response_class=PlainTextResponse)
+async def get_profile(
+    name: str,
+    profiler: RequestProfiler = Depends(get_request_profiler),
+) -> str:
+    content = profiler.read_profile(name)
+    if content is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="프로파일을 찾을 수 없습니다.")
+    return content
@@ -1,5 +1,6 @@
-from typing import Dict
+from typing import AsyncIterator, Dict, List
 from ..llm.clova_client import ClovaStudioClient
+from ..llm.llm_stage import LlmStage
 
 SYSTEM_PROMPT_CORRECTION = """
 당신은 글쓴이가 더 좋은 글을 쓸 수 있도록 도와주는 한국어 글쓰기 지도 교사이다.
@@ -35,8 +36,9 @@ class ContextLLMClient:
     def __init__(self, llm: ClovaStudioClient):
         self.llm = llm
 
-    async def get_context_feedback(self, title: str, contents: str) -> Dict[str, str]:
-        messages = [
+    @staticmethod
+    def _build_messages(title: str, contents: str) -> List[Dict[str, str]]:
+        return [
             {
                 "role": "system",
                 "content": (
@@ -65,6 +67,16 @@ class ContextLLMClient:
             },
         ]
 
-        feedback_text = await self.llm.chat(messages)
+    async def get_context_feedback(self, title: str, contents: str) -> Dict[str, str]:
+        messages = self._build_messages(title, contents)
+
+        feedback_text = await self.llm.chat(messages, stage=LlmStage.CONTEXT)
 
         return {"feedback": feedback_text}
+
+    async def stream_context_feedback(self, title: str, contents: str) -> AsyncIterator[str]:
+        """문맥 피드백을 생성되는 대로 조각(토큰) 단위로 내보냅니다."""
+        messages = self._build_messages(title, contents)
+
+        async for token in self.llm.chat_stream(messages, stage=LlmStage.CONTEXT):
+            yield token
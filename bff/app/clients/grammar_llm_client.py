@@ -1,6 +1,8 @@
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Optional
 from ..schemas.feedback_response import CorrectionOutput, GrammarFeedback
 from ..llm.clova_client import ClovaStudioClient
+from ..llm.llm_stage import LlmStage
+from ..llm.prompt_budget import CompactedPrompt, PromptBudget
 
 SYSTEM_PROMPT_CORRECTION = """
 당신은 한국어 학습자의 문장을 자연스럽고 정확하게 교정하는 전문가입니다.
@@ -139,8 +141,10 @@ SYSTEM_PROMPT_GRAMMAR_FEEDBACK = """
 
 class GrammarLLMClient:
     # ClovaStudioClient를 내부에서 사용한다고 가정
-    def __init__(self, llm: ClovaStudioClient):
+    def __init__(self, llm: ClovaStudioClient, prompt_budget: Optional[PromptBudget] = None):
         self.llm = llm
+        # 토큰 예산 안에서 예문·문법 정보를 줄여 프롬프트를 만듦
+        self.prompt_budget = prompt_budget or PromptBudget.from_settings()
 
     def _format_error_examples(self, error_examples: List[Dict[str, Any]]) -> str:
         """
@@ -173,11 +177,20 @@ class GrammarLLMClient:
         return "\n\n".join(formatted_list)
 
 
-    async def get_corrected_sentence(self, payload: Dict[str, Any]) -> Dict[str, Any]:
-        
-        original_sentence = payload["original_sentence"]
-        error_examples = payload.get("error_examples", [])
-        
+    @staticmethod
+    def _messages(system_prompt: str, user_content: str) -> List[Dict[str, str]]:
+        return [
+            {
+                "role": "system",
+                "content": system_prompt,
+            },
+            {
+                "role": "user",
+                "content": user_content,
+            },
+        ]
+
+    def _correction_messages(self, original_sentence: str, error_examples: List[Dict[str, Any]]) -> List[Dict[str, str]]:
         formatted_examples = self._format_error_examples(error_examples)
 
         user_content = (
@@ -189,54 +202,81 @@ class GrammarLLMClient:
             "교정 과정에서 중요하게 다룬 문법 요소/형태를 'errors' 목록에 담아주세요. "
             "응답은 반드시 지정된 JSON 스키마를 따르십시오."
         )
+        return self._messages(SYSTEM_PROMPT_CORRECTION, user_content)
 
-        messages = [
-            {
-                "role": "system",
-                "content": SYSTEM_PROMPT_CORRECTION,
-            },
-            {
-                "role": "user",
-                "content": user_content,
-            },
-        ]
+    def build_correction_prompt(self, payload: Dict[str, Any]) -> CompactedPrompt:
+        """
+        1차(교정) 호출 메시지. 예문은 검색 점수순으로 거의 같은 것을 빼고, 토큰 예산에 들어가는 만큼만 넣습니다.
+        (가장 관련 있는 예문 하나는 예산을 넘어도 남김. tools/retrieval_eval.py가 프롬프트 토큰을 추정할 때도 사용)
+        """
+        original_sentence = payload["original_sentence"]
+        error_examples = payload.get("error_examples", [])
+
+        return self.prompt_budget.fit(
+            LlmStage.CORRECTION,
+            lambda examples: self._correction_messages(original_sentence, examples),
+            items=error_examples,
+            candidates=self.prompt_budget.examples_for_prompt(error_examples),
+            min_items=1,
+        )
+
+    def build_correction_messages(self, payload: Dict[str, Any]) -> List[Dict[str, str]]:
+        return self.build_correction_prompt(payload).messages
+
+    async def get_corrected_sentence(self, payload: Dict[str, Any]) -> Dict[str, Any]:
+        prompt = self.build_correction_prompt(payload)
+        self.prompt_budget.record(LlmStage.CORRECTION, prompt)
 
         result: CorrectionOutput = await self.llm.chat_structred(
-            messages=messages,
+            messages=prompt.messages,
             response_model=CorrectionOutput,
+            stage=LlmStage.CORRECTION,
         )
 
         return result.model_dump()
 
-    async def get_grammar_feedback(self, payload: Dict[str, Any]) -> Dict[str, Any]:
-        original_sentence = payload["original_sentence"]
-        corrected_sentence = payload["corrected_sentence"]
-        grammar_db_info = payload.get("grammar_db_info", [])
+    @staticmethod
+    def _format_grammar_info(grammar_db_info: List[Dict[str, Any]]) -> str:
+        """문법 정보를 한 줄에 하나씩 '- 문법 요소: 설명' 형태로 나열합니다."""
+        if not grammar_db_info:
+            return "(없음)"
+        return "\n".join(f"- {info.get('grammar_element')}: {info.get('explanation')}" for info in grammar_db_info)
 
+    def _feedback_messages(
+        self, original_sentence: str, corrected_sentence: str, grammar_db_info: List[Dict[str, Any]]
+    ) -> List[Dict[str, str]]:
         user_content = (
             f"### 학습자 문장 (original_sentence)\n{original_sentence}\n\n"
             f"### 교정된 문장 (corrected_sentence)\n{corrected_sentence}\n\n"
-            f"### 관련 문법 정보 (grammar_db_info)\n{grammar_db_info}\n\n"
+            f"### 관련 문법 정보 (grammar_db_info)\n{self._format_grammar_info(grammar_db_info)}\n\n"
             "위 정보를 바탕으로, 한 문장 안에 존재하는 여러 교정을 각각 정리해 주세요.\n"
             "- 각 교정에 대해 '틀린표현 -> 맞은표현' 형식의 corrects와,\n"
             "  왜 그렇게 고쳐야 하는지에 대한 reason을 작성합니다.\n"
             "- 최종 출력은 내부 모델 GrammarFeedback 형식에 맞게 생성합니다."
         )
+        return self._messages(SYSTEM_PROMPT_GRAMMAR_FEEDBACK, user_content)
 
-        messages = [
-            {
-                "role": "system",
-                "content": SYSTEM_PROMPT_GRAMMAR_FEEDBACK,
-            },
-            {
-                "role": "user",
-                "content": user_content,
-            },
-        ]
+    def build_feedback_prompt(self, payload: Dict[str, Any]) -> CompactedPrompt:
+        """2차(피드백) 호출 메시지. 같은 문법 요소는 한 번만, 긴 설명은 잘라서 토큰 예산에 들어가는 만큼 넣습니다."""
+        original_sentence = payload["original_sentence"]
+        corrected_sentence = payload["corrected_sentence"]
+        grammar_db_info = payload.get("grammar_db_info", [])
+
+        return self.prompt_budget.fit(
+            LlmStage.FEEDBACK,
+            lambda infos: self._feedback_messages(original_sentence, corrected_sentence, infos),
+            items=grammar_db_info,
+            candidates=self.prompt_budget.grammar_info_for_prompt(grammar_db_info),
+        )
+
+    async def get_grammar_feedback(self, payload: Dict[str, Any]) -> Dict[str, Any]:
+        prompt = self.build_feedback_prompt(payload)
+        self.prompt_budget.record(LlmStage.FEEDBACK, prompt)
 
         result: GrammarFeedback = await self.llm.chat_structred(
-            messages=messages,
+            messages=prompt.messages,
             response_model=GrammarFeedback,
+            stage=LlmStage.FEEDBACK,
         )
 
-        return result.model_dump()
\ No newline at end of file
+        return result.model_dump()
@@ -1,3 +1,4 @@
+from typing import Optional
 from pydantic_settings import BaseSettings
 
 class Settings(BaseSettings):
@@ -6,12 +7,54 @@ class Settings(BaseSettings):
         "https://clovastudio.stream.ntruss.com/v3/chat-completions/HCX-007"
     )
 
+    # Clova Studio 요청 속도 제한 (API 키 기준 분당 요청 수, 순간 허용량)
+    CLOVA_RATE_LIMIT_QPM: float = 60
+    CLOVA_RATE_LIMIT_BURST: int = 5
+    # 워커·레플리카 간 할당량 공유 방식: local(프로세스 단독) | file(같은 호스트) | redis(여러 호스트)
+    CLOVA_RATE_LIMIT_BACKEND: str = "local"
+    CLOVA_RATE_LIMIT_FILE_PATH: Optional[str] = None
+    CLOVA_RATE_LIMIT_REDIS_URL: Optional[str] = None
+    CLOVA_RATE_LIMIT_REDIS_KEY: str = "clova:rate_limit"
+    # 스트리밍 API에서 문맥 피드백을 토큰 단위로 전달 (context_delta 이벤트)
+    CLOVA_STREAM_CONTEXT: bool = True
+    # 교정·피드백 프롬프트의 토큰 예산 (시스템 프롬프트 포함 추정치, 0이면 제한 없음)
+    # 예산 안에서 검색 점수가 높은 예문부터 넣고, 거의 같은 예문(글자 bigram 유사도 기준)은 하나만 남기며 문법 설명은 잘라 냄
+    PROMPT_CORRECTION_TOKEN_BUDGET: int = 1000
+    PROMPT_FEEDBACK_TOKEN_BUDGET: int = 800
+    PROMPT_MAX_EXAMPLES: int = 5
+    PROMPT_EXAMPLE_DEDUP_THRESHOLD: float = 0.85
+    PROMPT_EXPLANATION_MAX_CHARS: int = 240
+
     KAFKA_BOOTSTRAP_SERVERS: str = "kafka:9092"
     KAFKA_TOPIC: str = "collect-events"
 
     CHROMA_HOST: str
     CHROMA_COLLECTION_NAME: str
     ELASTICSEARCH_HOST: str
+    # 오류 예문 검색에 쓰는 임베딩 모델 (앱 기동 시 적재)
+    EMBEDDING_MODEL_NAME: str = "jhgan/ko-sroberta-multitask"
+    # 워커별 torch 연산 스레드 수. 비우면 gunicorn 실행 시 CPU 수 / 워커 수
+    EMBEDDING_TORCH_THREADS: Optional[int] = None
+    # 임베딩 서버(app.embedding.server) 유닉스 소켓 경로. 지정하면 워커는 모델을 적재하지 않고 서버에 인코딩을 요청
+    EMBEDDING_SERVER_SOCKET: Optional[str] = None
+    # 앱(또는 gunicorn 마스터)이 임베딩 서버 프로세스를 직접 띄움. compose 등에서 따로 띄우면 False
+    EMBEDDING_SERVER_AUTOSTART: bool = False
+    EMBEDDING_SERVER_TIMEOUT_SECONDS: float = 5.0
+    # 임베딩 서버의 동적 배치: 최대 배치 크기, 첫 요청 이후 더 모으는 최대 시간(ms), torch 스레드 수(0이면 torch 기본값)
+    EMBEDDING_SERVER_MAX_BATCH: int = 64
+    EMBEDDING_SERVER_MAX_WAIT_MS: float = 2.0
+    EMBEDDING_SERVER_THREADS: int = 0
+
+    # 기동 시 적재에 실패한 의존성을 다시 시도하는 간격(초). 성공할 때까지 readiness는 503
+    STARTUP_RETRY_INTERVAL_SECONDS: float = 10
+
+    # 오류 예문 검색: Chroma 결과 수, 최고 유사도(1 - 거리)가 이 값 미만이면 ES 패턴 검색 결과를 추가,
+    # ES 결과 수, n-gram 보정 검색의 최소 일치 비율과 중복 제거를 고려한 추가 조회 배수 (tools/retrieval_eval.py로 평가)
+    RETRIEVAL_CHROMA_N_RESULTS: int = 5
+    RETRIEVAL_CHROMA_SIM_THRESHOLD: float = 0.60
+    RETRIEVAL_ES_MAX_RESULTS: int = 5
+    RETRIEVAL_ES_NGRAM_MIN_SHOULD_MATCH: str = "50%"
+    RETRIEVAL_ES_NGRAM_OVERFETCH: int = 3
 
     POSTGRES_HOST: str = "localhost"
     POSTGRES_PORT: int = 5431
@@ -19,6 +62,77 @@ class Settings(BaseSettings):
     POSTGRES_USER: str = "grammar"
     POSTGRES_PASSWORD: str = "grammarpassword"
 
+    # 조사 이형태(을/를, 이/가 등) 오류를 LLM 없이 규칙으로 교정
+    PARTICLE_RULES_ENABLED: bool = True
+
+    # 요청 수용 제어: 문서 크기 한도, 문법 교정 동시 실행 한도, 과부하 정책(reject | degrade)
+    FEEDBACK_MAX_DOCUMENT_CHARS: int = 5000
+    FEEDBACK_MAX_SENTENCES: int = 100
+    GRAMMAR_CONCURRENCY_PER_REQUEST: int = 4
+    GRAMMAR_CONCURRENCY_GLOBAL: int = 16
+    FEEDBACK_MAX_INFLIGHT_REQUESTS: int = 64
+    FEEDBACK_OVERLOAD_POLICY: str = "reject"
+    FEEDBACK_OVERLOAD_RETRY_AFTER_SECONDS: int = 5
+
+    # 로그 레벨과 형식: text | json (json은 log_event 필드를 최상위 키로 출력)
+    LOG_LEVEL: str = "INFO"
+    LOG_FORMAT: str = "text"
+    # 문장별 단계 결과(검색 결과, LLM 출력 등) 상세 로그를 남길 요청의 비율 (0~1, 요청 단위로 결정)
+    LOG_STAGE_DUMP_SAMPLE_RATE: float = 0.01
+
+    # 이벤트 루프 지연 측정 간격(초, 0이면 끔)과, 디버그용 루프 차단 감지(임계값 이상 막히면 스택·단계를 로그로 남김)
+    LOOP_MONITOR_INTERVAL_SECONDS: float = 0.25
+    LOOP_BLOCK_DEBUG: bool = False
+    LOOP_BLOCK_THRESHOLD_MS: float = 100
+
+    # 운영 엔드포인트(/metrics, /internal/*) 접근 제한: 허용 네트워크(쉼표로 구분한 CIDR)에서 온 요청이거나
+    # Authorization: Bearer <OPS_TOKEN> 헤더가 있는 요청만 허용 (토큰이 없으면 허용 네트워크만)
+    OPS_TOKEN: Optional[str] = None
+    OPS_ALLOWED_NETWORKS: str = "127.0.0.1/32,::1/128"
+
+    # 요청 단위 프로파일링: X-Profile 헤더가 이 토큰과 같거나 샘플링에 걸린 POST /api/feedback 요청 (토큰이 없으면 헤더로는 켜지 않음)
+    PROFILE_ADMIN_TOKEN: Optional[str] = None
+    PROFILE_SAMPLE_RATE: float = 0.0
+    PROFILE_INTERVAL_MS: float = 5.0
+    PROFILE_OUTPUT_DIR: str = "data/profiles"
+    # tracemalloc이 기록할 스택 깊이 (0이면 할당 비교를 하지 않음). 스냅샷이 루프를 멈추므로 X-Profile 요청에만 사용
+    PROFILE_TRACEMALLOC_FRAMES: int = 10
+
+    # 요청 추적(span) 내보내기: none(기록 안 함) | jsonl(TRACE_FILE_PATH에 한 줄씩 기록)
+    TRACE_EXPORTER: str = "none"
+    TRACE_FILE_PATH: str = "data/traces.jsonl"
+    # 기록할 요청의 비율 (0~1)
+    TRACE_SAMPLE_RATE: float = 1.0
+
+    # 요청 전체 마감 시간. X-Request-Deadline 헤더(초)로 최대값까지 조정 가능
+    FEEDBACK_DEADLINE_SECONDS: float = 25
+    FEEDBACK_DEADLINE_MAX_SECONDS: float = 60
+    # 남은 시간이 이보다 적으면 해당 단계를 건너뜀
+    DEADLINE_MIN_LLM_SECONDS: float = 3.0
+    DEADLINE_MIN_RETRIEVAL_SECONDS: float = 0.5
+
+    # 퇴고 후 재제출 시 바뀌지 않은 문장의 피드백 재사용
+    DRAFT_REUSE_ENABLED: bool = True
+    # 직전 제출 결과 저장소: local(워커별 메모리, 워커가 하나일 때만 재사용됨) / file(같은 호스트의 워커 공유) / redis(여러 호스트 공유)
+    DRAFT_STORE_BACKEND: str = "local"
+    DRAFT_STORE_FILE_PATH: str = "data/drafts.db"
+    DRAFT_STORE_REDIS_URL: Optional[str] = None
+    DRAFT_STORE_REDIS_KEY_PREFIX: str = "draft"
+    # local·file 백엔드는 최근 사용자 수로, file·redis 백엔드는 보관 기간으로 크기를 제한
+    DRAFT_STORE_MAX_USERS: int = 1000
+    DRAFT_STORE_TTL_SECONDS: float = 86400
+    # 추가·삭제된 문장 길이 비율이 이 값을 넘을 때만 문맥 피드백을 새로 생성
+    DRAFT_CONTEXT_REGENERATE_RATIO: float = 0.2
+
+    # 비동기 피드백 작업 (POST /api/feedback/jobs)
+    FEEDBACK_JOB_WORKERS: int = 4
+    # 저장소 전체의 대기 작업 수 한도 (워커 프로세스 수와 관계없이 적용)
+    FEEDBACK_JOB_QUEUE_SIZE: int = 100
+    FEEDBACK_JOB_RESULT_TTL_SECONDS: float = 3600
+    FEEDBACK_JOB_DB_PATH: str = "data/feedback_jobs.db"
+    FEEDBACK_JOB_RETRY_AFTER_SECONDS: int = 30
+    FEEDBACK_JOB_DEADLINE_SECONDS: float = 120
+
     class Config:
         env_file = ".env"
 
@@ -0,0 +1,364 @@
+import asyncio
+import gc
+import json
+import subprocess
+import time
+from dataclasses import dataclass
+from functools import cached_property
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+from .config import settings
+from .loop_monitor import EventLoopMonitor
+from .profiling import RequestProfiler
+from .tracing import configure_tracing, create_exporter, shutdown_tracing
+from ..clients.context_llm_client import ContextLLMClient
+from ..clients.grammar_llm_client import GrammarLLMClient
+from ..llm.clova_client import ClovaStudioClient
+from ..services.admission_controller import AdmissionController
+from ..services.collect_event_publisher import CollectEventPublisher
+from ..services.context_service import ContextService
+from ..services.draft_store import DraftStore, create_draft_store
+from ..services.feedback_facade import FeedbackFacade
+from ..services.feedback_job_service import FeedbackJobService, FeedbackJobStore
+from ..services.grammar_service import GrammarService
+from ..services.particle_rule_service import ParticleRuleService
+from ..services.sentence_service import SentenceService
+from ..util.logger import logger, reinit_logging_after_fork
+
+DEPENDENCY_PENDING = "pending"
+DEPENDENCY_READY = "ready"
+DEPENDENCY_FAILED = "failed"
+
+
+@dataclass
+class DependencyState:
+    # required가 아닌 의존성(ES, Kafka)은 실패해도 대체 경로가 있어 readiness에 반영하지 않음
+    required: bool
+    status: str = DEPENDENCY_PENDING
+    error: Optional[str] = None
+    load_seconds: Optional[float] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "status": self.status,
+            "required": self.required,
+            "error": self.error,
+            "load_seconds": self.load_seconds,
+        }
+
+
+class AppContainer:
+    """
+    애플리케이션이 사용하는 서비스 객체를 보관합니다.
+
+    - 서비스 객체는 처음 접근할 때 만들며, 생성자는 가벼운 설정만 하므로 import 시점에 외부 연결이 없습니다.
+    - 임베딩 모델·ChromaDB·Mecab·Postgres 풀·Kafka 연결 같은 무거운 자원은 lifespan의 startup에서
+      한 번씩 동시에 적재하고(워밍업 포함), shutdown에서 닫습니다.
+    - 적재에 실패한 자원은 백그라운드에서 주기적으로 다시 시도하며, 상태는 readiness 엔드포인트로 노출합니다.
+    """
+
+    def __init__(self, retry_interval: float = 10.0) -> None:
+        self.retry_interval = retry_interval
+        self.dependencies: Dict[str, DependencyState] = {
+            "mecab": DependencyState(required=True),
+            "embedder": DependencyState(required=True),
+            "chroma": DependencyState(required=True),
+            "postgres": DependencyState(required=True),
+            "elasticsearch": DependencyState(required=False),
+            "kafka": DependencyState(required=False),
+        }
+        self.startup_seconds: Optional[float] = None
+        self._retry_task: Optional[asyncio.Task] = None
+        self._kafka_producer = None
+        # gunicorn 마스터가 fork 전에 비동기 작업을 복구했는지 (아니면 기동 시 직접 복구)
+        self.jobs_recovered_before_fork = False
+        # 이 프로세스가 띄운 임베딩 서버 (EMBEDDING_SERVER_AUTOSTART). fork한 워커는 소유하지 않음
+        self._embedding_process: Optional[subprocess.Popen] = None
+        self._forked = False
+
+    # ------------------------------------------------------------------
+
+    # 서비스 객체 (처음 접근할 때 생성)
+
+    @cached_property
+    def loop_monitor(self) -> EventLoopMonitor:
+        threshold = settings.LOOP_BLOCK_THRESHOLD_MS / 1000 if settings.LOOP_BLOCK_DEBUG else None
+        return EventLoopMonitor(interval=settings.LOOP_MONITOR_INTERVAL_SECONDS, block_threshold=threshold)
+
+    @cached_property
+    def request_profiler(self) -> RequestProfiler:
+        return RequestProfiler(
+            output_dir=settings.PROFILE_OUTPUT_DIR,
+            admin_token=settings.PROFILE_ADMIN_TOKEN,
+            sample_rate=settings.PROFILE_SAMPLE_RATE,
+            interval_ms=settings.PROFILE_INTERVAL_MS,
+            tracemalloc_frames=settings.PROFILE_TRACEMALLOC_FRAMES,
+        )
+
+    @cached_property
+    def llm_client(self) -> ClovaStudioClient:
+        return ClovaStudioClient()
+
+    @cached_property
+    def context_service(self) -> ContextService:
+        return ContextService(ContextLLMClient(self.llm_client))
+
+    @cached_property
+    def grammar_service(self) -> GrammarService:
+        return GrammarService(GrammarLLMClient(self.llm_client))
+
+    @cached_property
+    def sentence_service(self) -> SentenceService:
+        return SentenceService()
+
+    @cached_property
+    def particle_rule_service(self) -> Optional[ParticleRuleService]:
+        return ParticleRuleService(self.grammar_service) if settings.PARTICLE_RULES_ENABLED else None
+
+    @cached_property
+    def collect_event_publisher(self) -> CollectEventPublisher:
+        # 프로듀서는 startup에서 브로커에 연결한 뒤 채움
+        return CollectEventPublisher(
+            producer=None,
+            topic=settings.KAFKA_TOPIC,
+            fallback_repo=None,
+        )
+
+    @cached_property
+    def admission_controller(self) -> AdmissionController:
+        return AdmissionController(
+            max_document_chars=settings.FEEDBACK_MAX_DOCUMENT_CHARS,
+            max_sentences=settings.FEEDBACK_MAX_SENTENCES,
+            per_request_concurrency=settings.GRAMMAR_CONCURRENCY_PER_REQUEST,
+            global_concurrency=settings.GRAMMAR_CONCURRENCY_GLOBAL,
+            max_inflight_requests=settings.FEEDBACK_MAX_INFLIGHT_REQUESTS,
+            overload_policy=settings.FEEDBACK_OVERLOAD_POLICY,
+            retry_after=settings.FEEDBACK_OVERLOAD_RETRY_AFTER_SECONDS,
+        )
+
+    @cached_property
+    def draft_store(self) -> Optional[DraftStore]:
+        if not settings.DRAFT_REUSE_ENABLED:
+            return None
+        return create_draft_store(
+            settings.DRAFT_STORE_BACKEND,
+            max_users=settings.DRAFT_STORE_MAX_USERS,
+            ttl=settings.DRAFT_STORE_TTL_SECONDS,
+            file_path=settings.DRAFT_STORE_FILE_PATH,
+            redis_url=settings.DRAFT_STORE_REDIS_URL,
+            redis_key_prefix=settings.DRAFT_STORE_REDIS_KEY_PREFIX,
+        )
+
+    @cached_property
+    def feedback_facade(self) -> FeedbackFacade:
+        return FeedbackFacade(
+            context_service=self.context_service,
+            grammar_service=self.grammar_service,
+            sentence_service=self.sentence_service,
+            collect_event_publisher=self.collect_event_publisher,
+            particle_rule_service=self.particle_rule_service,
+            admission_controller=self.admission_controller,
+            draft_store=self.draft_store,
+            context_regenerate_ratio=settings.DRAFT_CONTEXT_REGENERATE_RATIO,
+        )
+
+    @cached_property
+    def feedback_job_service(self) -> FeedbackJobService:
+        return FeedbackJobService(
+            facade=self.feedback_facade,
+            store=FeedbackJobStore(settings.FEEDBACK_JOB_DB_PATH),
+            workers=settings.FEEDBACK_JOB_WORKERS,
+            queue_size=settings.FEEDBACK_JOB_QUEUE_SIZE,
+            result_ttl=settings.FEEDBACK_JOB_RESULT_TTL_SECONDS,
+            deadline_seconds=settings.FEEDBACK_JOB_DEADLINE_SECONDS,
+        )
+
+    # ------------------------------------------------------------------
+
+    # 무거운 자원 적재
+
+    def _loaders(self) -> Dict[str, Callable[[], Awaitable[None]]]:
+        grammar_service = self.grammar_service
+        return {
+            "mecab": lambda: asyncio.to_thread(self.sentence_service.warm_up),
+            "embedder": self._prepare_embedder,
+            "chroma": lambda: asyncio.to_thread(grammar_service.connect_chroma),
+            "postgres": grammar_service.initialize_db_pool,
+            "elasticsearch": grammar_service.ping_elasticsearch,
+            "kafka": lambda: asyncio.to_thread(self._connect_kafka),
+        }
+
+    def _connect_kafka(self) -> None:
+        from kafka import KafkaProducer
+
+        self._kafka_producer = KafkaProducer(
+            bootstrap_servers=settings.KAFKA_BOOTSTRAP_SERVERS,
+            value_serializer=lambda v: json.dumps(v, ensure_ascii=False).encode("utf-8"),
+        )
+        self.collect_event_publisher.producer = self._kafka_producer
+
+    async def _prepare_embedder(self) -> None:
+        if not self._forked:
+            await asyncio.to_thread(self.start_embedding_server)
+        await self.grammar_service.prepare_embedder()
+
+    def start_embedding_server(self) -> None:
+        """EMBEDDING_SERVER_AUTOSTART이면 임베딩 서버 프로세스를 띄웁니다. (이미 실행 중이면 그대로 둠)"""
+        if not (settings.EMBEDDING_SERVER_SOCKET and settings.EMBEDDING_SERVER_AUTOSTART):
+            return
+        if self._embedding_process is not None and self._embedding_process.poll() is None:
+            return
+
+        from ..embedding.server import spawn_server_process
+
+        self._embedding_process = spawn_server_process(
+            settings.EMBEDDING_SERVER_SOCKET,
+            settings.EMBEDDING_MODEL_NAME,
+            max_batch_size=settings.EMBEDDING_SERVER_MAX_BATCH,
+            max_wait_ms=settings.EMBEDDING_SERVER_MAX_WAIT_MS,
+            threads=settings.EMBEDDING_SERVER_THREADS,
+        )
+
+    def stop_embedding_server(self) -> None:
+        if self._embedding_process is None:
+            return
+        self._embedding_process.terminate()
+        try:
+            self._embedding_process.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            self._embedding_process.kill()
+        self._embedding_process = None
+
+    async def _load(self, name: str, loader: Callable[[], Awaitable[None]]) -> None:
+        state = self.dependencies[name]
+        started = time.perf_counter()
+        try:
+            await loader()
+        except Exception as e:
+            state.status = DEPENDENCY_FAILED
+            state.error = f"{type(e).__name__}: {e}"
+            logger.error("'%s' 적재 실패: %s", name, state.error)
+            return
+
+        state.status = DEPENDENCY_READY
+        state.error = None
+        state.load_seconds = round(time.perf_counter() - started, 3)
+        logger.info("'%s' 적재 완료 (%s초)", name, state.load_seconds)
+
+    async def _load_pending(self) -> None:
+        loaders = self._loaders()
+        await asyncio.gather(*(
+            self._load(name, loaders[name])
+            for name, state in self.dependencies.items()
+            if state.status != DEPENDENCY_READY
+        ))
+
+    async def _retry_failed(self) -> None:
+        while any(state.status == DEPENDENCY_FAILED for state in self.dependencies.values()):
+            await asyncio.sleep(self.retry_interval)
+            await self._load_pending()
+
+    async def startup(self) -> None:
+        """무거운 자원을 동시에 적재한 뒤 비동기 작업 워커를 기동합니다. 실패한 자원은 백그라운드에서 재시도합니다."""
+        configure_tracing(
+            create_exporter(settings.TRACE_EXPORTER, settings.TRACE_FILE_PATH), settings.TRACE_SAMPLE_RATE
+        )
+        if settings.LOOP_MONITOR_INTERVAL_SECONDS > 0:
+            # 자원 적재 중에 루프를 막는 작업도 보이도록 먼저 시작
+            self.loop_monitor.start()
+        started = time.perf_counter()
+        await self._load_pending()
+        self.startup_seconds = round(time.perf_counter() - started, 3)
+        logger.info("애플리케이션 자원 적재 완료 (%s초, ready=%s)", self.startup_seconds, self.is_ready())
+
+        if any(state.status == DEPENDENCY_FAILED for state in self.dependencies.values()):
+            self._retry_task = asyncio.create_task(self._retry_failed(), name="Dependency_Retry")
+
+        # 비동기 피드백 작업 워커 기동 (재시작 전 처리되지 않은 작업 복구 포함)
+        await self.feedback_job_service.start(recover=not self.jobs_recovered_before_fork)
+
+    async def shutdown(self) -> None:
+        if self._retry_task is not None:
+            self._retry_task.cancel()
+            await asyncio.gather(self._retry_task, return_exceptions=True)
+            self._retry_task = None
+
+        await self.feedback_job_service.stop()
+        await self.grammar_service.close()
+        if self.draft_store is not None:
+            await self.draft_store.close()
+        if settings.LOOP_MONITOR_INTERVAL_SECONDS > 0:
+            await self.loop_monitor.stop()
+
+        if self._kafka_producer is not None:
+            # 버퍼에 남은 수집 이벤트를 보낸 뒤 닫음
+            await asyncio.to_thread(self._kafka_producer.close, 5)
+            self._kafka_producer = None
+            self.collect_event_publisher.producer = None
+
+        await asyncio.to_thread(self.stop_embedding_server)
+        shutdown_tracing()
+
+    # ------------------------------------------------------------------
+
+    # 여러 워커 프로세스 실행 (gunicorn preload)
+
+    def preload(self) -> None:
+        """
+        gunicorn 마스터에서 fork 전에 호출합니다.
+        읽기 전용 자원(임베딩 모델 가중치, Mecab 사전, KSS 모델)을 한 번만 적재해 워커들이 copy-on-write로 공유합니다.
+        소켓·커넥션·스레드를 가진 자원은 만들지 않습니다. (워커의 startup에서 각자 생성)
+        """
+        if settings.EMBEDDING_SERVER_SOCKET:
+            # 모델은 임베딩 서버가 소유하므로 마스터에서는 서버만 띄움
+            self.start_embedding_server()
+        else:
+            import torch
+
+            # 마스터에서 OpenMP 스레드 풀이 만들어지면 fork한 워커의 첫 병렬 연산이 멈출 수 있으므로 단일 스레드로 적재
+            torch.set_num_threads(1)
+            self.grammar_service.load_embedder(warm_up=False)
+        self.sentence_service.warm_up()
+
+        # 워커가 여럿이면 각자 복구할 때 다른 워커가 실행 중인 작업까지 되돌리므로 fork 전에 한 번만 복구
+        # (이후 워커가 종료되면 실행하던 작업은 남은 워커들이 pid로 확인해 되돌림)
+        store = FeedbackJobStore(settings.FEEDBACK_JOB_DB_PATH)
+        try:
+            store.recover_unfinished()
+        finally:
+            store.close()
+        self.jobs_recovered_before_fork = True
+
+        # 적재한 객체를 GC 추적 대상에서 빼서, 워커의 GC가 공유 페이지를 건드려 복사되지 않도록 함
+        gc.freeze()
+
+    def after_fork(self, torch_threads: Optional[int] = None) -> None:
+        """gunicorn 워커에서 fork 직후 호출합니다. 부모와 공유하면 안 되는 자원을 다시 만듭니다."""
+        reinit_logging_after_fork()
+        # 임베딩 서버는 마스터가 관리 (워커가 종료하거나 다시 띄우지 않음)
+        self._forked = True
+        self._embedding_process = None
+        self.grammar_service.reset_connections()
+
+        if torch_threads and not settings.EMBEDDING_SERVER_SOCKET:
+            import torch
+
+            torch.set_num_threads(torch_threads)
+
+    # ------------------------------------------------------------------
+
+    # 상태 조회
+
+    def is_ready(self) -> bool:
+        return all(
+            state.status == DEPENDENCY_READY
+            for state in self.dependencies.values()
+            if state.required
+        )
+
+    def readiness(self) -> Dict[str, Any]:
+        return {
+            "ready": self.is_ready(),
+            "startup_seconds": self.startup_seconds,
+            "dependencies": {name: state.to_dict() for name, state in self.dependencies.items()},
+        }
@@ -1,42 +1,32 @@
-import json
-from kafka import KafkaProducer
-
 from .config import settings
-from ..clients.context_llm_client import ContextLLMClient
-from ..clients.grammar_llm_client import GrammarLLMClient
+from .container import AppContainer
+from .loop_monitor import EventLoopMonitor
+from .profiling import RequestProfiler
 from ..llm.clova_client import ClovaStudioClient
-from ..services.context_service import ContextService
-from ..services.grammar_service import GrammarService
-from ..services.sentence_service import SentenceService
+from ..services.admission_controller import AdmissionController
 from ..services.feedback_facade import FeedbackFacade
-from ..services.collect_event_publisher import CollectEventPublisher
+from ..services.feedback_job_service import FeedbackJobService
+
+# 서비스 객체는 처음 접근할 때, 무거운 자원은 lifespan(container.startup)에서 적재
+container = AppContainer(retry_interval=settings.STARTUP_RETRY_INTERVAL_SECONDS)
 
-llm_client = ClovaStudioClient()
+def get_container() -> AppContainer:
+    return container
 
-context_client = ContextLLMClient(llm_client)
-grammar_client = GrammarLLMClient(llm_client)
+def get_feedback_facade() -> FeedbackFacade:
+    return container.feedback_facade
 
-context_service = ContextService(context_client)
-grammar_service = GrammarService(grammar_client)
-sentence_service = SentenceService()
+def get_admission_controller() -> AdmissionController:
+    return container.admission_controller
 
-kafka_producer = KafkaProducer(
-    bootstrap_servers=settings.KAFKA_BOOTSTRAP_SERVERS,
-    value_serializer=lambda v: json.dumps(v, ensure_ascii=False).encode("utf-8"),
-)
+def get_llm_client() -> ClovaStudioClient:
+    return container.llm_client
 
-collect_event_publisher = CollectEventPublisher(
-    producer=kafka_producer,
-    topic=settings.KAFKA_TOPIC,
-    fallback_repo=None,
-)
+def get_feedback_job_service() -> FeedbackJobService:
+    return container.feedback_job_service
 
-feedback_facade = FeedbackFacade(
-    context_service=context_service,
-    grammar_service=grammar_service,
-    sentence_service=sentence_service,
-    collect_event_publisher=collect_event_publisher,
-)
+def get_loop_monitor() -> EventLoopMonitor:
+    return container.loop_monitor
 
-def get_feedback_facade() -> FeedbackFacade:
-    return feedback_facade
+def get_request_profiler() -> RequestProfiler:
+    return container.request_profiler
@@ -0,0 +1,119 @@
+import asyncio
+import sys
+import threading
+import time
+import traceback
+from collections import deque
+from typing import Any, Deque, Dict, Optional
+
+from .metrics import (
+    EVENT_LOOP_BLOCKED_TOTAL,
+    EVENT_LOOP_LAG_SECONDS,
+    set_task_stage_recording,
+    stage_of_task,
+)
+from ..util.logger import logger
+
+"""
+이벤트 루프 상태 감시
+
+- 지연(lag): interval마다 잠들었다 깨어나면서, 예약한 시각보다 얼마나 늦게 깨어났는지를 event_loop_lag_seconds로 기록합니다.
+  임베딩 encode, Chroma query, KSS, Mecab처럼 루프 스레드에서 동기로 실행되는 작업이 길수록 커집니다.
+- 차단 감지(block_threshold, 디버그용): 별도 스레드가 루프의 마지막 깨어난 시각을 지켜보다가, 임계값 이상 멈춰 있으면
+  그 순간 루프 스레드의 스택과 실행 중인 태스크의 단계(track_stage) 이름을 로그로 남깁니다.
+"""
+
+
+class EventLoopMonitor:
+    def __init__(self, interval: float = 0.25, block_threshold: Optional[float] = None, max_reports: int = 20) -> None:
+        self.interval = interval
+        self.block_threshold = block_threshold
+
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._loop_thread_id: Optional[int] = None
+        self._task: Optional[asyncio.Task] = None
+        self._watchdog: Optional[threading.Thread] = None
+        self._stopped = threading.Event()
+        # 루프가 마지막으로 깨어난 시각과, 이미 보고한 멈춤의 기준 시각 (같은 멈춤을 두 번 보고하지 않도록)
+        self._last_beat = time.monotonic()
+        self._reported_beat: Optional[float] = None
+
+        self.max_lag = 0.0
+        self.recent_blocks: Deque[Dict[str, Any]] = deque(maxlen=max_reports)
+
+    def start(self) -> None:
+        """실행 중인 이벤트 루프 안에서 호출합니다."""
+        self._loop = asyncio.get_running_loop()
+        self._loop_thread_id = threading.get_ident()
+        self._last_beat = time.monotonic()
+        self._stopped.clear()
+        self._task = asyncio.create_task(self._run(), name="Event_Loop_Monitor")
+
+        if self.block_threshold:
+            set_task_stage_recording(True)
+            self._watchdog = threading.Thread(target=self._watch, name="event-loop-watchdog", daemon=True)
+            self._watchdog.start()
+            logger.info("이벤트 루프 차단 감지 사용 (임계값 %.0fms)", self.block_threshold * 1000)
+
+    async def stop(self) -> None:
+        self._stopped.set()
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+        if self._watchdog is not None:
+            await asyncio.to_thread(self._watchdog.join, 1.0)
+            self._watchdog = None
+            set_task_stage_recording(False)
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            scheduled = loop.time() + self.interval
+            await asyncio.sleep(self.interval)
+            lag = max(0.0, loop.time() - scheduled)
+            self._last_beat = time.monotonic()
+            self.max_lag = max(self.max_lag, lag)
+            EVENT_LOOP_LAG_SECONDS.observe(lag)
+
+    # ------------------------------------------------------------------
+
+    # 차단 감지 (별도 스레드)
+
+    def _watch(self) -> None:
+        check_interval = max(self.block_threshold / 2, 0.005)
+        while not self._stopped.wait(check_interval):
+            beat = self._last_beat
+            stalled = time.monotonic() - beat - self.interval
+            if stalled >= self.block_threshold and self._reported_beat != beat:
+                self._reported_beat = beat
+                self._report(stalled)
+
+    def _report(self, stalled: float) -> None:
+        frame = sys._current_frames().get(self._loop_thread_id)
+        stack = "".join(traceback.format_stack(frame)) if frame is not None else ""
+        task = asyncio.current_task(self._loop)
+        stage = stage_of_task(task) or "unknown"
+        task_name = task.get_name() if task is not None else "-"
+
+        EVENT_LOOP_BLOCKED_TOTAL.labels(stage=stage).inc()
+        self.recent_blocks.append({
+            "at": time.time(),
+            "blocked_ms": round(stalled * 1000, 1),
+            "stage": stage,
+            "task": task_name,
+            "stack": stack,
+        })
+        # 보고 시점까지 막힌 시간 (실제 전체 시간은 event_loop_lag_seconds에 기록됨)
+        logger.warning(
+            "이벤트 루프가 %.0fms 이상 막혀 있습니다. (stage=%s, task=%s)\n%s",
+            stalled * 1000, stage, task_name, stack,
+        )
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "interval_seconds": self.interval,
+            "block_threshold_ms": self.block_threshold * 1000 if self.block_threshold else None,
+            "max_lag_ms": round(self.max_lag * 1000, 1),
+            "recent_blocks": list(self.recent_blocks),
+        }
@@ -0,0 +1,236 @@
+import asyncio
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterator, Optional, Tuple
+
+from prometheus_client import Counter, Gauge, Histogram
+
+from .profiling import note_current_task
+from .request_context import DeadlineExceededError
+from .tracing import trace_span
+
+"""
+애플리케이션 전역 Prometheus 메트릭 정의
+"""
+
+# Clova Studio 요청 속도 제한기
+
+CLOVA_LIMITER_QUEUE_DEPTH = Gauge(
+    "clova_limiter_queue_depth",
+    "Clova Studio 호출 슬롯을 기다리는 요청 수",
+    ["stage"],
+)
+
+CLOVA_LIMITER_WAIT_SECONDS = Histogram(
+    "clova_limiter_wait_seconds",
+    "Clova Studio 호출 슬롯을 얻기까지 기다린 시간",
+    ["stage"],
+    buckets=(0.01, 0.05, 0.1, 0.25, 0.5, 1, 2, 5, 10, 20, 30, 60),
+)
+
+CLOVA_LIMITER_RATE_QPM = Gauge(
+    "clova_limiter_rate_qpm",
+    "429 응답에 따라 조정된 현재 Clova Studio 허용 속도 (분당 요청 수)",
+)
+
+CLOVA_RATE_LIMITED_TOTAL = Counter(
+    "clova_rate_limited_total",
+    "Clova Studio가 429로 응답한 횟수",
+    ["stage"],
+)
+
+# 동일 요청 합치기 (singleflight)
+
+SINGLEFLIGHT_COALESCED_TOTAL = Counter(
+    "singleflight_coalesced_total",
+    "이미 실행 중인 동일 호출에 합류해 별도 실행을 생략한 횟수",
+    ["name"],
+)
+
+SINGLEFLIGHT_INFLIGHT = Gauge(
+    "singleflight_inflight",
+    "현재 실행 중인 고유 호출 수",
+    ["name"],
+)
+
+CLOVA_TIME_TO_FIRST_TOKEN_SECONDS = Histogram(
+    "clova_time_to_first_token_seconds",
+    "스트리밍 요청에서 첫 토큰을 받기까지 걸린 시간 (속도 제한 대기 제외)",
+    ["stage"],
+    buckets=(0.1, 0.25, 0.5, 1, 2, 3, 5, 10, 20, 30),
+)
+
+# 요청 수용 제어 (동시성 한도·과부하 차단)
+
+FEEDBACK_INFLIGHT_REQUESTS = Gauge(
+    "feedback_inflight_requests",
+    "현재 처리 중인 피드백 요청 수",
+)
+
+GRAMMAR_INFLIGHT_TASKS = Gauge(
+    "grammar_inflight_tasks",
+    "현재 실행 중인 문장별 문법 교정 작업 수 (전역 한도 적용)",
+)
+
+FEEDBACK_SHED_TOTAL = Counter(
+    "feedback_shed_total",
+    "과부하로 거절(rejected)하거나 축소 모드(degraded)로 처리한 요청 수",
+    ["action"],
+)
+
+CLOVA_CANCELLED_CALLS_TOTAL = Counter(
+    "clova_cancelled_calls_total",
+    "클라이언트 연결 종료 등으로 취소된 Clova Studio 호출 수 (queued: 슬롯 대기 중, in_flight: 응답 대기 중)",
+    ["stage", "phase"],
+)
+
+# 피드백 파이프라인 단계별 소요 시간
+# stage: kss_split, mecab_score, embedding, chroma_query, es_query, llm_correction,
+#        grammar_db, llm_feedback, llm_context, kafka_publish
+# LLM 단계는 속도 제한 대기를 포함하며, Clova 서버 응답 시간만은 clova_request_seconds로 따로 봄
+
+OUTCOME_SUCCESS = "success"
+OUTCOME_ERROR = "error"
+OUTCOME_TIMEOUT = "timeout"
+OUTCOME_CANCELLED = "cancelled"
+OUTCOME_SKIPPED = "skipped"
+
+FEEDBACK_STAGE_SECONDS = Histogram(
+    "feedback_stage_seconds",
+    "피드백 파이프라인 단계별 소요 시간 (실행한 단계만)",
+    ["stage", "outcome"],
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2, 5, 10, 20, 30),
+)
+
+FEEDBACK_STAGE_TOTAL = Counter(
+    "feedback_stage_total",
+    "피드백 파이프라인 단계 결과별 횟수 (마감 시간 부족 등으로 건너뛴 단계 포함)",
+    ["stage", "outcome"],
+)
+
+CLOVA_REQUEST_SECONDS = Histogram(
+    "clova_request_seconds",
+    "속도 제한 슬롯을 얻은 뒤 Clova Studio 응답을 받기까지 걸린 시간 (스트리밍은 마지막 토큰까지)",
+    ["stage", "outcome"],
+    buckets=(0.1, 0.25, 0.5, 1, 2, 3, 5, 10, 20, 30, 60),
+)
+
+# LLM 토큰 사용량 (Clova Studio 응답의 usage 기준, 동일 요청 합치기로 생략한 호출은 제외)
+
+CLOVA_TOKENS_TOTAL = Counter(
+    "clova_tokens_total",
+    "Clova Studio 호출의 토큰 수 (kind: prompt, completion)",
+    ["stage", "kind"],
+)
+
+CLOVA_PROMPT_TOKENS = Histogram(
+    "clova_prompt_tokens",
+    "Clova Studio 호출 하나의 프롬프트 토큰 수",
+    ["stage"],
+    buckets=(100, 250, 500, 750, 1000, 1500, 2000, 3000, 4000, 6000, 8000),
+)
+
+FEEDBACK_REQUEST_LLM_TOKENS = Histogram(
+    "feedback_request_llm_tokens",
+    "피드백 요청 하나가 쓴 LLM 토큰 수 (모든 단계의 프롬프트와 완성 합계)",
+    ["mode"],
+    buckets=(500, 1000, 2500, 5000, 10000, 20000, 40000, 80000, 160000),
+)
+
+LLM_PROMPT_ESTIMATED_TOKENS_TOTAL = Counter(
+    "llm_prompt_estimated_tokens_total",
+    "토큰 예산으로 프롬프트를 줄이기 전(before)·후(after)의 추정 토큰 수",
+    ["stage", "phase"],
+)
+
+# 이벤트 루프 상태
+
+EVENT_LOOP_LAG_SECONDS = Histogram(
+    "event_loop_lag_seconds",
+    "이벤트 루프가 예약된 시각보다 늦게 깨어난 시간 (동기 작업이 루프를 막은 정도)",
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2, 5),
+)
+
+EVENT_LOOP_BLOCKED_TOTAL = Counter(
+    "event_loop_blocked_total",
+    "이벤트 루프가 임계값 이상 막힌 것을 감지한 횟수 (LOOP_BLOCK_DEBUG, 막고 있던 태스크의 단계별)",
+    ["stage"],
+)
+
+
+class StageTimer:
+    """track_stage 블록 안에서 결과를 직접 지정할 때 사용합니다. (예: 검색 결과 없이 끝난 단계를 skipped로)"""
+
+    def __init__(self) -> None:
+        self.outcome = OUTCOME_SUCCESS
+
+
+@contextmanager
+def track_stage(stage: str) -> Iterator[StageTimer]:
+    """
+    블록의 실행 시간을 단계·결과별로 기록하고, 같은 이름의 추적 span을 만듭니다. 예외는 그대로 전파합니다.
+    마감 시간 초과는 timeout, 취소는 cancelled, 그 외 예외는 error로 기록합니다.
+    """
+    timer = StageTimer()
+    started = time.perf_counter()
+    recorded = _enter_task_stage(stage) if _record_task_stages else None
+    note_current_task()
+    try:
+        with trace_span(stage):
+            yield timer
+    except (DeadlineExceededError, asyncio.TimeoutError):
+        timer.outcome = OUTCOME_TIMEOUT
+        raise
+    except (asyncio.CancelledError, GeneratorExit):
+        timer.outcome = OUTCOME_CANCELLED
+        raise
+    except Exception:
+        timer.outcome = OUTCOME_ERROR
+        raise
+    finally:
+        FEEDBACK_STAGE_SECONDS.labels(stage=stage, outcome=timer.outcome).observe(time.perf_counter() - started)
+        FEEDBACK_STAGE_TOTAL.labels(stage=stage, outcome=timer.outcome).inc()
+        if recorded is not None:
+            _exit_task_stage(*recorded)
+
+
+def record_stage_skipped(stage: str) -> None:
+    FEEDBACK_STAGE_TOTAL.labels(stage=stage, outcome=OUTCOME_SKIPPED).inc()
+
+
+# 이벤트 루프 차단 감지(LOOP_BLOCK_DEBUG)에서 루프를 막고 있는 태스크가 어느 단계인지 찾기 위한 기록
+# 감지를 켠 경우에만 기록하므로 평소에는 track_stage에 비용이 없음
+
+_record_task_stages = False
+_task_stages: Dict[asyncio.Task, str] = {}
+
+
+def set_task_stage_recording(enabled: bool) -> None:
+    global _record_task_stages
+    _record_task_stages = enabled
+    if not enabled:
+        _task_stages.clear()
+
+
+def stage_of_task(task: Optional[asyncio.Task]) -> Optional[str]:
+    return _task_stages.get(task) if task is not None else None
+
+
+def _enter_task_stage(stage: str) -> Optional[Tuple[asyncio.Task, Optional[str]]]:
+    try:
+        task = asyncio.current_task()
+    except RuntimeError:
+        # 이벤트 루프 밖(스레드에서 실행하는 Kafka 발행 등)
+        return None
+    if task is None:
+        return None
+    previous = _task_stages.get(task)
+    _task_stages[task] = stage
+    return task, previous
+
+
+def _exit_task_stage(task: asyncio.Task, previous: Optional[str]) -> None:
+    if previous is None:
+        _task_stages.pop(task, None)
+    else:
+        _task_stages[task] = previous
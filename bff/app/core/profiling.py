@@ -0,0 +1,271 @@
+import asyncio
+import hmac
+import os
+import random
+import re
+import sys
+import threading
+import time
+import tracemalloc
+from collections import Counter
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
+from types import FrameType
+from typing import Any, AsyncIterator, Awaitable, Dict, List, Optional, Set, TypeVar
+
+from ..util.logger import logger
+
+"""
+요청 단위 프로파일링 (운영 환경에서 특정 요청만)
+
+- 관리자 헤더(X-Profile)나 샘플링으로 고른 요청의 피드백 파이프라인을 통계적 프로파일러로 실행합니다.
+- 샘플러 스레드가 interval마다 이벤트 루프 스레드의 스택을 읽어, 이 요청의 태스크가 실행 중일 때만 기록합니다.
+  이 요청의 태스크가 await로 기다리는 중이면 그 await 경로를 "(await)"로 기록하므로, CPU 시간과 대기 시간이 함께 보입니다.
+- 관리자 헤더로 요청한 경우에만 요청 전후의 tracemalloc 스냅샷 차이를 함께 남깁니다. (프로세스 전체 할당이므로 동시에 처리한 요청의 할당도 포함)
+  추적 중에는 워커의 모든 할당이 느려지고, 스냅샷은 스레드에서 찍어도 추적 중인 할당을 복사하는 동안 GIL을 잡아
+  이벤트 루프가 멈추므로(수 ms~수 초) 샘플링한 요청에서는 사용하지 않습니다.
+- 결과는 PROFILE_OUTPUT_DIR/<요청 ID>.collapsed (flamegraph.pl, speedscope에서 열 수 있는 collapsed stack)와
+  <요청 ID>.alloc.txt 로 저장합니다.
+
+프로파일링하지 않는 요청에서는 track_stage마다 ContextVar를 한 번 읽는 것 외에 비용이 없습니다.
+"""
+
+T = TypeVar("T")
+
+PROFILE_NAME_PATTERN = re.compile(r"^[A-Za-z0-9._-]{1,64}$")
+AWAIT_MARKER = "(await)"
+
+
+class ProfileSession:
+    def __init__(self, request_id: str, loop: asyncio.AbstractEventLoop, loop_thread_id: int) -> None:
+        self.request_id = request_id
+        self.loop = loop
+        self.loop_thread_id = loop_thread_id
+        self.tasks: Set[asyncio.Task] = set()
+        self.samples: Counter = Counter()
+        self.sample_count = 0
+        self.started = time.perf_counter()
+        self.malloc_start: Optional[tracemalloc.Snapshot] = None
+
+    def add_task(self, task: asyncio.Task) -> None:
+        self.tasks.add(task)
+
+    def sample(self, frames: Dict[int, FrameType]) -> None:
+        running = asyncio.current_task(self.loop)
+        self.sample_count += 1
+        for task in list(self.tasks):
+            if task.done():
+                self.tasks.discard(task)
+                continue
+            if task is running:
+                frame = frames.get(self.loop_thread_id)
+                if frame is not None:
+                    self.samples[_collapse(_stack_from_frame(frame))] += 1
+            else:
+                stack = _await_stack(task)
+                if stack:
+                    self.samples[_collapse(stack + [AWAIT_MARKER])] += 1
+
+
+def _frame_label(frame: FrameType) -> str:
+    code = frame.f_code
+    return f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+
+
+def _stack_from_frame(frame: Optional[FrameType]) -> List[str]:
+    stack = []
+    while frame is not None:
+        stack.append(_frame_label(frame))
+        frame = frame.f_back
+    stack.reverse()
+    # 이벤트 루프 내부 프레임(run_forever, _run_once 등)은 모든 샘플에 공통이므로 태스크 코루틴부터 표시
+    for i, label in enumerate(stack):
+        if label.startswith("_run (events.py"):
+            return stack[i + 1:]
+    return stack
+
+
+def _await_stack(task: asyncio.Task) -> List[str]:
+    """기다리는 중인 태스크의 코루틴 체인 (바깥 → 안쪽). 다른 스레드에서 읽으므로 중간에 바뀌면 빈 목록"""
+    stack = []
+    try:
+        coro: Any = task.get_coro()
+        while coro is not None and len(stack) < 128:
+            frame = getattr(coro, "cr_frame", None) or getattr(coro, "ag_frame", None) or getattr(coro, "gi_frame", None)
+            if frame is None:
+                break
+            stack.append(_frame_label(frame))
+            coro = getattr(coro, "cr_await", None) or getattr(coro, "ag_await", None) or getattr(coro, "gi_yieldfrom", None)
+    except Exception:
+        return []
+    return stack
+
+
+def _collapse(stack: List[str]) -> str:
+    return ";".join(label.replace(";", ",") for label in stack)
+
+
+_active_session: ContextVar[Optional[ProfileSession]] = ContextVar("profile_session", default=None)
+
+
+def note_current_task() -> None:
+    """프로파일링 중인 요청이면 현재 태스크를 샘플링 대상에 추가합니다. (track_stage 등에서 호출)"""
+    session = _active_session.get()
+    if session is None:
+        return
+    task = asyncio.current_task()
+    if task is not None:
+        session.add_task(task)
+
+
+class RequestProfiler:
+    def __init__(
+        self,
+        output_dir: str,
+        admin_token: Optional[str] = None,
+        sample_rate: float = 0.0,
+        interval_ms: float = 5.0,
+        tracemalloc_frames: int = 10,
+    ) -> None:
+        self.output_dir = output_dir
+        self.admin_token = admin_token
+        self.sample_rate = sample_rate
+        self.interval = interval_ms / 1000
+        self.tracemalloc_frames = tracemalloc_frames
+
+        self._sessions: Set[ProfileSession] = set()
+        self._lock = threading.Lock()
+        self._sampler: Optional[threading.Thread] = None
+        self._started_tracemalloc = False
+
+    def is_admin_request(self, header_value: Optional[str]) -> bool:
+        """관리자 토큰이 일치하는 X-Profile 헤더가 있는 요청인지 확인합니다."""
+        if header_value is None or not self.admin_token:
+            return False
+        return hmac.compare_digest(header_value.encode(), self.admin_token.encode())
+
+    def should_profile(self, header_value: Optional[str]) -> bool:
+        """관리자 토큰이 일치하는 X-Profile 헤더가 있거나 샘플링에 걸린 요청만 프로파일링합니다."""
+        if header_value is not None and self.admin_token:
+            return self.is_admin_request(header_value)
+        return self.sample_rate > 0 and random.random() < self.sample_rate
+
+    @asynccontextmanager
+    async def profile(self, request_id: str, trace_malloc: bool = False) -> AsyncIterator[ProfileSession]:
+        """trace_malloc이면 요청 전후 할당 비교도 남깁니다. (루프를 멈추므로 관리자 헤더로 요청한 경우에만)"""
+        session = ProfileSession(request_id, asyncio.get_running_loop(), threading.get_ident())
+        current = asyncio.current_task()
+        if current is not None:
+            session.add_task(current)
+        if trace_malloc:
+            await self._start_malloc(session)
+        with self._lock:
+            self._sessions.add(session)
+            self._ensure_sampler()
+
+        token = _active_session.set(session)
+        try:
+            yield session
+        finally:
+            _active_session.reset(token)
+            with self._lock:
+                self._sessions.discard(session)
+            await asyncio.to_thread(self._finish, session, time.perf_counter() - session.started)
+
+    async def run(self, request_id: str, awaitable: Awaitable[T], trace_malloc: bool = False) -> T:
+        async with self.profile(request_id, trace_malloc=trace_malloc):
+            return await awaitable
+
+    # ------------------------------------------------------------------
+
+    # 샘플링 (별도 스레드)
+
+    def _ensure_sampler(self) -> None:
+        if self._sampler is None or not self._sampler.is_alive():
+            self._sampler = threading.Thread(target=self._sample_loop, name="request-profiler", daemon=True)
+            self._sampler.start()
+
+    def _sample_loop(self) -> None:
+        while True:
+            with self._lock:
+                sessions = list(self._sessions)
+                if not sessions:
+                    # 프로파일링 중인 요청이 없으면 스레드 종료 (다음 요청에서 다시 시작)
+                    self._sampler = None
+                    return
+            frames = sys._current_frames()
+            for session in sessions:
+                session.sample(frames)
+            del frames
+            time.sleep(self.interval)
+
+    # ------------------------------------------------------------------
+
+    # 메모리 할당 (tracemalloc)
+
+    async def _start_malloc(self, session: ProfileSession) -> None:
+        if self.tracemalloc_frames <= 0:
+            return
+        with self._lock:
+            if not tracemalloc.is_tracing():
+                tracemalloc.start(self.tracemalloc_frames)
+                self._started_tracemalloc = True
+        # 종료 스냅샷(_malloc_report)과 같이 스레드에서 찍음 (Snapshot 객체를 만드는 동안은 루프가 함께 실행됨)
+        session.malloc_start = await asyncio.to_thread(tracemalloc.take_snapshot)
+
+    def _malloc_report(self, session: ProfileSession) -> Optional[str]:
+        if session.malloc_start is None:
+            return None
+        snapshot = tracemalloc.take_snapshot()
+        with self._lock:
+            if self._started_tracemalloc and not self._sessions:
+                tracemalloc.stop()
+                self._started_tracemalloc = False
+
+        filters = [tracemalloc.Filter(False, tracemalloc.__file__), tracemalloc.Filter(False, __file__)]
+        stats = snapshot.filter_traces(filters).compare_to(session.malloc_start.filter_traces(filters), "traceback")
+        lines = [f"# 요청 {session.request_id} 처리 중 할당 변화 (상위 30개, 프로세스 전체)"]
+        for stat in stats[:30]:
+            lines.append(f"{stat.size_diff / 1024:+10.1f} KiB  {stat.count_diff:+7d}개  (현재 {stat.size / 1024:.1f} KiB)")
+            lines.extend(f"    {line}" for line in stat.traceback.format(most_recent_first=True))
+        return "\n".join(lines) + "\n"
+
+    def _finish(self, session: ProfileSession, elapsed: float) -> None:
+        os.makedirs(self.output_dir, exist_ok=True)
+        base = os.path.join(self.output_dir, session.request_id)
+        with open(f"{base}.collapsed", "w", encoding="utf-8") as f:
+            for stack, count in session.samples.most_common():
+                f.write(f"{stack} {count}\n")
+
+        malloc_report = self._malloc_report(session)
+        if malloc_report is not None:
+            with open(f"{base}.alloc.txt", "w", encoding="utf-8") as f:
+                f.write(malloc_report)
+
+        logger.info(
+            "요청 프로파일 저장: %s.collapsed (%.0fms, 샘플 %d회, 간격 %.1fms)",
+            base, elapsed * 1000, session.sample_count, self.interval * 1000,
+        )
+
+    # ------------------------------------------------------------------
+
+    # 조회
+
+    def list_profiles(self) -> List[str]:
+        if not os.path.isdir(self.output_dir):
+            return []
+        return sorted(
+            (name for name in os.listdir(self.output_dir) if name.endswith((".collapsed", ".alloc.txt"))),
+            key=lambda name: os.path.getmtime(os.path.join(self.output_dir, name)),
+            reverse=True,
+        )
+
+    def read_profile(self, name: str) -> Optional[str]:
+        stem = name.removesuffix(".collapsed").removesuffix(".alloc.txt")
+        if not PROFILE_NAME_PATTERN.match(stem) or name not in (f"{stem}.collapsed", f"{stem}.alloc.txt"):
+            return None
+        path = os.path.join(self.output_dir, name)
+        if not os.path.isfile(path):
+            return None
+        with open(path, encoding="utf-8") as f:
+            return f.read()
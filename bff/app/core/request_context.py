@@ -0,0 +1,111 @@
+import time
+import uuid
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterator, Optional
+
+class DeadlineExceededError(Exception):
+    pass
+
+@dataclass
+class LlmUsage:
+    """LLM 호출 수와 응답의 usage로 받은 토큰 수 (단계 하나 또는 합계)"""
+    calls: int = 0
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
+
+    @property
+    def total_tokens(self) -> int:
+        return self.prompt_tokens + self.completion_tokens
+
+    def add(self, prompt_tokens: int, completion_tokens: int) -> None:
+        self.calls += 1
+        self.prompt_tokens += prompt_tokens
+        self.completion_tokens += completion_tokens
+
+    def to_dict(self) -> Dict[str, int]:
+        return {
+            "calls": self.calls,
+            "prompt_tokens": self.prompt_tokens,
+            "completion_tokens": self.completion_tokens,
+            "total_tokens": self.total_tokens,
+        }
+
+def usage_summary(usage: Dict[str, LlmUsage]) -> Dict[str, Any]:
+    """단계별 사용량과 합계. 추적 span, 로그, 수집 이벤트에 그대로 넣는 형식"""
+    total = LlmUsage()
+    for stage_usage in usage.values():
+        total.calls += stage_usage.calls
+        total.prompt_tokens += stage_usage.prompt_tokens
+        total.completion_tokens += stage_usage.completion_tokens
+    return {**total.to_dict(), "stages": {stage: u.to_dict() for stage, u in sorted(usage.items())}}
+
+@dataclass
+class RequestContext:
+    """
+    하나의 피드백 요청 동안 하위 계층(LLM 클라이언트 등)에서 참조하는 요청 단위 정보입니다.
+    asyncio 태스크는 생성 시점의 컨텍스트를 복사하므로, gather로 실행한 코루틴에서도 같은 객체를 봅니다.
+    """
+    user_id: Optional[str] = None
+    # 요청 전체 마감 시각 (time.monotonic 기준). None이면 제한 없음
+    deadline: Optional[float] = None
+    # 로그·추적에서 요청을 구분하는 ID (X-Request-ID 헤더 또는 비동기 작업 ID)
+    request_id: str = field(default_factory=lambda: uuid.uuid4().hex)
+    # 요청에서 실제로 보낸 LLM 호출의 단계별 토큰 사용량 (합쳐진 동일 호출은 한 번만 집계)
+    llm_usage: Dict[str, LlmUsage] = field(default_factory=dict)
+
+    def remaining(self) -> Optional[float]:
+        if self.deadline is None:
+            return None
+        return self.deadline - time.monotonic()
+
+_current_context: ContextVar[Optional[RequestContext]] = ContextVar("request_context", default=None)
+# 요청보다 작은 단위(문장 등)의 사용량을 따로 모을 때 설정. 블록 안에서 만든 태스크도 같은 dict에 기록
+_usage_scope: ContextVar[Optional[Dict[str, LlmUsage]]] = ContextVar("llm_usage_scope", default=None)
+
+def get_request_context() -> Optional[RequestContext]:
+    return _current_context.get()
+
+def remaining_budget() -> Optional[float]:
+    """현재 요청의 남은 시간(초). 마감 시각이 없으면 None을 반환합니다."""
+    context = _current_context.get()
+    return context.remaining() if context else None
+
+def ensure_budget(stage: str, min_seconds: float) -> Optional[float]:
+    """
+    남은 시간이 min_seconds보다 적으면 해당 단계를 시작하지 않도록 DeadlineExceededError를 발생시킵니다.
+    남은 시간(마감 시각이 없으면 None)을 반환합니다.
+    """
+    remaining = remaining_budget()
+    if remaining is not None and remaining < min_seconds:
+        raise DeadlineExceededError(
+            f"'{stage}' 단계를 시작하기에 남은 시간이 부족합니다. (남은 시간 {max(remaining, 0):.2f}초, 필요 {min_seconds:.2f}초)"
+        )
+    return remaining
+
+@contextmanager
+def bind_request_context(context: RequestContext) -> Iterator[RequestContext]:
+    token = _current_context.set(context)
+    try:
+        yield context
+    finally:
+        _current_context.reset(token)
+
+def record_llm_usage(stage: str, prompt_tokens: int, completion_tokens: int) -> None:
+    """현재 요청과 사용량 범위(track_llm_usage)에 LLM 호출 한 번의 토큰 수를 더합니다."""
+    context = _current_context.get()
+    scope = _usage_scope.get()
+    for usage in (context.llm_usage if context else None, scope):
+        if usage is not None:
+            usage.setdefault(stage, LlmUsage()).add(prompt_tokens, completion_tokens)
+
+@contextmanager
+def track_llm_usage() -> Iterator[Dict[str, LlmUsage]]:
+    """블록 안에서 보낸 LLM 호출의 단계별 사용량을 요청 전체와 별도로 모읍니다."""
+    usage: Dict[str, LlmUsage] = {}
+    token = _usage_scope.set(usage)
+    try:
+        yield usage
+    finally:
+        _usage_scope.reset(token)
@@ -0,0 +1,235 @@
+import asyncio
+import json
+import os
+import random
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Dict, Iterator, Optional
+
+from .request_context import DeadlineExceededError, get_request_context
+
+"""
+요청 단위 추적(span)
+
+- 요청 하나가 trace 하나이며, trace_id는 요청 ID(X-Request-ID 또는 비동기 작업 ID)입니다.
+- span은 요청 → 문장(sentence_id) → 의존성 호출(임베딩, Chroma, ES, Postgres, Clova, Kafka) 순으로 중첩됩니다.
+- 부모 span은 ContextVar로 전달되므로, span 안에서 만든 asyncio 태스크의 span은 자동으로 자식이 됩니다.
+- 끝난 span은 설정한 exporter로 내보냅니다. (기본은 내보내지 않음, jsonl은 파일에 한 줄씩 기록)
+"""
+
+STATUS_OK = "ok"
+STATUS_ERROR = "error"
+STATUS_TIMEOUT = "timeout"
+STATUS_CANCELLED = "cancelled"
+
+
+class Span:
+    __slots__ = (
+        "trace_id", "span_id", "parent", "name", "attributes",
+        "start_time", "_started", "duration", "status", "error", "sampled",
+    )
+
+    def __init__(self, name: str, trace_id: Optional[str], parent: Optional["Span"], sampled: bool, attributes: Dict[str, Any]) -> None:
+        self.trace_id = trace_id
+        self.span_id = uuid.uuid4().hex[:16]
+        self.parent = parent
+        self.name = name
+        self.attributes = attributes
+        self.start_time = time.time()
+        self._started = time.perf_counter()
+        self.duration: Optional[float] = None
+        self.status = STATUS_OK
+        self.error: Optional[str] = None
+        self.sampled = sampled
+
+    @property
+    def is_recording(self) -> bool:
+        return self.sampled and self.trace_id is not None
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        self.attributes[key] = value
+
+    def find_attribute(self, key: str) -> Any:
+        """자신부터 부모 방향으로 올라가며 속성을 찾습니다. (로그에 sentence_id를 붙일 때 사용)"""
+        span: Optional[Span] = self
+        while span is not None:
+            if key in span.attributes:
+                return span.attributes[key]
+            span = span.parent
+        return None
+
+    def end(self, status: Optional[str] = None, error: Optional[BaseException] = None) -> None:
+        """span을 끝내고 내보냅니다. 여러 번 호출해도 처음 한 번만 적용됩니다."""
+        if self.duration is not None:
+            return
+        self.duration = time.perf_counter() - self._started
+        if status is not None:
+            self.status = status
+        if error is not None:
+            self.error = f"{type(error).__name__}: {error}"
+        if self.is_recording:
+            _exporter.export(self)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "trace_id": self.trace_id,
+            "span_id": self.span_id,
+            "parent_id": self.parent.span_id if self.parent else None,
+            "name": self.name,
+            "start_time": self.start_time,
+            "duration_ms": round((self.duration or 0.0) * 1000, 3),
+            "status": self.status,
+            "error": self.error,
+            "attributes": self.attributes,
+        }
+
+
+# ----------------------------------------------------------------------
+
+# exporter
+
+
+class SpanExporter:
+    """끝난 span을 받아 외부로 내보내는 인터페이스입니다."""
+
+    def export(self, span: Span) -> None:
+        raise NotImplementedError
+
+    def close(self) -> None:
+        pass
+
+
+class NoopSpanExporter(SpanExporter):
+    def export(self, span: Span) -> None:
+        pass
+
+
+class JsonLinesSpanExporter(SpanExporter):
+    """
+    span을 JSON 한 줄씩 파일에 기록합니다.
+    여러 워커 프로세스가 같은 파일에 덧붙여 쓰므로, 모아 둔 줄을 write 한 번으로 기록해 줄이 섞이지 않게 합니다.
+    (요청(최상위 span)이 끝나거나 버퍼가 찼을 때)
+    """
+
+    def __init__(self, path: str, max_buffered: int = 256) -> None:
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.path = path
+        self.max_buffered = max_buffered
+        self._file = open(path, "ab", buffering=0)
+        self._buffer: list = []
+        # Kafka 발행처럼 스레드에서 끝나는 span도 있으므로 보호
+        self._lock = threading.Lock()
+
+    def export(self, span: Span) -> None:
+        line = json.dumps(span.to_dict(), ensure_ascii=False, default=str)
+        with self._lock:
+            self._buffer.append(line)
+            if span.parent is None or len(self._buffer) >= self.max_buffered:
+                self._flush()
+
+    def _flush(self) -> None:
+        if self._buffer:
+            self._file.write(("\n".join(self._buffer) + "\n").encode("utf-8"))
+            self._buffer = []
+
+    def close(self) -> None:
+        with self._lock:
+            self._flush()
+            self._file.close()
+
+
+_exporter: SpanExporter = NoopSpanExporter()
+_sample_rate = 1.0
+_current_span: ContextVar[Optional[Span]] = ContextVar("current_span", default=None)
+
+
+def create_exporter(name: str, path: Optional[str] = None) -> SpanExporter:
+    if name == "none":
+        return NoopSpanExporter()
+    if name == "jsonl":
+        if not path:
+            raise ValueError("jsonl exporter에는 파일 경로가 필요합니다.")
+        return JsonLinesSpanExporter(path)
+    raise ValueError(f"지원하지 않는 trace exporter입니다: {name}")
+
+
+def configure_tracing(exporter: SpanExporter, sample_rate: float = 1.0) -> None:
+    global _exporter, _sample_rate
+    _exporter.close()
+    _exporter = exporter
+    _sample_rate = sample_rate
+
+
+def shutdown_tracing() -> None:
+    configure_tracing(NoopSpanExporter())
+
+
+# ----------------------------------------------------------------------
+
+# span 생성
+
+
+def get_current_span() -> Optional[Span]:
+    return _current_span.get()
+
+
+def start_span(name: str, parent: Optional[Span] = None, **attributes: Any) -> Span:
+    """
+    span을 만들기만 하고 현재 span으로 설정하지는 않습니다. (스트리밍처럼 yield를 사이에 두는 경우 use_span과 함께 사용)
+    부모가 없으면 현재 요청 ID로 새 trace를 시작하며, 요청 밖(기동 시 워밍업 등)의 span은 기록하지 않습니다.
+    """
+    parent = parent or _current_span.get()
+    if parent is not None:
+        return Span(name, parent.trace_id, parent, parent.sampled, attributes)
+
+    context = get_request_context()
+    trace_id = context.request_id if context else None
+    sampled = not isinstance(_exporter, NoopSpanExporter) and random.random() < _sample_rate
+    return Span(name, trace_id, None, sampled, attributes)
+
+
+@contextmanager
+def use_span(span: Span) -> Iterator[Span]:
+    token = _current_span.set(span)
+    try:
+        yield span
+    finally:
+        try:
+            _current_span.reset(token)
+        except ValueError:
+            # 비동기 제너레이터가 다른 컨텍스트에서 닫힌 경우 (해당 컨텍스트는 이미 사라짐)
+            pass
+
+
+@contextmanager
+def trace_span(name: str, **attributes: Any) -> Iterator[Span]:
+    """블록 동안 span을 현재 span으로 설정하고, 끝나면 예외 종류에 따라 상태를 기록해 내보냅니다."""
+    span = start_span(name, **attributes)
+    try:
+        with use_span(span):
+            yield span
+    except (DeadlineExceededError, asyncio.TimeoutError) as e:
+        span.end(STATUS_TIMEOUT, e)
+        raise
+    except (asyncio.CancelledError, GeneratorExit):
+        span.end(STATUS_CANCELLED)
+        raise
+    except Exception as e:
+        span.end(STATUS_ERROR, e)
+        raise
+    finally:
+        span.end()
+
+
+def current_trace_fields() -> Dict[str, Any]:
+    """로그 레코드에 붙일 요청 ID와 문장 ID"""
+    span = _current_span.get()
+    if span is not None:
+        return {"request_id": span.trace_id, "sentence_id": span.find_attribute("sentence_id")}
+    context = get_request_context()
+    return {"request_id": context.request_id if context else None, "sentence_id": None}
@@ -0,0 +1,108 @@
+import asyncio
+import itertools
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from .protocol import STATUS_OK, encode_request, read_response_header
+
+
+class EmbeddingServerError(Exception):
+    pass
+
+
+class EmbeddingClient:
+    """
+    임베딩 서버에 유닉스 소켓으로 접속하는 클라이언트입니다.
+
+    - 워커 프로세스당 연결 하나를 여러 코루틴이 함께 쓰며, 응답은 request_id로 찾아 전달합니다.
+    - 처음 encode할 때 연결하고, 연결이 끊기면 대기 중인 요청을 실패시킨 뒤 다음 요청에서 다시 연결합니다.
+    - 결과는 받은 바이트를 그대로 감싼 (N, dim) float32 배열입니다. (읽기 전용)
+    """
+
+    def __init__(self, socket_path: str, timeout: float = 5.0) -> None:
+        self.socket_path = socket_path
+        self.timeout = timeout
+
+        self._reader: Optional[asyncio.StreamReader] = None
+        self._writer: Optional[asyncio.StreamWriter] = None
+        self._read_task: Optional[asyncio.Task] = None
+        self._waiters: Dict[int, asyncio.Future] = {}
+        self._request_ids = itertools.count(1)
+        self._connect_lock: Optional[asyncio.Lock] = None
+
+    async def _ensure_connected(self) -> asyncio.StreamWriter:
+        if self._writer is not None and not self._writer.is_closing():
+            return self._writer
+
+        if self._connect_lock is None:
+            self._connect_lock = asyncio.Lock()
+        async with self._connect_lock:
+            if self._writer is None or self._writer.is_closing():
+                try:
+                    self._reader, self._writer = await asyncio.open_unix_connection(self.socket_path)
+                except OSError as e:
+                    raise EmbeddingServerError(f"임베딩 서버({self.socket_path})에 연결할 수 없습니다: {e}") from e
+                self._read_task = asyncio.create_task(self._read_loop(self._reader), name="Embedding_Client_Reader")
+        return self._writer
+
+    async def _read_loop(self, reader: asyncio.StreamReader) -> None:
+        try:
+            while True:
+                request_id, status, rows, dim = await read_response_header(reader)
+                if status == STATUS_OK:
+                    payload = await reader.readexactly(rows * dim * 4)
+                    result = np.frombuffer(payload, dtype=np.float32).reshape(rows, dim)
+                else:
+                    message = (await reader.readexactly(rows)).decode("utf-8", errors="replace")
+                    result = EmbeddingServerError(message)
+
+                waiter = self._waiters.pop(request_id, None)
+                if waiter is None or waiter.done():
+                    # 시간 초과로 이미 포기한 요청
+                    continue
+                if isinstance(result, Exception):
+                    waiter.set_exception(result)
+                else:
+                    waiter.set_result(result)
+        except (asyncio.IncompleteReadError, ConnectionError, OSError) as e:
+            self._fail_waiters(EmbeddingServerError(f"임베딩 서버 연결이 끊어졌습니다: {e}"))
+        finally:
+            if self._writer is not None:
+                self._writer.close()
+            self._reader = self._writer = None
+
+    def _fail_waiters(self, error: Exception) -> None:
+        waiters, self._waiters = self._waiters, {}
+        for waiter in waiters.values():
+            if not waiter.done():
+                waiter.set_exception(error)
+
+    async def encode(self, texts: List[str]) -> np.ndarray:
+        if not texts:
+            return np.empty((0, 0), dtype=np.float32)
+
+        writer = await self._ensure_connected()
+        request_id = next(self._request_ids) & 0xFFFFFFFF
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters[request_id] = waiter
+        try:
+            writer.write(encode_request(request_id, texts))
+            await writer.drain()
+            return await asyncio.wait_for(waiter, timeout=self.timeout)
+        except asyncio.TimeoutError:
+            raise EmbeddingServerError(f"임베딩 서버가 {self.timeout}초 안에 응답하지 않았습니다.")
+        except ConnectionError as e:
+            raise EmbeddingServerError(f"임베딩 서버 연결이 끊어졌습니다: {e}") from e
+        finally:
+            self._waiters.pop(request_id, None)
+
+    async def close(self) -> None:
+        if self._read_task is not None:
+            self._read_task.cancel()
+            await asyncio.gather(self._read_task, return_exceptions=True)
+            self._read_task = None
+        if self._writer is not None:
+            self._writer.close()
+            self._reader = self._writer = None
+        self._fail_waiters(EmbeddingServerError("임베딩 클라이언트를 닫았습니다."))
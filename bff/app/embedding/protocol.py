@@ -0,0 +1,57 @@
+import asyncio
+import struct
+from typing import List, Tuple
+
+"""
+임베딩 서버와 API 워커 사이의 유닉스 소켓 프로토콜 (리틀 엔디언)
+
+요청:  request_id(u32) count(u32) [len(u32) utf-8 바이트] * count
+응답:  request_id(u32) status(u32) rows(u32) dim(u32) payload
+       status가 OK이면 payload는 rows * dim개의 float32, ERROR이면 utf-8 오류 메시지(길이 rows)
+"""
+
+STATUS_OK = 0
+STATUS_ERROR = 1
+
+_U32 = struct.Struct("<I")
+_REQUEST_HEADER = struct.Struct("<II")
+_RESPONSE_HEADER = struct.Struct("<IIII")
+
+# 한 요청에 담을 수 있는 최대 문장 수·문장 길이(바이트). 잘못된 프레임으로 메모리를 과도하게 잡지 않도록 제한
+MAX_TEXTS_PER_REQUEST = 4096
+MAX_TEXT_BYTES = 64 * 1024
+
+
+class EmbeddingProtocolError(Exception):
+    pass
+
+
+def encode_request(request_id: int, texts: List[str]) -> bytes:
+    parts = [_REQUEST_HEADER.pack(request_id, len(texts))]
+    for text in texts:
+        data = text.encode("utf-8")
+        parts.append(_U32.pack(len(data)))
+        parts.append(data)
+    return b"".join(parts)
+
+
+async def read_request(reader: asyncio.StreamReader) -> Tuple[int, List[str]]:
+    request_id, count = _REQUEST_HEADER.unpack(await reader.readexactly(_REQUEST_HEADER.size))
+    if count > MAX_TEXTS_PER_REQUEST:
+        raise EmbeddingProtocolError(f"한 요청의 문장 수가 너무 많습니다. ({count}개)")
+
+    texts = []
+    for _ in range(count):
+        (length,) = _U32.unpack(await reader.readexactly(_U32.size))
+        if length > MAX_TEXT_BYTES:
+            raise EmbeddingProtocolError(f"문장이 너무 깁니다. ({length}바이트)")
+        texts.append((await reader.readexactly(length)).decode("utf-8"))
+    return request_id, texts
+
+
+def encode_response_header(request_id: int, status: int, rows: int, dim: int) -> bytes:
+    return _RESPONSE_HEADER.pack(request_id, status, rows, dim)
+
+
+async def read_response_header(reader: asyncio.StreamReader) -> Tuple[int, int, int, int]:
+    return _RESPONSE_HEADER.unpack(await reader.readexactly(_RESPONSE_HEADER.size))
@@ -0,0 +1,295 @@
+import argparse
+import asyncio
+import os
+import signal
+import socket
+import subprocess
+import sys
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Deque, Dict, List, Optional
+
+import numpy as np
+
+from .protocol import (
+    STATUS_ERROR,
+    STATUS_OK,
+    EmbeddingProtocolError,
+    encode_response_header,
+    read_request,
+)
+from ..util.logger import logger
+
+"""
+SentenceTransformer를 혼자 소유하는 임베딩 서버 프로세스
+
+API 워커들은 유닉스 소켓으로 문장을 보내고 float32 벡터를 받습니다.
+여러 워커에서 동시에 들어온 요청을 하나의 배치로 묶어(dynamic batching) 한 스레드에서만 인코딩하므로,
+워커마다 torch 스레드 풀을 두고 코어를 다투는 일이 없고 모델도 한 번만 적재합니다.
+
+    python -m app.embedding.server --socket /run/embedding/embedding.sock
+"""
+
+
+@dataclass
+class _PendingRequest:
+    texts: List[str]
+    future: asyncio.Future
+
+
+class EmbeddingServer:
+    """
+    model은 encode(texts, batch_size=..., convert_to_numpy=True)로 (N, dim) 배열을 반환하는 객체입니다.
+    첫 요청이 도착하면 max_wait_ms 동안(또는 max_batch_size개가 찰 때까지) 요청을 더 모은 뒤 한 번에 인코딩합니다.
+    """
+
+    def __init__(self, model: Any, socket_path: str, max_batch_size: int = 64, max_wait_ms: float = 2.0) -> None:
+        self.model = model
+        self.socket_path = socket_path
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000
+
+        self._pending: Deque[_PendingRequest] = deque()
+        self._pending_texts = 0
+        self._has_pending = asyncio.Event()
+        self._batch_full = asyncio.Event()
+        # torch 연산은 이 스레드 하나에서만 실행
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="embedding")
+        self._server: Optional[asyncio.AbstractServer] = None
+        self._batch_task: Optional[asyncio.Task] = None
+
+        self.stats: Dict[str, int] = {"requests": 0, "texts": 0, "batches": 0, "max_batch_texts": 0}
+
+    # ------------------------------------------------------------------
+
+    # 수명 주기
+
+    async def start(self) -> None:
+        if os.path.exists(self.socket_path):
+            # 이전 실행에서 남은 소켓 파일
+            os.unlink(self.socket_path)
+        directory = os.path.dirname(self.socket_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self._server = await asyncio.start_unix_server(self._handle, path=self.socket_path)
+        self._batch_task = asyncio.create_task(self._batch_loop(), name="Embedding_Batcher")
+        logger.info(
+            "임베딩 서버 시작: %s (최대 배치 %d, 대기 %.1fms)", self.socket_path, self.max_batch_size, self.max_wait * 1000
+        )
+
+    async def stop(self) -> None:
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+        if self._batch_task is not None:
+            self._batch_task.cancel()
+            await asyncio.gather(self._batch_task, return_exceptions=True)
+            self._batch_task = None
+        self._executor.shutdown(wait=False)
+        if os.path.exists(self.socket_path):
+            os.unlink(self.socket_path)
+
+    # ------------------------------------------------------------------
+
+    # 연결 처리
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        # 한 연결에서 여러 요청을 동시에 보낼 수 있으며, 응답은 끝난 순서대로 request_id와 함께 보냄
+        write_lock = asyncio.Lock()
+        responders = set()
+        try:
+            while True:
+                try:
+                    request_id, texts = await read_request(reader)
+                except asyncio.IncompleteReadError:
+                    break
+                except EmbeddingProtocolError as e:
+                    logger.warning("잘못된 임베딩 요청으로 연결을 닫습니다: %s", e)
+                    break
+
+                future = asyncio.get_running_loop().create_future()
+                self._submit(_PendingRequest(texts=texts, future=future))
+                task = asyncio.create_task(self._respond(request_id, future, writer, write_lock))
+                responders.add(task)
+                task.add_done_callback(responders.discard)
+        except ConnectionError:
+            pass
+        finally:
+            for task in responders:
+                task.cancel()
+            writer.close()
+
+    async def _respond(
+        self,
+        request_id: int,
+        future: asyncio.Future,
+        writer: asyncio.StreamWriter,
+        write_lock: asyncio.Lock,
+    ) -> None:
+        try:
+            vectors: np.ndarray = await future
+        except Exception as e:
+            message = f"{type(e).__name__}: {e}".encode("utf-8")
+            async with write_lock:
+                writer.write(encode_response_header(request_id, STATUS_ERROR, len(message), 0))
+                writer.write(message)
+                await writer.drain()
+            return
+
+        rows, dim = vectors.shape
+        async with write_lock:
+            writer.write(encode_response_header(request_id, STATUS_OK, rows, dim))
+            if vectors.size:
+                # 배치 결과의 행 구간을 복사 없이 그대로 전송
+                writer.write(memoryview(vectors).cast("B"))
+            await writer.drain()
+
+    # ------------------------------------------------------------------
+
+    # 동적 배치
+
+    def _submit(self, request: _PendingRequest) -> None:
+        self.stats["requests"] += 1
+        self._pending.append(request)
+        self._pending_texts += len(request.texts)
+        self._has_pending.set()
+        if self._pending_texts >= self.max_batch_size:
+            self._batch_full.set()
+
+    def _take_batch(self) -> List[_PendingRequest]:
+        batch, count = [], 0
+        # 요청 하나가 최대 배치보다 크더라도 나누지 않고 한 번에 처리
+        while self._pending and (not batch or count + len(self._pending[0].texts) <= self.max_batch_size):
+            request = self._pending.popleft()
+            batch.append(request)
+            count += len(request.texts)
+
+        self._pending_texts -= count
+        if not self._pending:
+            self._has_pending.clear()
+        if self._pending_texts < self.max_batch_size:
+            self._batch_full.clear()
+        return batch
+
+    async def _batch_loop(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            await self._has_pending.wait()
+            if self._pending_texts < self.max_batch_size and self.max_wait > 0:
+                try:
+                    await asyncio.wait_for(self._batch_full.wait(), timeout=self.max_wait)
+                except asyncio.TimeoutError:
+                    pass
+
+            batch = self._take_batch()
+            texts = [text for request in batch for text in request.texts]
+            try:
+                vectors = await loop.run_in_executor(self._executor, self._encode, texts)
+            except Exception as e:
+                logger.error("임베딩 배치 인코딩 실패 (%d문장): %s", len(texts), e)
+                for request in batch:
+                    if not request.future.done():
+                        request.future.set_exception(e)
+                continue
+
+            self.stats["batches"] += 1
+            self.stats["texts"] += len(texts)
+            self.stats["max_batch_texts"] = max(self.stats["max_batch_texts"], len(texts))
+
+            offset = 0
+            for request in batch:
+                end = offset + len(request.texts)
+                if not request.future.done():
+                    request.future.set_result(vectors[offset:end])
+                offset = end
+
+    def _encode(self, texts: List[str]) -> np.ndarray:
+        if not texts:
+            return np.empty((0, 0), dtype=np.float32)
+        vectors = self.model.encode(texts, batch_size=len(texts), convert_to_numpy=True)
+        return np.ascontiguousarray(vectors, dtype=np.float32)
+
+
+# ----------------------------------------------------------------------
+
+# 실행 진입점
+
+
+async def _serve(args: argparse.Namespace) -> None:
+    from sentence_transformers import SentenceTransformer
+    import torch
+
+    if args.threads:
+        torch.set_num_threads(args.threads)
+
+    model = SentenceTransformer(args.model)
+    model.encode(["임베딩 서버 준비를 위한 문장입니다."])
+
+    server = EmbeddingServer(model, args.socket, max_batch_size=args.max_batch, max_wait_ms=args.max_wait_ms)
+    await server.start()
+
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGTERM, signal.SIGINT):
+        loop.add_signal_handler(sig, stop.set)
+    await stop.wait()
+
+    logger.info("임베딩 서버 종료 (처리 통계: %s)", server.stats)
+    await server.stop()
+
+
+def main() -> None:
+    # API 서버 설정(Settings)의 필수 항목 없이도 실행할 수 있도록 환경 변수를 직접 읽음
+    parser = argparse.ArgumentParser(description="임베딩 서버")
+    parser.add_argument("--socket", default=os.getenv("EMBEDDING_SERVER_SOCKET", "/tmp/bff-embedding.sock"))
+    parser.add_argument("--model", default=os.getenv("EMBEDDING_MODEL_NAME", "jhgan/ko-sroberta-multitask"))
+    parser.add_argument("--max-batch", type=int, default=int(os.getenv("EMBEDDING_SERVER_MAX_BATCH", 64)))
+    parser.add_argument("--max-wait-ms", type=float, default=float(os.getenv("EMBEDDING_SERVER_MAX_WAIT_MS", 2.0)))
+    parser.add_argument("--threads", type=int, default=int(os.getenv("EMBEDDING_SERVER_THREADS", 0)))
+    asyncio.run(_serve(parser.parse_args()))
+
+
+def spawn_server_process(
+    socket_path: str,
+    model_name: str,
+    max_batch_size: int = 64,
+    max_wait_ms: float = 2.0,
+    threads: int = 0,
+    startup_timeout: float = 300.0,
+) -> subprocess.Popen:
+    """
+    임베딩 서버를 자식 프로세스로 띄우고 소켓에 연결할 수 있을 때까지 기다립니다. (모델 적재·워밍업 포함)
+    앱이 직접 서버를 띄우는 경우(EMBEDDING_SERVER_AUTOSTART)에 사용합니다.
+    """
+    command = [
+        sys.executable, "-m", "app.embedding.server",
+        "--socket", socket_path,
+        "--model", model_name,
+        "--max-batch", str(max_batch_size),
+        "--max-wait-ms", str(max_wait_ms),
+        "--threads", str(threads),
+    ]
+    process = subprocess.Popen(command, cwd=Path(__file__).resolve().parents[2])
+
+    deadline = time.monotonic() + startup_timeout
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f"임베딩 서버 프로세스가 종료되었습니다. (exit code {process.returncode})")
+        try:
+            with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+                sock.connect(socket_path)
+            return process
+        except OSError:
+            time.sleep(0.2)
+
+    process.terminate()
+    raise TimeoutError(f"임베딩 서버가 {startup_timeout}초 안에 준비되지 않았습니다.")
+
+
+if __name__ == "__main__":
+    main()
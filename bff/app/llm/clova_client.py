@@ -1,12 +1,42 @@
+import asyncio
+import copy
 import json
-from typing import Any, Dict, List, Literal, Type, TypeVar
+import logging
+import time
+from email.utils import parsedate_to_datetime
+from datetime import datetime, timezone
+from typing import Any, AsyncIterator, Dict, List, Literal, Optional, Tuple, Type, TypeVar
 
 import httpx
 from pydantic import BaseModel
 from tenacity import retry, stop_after_attempt, wait_exponential, retry_if_exception
-from aiolimiter import AsyncLimiter
+from tenacity.wait import wait_base
 
+from .llm_stage import LlmStage
+from .rate_limiter import PriorityRateLimiter
+from .rate_limit_backends import create_rate_limit_backend
 from ..core.config import settings
+from ..core.metrics import (
+    CLOVA_CANCELLED_CALLS_TOTAL,
+    CLOVA_PROMPT_TOKENS,
+    CLOVA_REQUEST_SECONDS,
+    CLOVA_TIME_TO_FIRST_TOKEN_SECONDS,
+    CLOVA_TOKENS_TOTAL,
+    OUTCOME_CANCELLED,
+    OUTCOME_ERROR,
+    OUTCOME_SUCCESS,
+    OUTCOME_TIMEOUT,
+)
+from ..core.tracing import STATUS_OK, Span, start_span, trace_span
+from ..core.request_context import (
+    DeadlineExceededError,
+    ensure_budget,
+    get_request_context,
+    record_llm_usage,
+    remaining_budget,
+)
+from ..util.logger import log_event, logger
+from ..util.singleflight import SingleFlight
 
 Role = Literal["system", "user", "assistant"]
 Message = Dict[str, str]
@@ -23,6 +53,52 @@ def is_rate_limit_error(exception: BaseException) -> bool:
         exception.response.status_code == 429
     )
 
+def is_retryable_rate_limit(exception: BaseException) -> bool:
+    """429이면서, Retry-After만큼 기다린 뒤에도 요청 마감 시간 안에 다시 호출할 여유가 있을 때만 재시도"""
+    if not is_rate_limit_error(exception):
+        return False
+    remaining = remaining_budget()
+    if remaining is None:
+        return True
+    wait = parse_retry_after(exception.response) or 0.0
+    return remaining - wait >= settings.DEADLINE_MIN_LLM_SECONDS
+
+def http_status_outcome(status_code: int) -> str:
+    """HTTP 오류 응답을 메트릭 결과 라벨로 변환합니다. (429는 속도 제한을 따로 구분)"""
+    return "rate_limited" if status_code == 429 else f"http_{status_code // 100}xx"
+
+def parse_retry_after(response: httpx.Response) -> Optional[float]:
+    """Retry-After 헤더(초 또는 HTTP 날짜)를 대기 시간(초)으로 변환합니다."""
+    value = response.headers.get("Retry-After")
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=timezone.utc)
+    return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+
+class wait_retry_after(wait_base):
+    """429 응답에 Retry-After가 있으면 그 시간만큼, 없으면 fallback 전략대로 대기합니다."""
+
+    def __init__(self, fallback: wait_base, max_wait: float = 60.0) -> None:
+        self.fallback = fallback
+        self.max_wait = max_wait
+
+    def __call__(self, retry_state) -> float:
+        exception = retry_state.outcome.exception() if retry_state.outcome else None
+        if exception is not None and is_rate_limit_error(exception):
+            retry_after = parse_retry_after(exception.response)
+            if retry_after is not None:
+                return min(retry_after, self.max_wait)
+        return self.fallback(retry_state)
+
 class ClovaStudioClient:
 
     def __init__(
@@ -30,12 +106,28 @@ class ClovaStudioClient:
         api_key: str = settings.CLOVA_API_KEY,
         url: str = settings.CLOVA_URL,
         timeout: float = 30.0,
+        limiter: Optional[PriorityRateLimiter] = None,
     ) -> None:
         self.api_key = api_key
         self.url = url
         self.timeout = timeout
-        # 분당 60회로 요청 속도 제한 (QPM 60)
-        self.limiter = AsyncLimiter(60, 60)
+        # 단계별 우선순위·사용자별 공정성을 고려한 요청 속도 제한 (기본 QPM 60)
+        # 공유 백엔드(file/redis)를 쓰면 워커 수와 관계없이 API 키 전체 할당량을 함께 나눠 씀
+        self.limiter = limiter or PriorityRateLimiter(
+            max_rate=settings.CLOVA_RATE_LIMIT_QPM,
+            period=60.0,
+            burst=settings.CLOVA_RATE_LIMIT_BURST,
+            budget=create_rate_limit_backend(
+                backend=settings.CLOVA_RATE_LIMIT_BACKEND,
+                rate_per_minute=settings.CLOVA_RATE_LIMIT_QPM,
+                burst=settings.CLOVA_RATE_LIMIT_BURST,
+                file_path=settings.CLOVA_RATE_LIMIT_FILE_PATH,
+                redis_url=settings.CLOVA_RATE_LIMIT_REDIS_URL,
+                redis_key=settings.CLOVA_RATE_LIMIT_REDIS_KEY,
+            ),
+        )
+        # 동일한 payload로 동시에 들어온 호출은 한 번만 전송
+        self._inflight = SingleFlight("clova_chat")
 
     # ------------------------------------------------------------------
 
@@ -65,14 +157,124 @@ class ClovaStudioClient:
                 f"Clova Studio error: code={code}, message={message}"
             )
 
+    @staticmethod
+    def _parse_usage(result: Optional[Dict[str, Any]]) -> Optional[Tuple[int, int]]:
+        """응답 result의 usage에서 (프롬프트 토큰, 완성 토큰)을 꺼냅니다. 없으면 None"""
+        usage = (result or {}).get("usage")
+        if not isinstance(usage, dict):
+            return None
+        prompt_tokens = usage.get("promptTokens")
+        completion_tokens = usage.get("completionTokens")
+        if prompt_tokens is None and completion_tokens is None:
+            return None
+        return int(prompt_tokens or 0), int(completion_tokens or 0)
+
+    @classmethod
+    def _record_usage(cls, stage: LlmStage, result: Optional[Dict[str, Any]], span: Span) -> None:
+        """토큰 사용량을 메트릭, 호출 span, 현재 요청의 사용량에 기록합니다."""
+        usage = cls._parse_usage(result)
+        if usage is None:
+            return
+        prompt_tokens, completion_tokens = usage
+        CLOVA_TOKENS_TOTAL.labels(stage=stage.value, kind="prompt").inc(prompt_tokens)
+        CLOVA_TOKENS_TOTAL.labels(stage=stage.value, kind="completion").inc(completion_tokens)
+        CLOVA_PROMPT_TOKENS.labels(stage=stage.value).observe(prompt_tokens)
+        span.set_attribute("prompt_tokens", prompt_tokens)
+        span.set_attribute("completion_tokens", completion_tokens)
+        record_llm_usage(stage.value, prompt_tokens, completion_tokens)
+
+    @staticmethod
+    def _payload_key(payload: Dict[str, Any]) -> str:
+        return json.dumps(payload, ensure_ascii=False, sort_keys=True)
+
+    async def _post(self, payload: Dict[str, Any], stage: LlmStage) -> Dict[str, Any]:
+        """같은 payload의 동시 호출을 합친 뒤 요청을 보냅니다. 응답 본문은 호출자별로 복사해 반환합니다."""
+        body = await self._inflight.do(
+            self._payload_key(payload),
+            lambda: self._send(payload, stage),
+        )
+        return copy.deepcopy(body)
+
+    async def _acquire_slot(self, stage: LlmStage) -> float:
+        """
+        요청 마감 시간 안에서 속도 제한 슬롯을 얻고, 이번 호출에 쓸 HTTP 타임아웃을 반환합니다.
+        남은 시간이 부족하면 DeadlineExceededError를 발생시킵니다.
+        """
+        context = get_request_context()
+        user_id = context.user_id if context else None
+
+        min_budget = settings.DEADLINE_MIN_LLM_SECONDS
+        remaining = ensure_budget(stage.value, min_budget)
+        with trace_span("clova_limiter_wait", stage=stage.value):
+            try:
+                if remaining is None:
+                    await self.limiter.acquire(stage, user_id)
+                    return self.timeout
+                await asyncio.wait_for(self.limiter.acquire(stage, user_id), remaining - min_budget)
+            except asyncio.TimeoutError:
+                raise DeadlineExceededError(f"'{stage.value}' 단계: 속도 제한 슬롯을 기다리는 동안 마감 시간이 지났습니다.")
+            except asyncio.CancelledError:
+                CLOVA_CANCELLED_CALLS_TOTAL.labels(stage=stage.value, phase="queued").inc()
+                raise
+        return min(self.timeout, max(remaining_budget() or 0.0, 0.1))
+
+    async def _send(self, payload: Dict[str, Any], stage: LlmStage) -> Dict[str, Any]:
+        """속도 제한 슬롯을 얻은 뒤 요청을 보내고, 429 여부를 속도 제한기에 알려줍니다."""
+        timeout = await self._acquire_slot(stage)
+        # 속도 제한 대기(clova_limiter_wait_seconds)를 뺀 Clova 서버 응답 시간
+        started = time.perf_counter()
+        outcome = OUTCOME_ERROR
+        span = start_span("clova_request", stage=stage.value)
+
+        try:
+            async with httpx.AsyncClient(timeout=timeout) as client:
+                resp = await client.post(
+                    self.url,
+                    headers=self._build_headers(),
+                    json=payload,
+                )
+                resp.raise_for_status()
+                body = resp.json()
+            outcome = OUTCOME_SUCCESS
+            # 합쳐진 동일 호출은 여기서 한 번만 집계 (먼저 들어온 호출의 요청에 기록)
+            self._record_usage(stage, body.get("result"), span)
+
+        except asyncio.CancelledError:
+            outcome = OUTCOME_CANCELLED
+            CLOVA_CANCELLED_CALLS_TOTAL.labels(stage=stage.value, phase="in_flight").inc()
+            raise
+        except httpx.HTTPStatusError as e:
+            outcome = http_status_outcome(e.response.status_code)
+            if e.response.status_code == 429:
+                self.limiter.on_rate_limited(stage, parse_retry_after(e.response))
+            log_event(
+                logger, logging.ERROR, "clova.http_error",
+                stage=stage.value, status=e.response.status_code, body=e.response.text,
+            )
+            raise
+        except httpx.TimeoutException as e:
+            outcome = OUTCOME_TIMEOUT
+            if timeout < self.timeout:
+                raise DeadlineExceededError(f"'{stage.value}' 단계: 요청 마감 시간 안에 응답을 받지 못했습니다.") from e
+            raise
+        except Exception as e:
+            logger.error("An unexpected error occurred during Clova Studio API request: %s", e)
+            raise
+        finally:
+            CLOVA_REQUEST_SECONDS.labels(stage=stage.value, outcome=outcome).observe(time.perf_counter() - started)
+            span.end(STATUS_OK if outcome == OUTCOME_SUCCESS else outcome)
+
+        self.limiter.on_success()
+        return body
+
     # ------------------------------------------------------------------
 
     # 일반 API 요청 메서드
 
     @retry(
-        wait=wait_exponential(multiplier=1, min=2, max=60),
+        wait=wait_retry_after(wait_exponential(multiplier=1, min=2, max=60)),
         stop=stop_after_attempt(3),
-        retry=retry_if_exception(is_rate_limit_error)
+        retry=retry_if_exception(is_retryable_rate_limit)
     )
     async def chat(
         self,
@@ -82,6 +284,7 @@ class ClovaStudioClient:
         max_completion_tokens: int = 1024,
         temperature: float = 0.1,
         repetition_penalty: float = 1.,
+        stage: LlmStage = LlmStage.CONTEXT,
     ) -> str:
 
         payload: Dict[str, Any] = {
@@ -93,27 +296,7 @@ class ClovaStudioClient:
             "repetitionPenalty": repetition_penalty,
         }
         
-        try:
-            async with self.limiter:
-                async with httpx.AsyncClient(timeout=self.timeout) as client:
-                    resp = await client.post(
-                        self.url,
-                        headers=self._build_headers(),
-                        json=payload,
-                    )
-                    resp.raise_for_status()
-                    body = resp.json()
-
-        except httpx.HTTPStatusError as e:
-            print("\n" + "#"*50)
-            print("[CLOVA API ERROR (HTTP Status Error)]")
-            print(f"Status: {e.response.status_code}")
-            print(f"Response Body:\n{e.response.text}")
-            print("#"*50 + "\n")
-            raise
-        except Exception as e:
-            print(f"An unexpected error occurred during Clova Studio API request: {e}")
-            raise
+        body = await self._post(payload, stage)
 
         self._check_status(body)
 
@@ -126,9 +309,9 @@ class ClovaStudioClient:
     # Structed Output 기반 API 요청 메서드
 
     @retry(
-        wait=wait_exponential(multiplier=1, min=2, max=60),
+        wait=wait_retry_after(wait_exponential(multiplier=1, min=2, max=60)),
         stop=stop_after_attempt(3),
-        retry=retry_if_exception(is_rate_limit_error)
+        retry=retry_if_exception(is_retryable_rate_limit)
     )
     async def chat_structred(
         self,
@@ -139,6 +322,7 @@ class ClovaStudioClient:
         max_completion_tokens: int = 1024,
         temperature: float = 0.1,
         repetition_penalty: float = 1.,
+        stage: LlmStage = LlmStage.CORRECTION,
     ) -> T:
 
         schema = self._extract_pydantic_schema(response_model)
@@ -157,27 +341,7 @@ class ClovaStudioClient:
             },
         }
 
-        try:
-            async with self.limiter:
-                async with httpx.AsyncClient(timeout=self.timeout) as client:
-                    response = await client.post(
-                        self.url,
-                        headers=self._build_headers(),
-                        json=payload,
-                    )
-                    response.raise_for_status()
-                    body = response.json()
-
-        except httpx.HTTPStatusError as e:
-            print("\n" + "#"*50)
-            print("[CLOVA API ERROR (HTTP Status Error)]")
-            print(f"Status: {e.response.status_code}")
-            print(f"Response Body:\n{e.response.text}")
-            print("#"*50 + "\n")
-            raise
-        except Exception as e:
-            print(f"An unexpected error occurred during Clova Studio API request: {e}")
-            raise
+        body = await self._post(payload, stage)
 
         self._check_status(body)
 
@@ -192,3 +356,134 @@ class ClovaStudioClient:
 
         if hasattr(response_model, "model_validate"):
             return response_model.model_validate(content_dict)
+
+    # ------------------------------------------------------------------
+
+    # 스트리밍 API 요청 메서드
+
+    @staticmethod
+    def _parse_stream_event(event: Optional[str], data: str) -> Optional[str]:
+        """
+        SSE 이벤트 하나를 해석해 새로 생성된 토큰 문자열을 반환합니다.
+        token 이벤트 외(result, signal 등)는 None을 반환하고, error 이벤트는 예외로 변환합니다.
+        """
+        if not data:
+            return None
+        try:
+            body = json.loads(data)
+        except json.JSONDecodeError:
+            return None
+
+        if event == "error":
+            ClovaStudioClient._check_status(body)
+        if event == "token":
+            return (body.get("message") or {}).get("content") or None
+        return None
+
+    @staticmethod
+    def _parse_stream_result(data: str) -> Optional[Dict[str, Any]]:
+        try:
+            body = json.loads(data)
+        except json.JSONDecodeError:
+            return None
+        return body if isinstance(body, dict) else None
+
+    async def chat_stream(
+        self,
+        messages: List[Message],
+        top_p: float = 1.0,
+        top_k: int = 0,
+        max_completion_tokens: int = 1024,
+        temperature: float = 0.1,
+        repetition_penalty: float = 1.,
+        stage: LlmStage = LlmStage.CONTEXT,
+        max_attempts: int = 3,
+    ) -> AsyncIterator[str]:
+        """
+        응답을 SSE 스트림으로 받아 토큰이 생성되는 대로 내보냅니다.
+        속도 제한과 429 재시도는 chat과 같게 적용하되, 재시도는 첫 토큰을 받기 전까지만 합니다.
+        """
+        payload: Dict[str, Any] = {
+            "messages": messages,
+            "topP": top_p,
+            "topK": top_k,
+            "maxCompletionTokens": max_completion_tokens,
+            "temperature": temperature,
+            "repetitionPenalty": repetition_penalty,
+        }
+        headers = {**self._build_headers(), "Accept": "text/event-stream"}
+
+        for attempt in range(1, max_attempts + 1):
+            timeout = await self._acquire_slot(stage)
+            started = time.monotonic()
+            first_token = True
+            outcome = OUTCOME_ERROR
+            # yield를 사이에 두므로 현재 span으로 설정하지 않고 시작·종료만 기록
+            span = start_span("clova_stream", stage=stage.value, attempt=attempt)
+
+            try:
+                async with httpx.AsyncClient(timeout=timeout) as client:
+                    async with client.stream("POST", self.url, headers=headers, json=payload) as resp:
+                        if resp.status_code >= 400:
+                            await resp.aread()
+                            resp.raise_for_status()
+
+                        event: Optional[str] = None
+                        async for line in resp.aiter_lines():
+                            if line.startswith("event:"):
+                                event = line[len("event:"):].strip()
+                                continue
+                            if not line.startswith("data:"):
+                                continue
+
+                            data = line[len("data:"):].strip()
+                            if event == "result":
+                                # 마지막 result 이벤트에 전체 응답의 usage가 담김
+                                self._record_usage(stage, self._parse_stream_result(data), span)
+                                continue
+                            token = self._parse_stream_event(event, data)
+                            if token is None:
+                                continue
+                            if first_token:
+                                first_token = False
+                                ttft = time.monotonic() - started
+                                CLOVA_TIME_TO_FIRST_TOKEN_SECONDS.labels(stage=stage.value).observe(ttft)
+                                span.set_attribute("ttft_ms", round(ttft * 1000, 1))
+                            yield token
+
+                outcome = OUTCOME_SUCCESS
+                self.limiter.on_success()
+                return
+
+            except (asyncio.CancelledError, GeneratorExit):
+                # 소비하는 쪽이 스트림을 닫은 경우(GeneratorExit)도 취소로 기록
+                outcome = OUTCOME_CANCELLED
+                CLOVA_CANCELLED_CALLS_TOTAL.labels(stage=stage.value, phase="in_flight").inc()
+                raise
+            except httpx.HTTPStatusError as e:
+                outcome = http_status_outcome(e.response.status_code)
+                if e.response.status_code == 429:
+                    retry_after = parse_retry_after(e.response)
+                    self.limiter.on_rate_limited(stage, retry_after)
+                    if first_token and attempt < max_attempts and is_retryable_rate_limit(e):
+                        wait = retry_after if retry_after is not None else min(60, 2 ** attempt)
+                        await asyncio.sleep(min(wait, 60))
+                        continue
+                log_event(
+                    logger, logging.ERROR, "clova.http_error",
+                    stage=stage.value, status=e.response.status_code, body=e.response.text, stream=True,
+                )
+                raise
+            except ClovaStudioError:
+                raise
+            except httpx.TimeoutException as e:
+                outcome = OUTCOME_TIMEOUT
+                if timeout < self.timeout:
+                    raise DeadlineExceededError(f"'{stage.value}' 단계: 요청 마감 시간 안에 응답을 받지 못했습니다.") from e
+                raise
+            except Exception as e:
+                logger.error("An unexpected error occurred during Clova Studio streaming request: %s", e)
+                raise
+            finally:
+                CLOVA_REQUEST_SECONDS.labels(stage=stage.value, outcome=outcome).observe(time.monotonic() - started)
+                span.end(STATUS_OK if outcome == OUTCOME_SUCCESS else outcome)
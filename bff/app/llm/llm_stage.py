@@ -0,0 +1,7 @@
+from enum import Enum
+
+class LlmStage(str, Enum):
+    """Clova Studio 호출이 속한 파이프라인 단계"""
+    CONTEXT = "context" # 문맥 총평 (사용자가 바로 기다리는 응답)
+    CORRECTION = "correction" # 1차 문장 교정
+    FEEDBACK = "feedback" # 2차 문법 피드백
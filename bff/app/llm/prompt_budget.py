@@ -0,0 +1,174 @@
+import logging
+import re
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Sequence, TypeVar
+
+from .llm_stage import LlmStage
+from ..core.config import settings
+from ..core.metrics import LLM_PROMPT_ESTIMATED_TOKENS_TOTAL
+from ..core.tracing import get_current_span
+from ..util.logger import log_event, logger
+from ..util.tokens import estimate_tokens
+
+T = TypeVar("T")
+Message = Dict[str, str]
+
+_NON_WORD = re.compile(r"[\W_]+")
+
+
+@dataclass
+class CompactedPrompt:
+    """예산에 맞춘 메시지와, 줄이기 전·후의 추정 토큰 수와 항목 수"""
+    messages: List[Message]
+    tokens_before: int
+    tokens_after: int
+    items_before: int
+    items_after: int
+
+
+def prompt_tokens(messages: Sequence[Message]) -> int:
+    return sum(estimate_tokens(m["content"]) for m in messages)
+
+
+def _bigrams(text: str) -> set:
+    normalized = _NON_WORD.sub("", text)
+    if len(normalized) < 2:
+        return {normalized}
+    return {normalized[i:i + 2] for i in range(len(normalized) - 1)}
+
+
+def text_similarity(a: str, b: str) -> float:
+    """공백·문장 부호를 뺀 글자 bigram의 Jaccard 유사도"""
+    grams_a, grams_b = _bigrams(a), _bigrams(b)
+    if not grams_a or not grams_b:
+        return 0.0
+    return len(grams_a & grams_b) / len(grams_a | grams_b)
+
+
+def rank_examples(examples: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """검색 점수(score)가 높은 순. 점수가 같거나 없으면 검색 결과 순서를 유지"""
+    return sorted(examples, key=lambda ex: -(ex.get("score") or 0.0))
+
+
+def dedupe_examples(examples: List[Dict[str, Any]], threshold: float) -> List[Dict[str, Any]]:
+    """앞선 예문과 문장 유사도가 threshold 이상인 예문을 뺍니다. (순서대로 보므로 점수가 높은 쪽이 남음)"""
+    kept: List[Dict[str, Any]] = []
+    for example in examples:
+        sentence = example.get("original_sentence") or ""
+        if any(text_similarity(sentence, k.get("original_sentence") or "") >= threshold for k in kept):
+            continue
+        kept.append(example)
+    return kept
+
+
+def truncate_text(text: str, max_chars: int) -> str:
+    """max_chars보다 길면 ' / '로 나뉜 항목 경계(없으면 글자)에서 잘라 '…'를 붙입니다."""
+    if max_chars <= 0 or len(text) <= max_chars:
+        return text
+    cut = text[:max_chars]
+    boundary = cut.rfind(" / ")
+    if boundary >= max_chars // 2:
+        cut = cut[:boundary]
+    return cut.rstrip() + "…"
+
+
+class PromptBudget:
+    """
+    LLM 호출 단계별 토큰 예산 안에서 프롬프트의 가변 부분(예문, 문법 정보)을 줄입니다.
+    시스템 프롬프트는 그대로 두고, 앞에서부터 예산에 들어가는 만큼의 항목만 남깁니다.
+    토큰 수는 app/util/tokens.py의 추정치이며, 실제 사용량은 Clova 응답의 usage(clova_tokens_total)로 확인합니다.
+    """
+
+    def __init__(
+        self,
+        correction_tokens: int = 1000,
+        feedback_tokens: int = 800,
+        max_examples: int = 5,
+        dedup_threshold: float = 0.85,
+        explanation_max_chars: int = 240,
+    ) -> None:
+        self.limits = {
+            LlmStage.CORRECTION: correction_tokens,
+            LlmStage.FEEDBACK: feedback_tokens,
+        }
+        self.max_examples = max_examples
+        self.dedup_threshold = dedup_threshold
+        self.explanation_max_chars = explanation_max_chars
+
+    @classmethod
+    def from_settings(cls) -> "PromptBudget":
+        return cls(
+            correction_tokens=settings.PROMPT_CORRECTION_TOKEN_BUDGET,
+            feedback_tokens=settings.PROMPT_FEEDBACK_TOKEN_BUDGET,
+            max_examples=settings.PROMPT_MAX_EXAMPLES,
+            dedup_threshold=settings.PROMPT_EXAMPLE_DEDUP_THRESHOLD,
+            explanation_max_chars=settings.PROMPT_EXPLANATION_MAX_CHARS,
+        )
+
+    def fit(
+        self,
+        stage: LlmStage,
+        build: Callable[[List[T]], List[Message]],
+        items: List[T],
+        candidates: List[T],
+        min_items: int = 0,
+    ) -> CompactedPrompt:
+        """
+        candidates의 앞쪽부터 예산에 들어가는 만큼 남겨 메시지를 만듭니다. (min_items개는 예산을 넘어도 남김)
+        items는 줄이기 전의 입력으로, 비교용 토큰 수를 계산할 때만 씁니다.
+        """
+        before = prompt_tokens(build(items))
+        limit = self.limits.get(stage, 0)
+
+        count = len(candidates)
+        messages = build(candidates)
+        tokens = prompt_tokens(messages)
+        while limit > 0 and tokens > limit and count > min_items:
+            count -= 1
+            messages = build(candidates[:count])
+            tokens = prompt_tokens(messages)
+
+        return CompactedPrompt(
+            messages=messages,
+            tokens_before=before,
+            tokens_after=tokens,
+            items_before=len(items),
+            items_after=count,
+        )
+
+    def examples_for_prompt(self, examples: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """점수순 정렬 → 거의 같은 예문 제거 → 최대 개수"""
+        return dedupe_examples(rank_examples(examples), self.dedup_threshold)[:self.max_examples]
+
+    def grammar_info_for_prompt(self, grammar_db_info: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """같은 문법 요소는 한 번만, 설명은 최대 길이로 자름"""
+        seen: set = set()
+        compacted: List[Dict[str, Any]] = []
+        for info in grammar_db_info:
+            element = info.get("grammar_element")
+            if element in seen:
+                continue
+            seen.add(element)
+            compacted.append({
+                **info,
+                "explanation": truncate_text(info.get("explanation") or "", self.explanation_max_chars),
+            })
+        return compacted
+
+    @staticmethod
+    def record(stage: LlmStage, prompt: CompactedPrompt) -> None:
+        """줄이기 전·후 추정 토큰 수를 메트릭, 현재 span, 로그(DEBUG)에 남깁니다."""
+        LLM_PROMPT_ESTIMATED_TOKENS_TOTAL.labels(stage=stage.value, phase="before").inc(prompt.tokens_before)
+        LLM_PROMPT_ESTIMATED_TOKENS_TOTAL.labels(stage=stage.value, phase="after").inc(prompt.tokens_after)
+        span = get_current_span()
+        if span is not None:
+            span.set_attribute("prompt_tokens_before", prompt.tokens_before)
+            span.set_attribute("prompt_tokens_after", prompt.tokens_after)
+        log_event(
+            logger, logging.DEBUG, "prompt.budget",
+            stage=stage.value,
+            tokens_before=prompt.tokens_before,
+            tokens_after=prompt.tokens_after,
+            items_before=prompt.items_before,
+            items_after=prompt.items_after,
+        )
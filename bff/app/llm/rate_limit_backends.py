@@ -0,0 +1,285 @@
+import asyncio
+import json
+import os
+import tempfile
+import time
+from abc import ABC, abstractmethod
+from typing import Any, List, Optional, Tuple
+from urllib.parse import urlparse
+
+"""
+여러 uvicorn 워커·레플리카가 하나의 Clova Studio API 키 할당량(QPM)을 나눠 쓰기 위한 공유 토큰 버킷 백엔드
+"""
+
+
+class RateLimitBackendError(Exception):
+    pass
+
+
+class TokenBucketBackend(ABC):
+    """모든 프로세스가 공유하는 토큰 버킷. acquire()는 토큰 하나를 얻을 때까지 기다립니다."""
+
+    def __init__(self, rate: float, capacity: float) -> None:
+        self.rate = rate  # 초당 충전되는 토큰 수
+        self.capacity = max(1.0, capacity)
+
+    def _take(self, tokens: Optional[float], last: Optional[float], now: float) -> Tuple[float, float]:
+        """
+        저장된 상태(tokens, last)를 now 시점으로 충전한 뒤 토큰 하나를 꺼냅니다.
+        반환값: (남은 토큰 수, 더 기다려야 하는 시간). 기다려야 하면 토큰을 꺼내지 않습니다.
+        """
+        if tokens is None or last is None:
+            tokens, last = self.capacity, now
+        tokens = min(self.capacity, tokens + max(0.0, now - last) * self.rate)
+        if tokens >= 1:
+            return tokens - 1, 0.0
+        return tokens, (1 - tokens) / self.rate
+
+    @abstractmethod
+    async def try_acquire(self) -> float:
+        """토큰을 얻으면 0을, 얻지 못하면 다시 시도하기까지 기다릴 시간(초)을 반환합니다."""
+
+    async def acquire(self) -> float:
+        started = time.monotonic()
+        while True:
+            wait = await self.try_acquire()
+            if wait <= 0:
+                return time.monotonic() - started
+            await asyncio.sleep(wait)
+
+    async def close(self) -> None:
+        pass
+
+
+# ----------------------------------------------------------------------
+
+# 단일 호스트: 파일 잠금 + 공유 메모리(/dev/shm) 상태 파일
+
+
+class FileLockTokenBucket(TokenBucketBackend):
+    """
+    같은 호스트의 워커들이 fcntl 파일 잠금으로 하나의 상태 파일을 갱신합니다.
+    /dev/shm 아래에 두면 디스크 I/O 없이 공유 메모리로 동작합니다.
+    """
+
+    def __init__(self, path: str, rate: float, capacity: float) -> None:
+        super().__init__(rate, capacity)
+        self.path = path
+
+    def _try_acquire_sync(self) -> float:
+        import fcntl
+
+        fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o644)
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX)
+            raw = os.pread(fd, 256, 0)
+            tokens = last = None
+            if raw:
+                try:
+                    state = json.loads(raw)
+                    tokens, last = float(state["tokens"]), float(state["ts"])
+                except (ValueError, KeyError, TypeError):
+                    pass  # 손상된 상태는 가득 찬 버킷으로 초기화
+
+            now = time.time()
+            tokens, wait = self._take(tokens, last, now)
+            if wait <= 0:
+                data = json.dumps({"tokens": tokens, "ts": now}).encode()
+                os.ftruncate(fd, 0)
+                os.pwrite(fd, data, 0)
+            return wait
+        finally:
+            os.close(fd)  # 파일을 닫으면 잠금도 해제됨
+
+    async def try_acquire(self) -> float:
+        return await asyncio.to_thread(self._try_acquire_sync)
+
+
+# ----------------------------------------------------------------------
+
+# 여러 호스트: Redis 프로토콜(RESP) 기반
+
+
+class _RespConnection:
+    """토큰 버킷에 필요한 명령만 다루는 최소한의 RESP2 클라이언트"""
+
+    def __init__(self, host: str, port: int, password: Optional[str], db: int, timeout: float) -> None:
+        self.host = host
+        self.port = port
+        self.password = password
+        self.db = db
+        self.timeout = timeout
+        self._reader: Optional[asyncio.StreamReader] = None
+        self._writer: Optional[asyncio.StreamWriter] = None
+
+    async def _connect(self) -> None:
+        self._reader, self._writer = await asyncio.wait_for(
+            asyncio.open_connection(self.host, self.port), self.timeout
+        )
+        try:
+            if self.password:
+                await self.execute("AUTH", self.password)
+            if self.db:
+                await self.execute("SELECT", str(self.db))
+        except BaseException:
+            # 인증·DB 선택이 끝나지 않은 연결은 재사용하지 않음
+            self.abort()
+            raise
+
+    @staticmethod
+    def _encode(args: Tuple[Any, ...]) -> bytes:
+        parts = [f"*{len(args)}\r\n".encode()]
+        for arg in args:
+            data = arg if isinstance(arg, bytes) else str(arg).encode()
+            parts.append(b"$%d\r\n%s\r\n" % (len(data), data))
+        return b"".join(parts)
+
+    async def _read_reply(self) -> Any:
+        line = await self._reader.readline()
+        if not line:
+            raise ConnectionError("Redis connection closed")
+        kind, payload = line[:1], line[1:-2]
+        if kind == b"+":
+            return payload.decode()
+        if kind == b"-":
+            # 배열(EXEC 결과 등) 안의 오류도 나머지 요소를 끝까지 읽을 수 있도록 예외를 던지지 않고 반환
+            return RateLimitBackendError(payload.decode())
+        if kind == b":":
+            return int(payload)
+        if kind == b"$":
+            length = int(payload)
+            if length < 0:
+                return None
+            data = await self._reader.readexactly(length + 2)
+            return data[:-2]
+        if kind == b"*":
+            length = int(payload)
+            if length < 0:
+                return None
+            return [await self._read_reply() for _ in range(length)]
+        raise RateLimitBackendError(f"Unknown RESP reply: {line!r}")
+
+    async def execute(self, *args: Any) -> Any:
+        if self._writer is None:
+            await self._connect()
+        try:
+            self._writer.write(self._encode(args))
+            await self._writer.drain()
+            reply = await asyncio.wait_for(self._read_reply(), self.timeout)
+        except BaseException:
+            # 응답을 끝까지 읽기 전에 중단되면(취소 포함) 다음 명령이 이전 응답을 읽게 되므로 연결을 버림
+            self.abort()
+            raise
+        if isinstance(reply, RateLimitBackendError):
+            raise reply
+        return reply
+
+    def abort(self) -> None:
+        """연결 상태(읽지 않은 응답, WATCH·MULTI)를 믿을 수 없을 때 연결을 버립니다. 다음 명령에서 다시 연결합니다."""
+        if self._writer is not None:
+            self._writer.close()
+        self._reader = self._writer = None
+
+    async def close(self) -> None:
+        if self._writer is not None:
+            self._writer.close()
+            try:
+                await self._writer.wait_closed()
+            except Exception:
+                pass
+        self._reader = self._writer = None
+
+
+class RedisTokenBucket(TokenBucketBackend):
+    """
+    WATCH/MULTI/EXEC 낙관적 트랜잭션으로 Redis 키 하나에 버킷 상태를 저장합니다.
+    시각은 Redis 서버의 TIME을 사용하므로 호스트 간 시계 차이의 영향을 받지 않습니다.
+    Lua 스크립트를 쓰지 않으므로 Redis 호환 서버나 테스트용 가짜 서버에서도 동작합니다.
+    """
+
+    def __init__(self, url: str, key: str, rate: float, capacity: float, timeout: float = 2.0) -> None:
+        super().__init__(rate, capacity)
+        parsed = urlparse(url)
+        db = int(parsed.path.lstrip("/") or 0)
+        self.key = key
+        self._conn = _RespConnection(
+            parsed.hostname or "localhost", parsed.port or 6379, parsed.password, db, timeout
+        )
+        # WATCH 상태는 연결 단위이므로 한 번에 하나의 트랜잭션만 진행
+        self._lock = asyncio.Lock()
+        # 버킷이 가득 찬 채로 방치되면 키를 지워도 결과가 같으므로 TTL을 둠
+        self._ttl_ms = int(max(1.0, self.capacity / self.rate) * 2000)
+
+    async def try_acquire(self) -> float:
+        async with self._lock:
+            try:
+                return await self._transaction()
+            except BaseException:
+                # WATCH나 MULTI가 남은 연결을 다음 트랜잭션에서 재사용하지 않도록 연결을 버림
+                self._conn.abort()
+                raise
+
+    async def _transaction(self) -> float:
+        while True:
+            await self._conn.execute("WATCH", self.key)
+            raw = await self._conn.execute("GET", self.key)
+            seconds, micros = await self._conn.execute("TIME")
+            now = int(seconds) + int(micros) / 1_000_000
+
+            tokens = last = None
+            if raw:
+                try:
+                    tokens_str, last_str = raw.decode().split(":", 1)
+                    tokens, last = float(tokens_str), float(last_str)
+                except ValueError:
+                    pass
+
+            tokens, wait = self._take(tokens, last, now)
+            if wait > 0:
+                await self._conn.execute("UNWATCH")
+                return wait
+
+            await self._conn.execute("MULTI")
+            await self._conn.execute("SET", self.key, f"{tokens:.6f}:{now:.6f}", "PX", self._ttl_ms)
+            result: Optional[List[Any]] = await self._conn.execute("EXEC")
+            if result is not None:
+                errors = [r for r in result if isinstance(r, RateLimitBackendError)]
+                if errors:
+                    raise errors[0]
+                return 0.0
+            # 다른 워커가 먼저 갱신함: 즉시 재시도
+
+    async def close(self) -> None:
+        await self._conn.close()
+
+
+# ----------------------------------------------------------------------
+
+
+def default_shared_state_path() -> str:
+    base = "/dev/shm" if os.path.isdir("/dev/shm") else tempfile.gettempdir()
+    return os.path.join(base, "clova_rate_limit.json")
+
+
+def create_rate_limit_backend(
+    backend: str,
+    rate_per_minute: float,
+    burst: int,
+    file_path: Optional[str] = None,
+    redis_url: Optional[str] = None,
+    redis_key: str = "clova:rate_limit",
+) -> Optional[TokenBucketBackend]:
+    """설정값에 맞는 공유 백엔드를 생성합니다. 'local'이면 None(프로세스 내 제한만 사용)을 반환합니다."""
+    rate = rate_per_minute / 60.0
+    backend = backend.lower()
+
+    if backend == "local":
+        return None
+    if backend == "file":
+        return FileLockTokenBucket(file_path or default_shared_state_path(), rate, burst)
+    if backend == "redis":
+        if not redis_url:
+            raise RateLimitBackendError("redis 백엔드에는 CLOVA_RATE_LIMIT_REDIS_URL 설정이 필요합니다.")
+        return RedisTokenBucket(redis_url, redis_key, rate, burst)
+
+    raise RateLimitBackendError(f"지원하지 않는 속도 제한 백엔드입니다: {backend}")
@@ -0,0 +1,247 @@
+import asyncio
+import time
+from collections import OrderedDict, deque
+from dataclasses import dataclass, field
+from typing import Any, Deque, Dict, Optional
+
+from .llm_stage import LlmStage
+from .rate_limit_backends import TokenBucketBackend
+from ..util.logger import logger
+from ..core.metrics import (
+    CLOVA_LIMITER_QUEUE_DEPTH,
+    CLOVA_LIMITER_WAIT_SECONDS,
+    CLOVA_LIMITER_RATE_QPM,
+    CLOVA_RATE_LIMITED_TOTAL,
+)
+
+ANONYMOUS_USER = "anonymous"
+
+# 단계별 가중치: 사용자가 바로 기다리는 문맥 총평 > 이미 1차 교정이 끝난 문장의 2차 피드백 > 새 문장의 1차 교정
+DEFAULT_STAGE_WEIGHTS: Dict[LlmStage, int] = {
+    LlmStage.CONTEXT: 4,
+    LlmStage.FEEDBACK: 2,
+    LlmStage.CORRECTION: 1,
+}
+
+
+@dataclass
+class _Waiter:
+    future: asyncio.Future
+    enqueued_at: float
+    # 대기열에서 빠졌는지 (디스패처가 꺼냈거나 취소되어 제거됨). 대기열 길이는 빼는 쪽에서 한 번만 줄임
+    dequeued: bool = False
+
+
+@dataclass
+class _Lane:
+    weight: int
+    # 사용자별 대기열 (라운드 로빈 순서 유지)
+    users: "OrderedDict[str, Deque[_Waiter]]" = field(default_factory=OrderedDict)
+    depth: int = 0
+    current_weight: int = 0
+
+
+class PriorityRateLimiter:
+    """
+    Clova Studio 호출을 위한 우선순위·공정성 기반 속도 제한기입니다.
+
+    - 단계(LlmStage)별 대기열을 가중치 라운드 로빈으로 처리해 문맥 총평이 긴 글의 문장 교정에 밀리지 않도록 합니다.
+    - 같은 단계 안에서는 사용자(user_id)별로 번갈아 슬롯을 배정해, 한 사용자의 긴 글이 다른 사용자를 굶기지 않습니다.
+    - 429 응답을 받으면 속도를 절반으로 줄이고(Retry-After가 있으면 그 시간 동안 정지), 성공할 때마다 조금씩 회복합니다.
+    - budget(공유 토큰 버킷)이 주어지면 프로세스 내 제한과 별도로, 모든 워커가 공유하는 할당량에서도 토큰을 얻어야 합니다.
+    """
+
+    def __init__(
+        self,
+        max_rate: float = 60,
+        period: float = 60.0,
+        burst: int = 5,
+        stage_weights: Optional[Dict[LlmStage, int]] = None,
+        min_rate_ratio: float = 0.1,
+        decrease_factor: float = 0.5,
+        recovery_ratio: float = 0.05,
+        budget: Optional[TokenBucketBackend] = None,
+    ) -> None:
+        self.base_rate = max_rate / period  # 초당 허용 요청 수
+        self.min_rate = self.base_rate * min_rate_ratio
+        self.current_rate = self.base_rate
+        self.decrease_factor = decrease_factor
+        self.recovery_step = self.base_rate * recovery_ratio
+
+        self.capacity = float(max(1, burst))
+        self._tokens = self.capacity
+        self._last_refill = time.monotonic()
+        self._paused_until = 0.0
+
+        weights = stage_weights or DEFAULT_STAGE_WEIGHTS
+        self._lanes: Dict[LlmStage, _Lane] = {
+            stage: _Lane(weight=weights.get(stage, 1)) for stage in LlmStage
+        }
+        self._dispatcher: Optional[asyncio.Task] = None
+
+        self.budget = budget
+        self._budget_token = False  # 공유 버킷에서 미리 받아 둔 토큰
+
+        # 대기 시간 통계 (snapshot 용)
+        self._granted = 0
+        self._wait_total = 0.0
+        self._wait_max = 0.0
+
+        CLOVA_LIMITER_RATE_QPM.set(self.current_rate * 60)
+
+    # ------------------------------------------------------------------
+
+    # 슬롯 획득
+
+    async def acquire(self, stage: LlmStage, user_id: Optional[str] = None) -> float:
+        """호출 슬롯을 얻을 때까지 기다리고, 기다린 시간(초)을 반환합니다."""
+        loop = asyncio.get_running_loop()
+        waiter = _Waiter(future=loop.create_future(), enqueued_at=time.monotonic())
+
+        lane = self._lanes[stage]
+        user_key = user_id or ANONYMOUS_USER
+        lane.users.setdefault(user_key, deque()).append(waiter)
+        lane.depth += 1
+        CLOVA_LIMITER_QUEUE_DEPTH.labels(stage=stage.value).inc()
+
+        if self._dispatcher is None or self._dispatcher.done():
+            self._dispatcher = asyncio.create_task(self._dispatch(), name="Clova_Rate_Limiter_Dispatcher")
+
+        try:
+            await waiter.future
+        finally:
+            if not waiter.future.done():
+                waiter.future.cancel()
+            if not waiter.dequeued:
+                # 슬롯을 받기 전에 취소된 경우(마감 시간, 연결 끊김): 대기열 길이·지표에 남지 않도록 바로 제거
+                self._remove_waiter(stage, user_key, waiter)
+
+        waited = time.monotonic() - waiter.enqueued_at
+        self._granted += 1
+        self._wait_total += waited
+        self._wait_max = max(self._wait_max, waited)
+        CLOVA_LIMITER_WAIT_SECONDS.labels(stage=stage.value).observe(waited)
+        return waited
+
+    def _refill(self, now: float) -> None:
+        elapsed = now - self._last_refill
+        self._last_refill = now
+        self._tokens = min(self.capacity, self._tokens + elapsed * self.current_rate)
+
+    def _has_waiters(self) -> bool:
+        return any(lane.depth > 0 for lane in self._lanes.values())
+
+    def _dequeued(self, stage: LlmStage, waiter: _Waiter) -> None:
+        waiter.dequeued = True
+        self._lanes[stage].depth -= 1
+        CLOVA_LIMITER_QUEUE_DEPTH.labels(stage=stage.value).dec()
+
+    def _remove_waiter(self, stage: LlmStage, user_key: str, waiter: _Waiter) -> None:
+        lane = self._lanes[stage]
+        queue = lane.users.get(user_key)
+        if queue is not None:
+            queue.remove(waiter)
+            if not queue:
+                del lane.users[user_key]
+        self._dequeued(stage, waiter)
+
+    def _pop_waiter(self, stage: LlmStage) -> Optional[_Waiter]:
+        """해당 단계에서 다음 차례 사용자의 가장 오래된 요청을 꺼냅니다."""
+        lane = self._lanes[stage]
+        while lane.users:
+            user_id, queue = lane.users.popitem(last=False)
+            waiter = queue.popleft()
+            if queue:
+                lane.users[user_id] = queue  # 다음 차례를 위해 맨 뒤로
+            self._dequeued(stage, waiter)
+            # 취소되었지만 아직 acquire의 정리 코드가 실행되기 전인 요청은 건너뜀
+            if not waiter.future.done():
+                return waiter
+        return None
+
+    def _select_stage(self) -> Optional[LlmStage]:
+        """대기 중인 단계 중 하나를 smooth weighted round robin으로 고릅니다."""
+        active = [(stage, lane) for stage, lane in self._lanes.items() if lane.depth > 0]
+        if not active:
+            return None
+
+        total = 0
+        best_stage, best_lane = None, None
+        for stage, lane in active:
+            lane.current_weight += lane.weight
+            total += lane.weight
+            if best_lane is None or lane.current_weight > best_lane.current_weight:
+                best_stage, best_lane = stage, lane
+
+        best_lane.current_weight -= total
+        return best_stage
+
+    async def _dispatch(self) -> None:
+        while self._has_waiters():
+            now = time.monotonic()
+            if now < self._paused_until:
+                await asyncio.sleep(self._paused_until - now)
+                continue
+
+            self._refill(now)
+            if self._tokens < 1:
+                await asyncio.sleep((1 - self._tokens) / self.current_rate)
+                continue
+
+            if self.budget is not None and not self._budget_token:
+                await self._acquire_budget()
+                continue  # 공유 토큰을 기다리는 동안 대기열이 바뀌었을 수 있으므로 다시 확인
+
+            stage = self._select_stage()
+            if stage is None:
+                break
+            waiter = self._pop_waiter(stage)
+            if waiter is None:
+                continue
+
+            self._tokens -= 1
+            self._budget_token = False
+            waiter.future.set_result(None)
+
+    async def _acquire_budget(self) -> None:
+        try:
+            await self.budget.acquire()
+        except Exception as e:
+            # 공유 저장소 장애 시 요청을 멈추지 않고 프로세스 내 제한만으로 계속 진행
+            logger.warning("공유 속도 제한 백엔드를 사용할 수 없어 로컬 제한만 적용합니다: %s", e)
+        self._budget_token = True
+
+    # ------------------------------------------------------------------
+
+    # 429 응답에 따른 속도 조절
+
+    def on_rate_limited(self, stage: LlmStage, retry_after: Optional[float] = None) -> None:
+        CLOVA_RATE_LIMITED_TOTAL.labels(stage=stage.value).inc()
+
+        self.current_rate = max(self.min_rate, self.current_rate * self.decrease_factor)
+        # 이미 쌓인 버스트도 비워서 바로 다음 요청이 또 429를 받지 않도록 함
+        self._tokens = min(self._tokens, 0.0)
+        if retry_after is not None and retry_after > 0:
+            self._paused_until = max(self._paused_until, time.monotonic() + retry_after)
+
+        CLOVA_LIMITER_RATE_QPM.set(self.current_rate * 60)
+
+    def on_success(self) -> None:
+        if self.current_rate < self.base_rate:
+            self.current_rate = min(self.base_rate, self.current_rate + self.recovery_step)
+            CLOVA_LIMITER_RATE_QPM.set(self.current_rate * 60)
+
+    # ------------------------------------------------------------------
+
+    def snapshot(self) -> Dict[str, Any]:
+        paused_for = max(0.0, self._paused_until - time.monotonic())
+        return {
+            "rate_qpm": round(self.current_rate * 60, 2),
+            "base_rate_qpm": round(self.base_rate * 60, 2),
+            "paused_for_seconds": round(paused_for, 3),
+            "queue_depth": {stage.value: lane.depth for stage, lane in self._lanes.items()},
+            "waiting_users": {stage.value: len(lane.users) for stage, lane in self._lanes.items()},
+            "granted": self._granted,
+            "wait_avg_seconds": round(self._wait_total / self._granted, 4) if self._granted else 0.0,
+            "wait_max_seconds": round(self._wait_max, 4),
+        }
@@ -1,6 +1,40 @@
-from fastapi import FastAPI
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, Request, status
+from fastapi.responses import JSONResponse
 from .api.feedback_router import router as feedback_router
+from .api.health_router import router as health_router
+from .api.job_router import router as job_router
+from .api.ops_router import router as ops_router
+from .core.config import settings
+from .core.dependencies import container
+from .services.admission_controller import DocumentTooLargeError, ServiceOverloadedError
+from .util.logger import configure_logging
 
-app = FastAPI()
+# 요청 처리 경로에서는 로그를 큐에 넣기만 하고 출력은 별도 스레드에서 (gunicorn 워커는 fork 후 다시 시작)
+configure_logging(settings.LOG_LEVEL, settings.LOG_FORMAT, settings.LOG_STAGE_DUMP_SAMPLE_RATE)
 
-app.include_router(feedback_router, prefix="/api")
\ No newline at end of file
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # 임베딩 모델·ChromaDB·Mecab·Postgres 풀·Kafka를 동시에 적재하고 비동기 작업 워커 기동
+    await container.startup()
+    yield
+    await container.shutdown()
+
+app = FastAPI(lifespan=lifespan)
+
+@app.exception_handler(DocumentTooLargeError)
+async def document_too_large_handler(request: Request, exc: DocumentTooLargeError):
+    return JSONResponse(status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE, content={"detail": str(exc)})
+
+@app.exception_handler(ServiceOverloadedError)
+async def service_overloaded_handler(request: Request, exc: ServiceOverloadedError):
+    return JSONResponse(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        content={"detail": str(exc)},
+        headers={"Retry-After": str(exc.retry_after)},
+    )
+
+app.include_router(feedback_router, prefix="/api")
+app.include_router(job_router, prefix="/api")
+app.include_router(ops_router)
+app.include_router(health_router)
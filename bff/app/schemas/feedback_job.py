@@ -0,0 +1,26 @@
+from enum import Enum
+from typing import Optional
+from pydantic import BaseModel, Field
+
+from .feedback_response import FeedbackResponse
+
+"""비동기 피드백 작업 관련 모델"""
+
+class JobStatus(str, Enum):
+    QUEUED = "queued"
+    RUNNING = "running"
+    SUCCEEDED = "succeeded"
+    FAILED = "failed"
+
+class FeedbackJob(BaseModel):
+    job_id: str
+    user_id: str = Field(..., exclude=True)
+    status: JobStatus
+    result: Optional[FeedbackResponse] = None
+    error: Optional[str] = None
+    created_at: float
+    updated_at: float
+
+class FeedbackJobAccepted(BaseModel):
+    job_id: str
+    status: JobStatus = JobStatus.QUEUED
@@ -1,10 +1,19 @@
-from typing import List, Optional, Any
+from enum import Enum
+from typing import Any, Dict, List, Optional
 from pydantic import BaseModel, Field
 
+class FeedbackStatus(str, Enum):
+    COMPLETED = "completed"
+    SKIPPED = "skipped"      # 과부하 축소 모드 등으로 생성을 생략
+    TIMED_OUT = "timed_out"  # 요청 마감 시간 안에 끝나지 않음
+    FAILED = "failed"
+
 """문맥 피드백 관련 응답 모델"""
 
 class ContextFeedback(BaseModel):
     feedback: str
+    is_reused: bool = Field(default=False, description="직전 제출의 문맥 피드백을 재사용했는지 여부")
+    status: FeedbackStatus = FeedbackStatus.COMPLETED
 
 """ 문법 피드백 관련 응답 모델"""
 
@@ -18,6 +27,7 @@ class ErrorWord(BaseModel):
 class ErrorExample(BaseModel):
     original_sentence: str = Field(..., description="오류가 있는 원본 문장")
     error_words: List[ErrorWord] = Field(..., description="문장 내 오류 정보 목록")
+    score: Optional[float] = Field(default=None, description="검색 순위로 매긴 점수 (클수록 관련성이 높음)")
 
 # 1차 LLM 출력 모델
 class CorrectionOutput(BaseModel):
@@ -48,7 +58,13 @@ class Sentence(BaseModel):
     original_sentence: str
     is_error: bool = False
     is_error_candidate: bool = Field(default=False, exclude=True)
+    is_reused: bool = Field(default=False, description="직전 제출과 같은 문장이어서 피드백을 재사용했는지 여부")
+    status: FeedbackStatus = Field(default=FeedbackStatus.COMPLETED, description="문법 피드백 생성 결과 상태")
     grammar_feedback: Optional[GrammarFeedback] = None
+    # ES 패턴 검색용 어절별 형태소 분석 결과 (응답에는 포함하지 않음)
+    words: Optional[List[Dict[str, Any]]] = Field(default=None, exclude=True)
+    # 이 문장의 문법 교정에 쓴 LLM 토큰 사용량 (수집 이벤트용, 응답에는 포함하지 않음)
+    llm_usage: Optional[Dict[str, Any]] = Field(default=None, exclude=True)
 
 class FeedbackResponse(BaseModel):
     context_feedback: ContextFeedback
@@ -0,0 +1,154 @@
+import asyncio
+from contextlib import AsyncExitStack, asynccontextmanager
+from dataclasses import dataclass
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, TypeVar
+
+from ..core.metrics import (
+    FEEDBACK_INFLIGHT_REQUESTS,
+    FEEDBACK_SHED_TOTAL,
+    GRAMMAR_INFLIGHT_TASKS,
+)
+from ..core.tracing import trace_span
+from ..schemas.feedback_request import FeedbackRequest
+from ..util.logger import logger
+
+T = TypeVar("T")
+
+OVERLOAD_REJECT = "reject"
+OVERLOAD_DEGRADE = "degrade"
+
+
+class DocumentTooLargeError(Exception):
+    pass
+
+
+class ServiceOverloadedError(Exception):
+    def __init__(self, message: str, retry_after: int) -> None:
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+@dataclass
+class AdmissionTicket:
+    """요청 하나에 배정된 동시성 한도. degraded이면 검색·LLM 문법 교정을 생략합니다."""
+    grammar_slots: asyncio.Semaphore
+    degraded: bool = False
+
+
+class AdmissionController:
+    """
+    피드백 요청의 수용 여부와 문법 교정 파이프라인의 동시 실행 수를 관리합니다.
+
+    - 문서 길이와 문장 수가 한도를 넘으면 DocumentTooLargeError (413)
+    - 처리 중인 요청 수가 임계치를 넘으면 정책에 따라 거절(ServiceOverloadedError, 503)하거나
+      규칙 기반 교정과 문맥 피드백만 제공하는 축소 모드로 처리
+    - 문장별 문법 교정 작업은 요청별 한도와 전역 한도를 모두 얻어야 실행
+      (Chroma·ES 동시 질의 수와 Postgres 커넥션 풀 점유를 함께 제한)
+    """
+
+    def __init__(
+        self,
+        max_document_chars: int = 5000,
+        max_sentences: int = 100,
+        per_request_concurrency: int = 4,
+        global_concurrency: int = 16,
+        max_inflight_requests: int = 64,
+        overload_policy: str = OVERLOAD_REJECT,
+        retry_after: int = 5,
+    ) -> None:
+        if overload_policy not in (OVERLOAD_REJECT, OVERLOAD_DEGRADE):
+            raise ValueError(f"지원하지 않는 과부하 정책입니다: {overload_policy}")
+
+        self.max_document_chars = max_document_chars
+        self.max_sentences = max_sentences
+        self.per_request_concurrency = per_request_concurrency
+        self.max_inflight_requests = max_inflight_requests
+        self.overload_policy = overload_policy
+        self.retry_after = retry_after
+
+        self._global_slots = asyncio.Semaphore(global_concurrency)
+        self._inflight_requests = 0
+        self._inflight_grammar = 0
+
+    # ------------------------------------------------------------------
+
+    # 요청 수용
+
+    def check_document(self, request: FeedbackRequest) -> None:
+        if len(request.contents) > self.max_document_chars:
+            raise DocumentTooLargeError(
+                f"글은 최대 {self.max_document_chars}자까지 제출할 수 있습니다. (현재 {len(request.contents)}자)"
+            )
+
+    def check_sentence_count(self, count: int) -> None:
+        if count > self.max_sentences:
+            raise DocumentTooLargeError(
+                f"글은 최대 {self.max_sentences}문장까지 제출할 수 있습니다. (현재 {count}문장)"
+            )
+
+    def is_overloaded(self) -> bool:
+        return self._inflight_requests >= self.max_inflight_requests
+
+    def check_capacity(self) -> None:
+        """거절 정책에서 과부하 상태이면 작업을 시작하기 전에 거절합니다."""
+        if self.overload_policy == OVERLOAD_REJECT and self.is_overloaded():
+            FEEDBACK_SHED_TOTAL.labels(action="rejected").inc()
+            raise ServiceOverloadedError(
+                "요청이 많아 지금은 피드백을 생성할 수 없습니다. 잠시 후 다시 시도해 주세요.",
+                retry_after=self.retry_after,
+            )
+
+    @asynccontextmanager
+    async def admit(self, request: FeedbackRequest, allow_shedding: bool = True) -> AsyncIterator[AdmissionTicket]:
+        """
+        요청을 처리 중 목록에 올리고 동시성 한도를 배정합니다.
+        allow_shedding=False이면 과부하여도 거절·축소하지 않습니다. (이미 워커 수로 제한된 비동기 작업 등)
+        """
+        self.check_document(request)
+        if allow_shedding:
+            self.check_capacity()
+
+        degraded = allow_shedding and self.is_overloaded()
+        if degraded:
+            FEEDBACK_SHED_TOTAL.labels(action="degraded").inc()
+            logger.warning(
+                "처리 중인 요청이 %d개로 임계치를 넘어 문법 교정을 축소 모드로 처리합니다.", self._inflight_requests
+            )
+
+        self._inflight_requests += 1
+        FEEDBACK_INFLIGHT_REQUESTS.inc()
+        try:
+            yield AdmissionTicket(
+                grammar_slots=asyncio.Semaphore(self.per_request_concurrency),
+                degraded=degraded,
+            )
+        finally:
+            self._inflight_requests -= 1
+            FEEDBACK_INFLIGHT_REQUESTS.dec()
+
+    # ------------------------------------------------------------------
+
+    # 문법 교정 동시 실행 제한
+
+    async def run_grammar(self, ticket: AdmissionTicket, fn: Callable[[], Awaitable[T]]) -> T:
+        """요청별 한도 → 전역 한도 순서로 슬롯을 얻은 뒤 문법 교정 작업을 실행합니다."""
+        async with AsyncExitStack() as slots:
+            # 대기 중 취소(마감 시간, 연결 종료)되어도 span이 cancelled 상태로 끝나도록 대기 구간만 감쌈
+            with trace_span("grammar_slot_wait"):
+                await slots.enter_async_context(ticket.grammar_slots)
+                await slots.enter_async_context(self._global_slots)
+            self._inflight_grammar += 1
+            GRAMMAR_INFLIGHT_TASKS.inc()
+            try:
+                return await fn()
+            finally:
+                self._inflight_grammar -= 1
+                GRAMMAR_INFLIGHT_TASKS.dec()
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "inflight_requests": self._inflight_requests,
+            "max_inflight_requests": self.max_inflight_requests,
+            "inflight_grammar_tasks": self._inflight_grammar,
+            "overload_policy": self.overload_policy,
+        }
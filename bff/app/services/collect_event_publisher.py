@@ -1,8 +1,9 @@
 import logging
-from typing import List
+from typing import Any, Dict, List, Optional
 from kafka import KafkaProducer
 from dataclasses import dataclass
 
+from ..core.metrics import OUTCOME_ERROR, track_stage
 from ..schemas.feedback_response import FeedbackDetail
 
 @dataclass
@@ -13,11 +14,16 @@ class GrammarFeedbackEvent:
     original_text: str
     corrected_text: str
     feedbacks: List[FeedbackDetail]
+    request_id: Optional[str] = None
+    # 이 문장과 요청 전체의 LLM 토큰 사용량 (usage_summary 형식)
+    llm_usage: Optional[Dict[str, Any]] = None
+    request_llm_usage: Optional[Dict[str, Any]] = None
 
 logger = logging.getLogger(__name__)
 
 class CollectEventPublisher:
-    def __init__(self, producer: KafkaProducer, topic: str, fallback_repo=None):
+    def __init__(self, producer: Optional[KafkaProducer], topic: str, fallback_repo=None):
+        # 브로커 연결은 앱 기동 시 맺으므로, 연결 전이거나 실패했다면 None
         self.producer = producer
         self.topic = topic
         self.fallback_repo = fallback_repo  # Optional: 실패 시 파일/DB에 저장
@@ -44,6 +50,9 @@ class CollectEventPublisher:
             "originalText": event.original_text,
             "correctedText": event.corrected_text,
             "feedbacks": feedbacks_payload,
+            "requestId": event.request_id,
+            "llmUsage": event.llm_usage,
+            "requestLlmUsage": event.request_llm_usage,
         }
 
     def publish_safe(self, events: list["GrammarFeedbackEvent"]) -> None:
@@ -52,20 +61,25 @@ class CollectEventPublisher:
             logger.info("Attempted to publish, but event list is empty.")
             return
 
-        try:
-            logger.info(f"Attempting to publish {len(events)} grammar events to topic '{self.topic}'.")
+        with track_stage("kafka_publish") as stage:
+            try:
+                if self.producer is None:
+                    raise ConnectionError("Kafka producer is not connected.")
 
-            for event in events:
-                record = self._to_record(event)
-                self.producer.send(self.topic, value=record)
+                logger.debug("Attempting to publish %d grammar events to topic '%s'.", len(events), self.topic)
 
-            self.producer.flush()
-            logger.info(f"Successfully published {len(events)} events and flushed.")
-            
-        except Exception as e:
-            logger.error("Failed to publish grammar events to Kafka", exc_info=e)
-            if self.fallback_repo:
-                try:
-                    self.fallback_repo.save(events)
-                except Exception as e2:
-                    logger.error("Failed to save grammar events to fallback store", exc_info=e2)
+                for event in events:
+                    record = self._to_record(event)
+                    self.producer.send(self.topic, value=record)
+
+                self.producer.flush()
+                logger.info("Successfully published %d events and flushed.", len(events))
+
+            except Exception as e:
+                stage.outcome = OUTCOME_ERROR
+                logger.error("Failed to publish grammar events to Kafka", exc_info=e)
+                if self.fallback_repo:
+                    try:
+                        self.fallback_repo.save(events)
+                    except Exception as e2:
+                        logger.error("Failed to save grammar events to fallback store", exc_info=e2)
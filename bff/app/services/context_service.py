@@ -1,3 +1,6 @@
+from typing import AsyncIterator
+
+from ..core.metrics import track_stage
 from ..schemas.feedback_response import ContextFeedback
 from ..clients.context_llm_client import ContextLLMClient
 
@@ -6,6 +9,12 @@ class ContextService:
         self.client = client
 
     async def create_context_feedback(self, title: str, contents: str) -> ContextFeedback:
-        result = await self.client.get_context_feedback(title=title, contents=contents)
+        with track_stage("llm_context"):
+            result = await self.client.get_context_feedback(title=title, contents=contents)
 
         return ContextFeedback(**result)
+
+    async def stream_context_feedback(self, title: str, contents: str) -> AsyncIterator[str]:
+        with track_stage("llm_context"):
+            async for token in self.client.stream_context_feedback(title=title, contents=contents):
+                yield token
@@ -0,0 +1,289 @@
+import asyncio
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+from urllib.parse import urlparse
+
+from ..llm.rate_limit_backends import _RespConnection
+from ..schemas.feedback_response import ContextFeedback, GrammarFeedback
+
+"""
+퇴고 후 재제출한 글에서 바뀌지 않은 문장의 피드백을 재사용하기 위한 직전 제출 결과 저장소
+- local: 프로세스 메모리 LRU (워커가 하나일 때만 재사용됨)
+- file: SQLite 파일 (같은 호스트의 gunicorn 워커들이 공유)
+- redis: Redis 키 (여러 호스트·레플리카가 공유)
+"""
+
+
+class DraftStoreError(Exception):
+    pass
+
+
+@dataclass
+class DraftSentence:
+    # 오류가 없던 문장은 None
+    grammar_feedback: Optional[GrammarFeedback]
+    length: int
+
+
+@dataclass
+class DraftSnapshot:
+    """사용자의 직전 제출 결과. 문장은 정규화한 텍스트의 해시로 찾습니다."""
+    title: str
+    sentences: Dict[str, DraftSentence] = field(default_factory=dict)
+    context_feedback: Optional[ContextFeedback] = None
+
+    @property
+    def total_length(self) -> int:
+        return sum(s.length for s in self.sentences.values())
+
+    def to_json(self) -> str:
+        return json.dumps(
+            {
+                "title": self.title,
+                "context_feedback": self.context_feedback.model_dump(mode="json") if self.context_feedback else None,
+                "sentences": {
+                    key: {
+                        "grammar_feedback": s.grammar_feedback.model_dump(mode="json") if s.grammar_feedback else None,
+                        "length": s.length,
+                    }
+                    for key, s in self.sentences.items()
+                },
+            },
+            ensure_ascii=False,
+        )
+
+    @classmethod
+    def from_json(cls, raw: str) -> "DraftSnapshot":
+        data = json.loads(raw)
+        context_feedback = data.get("context_feedback")
+        return cls(
+            title=data["title"],
+            context_feedback=ContextFeedback.model_validate(context_feedback) if context_feedback else None,
+            sentences={
+                key: DraftSentence(
+                    grammar_feedback=(
+                        GrammarFeedback.model_validate(s["grammar_feedback"]) if s.get("grammar_feedback") else None
+                    ),
+                    length=s["length"],
+                )
+                for key, s in data.get("sentences", {}).items()
+            },
+        )
+
+
+class DraftStore(ABC):
+    """사용자(세션)별 직전 제출 결과 저장소. 요청 처리 중에 호출하므로 이벤트 루프를 막지 않아야 합니다."""
+
+    @staticmethod
+    def sentence_key(text: str) -> str:
+        normalized = " ".join(text.split())
+        return hashlib.sha1(normalized.encode("utf-8")).hexdigest()
+
+    @abstractmethod
+    async def get(self, user_id: str) -> Optional[DraftSnapshot]:
+        pass
+
+    @abstractmethod
+    async def put(self, user_id: str, snapshot: DraftSnapshot) -> None:
+        pass
+
+    async def close(self) -> None:
+        pass
+
+
+# ----------------------------------------------------------------------
+
+# 단일 워커: 프로세스 메모리
+
+
+class MemoryDraftStore(DraftStore):
+    """
+    크기 제한 LRU로 프로세스 메모리에 보관합니다.
+    gunicorn 워커가 여럿이면 재제출이 다른 워커로 가는 경우가 많아 재사용되지 않으므로 file·redis 백엔드를 사용합니다.
+    """
+
+    def __init__(self, max_users: int = 1000) -> None:
+        self.max_users = max_users
+        self._drafts: "OrderedDict[str, DraftSnapshot]" = OrderedDict()
+        # 비동기 작업 워커 등 다른 스레드에서 접근할 수 있으므로 보호
+        self._lock = threading.Lock()
+
+    async def get(self, user_id: str) -> Optional[DraftSnapshot]:
+        with self._lock:
+            snapshot = self._drafts.get(user_id)
+            if snapshot is not None:
+                self._drafts.move_to_end(user_id)
+            return snapshot
+
+    async def put(self, user_id: str, snapshot: DraftSnapshot) -> None:
+        with self._lock:
+            self._drafts[user_id] = snapshot
+            self._drafts.move_to_end(user_id)
+            while len(self._drafts) > self.max_users:
+                self._drafts.popitem(last=False)
+
+    def __len__(self) -> int:
+        return len(self._drafts)
+
+
+# ----------------------------------------------------------------------
+
+# 단일 호스트: SQLite 파일
+
+
+class SqliteDraftStore(DraftStore):
+    """
+    같은 호스트의 워커들이 하나의 SQLite 파일(WAL)을 공유합니다.
+    파일 I/O는 asyncio.to_thread에서 실행하고, 연결은 fork 이후 워커마다 새로 엽니다.
+    최근 저장한 사용자 max_users명분만 남기고, ttl이 지난 결과는 읽지 않습니다.
+    """
+
+    def __init__(self, path: str, max_users: int = 1000, ttl: float = 86400) -> None:
+        self.path = path
+        self.max_users = max_users
+        self.ttl = ttl
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._conn: Optional[sqlite3.Connection] = None
+        self._pid: Optional[int] = None
+        # 연결 하나를 여러 스레드(to_thread)에서 쓰므로 직렬화
+        self._lock = threading.Lock()
+
+    def _connection(self) -> sqlite3.Connection:
+        # 마스터에서 연 연결을 fork한 워커가 그대로 쓰지 않도록 프로세스가 바뀌면 다시 엶
+        if self._conn is None or self._pid != os.getpid():
+            conn = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None, timeout=5)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS drafts (
+                    user_id     TEXT PRIMARY KEY,
+                    snapshot    TEXT NOT NULL,
+                    updated_at  REAL NOT NULL
+                )
+                """
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_drafts_updated_at ON drafts (updated_at)")
+            self._conn, self._pid = conn, os.getpid()
+        return self._conn
+
+    def _get(self, user_id: str) -> Optional[str]:
+        with self._lock:
+            row = self._connection().execute(
+                "SELECT snapshot FROM drafts WHERE user_id = ? AND updated_at > ?",
+                (user_id, time.time() - self.ttl),
+            ).fetchone()
+        return row[0] if row else None
+
+    def _put(self, user_id: str, raw: str) -> None:
+        with self._lock:
+            conn = self._connection()
+            conn.execute(
+                "INSERT INTO drafts (user_id, snapshot, updated_at) VALUES (?, ?, ?) "
+                "ON CONFLICT(user_id) DO UPDATE SET snapshot = excluded.snapshot, updated_at = excluded.updated_at",
+                (user_id, raw, time.time()),
+            )
+            conn.execute(
+                "DELETE FROM drafts WHERE updated_at <= (SELECT updated_at FROM drafts ORDER BY updated_at DESC LIMIT 1 OFFSET ?)",
+                (self.max_users,),
+            )
+
+    async def get(self, user_id: str) -> Optional[DraftSnapshot]:
+        raw = await asyncio.to_thread(self._get, user_id)
+        return DraftSnapshot.from_json(raw) if raw else None
+
+    async def put(self, user_id: str, snapshot: DraftSnapshot) -> None:
+        await asyncio.to_thread(self._put, user_id, snapshot.to_json())
+
+    async def close(self) -> None:
+        with self._lock:
+            if self._conn is not None and self._pid == os.getpid():
+                self._conn.close()
+            self._conn = None
+
+
+# ----------------------------------------------------------------------
+
+# 여러 호스트: Redis
+
+
+class RedisDraftStore(DraftStore):
+    """
+    사용자별 키 하나에 JSON으로 저장합니다. 보관 인원 대신 TTL(EX)로 크기를 제한합니다.
+    요청 태스크들이 연결 하나를 나눠 쓰므로, 응답을 읽기 전에 취소된 명령이 있으면 연결을 버려
+    다음 명령이 다른 사용자의 응답을 읽지 않도록 합니다. (_RespConnection.execute)
+    """
+
+    def __init__(self, url: str, key_prefix: str = "draft", ttl: float = 86400, timeout: float = 1.0) -> None:
+        parsed = urlparse(url)
+        db = int(parsed.path.lstrip("/") or 0)
+        self.key_prefix = key_prefix
+        self.ttl = max(1, int(ttl))
+        self._conn = _RespConnection(
+            parsed.hostname or "localhost", parsed.port or 6379, parsed.password, db, timeout
+        )
+        # 연결 하나에서 요청·응답 순서를 맞추기 위해 한 번에 하나의 명령만 보냄
+        self._lock = asyncio.Lock()
+
+    def _key(self, user_id: str) -> str:
+        return f"{self.key_prefix}:{user_id}"
+
+    async def get(self, user_id: str) -> Optional[DraftSnapshot]:
+        async with self._lock:
+            raw = await self._conn.execute("GET", self._key(user_id))
+        if raw is not None and not isinstance(raw, bytes):
+            raise DraftStoreError(f"GET 응답 형식이 올바르지 않습니다: {raw!r}")
+        return DraftSnapshot.from_json(raw.decode()) if raw else None
+
+    async def put(self, user_id: str, snapshot: DraftSnapshot) -> None:
+        async with self._lock:
+            await self._conn.execute("SET", self._key(user_id), snapshot.to_json().encode(), "EX", self.ttl)
+
+    async def close(self) -> None:
+        await self._conn.close()
+
+
+# ----------------------------------------------------------------------
+
+
+def create_draft_store(
+    backend: str,
+    max_users: int,
+    ttl: float,
+    file_path: Optional[str] = None,
+    redis_url: Optional[str] = None,
+    redis_key_prefix: str = "draft",
+) -> DraftStore:
+    """설정값에 맞는 직전 제출 결과 저장소를 생성합니다."""
+    backend = backend.lower()
+
+    if backend == "local":
+        return MemoryDraftStore(max_users=max_users)
+    if backend == "file":
+        if not file_path:
+            raise DraftStoreError("file 백엔드에는 DRAFT_STORE_FILE_PATH 설정이 필요합니다.")
+        return SqliteDraftStore(file_path, max_users=max_users, ttl=ttl)
+    if backend == "redis":
+        if not redis_url:
+            raise DraftStoreError("redis 백엔드에는 DRAFT_STORE_REDIS_URL 설정이 필요합니다.")
+        return RedisDraftStore(redis_url, key_prefix=redis_key_prefix, ttl=ttl)
+
+    raise DraftStoreError(f"지원하지 않는 재제출 결과 저장소 백엔드입니다: {backend}")
+
+
+def changed_ratio(previous: DraftSnapshot, current_keys: List[str], current_lengths: List[int]) -> float:
+    """직전 제출 대비 바뀐 분량의 비율 (0이면 동일, 1이면 전부 바뀜). 문장 교체는 추가·삭제 중 큰 쪽으로 셉니다."""
+    current = dict(zip(current_keys, current_lengths))
+    added = sum(length for key, length in current.items() if key not in previous.sentences)
+    removed = sum(s.length for key, s in previous.sentences.items() if key not in current)
+    base = max(previous.total_length, sum(current.values()), 1)
+    return max(added, removed) / base
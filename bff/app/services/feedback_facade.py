@@ -1,14 +1,34 @@
 import asyncio
 import datetime
-from typing import List
+import logging
+import time
+from typing import Any, AsyncIterator, Dict, List, Optional, Set, Tuple
 
+from .admission_controller import AdmissionController, AdmissionTicket
 from .context_service import ContextService
+from .draft_store import DraftSentence, DraftSnapshot, DraftStore, changed_ratio
 from .grammar_service import GrammarService
+from .particle_rule_service import ParticleCorrection, ParticleRuleService
 from .sentence_service import SentenceService
 from .collect_event_publisher import CollectEventPublisher, GrammarFeedbackEvent
 from ..schemas.feedback_request import FeedbackRequest
-from ..schemas.feedback_response import FeedbackResponse, ContextFeedback, GrammarFeedback, Sentence
-from ..util.logger import log_task_exception, logger
+from ..schemas.feedback_response import FeedbackResponse, FeedbackStatus, ContextFeedback, GrammarFeedback, Sentence
+from ..core.config import settings
+from ..core.metrics import FEEDBACK_REQUEST_LLM_TOKENS
+from ..core.profiling import note_current_task
+from ..core.request_context import (
+    DeadlineExceededError,
+    RequestContext,
+    bind_request_context,
+    get_request_context,
+    track_llm_usage,
+    usage_summary,
+)
+from ..core.tracing import Span, start_span, trace_span, use_span
+from ..util.logger import log_event, log_task_exception, logger, stage_dump_enabled
+
+# 각 단계가 스스로 마감 시간을 지키지 못했을 때 강제로 취소하기까지의 여유 시간
+DEADLINE_GRACE_SECONDS = 0.5
 
 class FeedbackFacade:
     def __init__(
@@ -17,81 +37,191 @@ class FeedbackFacade:
         grammar_service: GrammarService,
         sentence_service: SentenceService,
         collect_event_publisher: CollectEventPublisher,
+        particle_rule_service: Optional[ParticleRuleService] = None,
+        admission_controller: Optional[AdmissionController] = None,
+        draft_store: Optional[DraftStore] = None,
+        context_regenerate_ratio: float = 0.2,
     ):
         self.context_service = context_service
         self.grammar_service = grammar_service
         self.sentence_service = sentence_service
         self.collect_event_publisher = collect_event_publisher
+        self.particle_rule_service = particle_rule_service
+        self.admission_controller = admission_controller or AdmissionController()
+        self.draft_store = draft_store
+        self.context_regenerate_ratio = context_regenerate_ratio
 
     def _build_grammar_event(self, sentence: Sentence, user_id: str) -> GrammarFeedbackEvent:
         gf = sentence.grammar_feedback
+        context = get_request_context()
         return GrammarFeedbackEvent(
             user_id=user_id,
             timestamp= datetime.datetime.now().isoformat(),
             sentence_id=sentence.sentence_id,
             original_text=sentence.original_sentence,
             corrected_text=gf.corrected_sentence,
-            feedbacks=gf.feedbacks
+            feedbacks=gf.feedbacks,
+            request_id=context.request_id if context else None,
+            llm_usage=sentence.llm_usage,
+            request_llm_usage=usage_summary(context.llm_usage) if context else None,
         )
 
-    async def create_feedback(self, request: FeedbackRequest, user_id: str) -> FeedbackResponse:
-        # 1. 문맥 피드백 코루틴 준비
-        context_task = self.context_service.create_context_feedback(
-            title=request.title,
-            contents=request.contents,
+    @staticmethod
+    def _report_llm_usage(request_context: RequestContext, span: Span, mode: str) -> None:
+        """요청 전체의 LLM 토큰 사용량을 요청 span, 메트릭, 로그에 남깁니다."""
+        summary = usage_summary(request_context.llm_usage)
+        if not summary["calls"]:
+            return
+        span.set_attribute("llm_usage", summary)
+        FEEDBACK_REQUEST_LLM_TOKENS.labels(mode=mode).observe(summary["total_tokens"])
+        log_event(
+            logger, logging.INFO, "feedback.llm_usage",
+            request_id=request_context.request_id, mode=mode, **summary,
         )
 
+    async def _resolve_by_particle_rules(self, sentences: List[Sentence]) -> List[Sentence]:
+        """
+        조사 이형태 오류만 있는 문장은 규칙 엔진으로 피드백을 완성하고, 검색·LLM 단계에서 제외합니다.
+        규칙 교정 후에도 오류 의심 점수가 남아 있으면 LLM 파이프라인으로 넘깁니다.
+        """
+        if self.particle_rule_service is None:
+            return []
+
+        # 문장마다 형태소 분석(Mecab)을 하므로 긴 글에서 이벤트 루프를 막지 않도록 한 번에 별도 스레드에서 실행
+        checked = await asyncio.to_thread(self._check_particle_rules, sentences)
+
+        resolved: List[Sentence] = []
+        for sentence, corrections, still_error in checked:
+            if still_error:
+                # 다른 오류가 남아 있을 가능성이 있으므로 LLM이 전체 문장을 다시 교정
+                sentence.is_error_candidate = True
+                continue
+
+            sentence.grammar_feedback = await self.particle_rule_service.build_feedback(
+                sentence.original_sentence, corrections
+            )
+            sentence.is_error_candidate = False
+            resolved.append(sentence)
+
+        return resolved
+
+    def _check_particle_rules(self, sentences: List[Sentence]) -> List[Tuple[Sentence, List[ParticleCorrection], bool]]:
+        """조사 이형태 오류가 있는 문장마다 (문장, 교정 목록, 규칙 교정 후에도 오류 후보인지)를 반환합니다."""
+        checked = []
+        for sentence in sentences:
+            if sentence.is_reused:
+                continue
+            corrections = self.particle_rule_service.check(sentence.original_sentence)
+            if not corrections:
+                continue
+            corrected = self.particle_rule_service.apply(sentence.original_sentence, corrections)
+            checked.append((sentence, corrections, self.sentence_service.is_error_candidate(corrected)))
+        return checked
+
+    def _prepare_sentences(self, contents: str) -> List[Sentence]:
+        """문장을 분할하고 형태소 분석 기반으로 오류 후보 문장을 태깅합니다."""
         # 2. 문장 분할
-        sentences = self.sentence_service.split_into_sentences(request.contents)
+        sentences = self.sentence_service.split_into_sentences(contents)
+        self.admission_controller.check_sentence_count(len(sentences))
 
         # 3. 오류를 포함한 문장 태깅
         sentences = self.sentence_service.tag_error_sentences_by_konlpy(sentences)
 
-        # 4. 문법 교정 코루틴 리스트 준비
-        grammar_tasks = []
-        error_sentences = [s for s in sentences if s.is_error_candidate]
-        logger.info(f"형태소 분석 기반 오류 후보 문장: {len(error_sentences)}개")
+        return sentences
 
-        for sentence in error_sentences:
-            task = self.grammar_service.attach_grammar_feedback(sentence)
-            grammar_tasks.append(task)
+    @staticmethod
+    def _status_for_exception(exc: BaseException) -> FeedbackStatus:
+        if isinstance(exc, (DeadlineExceededError, asyncio.TimeoutError, asyncio.CancelledError)):
+            return FeedbackStatus.TIMED_OUT
+        return FeedbackStatus.FAILED
 
-        # 5. 코루틴 동시 실행 및 응답 대기
-        results = await asyncio.gather(
-            context_task,
-            *grammar_tasks,
-            return_exceptions=True
-        )
+    @classmethod
+    def _to_context_feedback(cls, context_result) -> ContextFeedback:
+        if isinstance(context_result, BaseException):
+            status = cls._status_for_exception(context_result)
+            if status == FeedbackStatus.TIMED_OUT:
+                logger.warning("Context task timed out: %s", context_result)
+                return ContextFeedback(feedback="제한 시간 안에 문맥 피드백을 생성하지 못했습니다.", status=status)
+            logger.error("Context task failed: %s", context_result, exc_info=True)
+            return ContextFeedback(feedback="문맥 피드백 생성에 실패했습니다.", status=status)
+        return context_result
 
-        # 6. 결과 분리
-        context_result: ContextFeedback = results[0]
-        grammar_feedbacks: list[GrammarFeedback | None] = results[1:]
-
-        if isinstance(context_result, Exception):
-            logger.error(f"Context task failed: {context_result}", exc_info=True)
-            context_feedback = ContextFeedback(feedback="문맥 피드백 생성에 실패했습니다.") 
+    def _apply_grammar_result(self, sentence: Sentence, result: Any, failed_sentence_ids: Set[int]) -> None:
+        """문법 교정 태스크의 결과(또는 예외)를 문장에 반영합니다."""
+        if isinstance(result, GrammarFeedback):
+            sentence.grammar_feedback = result
+            return
+        failed_sentence_ids.add(sentence.sentence_id)
+        sentence.status = self._status_for_exception(result)
+        if sentence.status == FeedbackStatus.TIMED_OUT:
+            logger.warning("Grammar task for '%s' timed out: %s", sentence.original_sentence, result)
         else:
-            context_feedback: ContextFeedback = context_result
-        
-        log_msg = [f"\n===== 전체 문맥 피드백 결과 ====="]
-        log_msg.append(context_feedback.feedback)
-        log_msg.append("=" * 30)
-        logger.info("\n".join(log_msg))
+            logger.error("Grammar task for '%s' failed: %s", sentence.original_sentence, result)
 
-        # 7. 생성한 문법 피드백을 원본 문장 데이터에 연결
-        for sentence, result in zip(error_sentences, grammar_feedbacks):
-            if isinstance(result, GrammarFeedback):
-                sentence.grammar_feedback = result
+    @staticmethod
+    def _new_request_context(
+        user_id: str, deadline_seconds: Optional[float], request_id: Optional[str] = None
+    ) -> RequestContext:
+        budget = deadline_seconds if deadline_seconds is not None else settings.FEEDBACK_DEADLINE_SECONDS
+        context = RequestContext(user_id=user_id, deadline=time.monotonic() + budget)
+        if request_id:
+            context.request_id = request_id
+        return context
+
+    @staticmethod
+    def _wait_timeout(request_context: RequestContext) -> Optional[float]:
+        remaining = request_context.remaining()
+        if remaining is None:
+            return None
+        return max(remaining, 0.0) + DEADLINE_GRACE_SECONDS
+
+    async def _gather_until_deadline(self, tasks: List[asyncio.Task], request_context: RequestContext) -> List[Any]:
+        """
+        태스크를 마감 시간까지 기다린 뒤, 태스크 순서대로 결과(또는 예외)를 반환합니다.
+        마감 시간까지 끝나지 않은 태스크는 취소하고 DeadlineExceededError로 채웁니다.
+        """
+        _, pending = await asyncio.wait(tasks, timeout=self._wait_timeout(request_context))
+        if pending:
+            for task in pending:
+                task.cancel()
+            # 취소된 태스크가 커넥션·속도 제한 슬롯을 정리할 때까지 대기
+            await asyncio.gather(*pending, return_exceptions=True)
+
+        results: List[Any] = []
+        for task in tasks:
+            if task in pending or task.cancelled():
+                results.append(DeadlineExceededError("마감 시간까지 끝나지 않아 취소했습니다."))
             else:
-                logger.error(f"Grammar task for '{sentence.original_sentence}' failed: {result}")
+                results.append(task.exception() or task.result())
+        return results
+
+    @staticmethod
+    def _finalize_sentence(sentence: Sentence) -> Sentence:
+        # grammar_feedback이 있고, 그 안에 feedbacks 리스트가 비어있지 않으면 오류가 있는 문장
+        if sentence.grammar_feedback and sentence.grammar_feedback.feedbacks:
+            sentence.is_error = True
+        else:
+            sentence.is_error = False
+            # is_error가 False이면 grammar_feedback을 null로 설정하여 불필요한 데이터 제외
+            sentence.grammar_feedback = None
+        return sentence
+
+    @classmethod
+    def _sentence_payload(cls, sentence: Sentence) -> Dict[str, Any]:
+        """
+        스트리밍 sentence 이벤트 데이터. 수집 이벤트는 마지막에 발행하므로 원본은 그대로 두고 복사본을 정리합니다.
+        (오류가 없다는 LLM 교정 결과도 수집 이벤트에 포함되어야 함)
+        """
+        return cls._finalize_sentence(sentence.model_copy(deep=True)).model_dump()
 
+    def _publish_collect_events(self, sentences: List[Sentence], user_id: str) -> None:
         events: List[GrammarFeedbackEvent] = [
             self._build_grammar_event(sentence, user_id)
-            for sentence in error_sentences
+            for sentence in sentences
             if sentence.grammar_feedback is not None
         ]
 
-        # 8. 별도의 스레드에서 새로운 데이터 수집 이벤트 발행
+        # 별도의 스레드에서 새로운 데이터 수집 이벤트 발행
         if events:
             collector_task = asyncio.create_task(
                 asyncio.to_thread(self.collect_event_publisher.publish_safe, events),
@@ -99,17 +229,445 @@ class FeedbackFacade:
             )
             collector_task.add_done_callback(log_task_exception)
 
+    async def _reuse_previous_draft(
+        self, request: FeedbackRequest, sentences: List[Sentence], user_id: str
+    ) -> Optional[ContextFeedback]:
+        """
+        직전 제출과 정규화한 텍스트가 같은 문장은 저장된 문법 피드백을 붙이고 검색·LLM 대상에서 제외합니다.
+        제목이 같고 바뀐 분량이 임계치 이하이면 재사용할 문맥 피드백을 반환합니다.
+        """
+        if self.draft_store is None:
+            return None
+        try:
+            previous = await self.draft_store.get(user_id)
+        except Exception as e:
+            # 저장소 장애 시 재사용 없이 처리
+            logger.warning("직전 제출 결과를 불러오지 못했습니다: %s", e)
+            return None
+        if previous is None:
+            return None
+
+        keys = [DraftStore.sentence_key(s.original_sentence) for s in sentences]
+        for sentence, key in zip(sentences, keys):
+            stored = previous.sentences.get(key)
+            if stored is None:
+                continue
+            sentence.grammar_feedback = (
+                stored.grammar_feedback.model_copy(deep=True) if stored.grammar_feedback else None
+            )
+            sentence.is_error_candidate = False
+            sentence.is_reused = True
+
+        ratio = changed_ratio(previous, keys, [len(s.original_sentence.strip()) for s in sentences])
+        reused_count = sum(1 for s in sentences if s.is_reused)
+        log_event(
+            logger, logging.INFO, "draft.reused",
+            reused=reused_count, sentences=len(sentences), changed_ratio=round(ratio, 2),
+        )
+
+        if (
+            previous.context_feedback is None
+            or previous.title != request.title
+            or ratio > self.context_regenerate_ratio
+        ):
+            return None
+        return previous.context_feedback.model_copy(update={"is_reused": True})
+
+    async def _remember_draft(
+        self,
+        request: FeedbackRequest,
+        user_id: str,
+        sentences: List[Sentence],
+        context_feedback: Optional[ContextFeedback],
+        failed_sentence_ids: Set[int],
+    ) -> None:
+        """최종 결과를 다음 제출에서 재사용할 수 있도록 저장합니다. 실패한 문장과 문맥 피드백은 저장하지 않습니다."""
+        if self.draft_store is None:
+            return
+
+        snapshot = DraftSnapshot(
+            title=request.title,
+            context_feedback=context_feedback.model_copy(update={"is_reused": False}) if context_feedback else None,
+        )
+        for sentence in sentences:
+            if sentence.sentence_id in failed_sentence_ids:
+                continue
+            snapshot.sentences[DraftStore.sentence_key(sentence.original_sentence)] = DraftSentence(
+                grammar_feedback=sentence.grammar_feedback.model_copy(deep=True) if sentence.grammar_feedback else None,
+                length=len(sentence.original_sentence.strip()),
+            )
+        try:
+            await self.draft_store.put(user_id, snapshot)
+        except Exception as e:
+            logger.warning("재제출 결과를 저장하지 못했습니다: %s", e)
+
+    @staticmethod
+    async def _completed(value: Any) -> Any:
+        return value
+
+    def _abandon(
+        self,
+        request: FeedbackRequest,
+        user_id: str,
+        sentences: List[Sentence],
+        rule_resolved_sentences: List[Sentence],
+        context_task: asyncio.Task,
+        grammar_tasks: Dict[asyncio.Task, Sentence],
+        ticket: AdmissionTicket,
+    ) -> None:
+        """
+        클라이언트 연결이 끊겼을 때 남은 작업을 취소합니다. (Postgres 커넥션·속도 제한 슬롯 반환)
+        취소가 끝나기를 기다리는 동안 요청 태스크가 다시 취소될 수 있으므로, 정리는 별도 태스크에서 합니다.
+        """
+        unfinished = [task for task in (context_task, *grammar_tasks) if not task.done()]
+        for task in unfinished:
+            task.cancel()
+        logger.info("클라이언트 연결이 끊겨 남은 작업 %d개를 취소합니다.", len(unfinished))
+
+        salvage_task = asyncio.create_task(
+            self._salvage_finished(
+                request, user_id, sentences, rule_resolved_sentences, context_task, grammar_tasks, ticket
+            ),
+            name="Feedback_Salvage_Task",
+        )
+        salvage_task.add_done_callback(log_task_exception)
+
+    async def _salvage_finished(
+        self,
+        request: FeedbackRequest,
+        user_id: str,
+        sentences: List[Sentence],
+        rule_resolved_sentences: List[Sentence],
+        context_task: asyncio.Task,
+        grammar_tasks: Dict[asyncio.Task, Sentence],
+        ticket: AdmissionTicket,
+    ) -> None:
+        """이미 끝난 결과는 수집 이벤트와 재사용 저장소에 그대로 반영합니다."""
+        await asyncio.gather(context_task, *grammar_tasks, return_exceptions=True)
+
+        finished: List[Sentence] = []
+        failed_sentence_ids: Set[int] = set()
+        for task, sentence in grammar_tasks.items():
+            if task.cancelled() or task.exception() is not None:
+                failed_sentence_ids.add(sentence.sentence_id)
+                continue
+            sentence.grammar_feedback = task.result()
+            finished.append(sentence)
+
+        self._publish_collect_events(finished + rule_resolved_sentences, user_id)
+
+        if not ticket.degraded:
+            context_feedback = None
+            if not context_task.cancelled() and context_task.exception() is None:
+                context_feedback = context_task.result()
+            await self._remember_draft(request, user_id, sentences, context_feedback, failed_sentence_ids)
+
+    def _select_grammar_targets(self, sentences: List[Sentence], ticket: AdmissionTicket) -> List[Sentence]:
+        """검색·LLM 문법 교정을 실행할 문장을 고릅니다. 축소 모드에서는 모두 생략합니다."""
+        error_sentences = [s for s in sentences if s.is_error_candidate]
+        if ticket.degraded and error_sentences:
+            logger.warning("축소 모드: 오류 후보 문장 %d개의 LLM 문법 교정을 생략합니다.", len(error_sentences))
+            for sentence in error_sentences:
+                sentence.is_error_candidate = False
+                sentence.status = FeedbackStatus.SKIPPED
+            return []
+        return error_sentences
+
+    async def _grammar_coroutine(self, sentence: Sentence, ticket: AdmissionTicket):
+        # 문장 단위 span (동시 실행 슬롯 대기 포함). 하위 의존성 호출 span과 로그에 sentence_id가 붙음
+        note_current_task()
+        with trace_span("sentence", sentence_id=sentence.sentence_id, length=len(sentence.original_sentence)) as span, \
+                track_llm_usage() as usage:
+            try:
+                return await self.admission_controller.run_grammar(
+                    ticket, lambda: self.grammar_service.attach_grammar_feedback(sentence)
+                )
+            finally:
+                # 같은 문장의 동시 요청과 합쳐졌다면 먼저 실행한 쪽에만 사용량이 기록됨
+                if usage:
+                    sentence.llm_usage = usage_summary(usage)
+                    span.set_attribute("llm_usage", sentence.llm_usage)
+
+    def check_request(self, request: FeedbackRequest) -> None:
+        """응답을 시작하기 전에 문서 크기와 서버 여유를 확인합니다. (스트리밍 응답의 상태 코드 결정용)"""
+        self.admission_controller.check_document(request)
+        self.admission_controller.check_capacity()
+
+    async def _stream_context_feedback(self, request: FeedbackRequest, deltas: asyncio.Queue) -> ContextFeedback:
+        """문맥 피드백 스트림을 소비하며 조각을 큐에 넣고, 완성된 피드백을 반환합니다."""
+        chunks: List[str] = []
+        async for token in self.context_service.stream_context_feedback(
+            title=request.title,
+            contents=request.contents,
+        ):
+            chunks.append(token)
+            deltas.put_nowait(token)
+        return ContextFeedback(feedback="".join(chunks))
+
+    async def create_feedback(
+        self,
+        request: FeedbackRequest,
+        user_id: str,
+        allow_shedding: bool = True,
+        deadline_seconds: Optional[float] = None,
+        request_id: Optional[str] = None,
+    ) -> FeedbackResponse:
+        # 하위 LLM 호출이 사용자별 공정 큐잉과 요청 마감 시간을 참조할 수 있도록 요청 컨텍스트 설정
+        request_context = self._new_request_context(user_id, deadline_seconds, request_id)
+        with bind_request_context(request_context), trace_span("feedback", mode="sync", chars=len(request.contents)) as span:
+            try:
+                async with self.admission_controller.admit(request, allow_shedding=allow_shedding) as ticket:
+                    return await self._create_feedback(request, user_id, ticket, request_context)
+            finally:
+                self._report_llm_usage(request_context, span, "sync")
+
+    async def _create_feedback(
+        self,
+        request: FeedbackRequest,
+        user_id: str,
+        ticket: AdmissionTicket,
+        request_context: RequestContext,
+    ) -> FeedbackResponse:
+        # 1~3. 문장 분할 및 오류 후보 태깅
+        sentences = self._prepare_sentences(request.contents)
+
+        # 3-1. 직전 제출과 같은 문장은 저장된 피드백 재사용
+        reused_context = await self._reuse_previous_draft(request, sentences, user_id)
+
+        # 3-2. 조사 이형태 오류만 있는 문장은 규칙 기반으로 바로 피드백 생성
+        rule_resolved_sentences = await self._resolve_by_particle_rules(sentences)
+
+        # 문맥 피드백 코루틴 준비
+        if reused_context is not None:
+            context_task = self._completed(reused_context)
+        else:
+            context_task = self.context_service.create_context_feedback(
+                title=request.title,
+                contents=request.contents,
+            )
+
+        # 4. 문법 교정 태스크 리스트 준비 (요청별·전역 동시 실행 한도 적용)
+        error_sentences = self._select_grammar_targets(sentences, ticket)
+        log_event(
+            logger, logging.INFO, "feedback.targets",
+            sentences=len(sentences), error_candidates=len(error_sentences), rule_resolved=len(rule_resolved_sentences),
+        )
+
+        context_task = asyncio.create_task(context_task, name="Context_Feedback_Task")
+        grammar_tasks: Dict[asyncio.Task, Sentence] = {
+            asyncio.create_task(
+                self._grammar_coroutine(sentence, ticket),
+                name=f"Grammar_Feedback_Task_{sentence.sentence_id}",
+            ): sentence
+            for sentence in error_sentences
+        }
+
+        # 5. 동시 실행 후 요청 마감 시간까지 대기 (끝난 결과만 사용)
+        try:
+            results = await self._gather_until_deadline([context_task, *grammar_tasks], request_context)
+        except asyncio.CancelledError:
+            # 클라이언트 연결 종료
+            self._abandon(
+                request, user_id, sentences, rule_resolved_sentences, context_task, grammar_tasks, ticket
+            )
+            raise
+
+        # 6. 결과 분리
+        context_feedback = self._to_context_feedback(results[0])
+        grammar_feedbacks: list[GrammarFeedback | None] = results[1:]
+
+        if stage_dump_enabled(logger):
+            log_event(logger, logging.INFO, "feedback.context_result", feedback=context_feedback.feedback)
+
+        # 7. 생성한 문법 피드백을 원본 문장 데이터에 연결
+        failed_sentence_ids: Set[int] = set()
+        for sentence, result in zip(error_sentences, grammar_feedbacks):
+            self._apply_grammar_result(sentence, result, failed_sentence_ids)
+
+        # 8. 새로운 데이터 수집 이벤트 발행
+        self._publish_collect_events(error_sentences + rule_resolved_sentences, user_id)
+
         # 9. 최종 응답 데이터 정리 및 조립
         for sentence in sentences:
-            # grammar_feedback이 있고, 그 안에 feedbacks 리스트가 비어있지 않으면 오류가 있는 문장
-            if sentence.grammar_feedback and sentence.grammar_feedback.feedbacks:
-                sentence.is_error = True
-            else:
-                sentence.is_error = False
-                # is_error가 False이면 grammar_feedback을 null로 설정하여 불필요한 데이터 제외
-                sentence.grammar_feedback = None
+            self._finalize_sentence(sentence)
+
+        # 10. 다음 제출에서 재사용할 수 있도록 결과 저장 (축소 모드 결과는 저장하지 않음)
+        if not ticket.degraded:
+            await self._remember_draft(
+                request,
+                user_id,
+                sentences,
+                None if isinstance(results[0], BaseException) else context_feedback,
+                failed_sentence_ids,
+            )
 
         return FeedbackResponse(
             context_feedback=context_feedback,
             sentences=sentences,
         )
+
+    async def stream_feedback(
+        self,
+        request: FeedbackRequest,
+        user_id: str,
+        deadline_seconds: Optional[float] = None,
+        request_id: Optional[str] = None,
+    ) -> AsyncIterator[Tuple[str, Dict[str, Any]]]:
+        """
+        create_feedback의 스트리밍 버전입니다. (이벤트 이름, 데이터) 쌍을 완료되는 순서대로 내보냅니다.
+
+        - sentences: 문장 분할 결과 (가장 먼저 전송)
+        - sentence: 문장 하나의 최종 결과 (문법 교정 태스크가 끝나는 즉시)
+        - context_delta: 생성 중인 문맥 피드백 조각 (CLOVA_STREAM_CONTEXT 설정 시)
+        - context: 문맥 피드백
+        - done: 모든 작업 완료
+        """
+        request_context = self._new_request_context(user_id, deadline_seconds, request_id)
+        # yield를 사이에 두므로 span을 현재 span으로 계속 설정해 두지 않고, 하위 작업을 시작할 때만 설정
+        with bind_request_context(request_context):
+            span = start_span("feedback", mode="stream", chars=len(request.contents))
+        try:
+            try:
+                async with self.admission_controller.admit(request) as ticket:
+                    async for event in self._stream_feedback(request, user_id, ticket, request_context, span):
+                        yield event
+            finally:
+                # span을 닫기 전에 기록 (중간에 끊긴 요청도 그때까지 쓴 사용량을 남김)
+                self._report_llm_usage(request_context, span, "stream")
+        except GeneratorExit:
+            span.end("cancelled")
+            raise
+        except Exception as e:
+            span.end("error", e)
+            raise
+        finally:
+            span.end()
+
+    async def _stream_feedback(
+        self,
+        request: FeedbackRequest,
+        user_id: str,
+        ticket: AdmissionTicket,
+        request_context: RequestContext,
+        span,
+    ) -> AsyncIterator[Tuple[str, Dict[str, Any]]]:
+        # 태스크 생성 시점의 컨텍스트가 복사되므로, 첫 yield 전까지만 요청 컨텍스트와 span을 설정
+        with bind_request_context(request_context), use_span(span):
+            sentences = self._prepare_sentences(request.contents)
+            reused_context = await self._reuse_previous_draft(request, sentences, user_id)
+            rule_resolved_sentences = await self._resolve_by_particle_rules(sentences)
+            error_sentences = self._select_grammar_targets(sentences, ticket)
+
+            deltas: asyncio.Queue = asyncio.Queue()
+            if reused_context is not None:
+                context_coro = self._completed(reused_context)
+            elif settings.CLOVA_STREAM_CONTEXT:
+                context_coro = self._stream_context_feedback(request, deltas)
+            else:
+                context_coro = self.context_service.create_context_feedback(
+                    title=request.title,
+                    contents=request.contents,
+                )
+
+            context_task = asyncio.create_task(context_coro, name="Context_Feedback_Task")
+            grammar_tasks: Dict[asyncio.Task, Sentence] = {
+                asyncio.create_task(
+                    self._grammar_coroutine(sentence, ticket),
+                    name=f"Grammar_Feedback_Task_{sentence.sentence_id}",
+                ): sentence
+                for sentence in error_sentences
+            }
+
+        yield "sentences", {
+            "sentences": [
+                {
+                    "sentence_id": s.sentence_id,
+                    "original_sentence": s.original_sentence,
+                    "is_pending": s.is_error_candidate,
+                    "is_reused": s.is_reused,
+                }
+                for s in sentences
+            ]
+        }
+
+        # 오류 후보가 아닌 문장과 규칙으로 교정된 문장은 바로 확정
+        for sentence in sentences:
+            if not sentence.is_error_candidate:
+                yield "sentence", self._sentence_payload(sentence)
+
+        # 문맥 피드백 조각이 도착하면 깨어나기 위한 태스크
+        delta_task = asyncio.create_task(deltas.get(), name="Context_Delta_Task")
+        pending: Set[asyncio.Task] = {context_task, delta_task, *grammar_tasks}
+        context_feedback: Optional[ContextFeedback] = None
+        failed_sentence_ids: Set[int] = set()
+        completed = False
+        try:
+            while pending - {delta_task}:
+                done, pending = await asyncio.wait(
+                    pending,
+                    timeout=self._wait_timeout(request_context),
+                    return_when=asyncio.FIRST_COMPLETED,
+                )
+                if not done:
+                    # 마감 시간 초과: 남은 작업을 취소하고 지금까지의 결과로 마무리
+                    for task in pending:
+                        task.cancel()
+                    await asyncio.gather(*pending, return_exceptions=True)
+                    timed_out = DeadlineExceededError("마감 시간까지 끝나지 않아 취소했습니다.")
+                    if context_task in pending:
+                        yield "context", self._to_context_feedback(timed_out).model_dump()
+                    for task in pending:
+                        if task in grammar_tasks:
+                            sentence = grammar_tasks[task]
+                            self._apply_grammar_result(sentence, timed_out, failed_sentence_ids)
+                            yield "sentence", self._sentence_payload(sentence)
+                    pending = set()
+                    break
+
+                # 같은 시점에 끝났다면 조각을 문맥 피드백보다 먼저 처리
+                for task in sorted(done, key=lambda t: t is not delta_task):
+                    if task is delta_task:
+                        yield "context_delta", {"delta": task.result()}
+                        if not context_task.done():
+                            delta_task = asyncio.create_task(deltas.get(), name="Context_Delta_Task")
+                            pending.add(delta_task)
+                        continue
+
+                    if task is context_task:
+                        # 최종 context 이벤트 전에 남은 조각을 모두 전송
+                        if delta_task in pending:
+                            pending.discard(delta_task)
+                            if delta_task.done():
+                                yield "context_delta", {"delta": delta_task.result()}
+                            else:
+                                delta_task.cancel()
+                        while not deltas.empty():
+                            yield "context_delta", {"delta": deltas.get_nowait()}
+                        result = task.exception() or task.result()
+                        if not isinstance(result, BaseException):
+                            context_feedback = result
+                        yield "context", self._to_context_feedback(result).model_dump()
+                        continue
+
+                    sentence = grammar_tasks[task]
+                    self._apply_grammar_result(sentence, task.exception() or task.result(), failed_sentence_ids)
+                    yield "sentence", self._sentence_payload(sentence)
+            completed = True
+        finally:
+            delta_task.cancel()
+            if not completed:
+                # 클라이언트가 스트림을 중간에 닫으면 남은 작업은 취소하고, 끝난 결과만 반영
+                with bind_request_context(request_context), use_span(span):
+                    self._abandon(
+                        request, user_id, sentences, rule_resolved_sentences, context_task, grammar_tasks, ticket
+                    )
+
+        with bind_request_context(request_context), use_span(span):
+            self._publish_collect_events(error_sentences + rule_resolved_sentences, user_id)
+        # 동기 API와 같은 순서(수집 이벤트 발행 → 정리 → 저장)로 처리
+        for sentence in sentences:
+            self._finalize_sentence(sentence)
+        if not ticket.degraded:
+            await self._remember_draft(request, user_id, sentences, context_feedback, failed_sentence_ids)
+
+        yield "done", {"sentence_count": len(sentences)}
@@ -0,0 +1,348 @@
+import asyncio
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from typing import Callable, List, Optional, Tuple
+
+from .feedback_facade import FeedbackFacade
+from ..schemas.feedback_job import FeedbackJob, JobStatus
+from ..schemas.feedback_request import FeedbackRequest
+from ..schemas.feedback_response import FeedbackResponse
+from ..util.logger import logger
+
+
+class JobQueueFullError(Exception):
+    pass
+
+
+def process_alive(pid: int) -> bool:
+    """같은 호스트(pid 네임스페이스)에 해당 pid의 프로세스가 살아 있는지 확인합니다."""
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+class FeedbackJobStore:
+    """
+    피드백 작업의 요청·상태·결과를 SQLite 파일에 저장합니다.
+    서버가 재시작되어도 대기 중이던 작업을 다시 처리할 수 있도록 요청 본문까지 함께 보관합니다.
+    같은 파일을 쓰는 모든 워커 프로세스가 이 테이블을 대기열로 함께 쓰며, 실행 중인 작업에는 맡은 프로세스의 pid를 기록합니다.
+    """
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS feedback_jobs (
+                job_id      TEXT PRIMARY KEY,
+                user_id     TEXT NOT NULL,
+                status      TEXT NOT NULL,
+                request     TEXT NOT NULL,
+                result      TEXT,
+                error       TEXT,
+                created_at  REAL NOT NULL,
+                updated_at  REAL NOT NULL,
+                expires_at  REAL,
+                owner_pid   INTEGER
+            )
+            """
+        )
+        columns = {row[1] for row in self._conn.execute("PRAGMA table_info(feedback_jobs)")}
+        if "owner_pid" not in columns:
+            # owner_pid 추가 전에 만든 파일
+            self._conn.execute("ALTER TABLE feedback_jobs ADD COLUMN owner_pid INTEGER")
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_feedback_jobs_status ON feedback_jobs (status, created_at)")
+        # 연결 하나를 여러 스레드(to_thread)에서 쓰므로 직렬화
+        self._lock = threading.Lock()
+
+    def _execute(self, sql: str, params: Tuple = ()) -> List[sqlite3.Row]:
+        with self._lock:
+            return self._conn.execute(sql, params).fetchall()
+
+    def insert(self, job_id: str, user_id: str, request: FeedbackRequest, now: float, max_queued: int) -> bool:
+        """
+        대기 중인 작업이 max_queued개 미만일 때만 저장하고, 저장했는지를 반환합니다.
+        개수 확인과 저장을 한 문장으로 실행하므로 같은 파일을 쓰는 모든 프로세스에 한도가 함께 적용됩니다.
+        """
+        with self._lock:
+            return self._conn.execute(
+                "INSERT INTO feedback_jobs (job_id, user_id, status, request, created_at, updated_at) "
+                "SELECT ?, ?, ?, ?, ?, ? "
+                "WHERE (SELECT COUNT(*) FROM feedback_jobs WHERE status = ?) < ?",
+                (
+                    job_id, user_id, JobStatus.QUEUED.value, request.model_dump_json(), now, now,
+                    JobStatus.QUEUED.value, max_queued,
+                ),
+            ).rowcount == 1
+
+    def count_queued(self) -> int:
+        return self._execute("SELECT COUNT(*) FROM feedback_jobs WHERE status = ?", (JobStatus.QUEUED.value,))[0][0]
+
+    def claim_next(self, now: float, owner_pid: int) -> Optional[Tuple[str, str, FeedbackRequest]]:
+        """
+        가장 먼저 접수된 대기 작업 하나를 실행 중으로 바꾸고 (job_id, user_id, 요청)을 반환합니다.
+        대기 작업 선택과 상태 변경을 한 문장으로 실행하므로 여러 프로세스가 같은 작업을 가져가지 않습니다.
+        """
+        # 대기 작업이 없을 때는 쓰기 잠금을 잡지 않도록 먼저 읽기만 함
+        if not self._execute("SELECT 1 FROM feedback_jobs WHERE status = ? LIMIT 1", (JobStatus.QUEUED.value,)):
+            return None
+        rows = self._execute(
+            "UPDATE feedback_jobs SET status = ?, owner_pid = ?, updated_at = ? "
+            "WHERE job_id = (SELECT job_id FROM feedback_jobs WHERE status = ? ORDER BY created_at LIMIT 1) "
+            "RETURNING job_id, user_id, request",
+            (JobStatus.RUNNING.value, owner_pid, now, JobStatus.QUEUED.value),
+        )
+        if not rows:
+            return None
+        job_id, user_id, request = rows[0]
+        return job_id, user_id, FeedbackRequest.model_validate_json(request)
+
+    def mark_finished(
+        self,
+        job_id: str,
+        status: JobStatus,
+        now: float,
+        expires_at: float,
+        result: Optional[FeedbackResponse] = None,
+        error: Optional[str] = None,
+    ) -> None:
+        self._execute(
+            "UPDATE feedback_jobs SET status = ?, result = ?, error = ?, updated_at = ?, expires_at = ? "
+            "WHERE job_id = ?",
+            (status.value, result.model_dump_json() if result else None, error, now, expires_at, job_id),
+        )
+
+    def get(self, job_id: str, now: float) -> Optional[FeedbackJob]:
+        rows = self._execute(
+            "SELECT job_id, user_id, status, result, error, created_at, updated_at FROM feedback_jobs "
+            "WHERE job_id = ? AND (expires_at IS NULL OR expires_at > ?)",
+            (job_id, now),
+        )
+        if not rows:
+            return None
+        job_id, user_id, status, result, error, created_at, updated_at = rows[0]
+        return FeedbackJob(
+            job_id=job_id,
+            user_id=user_id,
+            status=JobStatus(status),
+            result=FeedbackResponse.model_validate_json(result) if result else None,
+            error=error,
+            created_at=created_at,
+            updated_at=updated_at,
+        )
+
+    def recover_unfinished(self) -> int:
+        """
+        재시작 전에 실행 중이던 작업을 모두 다시 대기 상태로 돌리고, 처리되지 않은 작업 수를 반환합니다.
+        살아 있는 워커가 없을 때(서버 기동 시, gunicorn 마스터의 fork 전)만 호출합니다.
+        """
+        self._execute(
+            "UPDATE feedback_jobs SET status = ?, owner_pid = NULL WHERE status = ?",
+            (JobStatus.QUEUED.value, JobStatus.RUNNING.value),
+        )
+        return self.count_queued()
+
+    def requeue_orphaned(self, is_alive: Callable[[int], bool]) -> List[str]:
+        """실행을 맡은 프로세스가 종료된(강제 종료, OOM, gunicorn timeout) 작업을 다시 대기 상태로 돌립니다."""
+        rows = self._execute(
+            "SELECT job_id, owner_pid FROM feedback_jobs WHERE status = ?", (JobStatus.RUNNING.value,)
+        )
+        requeued = []
+        for job_id, owner_pid in rows:
+            if owner_pid is not None and is_alive(owner_pid):
+                continue
+            with self._lock:
+                # 확인하는 사이에 작업이 끝났거나 다른 프로세스가 먼저 돌려놓았으면 건너뜀
+                changed = self._conn.execute(
+                    "UPDATE feedback_jobs SET status = ?, owner_pid = NULL "
+                    "WHERE job_id = ? AND status = ? AND owner_pid IS ?",
+                    (JobStatus.QUEUED.value, job_id, JobStatus.RUNNING.value, owner_pid),
+                ).rowcount
+            if changed:
+                requeued.append(job_id)
+        return requeued
+
+    def purge_expired(self, now: float) -> int:
+        with self._lock:
+            return self._conn.execute(
+                "DELETE FROM feedback_jobs WHERE expires_at IS NOT NULL AND expires_at <= ?", (now,)
+            ).rowcount
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+class FeedbackJobService:
+    """
+    피드백 생성을 비동기 작업으로 처리합니다.
+
+    - 접수한 작업은 저장소에 대기 상태로 넣고, 고정된 수의 워커가 저장소에서 가져가 파이프라인을 실행합니다.
+      여러 워커 프로세스로 실행하면 어느 프로세스가 접수했든 여유 있는 워커가 가져갑니다.
+    - 작업을 실행하던 프로세스가 종료되면, 다른 프로세스가 기동할 때와 정리 주기마다 해당 작업을 다시 대기 상태로 돌립니다.
+    - 저장소의 대기 중인 작업이 queue_size개에 이르면 JobQueueFullError로 접수를 거절합니다. (무제한으로 쌓지 않음)
+      한도는 저장소 기준이므로 여러 워커 프로세스로 실행해도 전체 대기 작업 수가 queue_size를 넘지 않습니다.
+    - 완료된 결과는 TTL 동안 저장소에 보관합니다.
+    """
+
+    def __init__(
+        self,
+        facade: FeedbackFacade,
+        store: FeedbackJobStore,
+        workers: int = 4,
+        queue_size: int = 100,
+        result_ttl: float = 3600.0,
+        deadline_seconds: Optional[float] = None,
+        purge_interval: float = 60.0,
+        poll_interval: float = 1.0,
+    ) -> None:
+        self.facade = facade
+        self.store = store
+        self.workers = workers
+        self.queue_size = queue_size
+        self.result_ttl = result_ttl
+        self.deadline_seconds = deadline_seconds
+        self.purge_interval = purge_interval
+        # 다른 프로세스가 접수하거나 다시 대기 상태로 돌린 작업을 확인하는 주기
+        self.poll_interval = poll_interval
+
+        # 이 프로세스에서 접수하면 대기 중인 워커를 바로 깨움
+        self._wakeup = asyncio.Event()
+        self._tasks: List[asyncio.Task] = []
+
+    # ------------------------------------------------------------------
+
+    # 수명 주기
+
+    async def start(self, recover: bool = True) -> None:
+        """
+        워커를 기동합니다. recover이면 재시작 전에 실행 중이던 작업을 모두 다시 대기 상태로 돌립니다.
+        (여러 워커 프로세스로 실행할 때는 마스터가 fork 전에 한 번만 복구하고, 워커는 종료된 프로세스의 작업만 되돌림)
+        """
+        if self._tasks:
+            return
+
+        if recover:
+            pending = await asyncio.to_thread(self.store.recover_unfinished)
+            if pending:
+                logger.info("재시작 전 처리되지 않은 피드백 작업 %d개를 다시 처리합니다.", pending)
+        else:
+            # 이 워커가 다시 띄워진 경우, 종료된 이전 워커가 실행하던 작업을 바로 되돌림
+            await self._requeue_orphaned()
+
+        for i in range(self.workers):
+            self._tasks.append(asyncio.create_task(self._worker(), name=f"Feedback_Job_Worker_{i}"))
+        self._tasks.append(asyncio.create_task(self._housekeeping_loop(), name="Feedback_Job_Housekeeping"))
+
+    async def stop(self) -> None:
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        # 실행 중이던 작업은 running 상태로 남고, 이 프로세스가 종료된 뒤 다른 워커나 다음 기동 시 다시 처리됨
+
+    # ------------------------------------------------------------------
+
+    # 접수 및 조회
+
+    async def submit(self, request: FeedbackRequest, user_id: str) -> str:
+        job_id = uuid.uuid4().hex
+        inserted = await asyncio.to_thread(self.store.insert, job_id, user_id, request, time.time(), self.queue_size)
+        if not inserted:
+            raise JobQueueFullError("피드백 작업 대기열이 가득 찼습니다.")
+        self._wakeup.set()
+        return job_id
+
+    async def get(self, job_id: str, user_id: str) -> Optional[FeedbackJob]:
+        job = await asyncio.to_thread(self.store.get, job_id, time.time())
+        # 다른 사용자의 작업은 존재하지 않는 것으로 취급
+        if job is None or job.user_id != user_id:
+            return None
+        return job
+
+    async def queue_depth(self) -> int:
+        """모든 워커 프로세스를 합친 대기 작업 수"""
+        return await asyncio.to_thread(self.store.count_queued)
+
+    # ------------------------------------------------------------------
+
+    # 워커
+
+    async def _next_job(self) -> Tuple[str, str, FeedbackRequest]:
+        while True:
+            # 확인한 뒤에 접수된 작업도 놓치지 않도록 저장소를 확인하기 전에 초기화
+            self._wakeup.clear()
+            claimed = await asyncio.to_thread(self.store.claim_next, time.time(), os.getpid())
+            if claimed is not None:
+                return claimed
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), self.poll_interval)
+            except asyncio.TimeoutError:
+                pass
+
+    async def _worker(self) -> None:
+        while True:
+            job_id = None
+            try:
+                job_id, user_id, request = await self._next_job()
+                await self._run(job_id, user_id, request)
+            except Exception as e:
+                logger.error("Feedback job '%s' could not be processed: %s", job_id, e, exc_info=True)
+                if job_id is None:
+                    # 저장소 오류가 이어질 때 바쁘게 재시도하지 않도록 대기
+                    await asyncio.sleep(self.poll_interval)
+
+    async def _run(self, job_id: str, user_id: str, request: FeedbackRequest) -> None:
+        try:
+            # 워커 수로 이미 동시 실행이 제한되므로 과부하 차단은 적용하지 않음
+            result = await self.facade.create_feedback(
+                request, user_id=user_id, allow_shedding=False, deadline_seconds=self.deadline_seconds,
+                request_id=job_id,
+            )
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.error("Feedback job '%s' failed: %s", job_id, e, exc_info=True)
+            now = time.time()
+            await asyncio.to_thread(
+                self.store.mark_finished, job_id, JobStatus.FAILED, now, now + self.result_ttl, None, str(e)
+            )
+            return
+
+        now = time.time()
+        await asyncio.to_thread(
+            self.store.mark_finished, job_id, JobStatus.SUCCEEDED, now, now + self.result_ttl, result
+        )
+
+    async def _requeue_orphaned(self) -> None:
+        try:
+            requeued = await asyncio.to_thread(self.store.requeue_orphaned, process_alive)
+        except Exception as e:
+            logger.warning("종료된 프로세스의 피드백 작업 확인에 실패했습니다: %s", e)
+            return
+        if requeued:
+            logger.warning("종료된 프로세스가 실행하던 피드백 작업 %d개를 다시 대기 상태로 돌립니다.", len(requeued))
+            self._wakeup.set()
+
+    async def _housekeeping_loop(self) -> None:
+        while True:
+            await asyncio.sleep(self.purge_interval)
+            await self._requeue_orphaned()
+            try:
+                purged = await asyncio.to_thread(self.store.purge_expired, time.time())
+                if purged:
+                    logger.info("만료된 피드백 작업 결과 %d개를 삭제했습니다.", purged)
+            except Exception as e:
+                logger.warning("만료된 피드백 작업 정리에 실패했습니다: %s", e)
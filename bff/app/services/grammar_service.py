@@ -1,13 +1,17 @@
+import asyncio
 import asyncpg
-import chromadb
 import json
-from sentence_transformers import SentenceTransformer
+import logging
+from dataclasses import dataclass
 from urllib.parse import urlparse
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Tuple
 from elasticsearch8 import AsyncElasticsearch
 
 from ..clients.grammar_llm_client import GrammarLLMClient
 from ..core.config import settings
+from ..embedding.client import EmbeddingClient
+from ..core.metrics import record_stage_skipped, track_stage
+from ..core.request_context import DeadlineExceededError, ensure_budget, remaining_budget
 from ..schemas.feedback_response import (
     Sentence, 
     GrammarFeedback, 
@@ -18,34 +22,51 @@ from ..schemas.feedback_response import (
 )
 from ..util.standardization import standardize_word
 from ..util.morpheme import analyze_sentence_to_words
-from ..util.logger import logger
+from ..util.logger import log_event, logger, stage_dump_enabled
+from ..util.singleflight import SingleFlight
 
 class ChromaCollectionNotFound(Exception):
     pass
 
+# 검색 결과 순위 → 점수 변환(Reciprocal Rank Fusion) 상수. ES 점수와 Chroma 거리는 척도가 달라 순위만 사용
+RRF_K = 60
+
+@dataclass
+class RetrievalConfig:
+    """오류 예문 검색 조건. 기본값은 설정(RETRIEVAL_*)이고, tools/retrieval_eval.py는 조합을 바꿔 가며 평가합니다."""
+    chroma_n_results: int
+    chroma_sim_threshold: float
+    es_max_results: int
+    es_ngram_min_should_match: str
+    es_ngram_overfetch: int
+
+    @classmethod
+    def from_settings(cls) -> "RetrievalConfig":
+        return cls(
+            chroma_n_results=settings.RETRIEVAL_CHROMA_N_RESULTS,
+            chroma_sim_threshold=settings.RETRIEVAL_CHROMA_SIM_THRESHOLD,
+            es_max_results=settings.RETRIEVAL_ES_MAX_RESULTS,
+            es_ngram_min_should_match=settings.RETRIEVAL_ES_NGRAM_MIN_SHOULD_MATCH,
+            es_ngram_overfetch=settings.RETRIEVAL_ES_NGRAM_OVERFETCH,
+        )
+
 class GrammarService:
     # 커넥션 풀을 저장할 클래스 변수
     _pool: Optional[asyncpg.Pool] = None
 
-    def __init__(self, client: GrammarLLMClient):
+    def __init__(self, client: GrammarLLMClient, retrieval: Optional[RetrievalConfig] = None):
         # LLM Client
         self.client = client
+        self.retrieval = retrieval or RetrievalConfig.from_settings()
 
-        # ChromaDB Client
-        url = settings.CHROMA_HOST
-        collection_name = settings.CHROMA_COLLECTION_NAME
-
-        parsed = urlparse(url)
-        host = parsed.hostname
-        port = parsed.port
-
-        self.chroma_client = chromadb.HttpClient(host=host, port=port)
+        # ChromaDB Client / SentenceTransformer Embedder
+        # 무거운 자원이므로 생성자에서는 만들지 않고, 앱 기동(lifespan) 시 connect_chroma / load_embedder로 적재
+        self.chroma_client = None
+        self.collection = None
+        self.embedder = None
+        # 임베딩 서버를 쓰면 워커는 모델을 적재하지 않음
+        self.embedding_client = self._create_embedding_client()
 
-        try:
-            self.collection = self.chroma_client.get_collection(name=collection_name)
-        except Exception as e:
-            raise ChromaCollectionNotFound(f"Failed to get collection '{collection_name}': {e}")
-        
         # PostgreSQL Connection Settings
         self._db_connect_kwargs = {
             "host": settings.POSTGRES_HOST,
@@ -57,14 +78,98 @@ class GrammarService:
             "max_size": 20,
         }
         
-        # SentenceTransformer Embedder
-        self.embedder = SentenceTransformer("jhgan/ko-sroberta-multitask")
+        self.es_client = self._create_es_client()
+        self.es_index = "graduation_project_data"
 
-        self.es_client = AsyncElasticsearch(
+        # 같은 문장에 대한 동시 요청은 검색·LLM 파이프라인을 한 번만 실행
+        self._inflight = SingleFlight("grammar_feedback")
+
+    @staticmethod
+    def _create_es_client() -> AsyncElasticsearch:
+        return AsyncElasticsearch(
             hosts=[settings.ELASTICSEARCH_HOST],
             request_timeout=5
         )
-        self.es_index = "graduation_project_data"
+
+    @staticmethod
+    def _create_embedding_client() -> Optional[EmbeddingClient]:
+        if not settings.EMBEDDING_SERVER_SOCKET:
+            return None
+        return EmbeddingClient(settings.EMBEDDING_SERVER_SOCKET, timeout=settings.EMBEDDING_SERVER_TIMEOUT_SECONDS)
+
+    def connect_chroma(self) -> None:
+        """ChromaDB에 접속해 검색 대상 컬렉션을 가져옵니다. (블로킹 호출이므로 스레드에서 실행)"""
+        import chromadb
+
+        url = settings.CHROMA_HOST
+        collection_name = settings.CHROMA_COLLECTION_NAME
+
+        parsed = urlparse(url)
+        chroma_client = chromadb.HttpClient(host=parsed.hostname, port=parsed.port)
+
+        try:
+            self.collection = chroma_client.get_collection(name=collection_name)
+        except Exception as e:
+            raise ChromaCollectionNotFound(f"Failed to get collection '{collection_name}': {e}")
+        self.chroma_client = chroma_client
+
+    def load_embedder(self, warm_up: bool = True) -> None:
+        """
+        임베딩 모델을 적재하고 한 번 인코딩해 첫 요청의 지연(가중치 로딩·커널 초기화)을 미리 치릅니다.
+        이미 적재되어 있으면(gunicorn 마스터에서 fork 전에 적재한 경우) 워밍업만 합니다.
+        """
+        if self.embedder is None:
+            from sentence_transformers import SentenceTransformer
+
+            self.embedder = SentenceTransformer(settings.EMBEDDING_MODEL_NAME)
+        if warm_up:
+            self.embedder.encode("임베딩 모델 준비를 위한 문장입니다.")
+
+    async def prepare_embedder(self) -> None:
+        """임베딩 서버를 쓰면 연결과 응답을 확인하고, 아니면 프로세스 안에 모델을 적재합니다."""
+        if self.embedding_client is not None:
+            await self.embedding_client.encode(["임베딩 서버 연결 확인을 위한 문장입니다."])
+        else:
+            await asyncio.to_thread(self.load_embedder)
+
+    async def _embed(self, text: str) -> List[float]:
+        if self.embedding_client is not None:
+            return (await self.embedding_client.encode([text]))[0].tolist()
+        # 프로세스 안 모델의 인코딩은 CPU를 쓰는 동기 호출이므로 스레드에서 실행
+        return (await asyncio.to_thread(self.embedder.encode, text)).tolist()
+
+    async def _query_chroma(self, query_embedding: List[float]) -> Dict[str, Any]:
+        """ChromaDB HTTP 클라이언트는 동기 호출이므로 스레드에서 실행합니다."""
+        return await asyncio.to_thread(
+            self.collection.query,
+            query_embeddings=[query_embedding],
+            n_results=self.retrieval.chroma_n_results,
+            include=['documents', 'metadatas', 'distances'],
+        )
+
+    async def _analyze_and_search_es(self, sentence: Sentence) -> List[ErrorExample]:
+        # 형태소 분석(Mecab)은 동기 호출이므로 스레드에서 실행
+        sentence.words = await asyncio.to_thread(analyze_sentence_to_words, sentence.original_sentence)
+        return await self._search_pattern_es(sentence)
+
+    def reset_connections(self) -> None:
+        """fork한 워커가 부모 프로세스의 소켓·커넥션을 함께 쓰지 않도록 네트워크 자원을 새로 만듭니다."""
+        GrammarService._pool = None
+        self.chroma_client = None
+        self.collection = None
+        self.es_client = self._create_es_client()
+        self.embedding_client = self._create_embedding_client()
+
+    async def ping_elasticsearch(self) -> None:
+        if not await self.es_client.ping():
+            raise ConnectionError(f"Elasticsearch({settings.ELASTICSEARCH_HOST})에 연결할 수 없습니다.")
+
+    async def close(self) -> None:
+        """애플리케이션 종료 시 커넥션 풀과 Elasticsearch 클라이언트를 닫습니다."""
+        await self.close_db_pool()
+        await self.es_client.close()
+        if self.embedding_client is not None:
+            await self.embedding_client.close()
 
     async def initialize_db_pool(self):
         """커넥션 풀을 초기화하는 비동기 메서드"""
@@ -79,6 +184,54 @@ class GrammarService:
             await GrammarService._pool.close()
             GrammarService._pool = None
 
+    @staticmethod
+    def _row_to_grammar_info(row) -> GrammarDBInfo:
+        """grammar_items 행을 LLM에 전달할 GrammarDBInfo로 변환합니다."""
+        parts: List[str] = []
+
+        if row.get("meaning"):
+            parts.append(f"의미: {row['meaning']}")
+        if row.get("form_info"):
+            parts.append(f"형태 정보: {row['form_info']}")
+        if row.get("constraints"):
+            parts.append(f"제약: {row['constraints']}")
+        if row.get("pos"):
+            parts.append(f"품사: {row['pos']}")
+        if row.get("topik"):
+            parts.append(f"토픽 등급: {row['topik']}")
+
+        explanation = " / ".join(parts) if parts else "설명 정보가 없습니다."
+
+        return GrammarDBInfo(
+            grammar_element=row["headword"],
+            explanation=explanation,
+        )
+
+    async def fetch_grammar_items_by_headword(self, headwords: List[str]) -> Dict[str, GrammarDBInfo]:
+        """
+        표제어가 정확히 일치하는 문법 항목을 조회합니다.
+        trigram 유사도 검색과 달리 한두 글자짜리 조사 표제어도 다른 항목과 섞이지 않습니다.
+        """
+        targets = sorted({h.strip() for h in headwords if h and h.strip()})
+        if not targets:
+            return {}
+
+        if GrammarService._pool is None:
+            await self.initialize_db_pool()
+
+        async with GrammarService._pool.acquire() as conn:
+            rows = await conn.fetch(
+                """
+                SELECT DISTINCT ON (headword) headword, pos, topik, meaning, form_info, constraints
+                FROM grammar_items
+                WHERE headword = ANY($1::text[])
+                ORDER BY headword, id;
+                """,
+                targets,
+            )
+
+        return {row["headword"]: self._row_to_grammar_info(row) for row in rows}
+
     async def _search_grammar_db(self, corrected_errors: List[str]) -> List[GrammarDBInfo]:
         """
         PostgreSQL 커넥션 풀을 사용하여 문법 DB를 비동기적으로 검색합니다.
@@ -106,7 +259,7 @@ class GrammarService:
                 await self.initialize_db_pool()
             
         except Exception as e:
-            print(f"PostgreSQL Pool initialization failed: {e}")
+            logger.error("PostgreSQL Pool initialization failed: %s", e)
             return []
 
         # 풀에서 커넥션을 대여하여 사용
@@ -128,129 +281,113 @@ class GrammarService:
                         
                         if not row:
                             continue
-                    
-                        parts: List[str] = []
-
-                        if row.get("meaning"):
-                            parts.append(f"의미: {row['meaning']}")
-                        if row.get("form_info"):
-                            parts.append(f"형태 정보: {row['form_info']}")
-                        if row.get("constraints"):
-                            parts.append(f"제약: {row['constraints']}")
-                        if row.get("pos"):
-                            parts.append(f"품사: {row['pos']}")
-                        if row.get("topik"):
-                            parts.append(f"토픽 등급: {row['topik']}")
-
-                        explanation = " / ".join(parts) if parts else "설명 정보가 없습니다."
-
-                        grammar_info_list.append(
-                            GrammarDBInfo(
-                                grammar_element=row["headword"],
-                                explanation=explanation,
-                            )
-                        )
+
+                        grammar_info_list.append(self._row_to_grammar_info(row))
         except Exception as e:
-            print(f"PostgreSQL query execution failed: {e}")
+            logger.error("PostgreSQL query execution failed: %s", e)
             return []
 
         return grammar_info_list
     
-    async def _search_pattern_es(self, sentence: Sentence, max_results: int = 5) -> List[ErrorExample]:
+    async def _search_pattern_es(self, sentence: Sentence, max_results: Optional[int] = None) -> List[ErrorExample]:
         """
         Elasticsearch에서 문법 패턴(normalized_tags) 유사도가 높은 문장을 검색해
         ErrorExample 리스트로 반환한다.
         sentence.words는 코퍼스의 words와 동일 구조라고 가정.
         """
+        if max_results is None:
+            max_results = self.retrieval.es_max_results
+
         words = getattr(sentence, "words", None)
         if not words:
-            logger.warning(f"Sentence에 words 정보가 없어 ES 패턴 검색을 건너뜁니다. sentence={sentence.original_sentence}")
+            logger.warning("Sentence에 words 정보가 없어 ES 패턴 검색을 건너뜁니다. sentence=%s", sentence.original_sentence)
             return []
 
         # 1) 검색용 정규화 쿼리 생성 (인덱싱 때와 동일한 규칙)
-        standardized_parts = [standardize_word(w) for w in words]
-        normalized_query = " ".join(p for p in standardized_parts if p)
+        normalized_query = self._normalized_query(words)
 
         if not normalized_query:
-            logger.warning(f"정규화 쿼리가 비어 있어 ES 패턴 검색을 건너뜁니다. sentence={sentence.original_sentence}")
+            logger.warning("정규화 쿼리가 비어 있어 ES 패턴 검색을 건너뜁니다. sentence=%s", sentence.original_sentence)
             return []
-        
-        found_ids: set[str] = set()
-        hits_all: List[Dict[str, Any]] = []
 
         # -----------------------
         # 1단계: normalized_tags match
         # -----------------------
-        query_exact = {
-            "match": {
-                "normalized_tags": {
-                    "query": normalized_query,
-                }
-            }
-        }
-
         try:
             resp_exact = await self.es_client.search(
                 index=self.es_index,
-                query=query_exact,
+                query=self._es_exact_query(normalized_query),
                 size=max_results,
             )
         except Exception as e:
-            logger.error(f"ES 1차 패턴 검색 실패: {e}")
+            logger.error("ES 1차 패턴 검색 실패: %s", e)
             return []
 
         first_hits = resp_exact.get("hits", {}).get("hits", []) or []
-        for h in first_hits:
-            if len(hits_all) >= max_results:
-                break
-            hits_all.append(h)
-            found_ids.add(h["_id"])
 
         # -----------------------
         # 2단계: normalized_tags.ngram 보정
         # -----------------------
-        needed = max_results - len(hits_all)
+        needed = max_results - min(len(first_hits), max_results)
+        ngram_hits: List[Dict[str, Any]] = []
 
         if needed > 0:
-            query_ngram = {
-                "match": {
-                    "normalized_tags.ngram": {
-                        "query": normalized_query,
-                        "minimum_should_match": "50%",
-                    }
-                }
-            }
-
             try:
                 resp_ngram = await self.es_client.search(
                     index=self.es_index,
-                    query=query_ngram,
-                    size=needed * 3,  # 중복 제거 고려해서 넉넉히
+                    query=self._es_ngram_query(normalized_query, self.retrieval.es_ngram_min_should_match),
+                    size=needed * self.retrieval.es_ngram_overfetch,  # 중복 제거 고려해서 넉넉히
                 )
+                ngram_hits = resp_ngram.get("hits", {}).get("hits", []) or []
             except Exception as e:
-                logger.error(f"ES 2차(N-gram) 패턴 검색 실패: {e}")
-                resp_ngram = {}
-
-            ngram_hits = resp_ngram.get("hits", {}).get("hits", []) or []
-            added = 0
-            for h in ngram_hits:
-                if added >= needed:
-                    break
-                if h["_id"] in found_ids:
-                    continue
-                hits_all.append(h)
-                found_ids.add(h["_id"])
-                added += 1
+                logger.error("ES 2차(N-gram) 패턴 검색 실패: %s", e)
 
         # -----------------------
-        # 최종 hits_all → ErrorExample 변환
+        # 최종 hits → ErrorExample 변환
         # -----------------------
-        if not hits_all:
-            return []
+        return self._es_hits_to_examples(self._merge_es_hits(first_hits, ngram_hits, max_results))
+
+    @staticmethod
+    def _normalized_query(words: List[Dict[str, Any]]) -> str:
+        standardized_parts = [standardize_word(w) for w in words]
+        return " ".join(p for p in standardized_parts if p)
+
+    @staticmethod
+    def _es_exact_query(normalized_query: str) -> Dict[str, Any]:
+        return {"match": {"normalized_tags": {"query": normalized_query}}}
+
+    @staticmethod
+    def _es_ngram_query(normalized_query: str, minimum_should_match: str) -> Dict[str, Any]:
+        return {
+            "match": {
+                "normalized_tags.ngram": {
+                    "query": normalized_query,
+                    "minimum_should_match": minimum_should_match,
+                }
+            }
+        }
+
+    @staticmethod
+    def _merge_es_hits(
+        first_hits: List[Dict[str, Any]], ngram_hits: List[Dict[str, Any]], max_results: int
+    ) -> List[Dict[str, Any]]:
+        """1차 결과를 앞에 두고, 모자란 만큼 n-gram 결과 중 처음 보는 문서로 채웁니다."""
+        hits_all = list(first_hits[:max_results])
+        found_ids = {h["_id"] for h in hits_all}
+        for h in ngram_hits:
+            if len(hits_all) >= max_results:
+                break
+            if h["_id"] in found_ids:
+                continue
+            hits_all.append(h)
+            found_ids.add(h["_id"])
+        return hits_all
 
+    @staticmethod
+    def _es_hits_to_examples(hits: List[Dict[str, Any]]) -> List[ErrorExample]:
         error_examples: List[ErrorExample] = []
 
-        for hit in hits_all:
+        for hit in hits:
             src = hit.get("_source", {}) or {}
             original_text = src.get("original_text")
             metadata = src.get("metadata", {}) or {}
@@ -262,7 +399,7 @@ class GrammarService:
                 try:
                     error_words_data = json.loads(error_words_raw)
                 except json.JSONDecodeError:
-                    logger.warning(f"ES error_words JSON 파싱 실패: {error_words_raw}")
+                    logger.warning("ES error_words JSON 파싱 실패: %s", error_words_raw)
             elif isinstance(error_words_raw, list):
                 error_words_data = error_words_raw
 
@@ -280,26 +417,11 @@ class GrammarService:
                 )
             )
 
-        return error_examples
-        
-    async def attach_grammar_feedback(self, sentence: Sentence) -> GrammarFeedback:
-        logger.info(f"\n\n===== 피드백 생성 시작: '{sentence.original_sentence}' =====")
-        # ------------------------------
-        # 1. ChromaDB 쿼리
-        # ------------------------------
-        try:
-            query_embedding = self.embedder.encode(sentence.original_sentence).tolist()
-            n_results = 5
-
-            results = self.collection.query(
-                query_embeddings=[query_embedding],
-                n_results=n_results,
-                include=['documents', 'metadatas', 'distances']
-            )
-        except Exception as e:
-            logger.error(f"ChromaDB query failed for '{sentence.original_sentence}': {e}")
-            results = {"documents": [[]], "metadatas": [[]], "distances": [[]]}
+        return GrammarService._rank_scored(error_examples)
 
+    @staticmethod
+    def _chroma_results_to_examples(results: Dict[str, Any]) -> Tuple[List[ErrorExample], Optional[float]]:
+        """Chroma query 결과를 ErrorExample 리스트와 최고 유사도(1 - 거리)로 변환합니다."""
         chroma_examples: List[ErrorExample] = []
         documents = results.get("documents", [[]])[0]
         metadatas = results.get("metadatas", [[]])[0]
@@ -322,45 +444,134 @@ class GrammarService:
                         )
                     )
                 except Exception as e:
-                    logger.error(f"Error processing ChromaDB result metadata for doc '{doc}': {e}")
+                    logger.error("Error processing ChromaDB result metadata for doc '%s': %s", doc, e)
+
+        return GrammarService._rank_scored(chroma_examples), best_similarity
+
+    @staticmethod
+    def _rank_scored(examples: List[ErrorExample]) -> List[ErrorExample]:
+        """검색 결과 순서대로 1 / (RRF_K + 순위) 점수를 매깁니다. (프롬프트에 넣을 예문을 고를 때 사용)"""
+        for rank, example in enumerate(examples, start=1):
+            example.score = 1.0 / (RRF_K + rank)
+        return examples
+
+    @staticmethod
+    def _needs_es_examples(examples: List[ErrorExample], best_similarity: Optional[float], threshold: float) -> bool:
+        """Chroma 결과가 없거나 가장 가까운 예문도 유사도가 기준 미만이면 ES 패턴 검색 결과를 추가합니다."""
+        return not examples or (best_similarity is not None and best_similarity < threshold)
+
+    @staticmethod
+    def _merge_examples(examples: List[ErrorExample], extra: List[ErrorExample]) -> List[ErrorExample]:
+        """extra를 뒤에 붙입니다. 이미 있는 문장이면 붙이지 않고 점수를 더합니다. (양쪽 검색에 모두 나온 예문이 앞순위)"""
+        merged = list(examples)
+        by_sentence = {ex.original_sentence: ex for ex in merged}
+        for ex in extra:
+            existing = by_sentence.get(ex.original_sentence)
+            if existing is None:
+                merged.append(ex)
+                by_sentence[ex.original_sentence] = ex
+            elif ex.score is not None:
+                existing.score = (existing.score or 0.0) + ex.score
+        return merged
+
+    @staticmethod
+    def _sentence_key(sentence: Sentence) -> str:
+        return " ".join(sentence.original_sentence.split())
 
-        log_msg = [f"--- 1. ChromaDB 검색 결과 (Best Sim: {best_similarity:.4f}) ---"]
-        if chroma_examples:
-            for ex in chroma_examples:
-                log_msg.append(f"  - {ex.original_sentence}")
-        else:
-            log_msg.append("  - 결과 없음")
-        logger.info("\n".join(log_msg))
+    async def attach_grammar_feedback(self, sentence: Sentence) -> GrammarFeedback:
+        feedback = await self._inflight.do(
+            self._sentence_key(sentence),
+            lambda: self._attach_grammar_feedback(sentence),
+        )
+        # 합쳐진 호출끼리 같은 객체를 공유하지 않도록 복사본을 반환
+        return feedback.model_copy(deep=True)
+
+    @staticmethod
+    def _retrieval_budget(llm_calls_left: int) -> Optional[float]:
+        """남은 LLM 호출에 필요한 시간을 빼고 검색 단계에 쓸 수 있는 시간. 마감 시각이 없으면 None"""
+        remaining = remaining_budget()
+        if remaining is None:
+            return None
+        return remaining - settings.DEADLINE_MIN_LLM_SECONDS * llm_calls_left
+
+    @staticmethod
+    def _has_retrieval_budget(budget: Optional[float]) -> bool:
+        return budget is None or budget >= settings.DEADLINE_MIN_RETRIEVAL_SECONDS
+
+    async def _attach_grammar_feedback(self, sentence: Sentence) -> GrammarFeedback:
+        # 1차 LLM 호출조차 할 수 없다면 검색도 하지 않음
+        ensure_budget("grammar", settings.DEADLINE_MIN_LLM_SECONDS)
+
+        # 단계별 상세 로그는 샘플링된 요청에서만 (문장마다 검색 결과·LLM 출력을 포맷하지 않도록)
+        dump = stage_dump_enabled(logger)
+        if dump:
+            log_event(logger, logging.INFO, "grammar.start", sentence=sentence.original_sentence)
+        # ------------------------------
+        # 1. ChromaDB 쿼리
+        # ------------------------------
+        # 스레드에서 실행 중인 호출은 중단할 수 없으므로, 마감 시간이 되면 기다리기를 멈추고 다음 단계로 진행
+        try:
+            chroma_budget = self._retrieval_budget(llm_calls_left=2)
+            if not self._has_retrieval_budget(chroma_budget):
+                raise DeadlineExceededError("남은 시간이 부족하여 ChromaDB 검색을 건너뜁니다.")
+            if (self.embedder is None and self.embedding_client is None) or self.collection is None:
+                # 기동 중이거나 적재에 실패한 경우 Elasticsearch 검색만으로 진행
+                raise RuntimeError("임베딩 모델 또는 ChromaDB 컬렉션이 아직 준비되지 않았습니다.")
+            with track_stage("embedding"):
+                query_embedding = await asyncio.wait_for(self._embed(sentence.original_sentence), chroma_budget)
+            with track_stage("chroma_query"):
+                results = await asyncio.wait_for(
+                    self._query_chroma(query_embedding), self._retrieval_budget(llm_calls_left=2)
+                )
+        except DeadlineExceededError as e:
+            record_stage_skipped("chroma_query")
+            logger.warning(str(e))
+            results = {"documents": [[]], "metadatas": [[]], "distances": [[]]}
+        except asyncio.TimeoutError:
+            logger.warning("요청 마감 시간에 맞추기 위해 임베딩·ChromaDB 검색을 중단합니다.")
+            results = {"documents": [[]], "metadatas": [[]], "distances": [[]]}
+        except Exception as e:
+            logger.error("ChromaDB query failed for '%s': %s", sentence.original_sentence, e)
+            results = {"documents": [[]], "metadatas": [[]], "distances": [[]]}
+
+        chroma_examples, best_similarity = self._chroma_results_to_examples(results)
+
+        if dump:
+            log_event(
+                logger, logging.INFO, "grammar.chroma_results",
+                best_similarity=None if best_similarity is None else round(best_similarity, 4),
+                examples=[ex.original_sentence for ex in chroma_examples],
+            )
 
         error_examples = chroma_examples
 
         # --------------------------
         # 1-2. 유사도가 낮으면 ES 문법 패턴 검색 결과 추가
         # --------------------------
-        CHROMA_SIM_THRESHOLD = 0.60
-        need_es_examples = not error_examples or (best_similarity is not None and best_similarity < CHROMA_SIM_THRESHOLD)
+        need_es_examples = self._needs_es_examples(error_examples, best_similarity, self.retrieval.chroma_sim_threshold)
 
-        if need_es_examples:
-            logger.info(f"Chroma similarity가 낮거나 결과가 부족하여 ES 패턴 검색을 추가로 수행합니다.")
+        es_budget = self._retrieval_budget(llm_calls_left=2)
+        if need_es_examples and not self._has_retrieval_budget(es_budget):
+            record_stage_skipped("es_query")
+            logger.warning("남은 시간이 부족하여 ES 패턴 검색을 건너뜁니다.")
+        elif need_es_examples:
             try:
-                sentence.words = analyze_sentence_to_words(sentence.original_sentence)
-                es_examples = await self._search_pattern_es(sentence, max_results=5)
+                with track_stage("es_query"):
+                    es_examples = await asyncio.wait_for(
+                        self._analyze_and_search_es(sentence), es_budget
+                    )
                 
-                log_msg = [f"--- 2. ES 패턴 검색 결과 ---"]
-                if es_examples:
-                    for ex in es_examples:
-                        log_msg.append(f"  - {ex.original_sentence}")
-                else:
-                    log_msg.append("  - 결과 없음")
-                logger.info("\n".join(log_msg))
-
-                existing_sentences = {ex.original_sentence for ex in error_examples}
-                for es_ex in es_examples:
-                    if es_ex.original_sentence not in existing_sentences:
-                        error_examples.append(es_ex)
-                        existing_sentences.add(es_ex.original_sentence)
+                if dump:
+                    log_event(
+                        logger, logging.INFO, "grammar.es_results",
+                        examples=[ex.original_sentence for ex in es_examples],
+                    )
+
+                error_examples = self._merge_examples(error_examples, es_examples)
+            except asyncio.TimeoutError:
+                logger.warning("요청 마감 시간에 맞추기 위해 ES 패턴 검색을 중단합니다.")
             except Exception as e:
-                logger.error(f"ES 패턴 검색 중 오류: {e}")
+                logger.error("ES 패턴 검색 중 오류: %s", e)
 
         # 2. 1차 LLM 호출 
         first_llm_input = {
@@ -369,36 +580,46 @@ class GrammarService:
         }
 
         try:
-            correction_result_data: Dict[str, Any] = await self.client.get_corrected_sentence(first_llm_input)
+            with track_stage("llm_correction"):
+                correction_result_data: Dict[str, Any] = await self.client.get_corrected_sentence(first_llm_input)
             correction_result = CorrectionOutput(**correction_result_data)
         except Exception as e:
-            logger.error(f"1st LLM call failed for '{sentence.original_sentence}'. Error: {e}", exc_info=True)
+            logger.error("1st LLM call failed for '%s'. Error: %s", sentence.original_sentence, e, exc_info=True)
             raise
 
-        log_msg = [f"--- 3. 1차 LLM 교정 결과 ---"]
-        log_msg.append(f"  - is_error: {correction_result.is_error}")
-        log_msg.append(f"  - Corrected: '{correction_result.corrected_sentence}'")
-        log_msg.append(f"  - Errors: {correction_result.errors}")
-        logger.info("\n".join(log_msg))
+        if dump:
+            log_event(
+                logger, logging.INFO, "grammar.correction",
+                is_error=correction_result.is_error,
+                corrected=correction_result.corrected_sentence,
+                errors=list(correction_result.errors),
+            )
 
         if not correction_result.is_error:
-            logger.info("오류 없음으로 판단, 피드백 생성 절차를 중단합니다.")
             return GrammarFeedback(corrected_sentence=sentence.original_sentence, feedbacks=[])
 
         corrected_sentence = correction_result.corrected_sentence
         corrected_errors = correction_result.errors
 
         # 3. 문법 정보 DB 쿼리
-        logger.info(f"--- 4. 문법 DB 검색 ---\n  - 검색 요소: {corrected_errors}")
-        grammar_db_info_list: List[GrammarDBInfo] = await self._search_grammar_db(corrected_errors)
-        
-        log_msg = [f"--- 5. 문법 DB 검색 결과 ---"]
-        if grammar_db_info_list:
-            for info in grammar_db_info_list:
-                log_msg.append(f"  - Element: {info.grammar_element}, Explanation: {info.explanation[:50]}...")
+        grammar_db_info_list: List[GrammarDBInfo] = []
+        db_budget = self._retrieval_budget(llm_calls_left=1)
+        if not self._has_retrieval_budget(db_budget):
+            record_stage_skipped("grammar_db")
+            logger.warning("남은 시간이 부족하여 문법 DB 검색을 건너뜁니다.")
         else:
-            log_msg.append("  - 결과 없음")
-        logger.info("\n".join(log_msg))
+            try:
+                with track_stage("grammar_db"):
+                    grammar_db_info_list = await asyncio.wait_for(self._search_grammar_db(corrected_errors), db_budget)
+            except asyncio.TimeoutError:
+                logger.warning("요청 마감 시간에 맞추기 위해 문법 DB 검색을 중단합니다.")
+        
+        if dump:
+            log_event(
+                logger, logging.INFO, "grammar.db_results",
+                queried=list(corrected_errors),
+                elements=[info.grammar_element for info in grammar_db_info_list],
+            )
 
         # 4. 2차 LLM 호출
         second_llm_input = {
@@ -408,11 +629,13 @@ class GrammarService:
         }
 
         try:
-            final_feedback_data: Dict[str, Any] = await self.client.get_grammar_feedback(second_llm_input)
+            with track_stage("llm_feedback"):
+                final_feedback_data: Dict[str, Any] = await self.client.get_grammar_feedback(second_llm_input)
             final_feedback = GrammarFeedback(**final_feedback_data)
         except Exception as e:
-            logger.error(f"2nd LLM call failed for '{sentence.original_sentence}'. Error: {e}", exc_info=True)
+            logger.error("2nd LLM call failed for '%s'. Error: %s", sentence.original_sentence, e, exc_info=True)
             raise
-        
-        logger.info(f"===== 피드백 생성 종료: '{sentence.original_sentence}' =====\n")
+
+        if dump:
+            log_event(logger, logging.INFO, "grammar.done", feedbacks=len(final_feedback.feedbacks))
         return final_feedback
\ No newline at end of file
@@ -0,0 +1,200 @@
+import asyncio
+import re
+from dataclasses import dataclass
+from typing import Dict, FrozenSet, List, Optional, Set, Tuple
+
+from ..schemas.feedback_response import FeedbackDetail, GrammarFeedback, GrammarDBInfo
+from ..util.morpheme import analyze_sentence_in_context
+from ..util.standardization import has_final_consonant, has_final_rieul
+from ..util.logger import logger
+
+
+@dataclass(frozen=True)
+class ParticleRule:
+    """받침 유무에 따라 형태가 바뀌는 조사(이형태) 한 쌍에 대한 규칙"""
+    name: str
+    pos_tags: FrozenSet[str]
+    after_consonant: str  # 받침 있는 말 뒤
+    after_vowel: str      # 받침 없는 말 뒤
+    headwords: Tuple[str, ...]  # grammar_items 조회용 표제어 후보
+    rieul_as_vowel: bool = False  # 'ㄹ' 받침을 받침 없는 말처럼 취급 (으로/로)
+
+    def expected_form(self, preceding_morph: str) -> str:
+        if self.rieul_as_vowel and has_final_rieul(preceding_morph):
+            return self.after_vowel
+        return self.after_consonant if has_final_consonant(preceding_morph) else self.after_vowel
+
+
+PARTICLE_RULES: List[ParticleRule] = [
+    ParticleRule("object", frozenset({"JKO"}), "을", "를", ("을/를", "을", "를")),
+    ParticleRule("subject", frozenset({"JKS", "JKC"}), "이", "가", ("이/가", "이", "가")),
+    ParticleRule("topic", frozenset({"JX"}), "은", "는", ("은/는", "은", "는")),
+    ParticleRule("conjunctive", frozenset({"JKB", "JC"}), "과", "와", ("와/과", "과", "와")),
+    ParticleRule("adverbial", frozenset({"JKB"}), "으로", "로", ("으로/로", "으로", "로"), rieul_as_vowel=True),
+]
+
+# 조사 앞에 올 수 있는 체언류 태그 (명사, 대명사, 수사, 명사 파생 접미사, 명사형 전성 어미)
+NOMINAL_TAGS: Set[str] = {"NNG", "NNP", "NNB", "NR", "NP", "XSN", "ETN"}
+
+
+@dataclass
+class ParticleCorrection:
+    word_index: int
+    original_word: str
+    corrected_word: str
+    rule: ParticleRule
+    wrong_particle: str
+    right_particle: str
+
+
+class ParticleRuleService:
+    """
+    Mecab 형태소 분석 결과만으로 조사 이형태(을/를, 이/가, 은/는, 와/과, 으로/로) 오류를 검출하고 교정하는 규칙 엔진입니다.
+    검색(Chroma, ES)이나 LLM 호출 없이 결정적으로 동작합니다.
+    """
+
+    def __init__(self, grammar_service=None, rules: Optional[List[ParticleRule]] = None):
+        # 규칙별 설명을 grammar_items에서 가져오기 위해 GrammarService의 커넥션 풀을 재사용
+        self.grammar_service = grammar_service
+        self.rules = rules or PARTICLE_RULES
+        self._reasons: Dict[str, GrammarDBInfo] = {}
+        self._reasons_loaded = False
+        self._reasons_lock = asyncio.Lock()
+
+    # ------------------------------------------------------------------
+
+    # 오류 검출 및 교정
+
+    def _match_rule(self, morph: str, pos: str) -> Optional[ParticleRule]:
+        for rule in self.rules:
+            if pos in rule.pos_tags and morph in (rule.after_consonant, rule.after_vowel):
+                return rule
+        return None
+
+    def check(self, sentence: str) -> List[ParticleCorrection]:
+        """문장에서 조사 이형태 오류를 찾아 교정 목록을 반환합니다."""
+        corrections: List[ParticleCorrection] = []
+        eojeols = sentence.split()
+        words = analyze_sentence_in_context(sentence)
+
+        for word_index, (eojeol, word) in enumerate(zip(eojeols, words)):
+            morphs = word.get("morphs", [])
+
+            for prev, curr in zip(morphs, morphs[1:]):
+                prev_morph, prev_pos = prev["morph"], prev["pos"]
+                particle, particle_pos = curr["morph"], curr["pos"]
+
+                if prev_pos not in NOMINAL_TAGS:
+                    continue
+                # 숫자, 로마자 등 한글 음절로 끝나지 않는 말은 읽는 방식에 따라 달라지므로 판단하지 않음
+                if not ("가" <= prev_morph[-1:] <= "힣"):
+                    continue
+
+                rule = self._match_rule(particle, particle_pos)
+                if rule is None:
+                    continue
+
+                expected = rule.expected_form(prev_morph)
+                if particle == expected:
+                    continue
+
+                # 표면형이 형태소와 일치하는 경우에만 교정 (불확실하면 건드리지 않음)
+                target = prev_morph + particle
+                pos_in_word = eojeol.find(target)
+                if pos_in_word < 0:
+                    continue
+
+                end = pos_in_word + len(target)
+                corrections.append(
+                    ParticleCorrection(
+                        word_index=word_index,
+                        original_word=eojeol[:end],
+                        corrected_word=eojeol[:pos_in_word] + prev_morph + expected,
+                        rule=rule,
+                        wrong_particle=particle,
+                        right_particle=expected,
+                    )
+                )
+                # 한 어절에는 조사 이형태 오류가 하나만 있다고 보고 다음 어절로 이동
+                break
+
+        return corrections
+
+    @staticmethod
+    def apply(sentence: str, corrections: List[ParticleCorrection]) -> str:
+        """교정 목록을 원문에 적용합니다. 원문의 공백은 그대로 유지합니다."""
+        by_index = {c.word_index: c for c in corrections}
+        pieces: List[str] = []
+        last = 0
+
+        for word_index, match in enumerate(re.finditer(r"\S+", sentence)):
+            pieces.append(sentence[last:match.start()])
+            eojeol = match.group()
+            correction = by_index.get(word_index)
+            if correction is not None:
+                eojeol = correction.corrected_word + eojeol[len(correction.original_word):]
+            pieces.append(eojeol)
+            last = match.end()
+
+        pieces.append(sentence[last:])
+        return "".join(pieces)
+
+    # ------------------------------------------------------------------
+
+    # 피드백 생성
+
+    async def _ensure_reasons(self) -> None:
+        """규칙별 설명을 grammar_items에서 한 번만 읽어 캐시합니다."""
+        if self._reasons_loaded or self.grammar_service is None:
+            return
+
+        async with self._reasons_lock:
+            if self._reasons_loaded:
+                return
+
+            headwords = [h for rule in self.rules for h in rule.headwords]
+            try:
+                self._reasons = await self.grammar_service.fetch_grammar_items_by_headword(headwords)
+                self._reasons_loaded = True
+            except Exception as e:
+                # DB를 사용할 수 없으면 기본 설명만 사용하고, 다음 요청에서 다시 시도
+                logger.warning("조사 규칙 설명을 grammar_items에서 불러오지 못했습니다: %s", e)
+
+    def _reason_for(self, correction: ParticleCorrection) -> str:
+        rule = correction.rule
+        noun = correction.corrected_word[: -len(correction.right_particle)]
+        last_char = noun[-1:]
+
+        if rule.rieul_as_vowel and has_final_rieul(last_char):
+            basis = f"'{last_char}'처럼 'ㄹ' 받침으로 끝나는 말 뒤에는"
+        elif has_final_consonant(last_char):
+            basis = f"'{last_char}'처럼 받침이 있는 말 뒤에는"
+        else:
+            basis = f"'{last_char}'처럼 받침이 없는 말 뒤에는"
+
+        reason = (
+            f"조사 '{rule.after_consonant}/{rule.after_vowel}'의 형태는 앞말의 받침 유무에 따라 달라집니다. "
+            f"{basis} '{correction.right_particle}' 형태를 씁니다."
+        )
+
+        for headword in rule.headwords:
+            info = self._reasons.get(headword)
+            if info is not None:
+                return f"{reason}\n({info.grammar_element}) {info.explanation}"
+
+        return reason
+
+    async def build_feedback(self, sentence: str, corrections: List[ParticleCorrection]) -> GrammarFeedback:
+        """규칙 교정 결과만으로 완전한 GrammarFeedback을 생성합니다."""
+        await self._ensure_reasons()
+
+        return GrammarFeedback(
+            corrected_sentence=self.apply(sentence, corrections),
+            feedbacks=[
+                FeedbackDetail(
+                    corrects=f"{c.original_word} -> {c.corrected_word}",
+                    reason=self._reason_for(c),
+                )
+                for c in corrections
+            ],
+        )
@@ -1,13 +1,12 @@
 import enum
 from typing import List
+from ..core.metrics import track_stage
 from ..schemas.feedback_response import Sentence
-from konlpy.tag import Mecab
-import kss
+from ..util.morpheme import mecab_pos
 
 class SentenceService:
 
     def __init__(self, error_threshold: float = 4.0):
-        self.mecab = Mecab()
         self.ERROR_THRESHOLD = error_threshold
 
     def _calculate_error_score(self, sentence: str) -> float:
@@ -15,7 +14,7 @@ class SentenceService:
 
         # 1. 분석 실패 시 최고 가중치 10.0 부여 및 계산 중단
         try:
-            tokens = self.mecab.pos(sentence)
+            tokens = mecab_pos(sentence)
         except Exception:
             return self.ERROR_THRESHOLD + 10.0
         
@@ -52,9 +51,18 @@ class SentenceService:
         return max(0.0, score)
 
 
+    def warm_up(self) -> None:
+        """형태소 분석기와 문장 분리기를 미리 적재해 첫 요청에서 초기화 비용을 치르지 않도록 합니다."""
+        self._calculate_error_score("형태소 분석기 준비를 위한 문장입니다.")
+        self.split_into_sentences("문장 분리기를 준비합니다. 두 번째 문장입니다.")
+
     def split_into_sentences(self, contents: str) -> list[Sentence]:
+        # kss는 가져오는 데만 수 초가 걸리므로 처음 사용할 때 가져옴 (앱 기동 시 warm_up에서 미리 호출)
+        import kss
+
         # 형태소 분석기 기반 문장 분리
-        sentence_list = kss.split_sentences(contents)
+        with track_stage("kss_split"):
+            sentence_list = kss.split_sentences(contents)
 
         sentences = []
         for idx, sent_text in enumerate(sentence_list):
@@ -67,13 +75,15 @@ class SentenceService:
 
         return sentences
     
+    def is_error_candidate(self, sentence: str) -> bool:
+        with track_stage("mecab_score"):
+            return self._calculate_error_score(sentence) >= self.ERROR_THRESHOLD
+
     def tag_error_sentences_by_konlpy(self, sentences: list[Sentence]) -> list[Sentence]:
         # 순회하며 오류 의심이 되면 contains_error를 true로 만들기
 
         for sent in sentences:
-            score = self._calculate_error_score(sent.original_sentence)
-            
-            if score >= self.ERROR_THRESHOLD:
+            if self.is_error_candidate(sent.original_sentence):
                 sent.is_error_candidate = True
          
         return sentences
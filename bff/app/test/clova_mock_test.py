@@ -0,0 +1,136 @@
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+import httpx
+
+from ..llm.clova_client import ClovaStudioClient, ClovaStudioError
+from ..llm.llm_stage import LlmStage
+from ..llm.rate_limiter import PriorityRateLimiter
+from ..core.request_context import RequestContext, bind_request_context, track_llm_usage
+from ..schemas.feedback_response import CorrectionOutput
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2] / "tools"))
+
+from clova_mock import ClovaMock, MockOptions, MockServerThread  # noqa: E402
+
+
+"""
+Clova Studio 모의 서버 테스트
+- ClovaStudioClient를 모의 서버(tools/clova_mock.py)에 연결해, 정상 응답·429 재시도·5xx·깨진 JSON·스트리밍 오류를
+  실제 클라이언트 코드가 기대한 대로 처리하는지 확인합니다.
+- 같은 seed에서는 요청 순서와 관계없이 같은 프롬프트에 같은 장애가 나는지(결정성) 확인합니다.
+- 응답(스트리밍은 result 이벤트)의 usage가 요청과 사용량 범위에 단계별로 집계되는지 확인합니다.
+"""
+
+SCRIPT = [
+    {"match": "정상 문장", "content": {"is_error": True, "corrected_sentence": "학교에 갔다.", "errors": ["에"]}},
+    {"match": "재시도 문장", "responses": [
+        {"status": 429, "retry_after": 1},
+        {"content": {"is_error": False, "corrected_sentence": "재시도 문장", "errors": []}},
+    ]},
+    {"match": "서버 오류 문장", "status": 503},
+    {"match": "깨진 문장", "malformed": True},
+    {"match": "스트림 오류", "stream_error": True},
+]
+
+
+def _client(url: str) -> ClovaStudioClient:
+    return ClovaStudioClient(api_key="test", url=url, limiter=PriorityRateLimiter(max_rate=6000, period=60.0, burst=100))
+
+
+def _messages(text: str):
+    return [{"role": "user", "content": text}]
+
+
+async def _expect_error(coro, error_type) -> bool:
+    try:
+        await coro
+    except error_type:
+        return True
+    except Exception:
+        return False
+    return False
+
+
+async def _collect(client: ClovaStudioClient, text: str) -> str:
+    return "".join([token async for token in client.chat_stream(_messages(text), stage=LlmStage.CONTEXT)])
+
+
+async def _run_cases(url: str, mock: ClovaMock):
+    client = _client(url)
+    results = []
+
+    output = await client.chat_structred(_messages("정상 문장"), CorrectionOutput)
+    results.append(("구조화 응답", output.corrected_sentence == "학교에 갔다." and output.errors == ["에"], output.corrected_sentence))
+
+    started = time.perf_counter()
+    output = await client.chat_structred(_messages("재시도 문장"), CorrectionOutput)
+    elapsed = time.perf_counter() - started
+    results.append(("429 후 재시도", output.corrected_sentence == "재시도 문장" and elapsed >= 0.9, f"{elapsed:.2f}초 (Retry-After 1초)"))
+
+    ok = await _expect_error(client.chat_structred(_messages("서버 오류 문장"), CorrectionOutput), httpx.HTTPStatusError)
+    results.append(("5xx 전파", ok, "HTTPStatusError"))
+
+    ok = await _expect_error(client.chat_structred(_messages("깨진 문장"), CorrectionOutput), ClovaStudioError)
+    results.append(("깨진 JSON", ok, "ClovaStudioError"))
+
+    text = await _collect(client, "스트리밍 정상")
+    results.append(("스트리밍", len(text) > 0, f"{len(text)}자"))
+
+    ok = await _expect_error(_collect(client, "스트림 오류"), ClovaStudioError)
+    results.append(("스트리밍 오류 이벤트", ok, "ClovaStudioError"))
+
+    context = RequestContext(user_id="usage")
+    with bind_request_context(context):
+        with track_llm_usage() as scoped:
+            await client.chat_structred(_messages("사용량 문장"), CorrectionOutput)
+        await _collect(client, "사용량 스트리밍")
+    correction, streamed = context.llm_usage.get("correction"), context.llm_usage.get("context")
+    results.append((
+        "토큰 사용량 집계",
+        correction is not None and correction.calls == 1 and correction.prompt_tokens > 0
+        and streamed is not None and streamed.calls == 1 and streamed.completion_tokens > 0
+        and list(scoped) == ["correction"],
+        f"correction={correction.total_tokens if correction else None}, context={streamed.total_tokens if streamed else None}",
+    ))
+
+    stats = mock.stats
+    results.append((
+        "요청 기록",
+        stats["scripted"] == 5 and stats["stream_error"] == 1 and stats["ok"] == 3,
+        f"scripted={stats['scripted']}, stream_error={stats['stream_error']}, ok={stats['ok']}",
+    ))
+    return results
+
+
+def _outcomes(order):
+    mock = ClovaMock(MockOptions(rate_limit_ratio=0.3, server_error_ratio=0.2, seed=7))
+    payloads = {i: {"messages": _messages(f"문장 {i}")} for i in order}
+    return {i: mock.plan(payloads[i]).outcome for i in order}
+
+
+def run_test():
+    print("\n" + "=" * 70)
+    print("| Clova Studio 모의 서버 테스트 |")
+    print("=" * 70)
+
+    with MockServerThread(MockOptions(latency="fixed:10", token_latency="fixed:1", script=SCRIPT)) as server:
+        results = asyncio.run(_run_cases(server.url, server.mock))
+
+    forward = _outcomes(list(range(50)))
+    backward = _outcomes(list(reversed(range(50))))
+    faults = sum(1 for outcome in forward.values() if outcome != "ok")
+    results.append(("결정성", forward == backward and 0 < faults < 50, f"순서를 바꿔도 같은 장애 {faults}/50건"))
+
+    for name, ok, detail in results:
+        status = "✅" if ok else "❌"
+        print(f"| {name: <18} | {detail: <36} | {status} |")
+
+    print("=" * 70 + "\n")
+    return all(ok for _, ok, _ in results)
+
+
+if __name__ == "__main__":
+    raise SystemExit(0 if run_test() else 1)
@@ -0,0 +1,145 @@
+import asyncio
+import os
+import tempfile
+
+from ..schemas.feedback_request import FeedbackRequest
+from ..schemas.feedback_response import ContextFeedback, FeedbackDetail, GrammarFeedback
+from ..services.draft_store import DraftSentence, DraftSnapshot, RedisDraftStore, SqliteDraftStore
+from ..services.feedback_facade import FeedbackFacade
+from .feedback_collect_event_test import FakeContextService, FakeGrammarService, FakePublisher, FakeSentenceService
+from .rate_limit_backend_test import FakeRedisServer
+
+
+"""
+재제출 결과 저장소 테스트
+- 워커 두 개가 같은 SQLite 파일을 쓸 때, 한 워커에서 저장한 결과를 다른 워커에서 읽어 재사용하는지 확인합니다.
+- 보관 인원(max_users)과 보관 기간(ttl)을 넘은 결과가 사라지는지 확인합니다.
+- Redis 백엔드는 로컬에서 띄운 가짜 RESP 서버를 대상으로 동작합니다. (실제 Redis 불필요)
+- 응답을 받기 전에 취소된 GET이 있어도, 다음 GET이 다른 사용자의 결과가 아닌 자기 키의 결과를 받는지 확인합니다.
+"""
+
+CONTENTS = "학교을 갔어요. 날씨가 좋아요."
+
+
+def _snapshot() -> DraftSnapshot:
+    feedback = GrammarFeedback(
+        corrected_sentence="학교에 갔어요.",
+        feedbacks=[FeedbackDetail(corrects="을->에", reason="방향을 나타낼 때는 '에'를 씁니다.")],
+    )
+    return DraftSnapshot(
+        title="제목",
+        sentences={
+            "a": DraftSentence(grammar_feedback=feedback, length=8),
+            "b": DraftSentence(grammar_feedback=None, length=7),
+        },
+        context_feedback=ContextFeedback(feedback="좋아요."),
+    )
+
+
+async def _shared_file(path: str):
+    worker_a, worker_b = SqliteDraftStore(path), SqliteDraftStore(path)
+    await worker_a.put("user", _snapshot())
+    loaded = await worker_b.get("user")
+    await worker_a.close()
+    await worker_b.close()
+    return loaded
+
+
+async def _limits(path: str):
+    store = SqliteDraftStore(path, max_users=2)
+    for user_id in ("u1", "u2", "u3"):
+        await store.put(user_id, _snapshot())
+    evicted = [await store.get(user_id) is None for user_id in ("u1", "u2", "u3")]
+    store.ttl = 0
+    expired = await store.get("u3") is None
+    await store.close()
+    return evicted, expired
+
+
+async def _redis():
+    server = FakeRedisServer()
+    port = await server.start()
+    worker_a = RedisDraftStore(f"redis://127.0.0.1:{port}/0")
+    worker_b = RedisDraftStore(f"redis://127.0.0.1:{port}/0")
+    await worker_a.put("user", _snapshot())
+    loaded = await worker_b.get("user")
+    missing = await worker_b.get("other")
+    await worker_a.close()
+    await worker_b.close()
+    await server.stop()
+    return loaded, missing
+
+
+async def _redis_cancelled_get():
+    server = FakeRedisServer()
+    port = await server.start()
+    store = RedisDraftStore(f"redis://127.0.0.1:{port}/0")
+    for user_id in ("slow", "alice"):
+        snapshot = _snapshot()
+        snapshot.title = user_id
+        await store.put(user_id, snapshot)
+    server.slow_keys[b"draft:slow"] = 0.2
+
+    # 요청 태스크가 GET을 보낸 뒤 응답을 받기 전에 취소됨 (클라이언트 연결 끊김, 마감 시간)
+    task = asyncio.create_task(store.get("slow"))
+    await asyncio.sleep(0.05)
+    task.cancel()
+    await asyncio.gather(task, return_exceptions=True)
+
+    loaded = await store.get("alice")
+    await asyncio.sleep(0.2)
+    await store.close()
+    await server.stop()
+    return loaded.title if loaded else None
+
+
+async def _resubmit_to_other_worker(path: str):
+    def facade() -> FeedbackFacade:
+        return FeedbackFacade(
+            context_service=FakeContextService(),
+            grammar_service=FakeGrammarService(),
+            sentence_service=FakeSentenceService(),
+            collect_event_publisher=FakePublisher(),
+            draft_store=SqliteDraftStore(path),
+        )
+
+    request = FeedbackRequest(title="제목", contents=CONTENTS)
+    await facade().create_feedback(request, user_id="user")
+    response = await facade().create_feedback(request, user_id="user")
+    return [s.is_reused for s in response.sentences], response.context_feedback.is_reused
+
+
+def run_test():
+    print("\n" + "=" * 70)
+    print("| 재제출 결과 저장소 테스트 |")
+    print("=" * 70)
+
+    results = []
+    expected = _snapshot()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        loaded = asyncio.run(_shared_file(os.path.join(tmp, "shared.db")))
+        results.append(("워커 간 공유(file)", loaded == expected, f"문장 {len(loaded.sentences) if loaded else 0}개"))
+
+        evicted, expired = asyncio.run(_limits(os.path.join(tmp, "limits.db")))
+        results.append(("보관 인원·기간", evicted == [True, False, False] and expired, f"제거={evicted}, 만료={expired}"))
+
+        reused, context_reused = asyncio.run(_resubmit_to_other_worker(os.path.join(tmp, "facade.db")))
+        results.append(("다른 워커 재제출", all(reused) and context_reused, f"재사용={reused}"))
+
+    loaded, missing = asyncio.run(_redis())
+    results.append(("워커 간 공유(redis)", loaded == expected and missing is None, f"없는 키={missing}"))
+
+    title = asyncio.run(_redis_cancelled_get())
+    results.append(("취소된 GET 이후(redis)", title == "alice", f"alice 조회 결과={title}"))
+
+    for name, ok, detail in results:
+        status = "✅" if ok else "❌"
+        print(f"| {name: <18} | {detail: <36} | {status} |")
+
+    print("=" * 70 + "\n")
+    return all(ok for _, ok, _ in results)
+
+
+if __name__ == "__main__":
+    raise SystemExit(0 if run_test() else 1)
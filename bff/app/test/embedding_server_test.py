@@ -0,0 +1,120 @@
+import asyncio
+import hashlib
+import os
+import tempfile
+import time
+
+import numpy as np
+
+from ..embedding.client import EmbeddingClient, EmbeddingServerError
+from ..embedding.server import EmbeddingServer
+
+
+"""
+임베딩 서버 테스트
+- 실제 모델 대신 문장 해시로 벡터를 만드는 가짜 모델을 쓰며, 로컬 유닉스 소켓에서만 동작합니다.
+- 여러 워커(클라이언트 연결)의 동시 요청이 하나의 배치로 묶이는지, 응답이 요청한 문장과 정확히 대응하는지 확인합니다.
+"""
+
+DIM = 8
+WORKERS = 4
+REQUESTS_PER_WORKER = 25
+FAIL_TEXT = "__fail__"
+
+
+class FakeModel:
+    """배치 크기를 기록하고, 배치마다 일정 시간 걸리는 가짜 SentenceTransformer"""
+
+    def __init__(self, latency: float = 0.005):
+        self.latency = latency
+        self.batch_sizes: list[int] = []
+
+    @staticmethod
+    def vector(text: str) -> np.ndarray:
+        digest = hashlib.sha256(text.encode("utf-8")).digest()
+        return np.frombuffer(digest[:DIM * 4], dtype=np.uint32).astype(np.float32) / 2**32
+
+    def encode(self, texts, batch_size=32, convert_to_numpy=True):
+        if FAIL_TEXT in texts:
+            raise ValueError("인코딩 실패 테스트")
+        self.batch_sizes.append(len(texts))
+        time.sleep(self.latency)
+        return np.stack([self.vector(t) for t in texts])
+
+
+async def _worker(client: EmbeddingClient, worker_id: int) -> int:
+    mismatches = 0
+
+    async def one(i: int) -> None:
+        nonlocal mismatches
+        texts = [f"워커 {worker_id}의 {i}번째 문장", f"워커 {worker_id}의 {i}번째 두 번째 문장"]
+        result = await client.encode(texts)
+        expected = np.stack([FakeModel.vector(t) for t in texts])
+        if result.shape != expected.shape or not np.array_equal(result, expected):
+            mismatches += 1
+
+    await asyncio.gather(*(one(i) for i in range(REQUESTS_PER_WORKER)))
+    return mismatches
+
+
+async def _run_cases() -> list[tuple[str, bool, str]]:
+    socket_path = os.path.join(tempfile.mkdtemp(), "embedding.sock")
+    model = FakeModel()
+    server = EmbeddingServer(model, socket_path, max_batch_size=32, max_wait_ms=2.0)
+    await server.start()
+    clients = [EmbeddingClient(socket_path, timeout=5.0) for _ in range(WORKERS)]
+    results = []
+    try:
+        mismatches = sum(await asyncio.gather(*(_worker(c, w) for w, c in enumerate(clients))))
+        total = WORKERS * REQUESTS_PER_WORKER
+        results.append(("응답-요청 대응", mismatches == 0, f"{total}건 중 불일치 {mismatches}건"))
+
+        merged = max(model.batch_sizes) > 2
+        results.append((
+            "워커 간 동적 배치",
+            merged,
+            f"배치 {len(model.batch_sizes)}회, 최대 {max(model.batch_sizes)}문장",
+        ))
+
+        vectors = await clients[0].encode(["복사 없이 받은 벡터"])
+        zero_copy = vectors.dtype == np.float32 and not vectors.flags.owndata
+        results.append(("float32 버퍼 그대로 사용", zero_copy, f"dtype={vectors.dtype}, owndata={vectors.flags.owndata}"))
+
+        try:
+            await clients[1].encode([FAIL_TEXT])
+            failed = False
+        except EmbeddingServerError:
+            failed = True
+        recovered = (await clients[1].encode(["실패 이후 요청"])).shape == (1, DIM)
+        results.append(("인코딩 오류 전달", failed and recovered, f"오류 전달={failed}, 이후 요청 정상={recovered}"))
+    finally:
+        for client in clients:
+            await client.close()
+        await server.stop()
+
+    down = EmbeddingClient(socket_path, timeout=1.0)
+    try:
+        await down.encode(["서버 없음"])
+        unavailable = False
+    except EmbeddingServerError:
+        unavailable = True
+    results.append(("서버 중지 시 오류", unavailable, "EmbeddingServerError 발생" if unavailable else "오류 없음"))
+    return results
+
+
+def run_test():
+    print("\n" + "=" * 70)
+    print(f"| 임베딩 서버 테스트 (워커 {WORKERS}개 × 요청 {REQUESTS_PER_WORKER}건) |")
+    print("=" * 70)
+
+    results = asyncio.run(_run_cases())
+    for name, ok, detail in results:
+        status = "✅" if ok else "❌"
+        print(f"| {name: <16} | {detail: <40} | {status} |")
+
+    print("=" * 70 + "\n")
+    return all(ok for _, ok, _ in results)
+
+
+if __name__ == "__main__":
+    raise SystemExit(0 if run_test() else 1)
@@ -0,0 +1,124 @@
+import asyncio
+import threading
+from typing import List
+
+from ..schemas.feedback_request import FeedbackRequest
+from ..schemas.feedback_response import ContextFeedback, FeedbackDetail, GrammarFeedback, Sentence
+from ..services.feedback_facade import FeedbackFacade
+
+
+"""
+수집 이벤트 발행 테스트
+- 같은 글을 동기 API(create_feedback)와 스트리밍 API(stream_feedback)로 처리했을 때 같은 수집 이벤트가 발행되는지 확인합니다.
+- LLM이 오류가 없다고 교정한 문장도 두 경로 모두에서 수집 이벤트에 포함되고, 응답에서는 grammar_feedback이 빠지는지 확인합니다.
+- 검색·LLM·Kafka 대신 가짜 서비스를 사용합니다.
+"""
+
+CONTENTS = "학교을 갔어요. 학교에 갔어요. 날씨가 좋아요."
+CANDIDATES = {"학교을 갔어요.", "학교에 갔어요."}
+FEEDBACKS = {
+    "학교을 갔어요.": GrammarFeedback(
+        corrected_sentence="학교에 갔어요.",
+        feedbacks=[FeedbackDetail(corrects="을->에", reason="방향을 나타낼 때는 '에'를 씁니다.")],
+    ),
+    # 오류 후보였지만 LLM이 오류가 없다고 판단한 문장
+    "학교에 갔어요.": GrammarFeedback(corrected_sentence="학교에 갔어요.", feedbacks=[]),
+}
+
+
+class FakeSentenceService:
+    def split_into_sentences(self, contents: str) -> List[Sentence]:
+        texts = [t.strip() + "." for t in contents.split(".") if t.strip()]
+        return [Sentence(sentence_id=i, original_sentence=t) for i, t in enumerate(texts)]
+
+    def tag_error_sentences_by_konlpy(self, sentences: List[Sentence]) -> List[Sentence]:
+        for sentence in sentences:
+            sentence.is_error_candidate = sentence.original_sentence in CANDIDATES
+        return sentences
+
+
+class FakeGrammarService:
+    async def attach_grammar_feedback(self, sentence: Sentence) -> GrammarFeedback:
+        await asyncio.sleep(0.01)
+        return FEEDBACKS[sentence.original_sentence].model_copy(deep=True)
+
+
+class FakeContextService:
+    async def create_context_feedback(self, title: str, contents: str) -> ContextFeedback:
+        return ContextFeedback(feedback="좋아요.")
+
+    async def stream_context_feedback(self, title: str, contents: str):
+        for token in ("좋", "아요."):
+            yield token
+
+
+class FakePublisher:
+    def __init__(self) -> None:
+        self.events = []
+        self.published = threading.Event()
+
+    def publish_safe(self, events) -> None:
+        self.events.extend(events)
+        self.published.set()
+
+
+def _facade(publisher: FakePublisher) -> FeedbackFacade:
+    return FeedbackFacade(
+        context_service=FakeContextService(),
+        grammar_service=FakeGrammarService(),
+        sentence_service=FakeSentenceService(),
+        collect_event_publisher=publisher,
+    )
+
+
+async def _wait_published(publisher: FakePublisher) -> list:
+    # 수집 이벤트는 별도 스레드에서 발행되므로 잠시 대기
+    await asyncio.to_thread(publisher.published.wait, 2.0)
+    return sorted((e.sentence_id, e.corrected_text, len(e.feedbacks)) for e in publisher.events)
+
+
+async def _run_sync():
+    publisher = FakePublisher()
+    response = await _facade(publisher).create_feedback(FeedbackRequest(title="제목", contents=CONTENTS), user_id="sync")
+    sentences = {s.sentence_id: s.model_dump() for s in response.sentences}
+    return await _wait_published(publisher), sentences
+
+
+async def _run_stream():
+    publisher = FakePublisher()
+    sentences = {}
+    async for name, data in _facade(publisher).stream_feedback(FeedbackRequest(title="제목", contents=CONTENTS), user_id="stream"):
+        if name == "sentence":
+            sentences[data["sentence_id"]] = data
+    return await _wait_published(publisher), sentences
+
+
+def run_test():
+    print("\n" + "=" * 70)
+    print("| 수집 이벤트 발행 테스트 (동기 / 스트리밍) |")
+    print("=" * 70)
+
+    sync_events, sync_sentences = asyncio.run(_run_sync())
+    stream_events, stream_sentences = asyncio.run(_run_stream())
+
+    results = [
+        ("동기 API 이벤트", [e[0] for e in sync_events] == [0, 1], f"{sync_events}"),
+        ("스트리밍 API 이벤트", stream_events == sync_events, f"{stream_events}"),
+        ("응답 문장", stream_sentences == sync_sentences, f"{len(stream_sentences)}문장 일치"),
+        (
+            "오류 없음 문장 응답",
+            stream_sentences[1]["grammar_feedback"] is None and not stream_sentences[1]["is_error"],
+            "grammar_feedback=None",
+        ),
+    ]
+
+    for name, ok, detail in results:
+        status = "✅" if ok else "❌"
+        print(f"| {name: <18} | {detail: <36} | {status} |")
+
+    print("=" * 70 + "\n")
+    return all(ok for _, ok, _ in results)
+
+
+if __name__ == "__main__":
+    raise SystemExit(0 if run_test() else 1)
@@ -0,0 +1,130 @@
+import asyncio
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+from ..schemas.feedback_job import JobStatus
+from ..schemas.feedback_request import FeedbackRequest
+from ..schemas.feedback_response import ContextFeedback, FeedbackResponse
+from ..services.feedback_job_service import FeedbackJobService, FeedbackJobStore, JobQueueFullError, process_alive
+
+
+"""
+비동기 피드백 작업 테스트
+- 워커 프로세스 두 개가 같은 작업 저장소를 쓸 때, 대기열 한도(queue_size)가 프로세스별이 아니라 전체에 적용되는지 확인합니다.
+- 한 프로세스에서 접수한 작업을 다른 프로세스의 워커가 가져가 처리하는지 확인합니다.
+- 작업을 실행하던 프로세스가 종료되면 그 작업만 다시 대기 상태로 돌아가 처리되는지 확인합니다. (살아 있는 프로세스의 작업은 그대로)
+"""
+
+QUEUE_SIZE = 3
+SUBMISSIONS = 5
+
+
+class FakeFacade:
+    async def create_feedback(self, request: FeedbackRequest, user_id: str, **kwargs) -> FeedbackResponse:
+        return FeedbackResponse(context_feedback=ContextFeedback(feedback="좋아요."), sentences=[])
+
+
+def _service(path: str, facade=None) -> FeedbackJobService:
+    # start()를 호출하지 않으면 워커 태스크가 없으므로 접수한 작업은 대기 상태로 남음
+    return FeedbackJobService(facade=facade, store=FeedbackJobStore(path), queue_size=QUEUE_SIZE, poll_interval=0.05)
+
+
+def _dead_pid() -> int:
+    proc = subprocess.Popen([sys.executable, "-c", "pass"])
+    proc.wait()
+    return proc.pid
+
+
+async def _wait_status(service: FeedbackJobService, job_id: str, status: JobStatus, timeout: float = 2.0):
+    deadline = time.monotonic() + timeout
+    while True:
+        job = await service.get(job_id, user_id="user")
+        if job.status == status or time.monotonic() > deadline:
+            return job.status
+        await asyncio.sleep(0.02)
+
+
+async def _submit_to_two_workers(path: str):
+    workers = [_service(path), _service(path)]
+    request = FeedbackRequest(title="제목", contents="학교을 갔어요.")
+    accepted = rejected = 0
+    for i in range(SUBMISSIONS):
+        try:
+            await workers[i % 2].submit(request, user_id="user")
+            accepted += 1
+        except JobQueueFullError:
+            rejected += 1
+    depth = await workers[1].queue_depth()
+    for worker in workers:
+        worker.store.close()
+    return accepted, rejected, depth
+
+
+async def _processed_by_other_worker(path: str):
+    receiver, worker = _service(path), _service(path, FakeFacade())
+    await worker.start(recover=False)
+    job_id = await receiver.submit(FeedbackRequest(title="제목", contents="학교을 갔어요."), user_id="user")
+    status = await _wait_status(receiver, job_id, JobStatus.SUCCEEDED)
+    await worker.stop()
+    receiver.store.close()
+    worker.store.close()
+    return status
+
+
+async def _requeue_orphaned(path: str):
+    store = FeedbackJobStore(path)
+    request = FeedbackRequest(title="제목", contents="학교을 갔어요.")
+    for job_id in ("killed", "alive"):
+        store.insert(job_id, "user", request, time.time(), QUEUE_SIZE)
+    store.claim_next(time.time(), _dead_pid())
+    store.claim_next(time.time(), os.getpid())
+    store.close()
+
+    # 새로 뜬 워커가 기동할 때 종료된 프로세스의 작업을 되돌려 처리
+    worker = _service(path, FakeFacade())
+    await worker.start(recover=False)
+    killed = await _wait_status(worker, "killed", JobStatus.SUCCEEDED)
+    alive = (await worker.get("alive", user_id="user")).status
+    await worker.stop()
+    worker.store.close()
+    return killed, alive, process_alive(os.getpid())
+
+
+def run_test():
+    print("\n" + "=" * 70)
+    print("| 비동기 피드백 작업 테스트 |")
+    print("=" * 70)
+
+    results = []
+
+    with tempfile.TemporaryDirectory() as tmp:
+        accepted, rejected, depth = asyncio.run(_submit_to_two_workers(os.path.join(tmp, "jobs.db")))
+        results.append((
+            "전체 대기열 한도",
+            accepted == QUEUE_SIZE and rejected == SUBMISSIONS - QUEUE_SIZE and depth == QUEUE_SIZE,
+            f"접수 {accepted}, 거절 {rejected}, 대기 {depth}",
+        ))
+
+        status = asyncio.run(_processed_by_other_worker(os.path.join(tmp, "shared.db")))
+        results.append(("다른 워커가 처리", status == JobStatus.SUCCEEDED, status.value))
+
+        killed, alive, self_alive = asyncio.run(_requeue_orphaned(os.path.join(tmp, "orphan.db")))
+        results.append((
+            "종료된 워커의 작업",
+            killed == JobStatus.SUCCEEDED and alive == JobStatus.RUNNING and self_alive,
+            f"종료={killed.value}, 실행 중={alive.value}",
+        ))
+
+    for name, ok, detail in results:
+        status = "✅" if ok else "❌"
+        print(f"| {name: <18} | {detail: <36} | {status} |")
+
+    print("=" * 70 + "\n")
+    return all(ok for _, ok, _ in results)
+
+
+if __name__ == "__main__":
+    raise SystemExit(0 if run_test() else 1)
@@ -0,0 +1,74 @@
+import asyncio
+import time
+
+from ..core.loop_monitor import EventLoopMonitor
+from ..core.metrics import track_stage
+
+
+"""
+이벤트 루프 감시 테스트
+- 동기 sleep으로 루프를 막는 단계(가짜 encode)를 실행해, 지연이 기록되고 차단이 그 단계 이름·스택과 함께 감지되는지 확인합니다.
+- 같은 작업을 스레드로 옮기면(asyncio.to_thread) 차단이 감지되지 않는지 확인합니다. (블로킹 호출 수정 검증 방법)
+"""
+
+INTERVAL = 0.01
+THRESHOLD = 0.05
+BLOCK_SECONDS = 0.2
+
+
+def fake_encode() -> None:
+    time.sleep(BLOCK_SECONDS)
+
+
+async def blocking_stage() -> None:
+    with track_stage("embedding"):
+        fake_encode()
+
+
+async def offloaded_stage() -> None:
+    with track_stage("embedding"):
+        await asyncio.to_thread(fake_encode)
+
+
+async def _measure(stage_coro) -> EventLoopMonitor:
+    monitor = EventLoopMonitor(interval=INTERVAL, block_threshold=THRESHOLD)
+    monitor.start()
+    try:
+        await asyncio.sleep(INTERVAL * 3)
+        await asyncio.create_task(stage_coro(), name="Grammar_Feedback_Task_0")
+        await asyncio.sleep(INTERVAL * 3)
+    finally:
+        await monitor.stop()
+    return monitor
+
+
+def run_test():
+    print("\n" + "=" * 70)
+    print(f"| 이벤트 루프 감시 테스트 (루프 차단 {BLOCK_SECONDS * 1000:.0f}ms, 임계값 {THRESHOLD * 1000:.0f}ms) |")
+    print("=" * 70)
+
+    blocked = asyncio.run(_measure(blocking_stage))
+    offloaded = asyncio.run(_measure(offloaded_stage))
+
+    block = blocked.recent_blocks[0] if blocked.recent_blocks else {}
+    results = [
+        ("지연 기록", blocked.max_lag >= BLOCK_SECONDS * 0.8, f"최대 지연 {blocked.max_lag * 1000:.0f}ms"),
+        ("차단 단계 식별", block.get("stage") == "embedding", f"stage={block.get('stage')}, task={block.get('task')}"),
+        ("차단 스택 수집", "fake_encode" in block.get("stack", ""), "스택에 fake_encode 포함 여부"),
+        (
+            "스레드로 옮긴 뒤",
+            not offloaded.recent_blocks and offloaded.max_lag < THRESHOLD,
+            f"차단 {len(offloaded.recent_blocks)}건, 최대 지연 {offloaded.max_lag * 1000:.0f}ms",
+        ),
+    ]
+
+    for name, ok, detail in results:
+        status = "✅" if ok else "❌"
+        print(f"| {name: <14} | {detail: <42} | {status} |")
+
+    print("=" * 70 + "\n")
+    return all(ok for _, ok, _ in results)
+
+
+if __name__ == "__main__":
+    raise SystemExit(0 if run_test() else 1)
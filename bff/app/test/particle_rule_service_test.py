@@ -0,0 +1,141 @@
+import json
+import os
+import time
+from pathlib import Path
+
+from ..services.particle_rule_service import ParticleRuleService
+
+
+"""
+조사 이형태 규칙 엔진 정밀도(precision) 테스트
+- 올바른 문장은 하나도 교정하지 않아야 합니다.
+- 말뭉치(processed_corpus.jsonl)가 있으면 error_words의 교정을 적용한 '정답 문장'으로도 검증합니다.
+"""
+
+CORPUS_PATH = Path(
+    os.getenv(
+        "CORPUS_PATH",
+        Path(__file__).resolve().parents[3] / "data" / "processed" / "processed_corpus.jsonl",
+    )
+)
+CORPUS_LIMIT = int(os.getenv("CORPUS_LIMIT", "5000"))
+
+# 교정되면 안 되는 올바른 문장
+CORRECT_SENTENCES = [
+    "나는 친구와 함께 비빔밥을 먹었다.",
+    "오늘 아침에 나는 늦게 일어나서 기분이 별로였다.",
+    "그래서 학교에 빨리 가려고 밥을 먹는 것을 포기했다.",
+    "점심시간에 친구를 만나서 같이 밥을 먹었다.",
+    "오후에 나는 도서관에 가서 공부를 하려고 했다.",
+    "하지만 머리가 아파서 집에 그냥 가기로 했다.",
+    "집에서 드라마를 봤는데 재미있었다.",
+    "서울로 이사한 지 벌써 삼 년이 되었다.",
+    "연필로 이름을 쓰고 볼펜으로 답을 적었다.",
+    "사과와 배는 가을에 나는 과일이다.",
+    "책과 공책을 가방에 넣었다.",
+    "동생은 학생이 아니고 회사원이다.",
+    "우리 가족은 주말마다 공원에 산책을 간다.",
+    "선생님께서 숙제를 많이 내 주셨다.",
+    "친구들은 한국 음식을 아주 좋아한다.",
+    "저는 내년에 대학원에 가려고 합니다.",
+    "이 문제는 생각보다 어렵지 않았다.",
+    "지하철로 출근하는 사람이 많다.",
+    "TV를 보면서 저녁을 먹었다.",
+    "3층으로 올라가면 교실이 있어요.",
+]
+
+# 반드시 교정되어야 하는 문장 (원문, 기대 교정문)
+WRONG_SENTENCES = [
+    ("나는 친구을 만났다.", "나는 친구를 만났다."),
+    ("책를 읽었다.", "책을 읽었다."),
+    ("학교으로 갔다.", "학교로 갔다."),
+    ("연필으로 썼다.", "연필로 썼다."),
+    ("집로 돌아왔다.", "집으로 돌아왔다."),
+    ("사과과 배를 샀다.", "사과와 배를 샀다."),
+    ("동생는 학생이다.", "동생은 학생이다."),
+]
+
+
+def _load_corpus_sentences(path: Path, limit: int) -> list[str]:
+    """error_words의 '오류 -> 교정'을 원문에 적용해 올바른 문장을 복원합니다."""
+    if not path.exists():
+        return []
+
+    sentences: list[str] = []
+    with path.open(encoding="utf-8") as f:
+        for line in f:
+            if len(sentences) >= limit:
+                break
+            line = line.strip()
+            if not line:
+                continue
+            record = json.loads(line)
+            sentence = record.get("original_sentence")
+            if not sentence:
+                continue
+
+            error_words = record.get("error_words") or []
+            if isinstance(error_words, str):
+                error_words = json.loads(error_words)
+
+            ok = True
+            for ew in error_words:
+                text = ew.get("text", "") if isinstance(ew, dict) else ""
+                if "->" not in text:
+                    ok = False
+                    break
+                wrong, right = (part.strip() for part in text.split("->", 1))
+                if not wrong or wrong not in sentence:
+                    ok = False
+                    break
+                sentence = sentence.replace(wrong, right, 1)
+
+            if ok:
+                sentences.append(sentence)
+
+    return sentences
+
+
+def run_test():
+    service = ParticleRuleService()
+
+    print("\n" + "=" * 70)
+    print("| ParticleRuleService 정밀도 테스트 |")
+    print("=" * 70)
+
+    corpus_sentences = _load_corpus_sentences(CORPUS_PATH, CORPUS_LIMIT)
+    print(f"말뭉치 문장: {len(corpus_sentences)}개 ({CORPUS_PATH})")
+
+    # 1. 정밀도: 올바른 문장에서 교정이 발생하면 오탐
+    start = time.perf_counter()
+    false_positives = []
+    correct_inputs = CORRECT_SENTENCES + corpus_sentences
+    for sentence in correct_inputs:
+        corrections = service.check(sentence)
+        if corrections:
+            false_positives.append((sentence, corrections))
+    elapsed = time.perf_counter() - start
+
+    print(f"올바른 문장 {len(correct_inputs)}개 검사 ({elapsed:.4f}초)")
+    for sentence, corrections in false_positives:
+        details = ", ".join(f"{c.original_word} -> {c.corrected_word}" for c in corrections)
+        print(f"  ❌ 오탐: {sentence} [{details}]")
+
+    # 2. 재현율: 알려진 조사 이형태 오류는 기대한 문장으로 교정
+    misses = []
+    for sentence, expected in WRONG_SENTENCES:
+        corrected = service.apply(sentence, service.check(sentence))
+        status = "✅" if corrected == expected else "❌"
+        print(f"  {status} {sentence} -> {corrected}")
+        if corrected != expected:
+            misses.append(sentence)
+
+    print("-" * 70)
+    print(f"오탐: {len(false_positives)}개, 미교정: {len(misses)}개")
+    print("=" * 70 + "\n")
+
+    return not false_positives and not misses
+
+
+if __name__ == "__main__":
+    raise SystemExit(0 if run_test() else 1)
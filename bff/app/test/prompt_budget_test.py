@@ -0,0 +1,106 @@
+from ..clients.grammar_llm_client import GrammarLLMClient
+from ..llm.prompt_budget import PromptBudget, truncate_text
+from ..services.grammar_service import GrammarService
+from ..schemas.feedback_response import ErrorExample
+
+
+"""
+프롬프트 토큰 예산 테스트
+- 예문이 검색 점수순으로 정렬되고, 거의 같은 예문이 빠지고, 최대 개수·토큰 예산 안으로 줄어드는지 확인합니다.
+- 예산이 아무리 작아도 가장 관련 있는 예문 하나는 남는지, 문법 정보의 중복 요소·긴 설명이 정리되는지 확인합니다.
+- ES/Chroma 결과를 합칠 때 양쪽에 모두 나온 예문이 앞순위가 되는지(RRF 점수 합산) 확인합니다.
+"""
+
+ERROR_WORD = {"text": "학교을", "error_location": "3", "error_aspect": "대치", "error_level": "형태"}
+
+
+def _example(sentence: str, score=None) -> dict:
+    return {"original_sentence": sentence, "error_words": [ERROR_WORD], "score": score}
+
+
+EXAMPLES = [
+    _example("저는 어제 친구하고 같이 도서관을 갔어요.", 0.010),
+    _example("저는 학교을 가요.", 0.030),
+    _example("저는 학교을 가요!", 0.029),
+    _example("주말에 가족들과 바다에 놀러 갔습니다.", 0.020),
+    _example("한국 음식은 맵지만 정말 맛있어요.", 0.015),
+    _example("선생님께서 숙제를 많이 내 주셨어요.", None),
+]
+
+GRAMMAR_INFO = [
+    {"grammar_element": "을", "explanation": "의미: 목적어 표시 / 형태 정보: 받침 뒤 / " + "제약: 긴 설명 " * 40},
+    {"grammar_element": "을", "explanation": "중복 항목"},
+    {"grammar_element": "에", "explanation": "의미: 장소, 방향"},
+]
+
+
+def _sentences(prompt) -> list:
+    user = prompt.messages[1]["content"]
+    return [ex["original_sentence"] for ex in EXAMPLES if ex["original_sentence"] in user]
+
+
+def run_test():
+    print("\n" + "=" * 70)
+    print("| 프롬프트 토큰 예산 테스트 |")
+    print("=" * 70)
+
+    results = []
+    payload = {"original_sentence": "저는 학교을 갔어요.", "error_examples": EXAMPLES}
+
+    client = GrammarLLMClient(llm=None, prompt_budget=PromptBudget(correction_tokens=0, max_examples=3))
+    prompt = client.build_correction_prompt(payload)
+    kept = _sentences(prompt)
+    results.append((
+        "점수순·중복 제거",
+        kept == ["저는 학교을 가요.", "주말에 가족들과 바다에 놀러 갔습니다.", "한국 음식은 맵지만 정말 맛있어요."],
+        f"{prompt.items_before}개 → {prompt.items_after}개",
+    ))
+
+    full = GrammarLLMClient(llm=None, prompt_budget=PromptBudget(correction_tokens=0, max_examples=10)).build_correction_prompt(payload)
+    limit = full.tokens_after - 20
+    client = GrammarLLMClient(llm=None, prompt_budget=PromptBudget(correction_tokens=limit, max_examples=10))
+    prompt = client.build_correction_prompt(payload)
+    results.append((
+        "토큰 예산",
+        prompt.tokens_after <= limit < prompt.tokens_before and prompt.items_after < full.items_after,
+        f"{prompt.tokens_before} → {prompt.tokens_after} (예산 {limit})",
+    ))
+
+    client = GrammarLLMClient(llm=None, prompt_budget=PromptBudget(correction_tokens=1))
+    prompt = client.build_correction_prompt(payload)
+    results.append(("최소 예문 1개", _sentences(prompt) == ["저는 학교을 가요."], f"{prompt.tokens_after} 토큰"))
+
+    client = GrammarLLMClient(llm=None, prompt_budget=PromptBudget(feedback_tokens=0, explanation_max_chars=60))
+    prompt = client.build_feedback_prompt({
+        "original_sentence": "저는 학교을 갔어요.",
+        "corrected_sentence": "저는 학교에 갔어요.",
+        "grammar_db_info": GRAMMAR_INFO,
+    })
+    user = prompt.messages[1]["content"]
+    results.append((
+        "문법 정보 정리",
+        prompt.items_after == 2 and "중복 항목" not in user and "- 에: 의미: 장소, 방향" in user
+        and prompt.tokens_after < prompt.tokens_before,
+        f"{prompt.tokens_before} → {prompt.tokens_after} 토큰",
+    ))
+
+    text = "의미: 목적어 / 형태 정보: 받침 뒤 / 제약: 없음"
+    truncated = truncate_text(text, 25)
+    results.append(("설명 자르기", truncated == "의미: 목적어 / 형태 정보: 받침 뒤…", truncated))
+
+    chroma = GrammarService._rank_scored([ErrorExample(**_example(s)) for s in ("가", "나", "다")])
+    es = GrammarService._rank_scored([ErrorExample(**_example(s)) for s in ("다", "라")])
+    merged = GrammarService._merge_examples(chroma, es)
+    order = [ex.original_sentence for ex in sorted(merged, key=lambda ex: -ex.score)]
+    results.append(("RRF 합산", order == ["다", "가", "나", "라"], " > ".join(order)))
+
+    for name, ok, detail in results:
+        status = "✅" if ok else "❌"
+        print(f"| {name: <18} | {detail: <36} | {status} |")
+
+    print("=" * 70 + "\n")
+    return all(ok for _, ok, _ in results)
+
+
+if __name__ == "__main__":
+    raise SystemExit(0 if run_test() else 1)
@@ -0,0 +1,215 @@
+import asyncio
+import multiprocessing
+import os
+import tempfile
+import time
+
+from ..llm.rate_limit_backends import FileLockTokenBucket, RateLimitBackendError, RedisTokenBucket, _RespConnection
+
+
+"""
+공유 토큰 버킷 백엔드 테스트
+- 워커 수와 관계없이 전체 허용량이 설정한 할당량(QPM)과 일치하는지 확인합니다.
+- Redis 백엔드는 로컬에서 띄운 가짜 RESP 서버를 대상으로 동작합니다. (실제 Redis 불필요)
+- EXEC 결과에 오류가 섞이거나 명령이 취소되어도 다음 명령이 자기 응답을 읽는지 확인합니다.
+"""
+
+QUOTA_PER_MINUTE = 600  # 초당 10회
+BURST = 1
+DURATION = 3.0
+WORKERS = 4
+TOLERANCE = 0.15
+
+
+class FakeRedisServer:
+    """WATCH/MULTI/EXEC, GET/SET, TIME만 지원하는 테스트용 가짜 Redis 서버"""
+
+    def __init__(self):
+        self.data: dict[bytes, bytes] = {}
+        self.versions: dict[bytes, int] = {}
+        # 응답을 늦게 보낼 키 (GET 도중 취소되는 상황 재현용)
+        self.slow_keys: dict[bytes, float] = {}
+        self.server = None
+
+    async def start(self) -> int:
+        self.server = await asyncio.start_server(self._handle, "127.0.0.1", 0)
+        return self.server.sockets[0].getsockname()[1]
+
+    async def stop(self):
+        self.server.close()
+        await self.server.wait_closed()
+
+    @staticmethod
+    async def _read_command(reader):
+        line = await reader.readline()
+        if not line:
+            return None
+        count = int(line[1:-2])
+        args = []
+        for _ in range(count):
+            length = int((await reader.readline())[1:-2])
+            args.append((await reader.readexactly(length + 2))[:-2])
+        return args
+
+    @staticmethod
+    def _bulk(value):
+        if value is None:
+            return b"$-1\r\n"
+        return b"$%d\r\n%s\r\n" % (len(value), value)
+
+    def _run(self, args):
+        name = args[0].upper()
+        if name == b"GET":
+            return self._bulk(self.data.get(args[1]))
+        if name == b"SET":
+            self.data[args[1]] = args[2]
+            self.versions[args[1]] = self.versions.get(args[1], 0) + 1
+            return b"+OK\r\n"
+        if name == b"TIME":
+            now = time.time()
+            sec, usec = str(int(now)).encode(), str(int((now % 1) * 1_000_000)).encode()
+            return b"*2\r\n" + self._bulk(sec) + self._bulk(usec)
+        return b"-ERR unknown command\r\n"
+
+    async def _handle(self, reader, writer):
+        watched: dict[bytes, int] = {}
+        queued = None
+        while True:
+            args = await self._read_command(reader)
+            if args is None:
+                break
+            name = args[0].upper()
+            if name == b"WATCH":
+                watched = {key: self.versions.get(key, 0) for key in args[1:]}
+                reply = b"+OK\r\n"
+            elif name == b"UNWATCH":
+                watched = {}
+                reply = b"+OK\r\n"
+            elif name == b"MULTI":
+                queued = []
+                reply = b"+OK\r\n"
+            elif name == b"EXEC":
+                conflict = any(self.versions.get(k, 0) != v for k, v in watched.items())
+                if conflict:
+                    reply = b"*-1\r\n"
+                else:
+                    results = [self._run(cmd) for cmd in queued]
+                    reply = b"*%d\r\n" % len(results) + b"".join(results)
+                watched, queued = {}, None
+            elif queued is not None:
+                queued.append(args)
+                reply = b"+QUEUED\r\n"
+            else:
+                if name == b"GET" and args[1] in self.slow_keys:
+                    await asyncio.sleep(self.slow_keys[args[1]])
+                reply = self._run(args)
+            try:
+                writer.write(reply)
+                await writer.drain()
+            except ConnectionError:
+                # 클라이언트가 응답을 기다리지 않고 연결을 버린 경우
+                break
+        writer.close()
+
+
+async def _count_admissions(bucket, duration: float) -> int:
+    admitted = 0
+    deadline = time.monotonic() + duration
+    while True:
+        await bucket.acquire()
+        if time.monotonic() >= deadline:
+            return admitted
+        admitted += 1
+
+
+async def _run_redis_case() -> tuple[int, float]:
+    fake = FakeRedisServer()
+    port = await fake.start()
+    rate = QUOTA_PER_MINUTE / 60
+    buckets = [
+        RedisTokenBucket(f"redis://127.0.0.1:{port}/0", "test:clova", rate, BURST)
+        for _ in range(WORKERS)
+    ]
+    try:
+        counts = await asyncio.gather(*(_count_admissions(b, DURATION) for b in buckets))
+    finally:
+        for b in buckets:
+            await b.close()
+        await fake.stop()
+    return sum(counts), rate * DURATION + BURST
+
+
+async def _run_reply_sync_case() -> tuple[bool, bool]:
+    fake = FakeRedisServer()
+    port = await fake.start()
+    conn = _RespConnection("127.0.0.1", port, None, 0, 2.0)
+    try:
+        # 실행 중 오류가 난 명령이 EXEC 결과 배열 중간에 섞인 경우
+        await conn.execute("MULTI")
+        await conn.execute("UNKNOWN")
+        await conn.execute("SET", "a", "1")
+        result = await conn.execute("EXEC")
+        exec_ok = isinstance(result[0], RateLimitBackendError) and await conn.execute("GET", "a") == b"1"
+
+        # 응답을 받기 전에 취소된 명령
+        fake.slow_keys[b"slow"] = 0.2
+        fake.data[b"slow"] = b"slow"
+        task = asyncio.create_task(conn.execute("GET", "slow"))
+        await asyncio.sleep(0.05)
+        task.cancel()
+        await asyncio.gather(task, return_exceptions=True)
+        cancel_ok = await conn.execute("GET", "a") == b"1"
+        # 늦게 오는 응답까지 서버가 처리를 마치도록 대기
+        await asyncio.sleep(0.2)
+    finally:
+        await conn.close()
+        await fake.stop()
+    return exec_ok, cancel_ok
+
+
+def _file_worker(path: str, queue) -> None:
+    bucket = FileLockTokenBucket(path, QUOTA_PER_MINUTE / 60, BURST)
+    queue.put(asyncio.run(_count_admissions(bucket, DURATION)))
+
+
+def _run_file_case() -> tuple[int, float]:
+    path = os.path.join(tempfile.mkdtemp(), "bucket.json")
+    queue = multiprocessing.Queue()
+    procs = [multiprocessing.Process(target=_file_worker, args=(path, queue)) for _ in range(WORKERS)]
+    for p in procs:
+        p.start()
+    total = sum(queue.get() for _ in procs)
+    for p in procs:
+        p.join()
+    return total, QUOTA_PER_MINUTE / 60 * DURATION + BURST
+
+
+def _report(name: str, admitted: int, expected: float) -> bool:
+    ok = abs(admitted - expected) <= expected * TOLERANCE
+    status = "✅" if ok else "❌"
+    print(f"| {name: <6} | 워커 {WORKERS}개 | 허용 {admitted: >4}회 | 기대 {expected: >6.1f}회 | {status} |")
+    return ok
+
+
+def run_test():
+    print("\n" + "=" * 70)
+    print(f"| 공유 속도 제한 백엔드 테스트 (QPM {QUOTA_PER_MINUTE}, {DURATION:.0f}초) |")
+    print("=" * 70)
+
+    results = [
+        _report("file", *_run_file_case()),
+        _report("redis", *asyncio.run(_run_redis_case())),
+    ]
+
+    exec_ok, cancel_ok = asyncio.run(_run_reply_sync_case())
+    for name, ok in (("EXEC 결과 중 오류", exec_ok), ("취소된 명령 이후", cancel_ok)):
+        status = "✅" if ok else "❌"
+        print(f"| {name: <18} | 다음 명령이 자기 응답을 읽음 | {status} |")
+        results.append(ok)
+
+    print("=" * 70 + "\n")
+    return all(results)
+
+
+if __name__ == "__main__":
+    raise SystemExit(0 if run_test() else 1)
@@ -0,0 +1,76 @@
+import asyncio
+
+from prometheus_client import REGISTRY
+
+from ..llm.llm_stage import LlmStage
+from ..llm.rate_limiter import PriorityRateLimiter
+
+
+"""
+속도 제한기 대기열 테스트
+- 429 Retry-After로 멈춘 동안 마감 시간이 지나 취소된 요청이 대기열 길이·지표·대기 사용자 수에 남지 않는지 확인합니다.
+- 취소된 요청만 남은 상태에서 공유 버킷(budget) 토큰을 쓰지 않는지, 이후 새 요청은 정상적으로 슬롯을 받는지 확인합니다.
+"""
+
+PAUSE = 0.3
+STAGE = LlmStage.CORRECTION
+
+
+class CountingBudget:
+    def __init__(self) -> None:
+        self.acquired = 0
+
+    async def acquire(self) -> float:
+        self.acquired += 1
+        return 0.0
+
+
+def _gauge() -> float:
+    return REGISTRY.get_sample_value("clova_limiter_queue_depth", {"stage": STAGE.value}) or 0.0
+
+
+async def _cancelled_during_pause():
+    budget = CountingBudget()
+    limiter = PriorityRateLimiter(max_rate=6000, period=60.0, burst=10, budget=budget)
+    gauge_before = _gauge()
+    limiter.on_rate_limited(STAGE, retry_after=PAUSE)
+
+    # 요청 마감 시간(_acquire_slot의 wait_for)이 Retry-After보다 짧은 요청들
+    outcomes = await asyncio.gather(
+        *(asyncio.wait_for(limiter.acquire(STAGE, user_id=user), 0.05) for user in ("a", "a", "b")),
+        return_exceptions=True,
+    )
+    cancelled = all(isinstance(o, asyncio.TimeoutError) for o in outcomes)
+    snapshot = limiter.snapshot()
+    during = (snapshot["queue_depth"][STAGE.value], snapshot["waiting_users"][STAGE.value], _gauge() - gauge_before)
+
+    # 멈춤이 끝나 디스패처가 깨어나도 취소된 요청 몫의 공유 토큰은 받지 않음
+    await asyncio.sleep(PAUSE + 0.05)
+    budget_after_pause = budget.acquired
+
+    await asyncio.wait_for(limiter.acquire(STAGE, user_id="c"), 1.0)
+    return cancelled, during, budget_after_pause, limiter.snapshot()["queue_depth"][STAGE.value]
+
+
+def run_test():
+    print("\n" + "=" * 70)
+    print("| 속도 제한기 대기열 테스트 |")
+    print("=" * 70)
+
+    cancelled, (depth, users, gauge), budget_used, depth_after = asyncio.run(_cancelled_during_pause())
+    results = [
+        ("취소된 요청 제거", cancelled and depth == 0 and users == 0 and gauge == 0, f"대기열 {depth}, 사용자 {users}, 지표 {gauge:+.0f}"),
+        ("공유 토큰 미사용", budget_used == 0, f"멈춤 후 공유 토큰 {budget_used}개"),
+        ("이후 요청 처리", depth_after == 0, f"대기열 {depth_after}"),
+    ]
+
+    for name, ok, detail in results:
+        status = "✅" if ok else "❌"
+        print(f"| {name: <18} | {detail: <36} | {status} |")
+
+    print("=" * 70 + "\n")
+    return all(ok for _, ok, _ in results)
+
+
+if __name__ == "__main__":
+    raise SystemExit(0 if run_test() else 1)
@@ -0,0 +1,129 @@
+import asyncio
+import time
+
+from ..core.request_context import (
+    DeadlineExceededError,
+    RequestContext,
+    bind_request_context,
+    ensure_budget,
+    remaining_budget,
+)
+from ..util.singleflight import SingleFlight
+
+
+"""
+동일 호출 합치기(SingleFlight) 테스트
+- 마감 시간이 짧은 요청이 먼저 시작한 호출에, 마감 시간이 긴 요청이 합류해도 긴 쪽은 결과를 받는지 확인합니다.
+  (공유 태스크의 마감 시각은 대기자 중 가장 늦은 값, 먼저 들어온 요청의 마감 시각은 그대로)
+- 이미 시작한 대기가 먼저 들어온 요청의 마감 시각으로 끝나면, 뒤에 들어온 요청이 자기 마감 시각으로 다시 실행하는지 확인합니다.
+- 대기자 하나가 취소되어도 다른 대기자는 결과를 받는지 확인합니다.
+"""
+
+SHORT = 0.1
+LONG = 1.0
+
+
+def _context(user_id: str, budget: float) -> RequestContext:
+    return RequestContext(user_id=user_id, deadline=time.monotonic() + budget)
+
+
+async def _call(flight: SingleFlight, context: RequestContext, fn, wait: float):
+    # 요청 쪽은 자기 마감 시간까지만 기다림 (FeedbackFacade._gather_until_deadline과 같은 역할)
+    with bind_request_context(context):
+        task = asyncio.create_task(flight.do("문장", fn))
+    try:
+        return await asyncio.wait_for(task, wait)
+    except (asyncio.TimeoutError, DeadlineExceededError) as e:
+        return type(e).__name__
+
+
+async def _extended_deadline():
+    flight = SingleFlight("test")
+    seen = []
+
+    async def fn():
+        await asyncio.sleep(SHORT * 2)
+        # 먼저 들어온 요청의 마감 시각은 지났지만 공유 태스크는 늦은 마감 시각을 봄
+        ensure_budget("grammar", 0.0)
+        seen.append(remaining_budget())
+        return "교정 결과"
+
+    short, long = _context("a", SHORT), _context("b", LONG)
+    short_deadline = short.deadline
+    first = asyncio.create_task(_call(flight, short, fn, SHORT))
+    await asyncio.sleep(0.01)
+    second = asyncio.create_task(_call(flight, long, fn, LONG))
+    results = await asyncio.gather(first, second)
+    return results, len(seen), short.deadline == short_deadline
+
+
+async def _retry_after_owner_deadline():
+    flight = SingleFlight("test")
+    calls = []
+
+    async def fn():
+        calls.append(remaining_budget())
+        # 시작할 때 정한 시간 제한 (속도 제한 대기, HTTP 타임아웃 등)
+        try:
+            await asyncio.wait_for(asyncio.sleep(SHORT * 2), remaining_budget())
+        except asyncio.TimeoutError:
+            raise DeadlineExceededError("마감 시간이 지났습니다.")
+        return "교정 결과"
+
+    first = asyncio.create_task(_call(flight, _context("a", SHORT), fn, LONG))
+    await asyncio.sleep(0.01)
+    second = asyncio.create_task(_call(flight, _context("b", LONG), fn, LONG))
+    results = await asyncio.gather(first, second)
+    return results, len(calls)
+
+
+async def _cancel_one_waiter():
+    flight = SingleFlight("test")
+
+    async def fn():
+        await asyncio.sleep(SHORT)
+        return "교정 결과"
+
+    context = _context("a", LONG)
+    with bind_request_context(context):
+        first = asyncio.create_task(flight.do("문장", fn))
+        second = asyncio.create_task(flight.do("문장", fn))
+    await asyncio.sleep(0.01)
+    first.cancel()
+    return await second
+
+
+def run_test():
+    print("\n" + "=" * 70)
+    print("| 동일 호출 합치기(SingleFlight) 테스트 |")
+    print("=" * 70)
+
+    results = []
+
+    (short_result, long_result), executed, unchanged = asyncio.run(_extended_deadline())
+    results.append((
+        "늦은 마감 시각 적용",
+        short_result == "TimeoutError" and long_result == "교정 결과" and executed == 1 and unchanged,
+        f"짧은 요청={short_result}, 긴 요청={long_result}",
+    ))
+
+    (owner_result, joiner_result), calls = asyncio.run(_retry_after_owner_deadline())
+    results.append((
+        "자기 마감 시각으로 재실행",
+        owner_result == "DeadlineExceededError" and joiner_result == "교정 결과" and calls == 2,
+        f"먼저={owner_result}, 나중={joiner_result}, 실행 {calls}회",
+    ))
+
+    result = asyncio.run(_cancel_one_waiter())
+    results.append(("대기자 취소", result == "교정 결과", result))
+
+    for name, ok, detail in results:
+        status = "✅" if ok else "❌"
+        print(f"| {name: <18} | {detail: <36} | {status} |")
+
+    print("=" * 70 + "\n")
+    return all(ok for _, ok, _ in results)
+
+
+if __name__ == "__main__":
+    raise SystemExit(0 if run_test() else 1)
@@ -0,0 +1,30 @@
+import asyncio
+from typing import Awaitable, Optional, TypeVar
+
+from fastapi import Request
+
+T = TypeVar("T")
+
+# nginx 관례: 클라이언트가 응답을 받기 전에 연결을 닫음
+CLIENT_CLOSED_REQUEST = 499
+
+
+async def run_until_disconnected(request: Request, awaitable: Awaitable[T], poll_interval: float = 0.5) -> Optional[T]:
+    """
+    작업을 실행하면서 클라이언트 연결 종료를 주기적으로 확인합니다.
+    연결이 끊기면 작업을 취소하고 None을 반환합니다.
+    """
+    task = asyncio.ensure_future(awaitable)
+    try:
+        while True:
+            done, _ = await asyncio.wait({task}, timeout=poll_interval)
+            if done:
+                return task.result()
+            if await request.is_disconnected():
+                task.cancel()
+                await asyncio.gather(task, return_exceptions=True)
+                return None
+    except asyncio.CancelledError:
+        # 서버 종료 등으로 요청 처리 자체가 취소된 경우에도 작업을 남기지 않음
+        task.cancel()
+        raise
@@ -1,11 +1,193 @@
 import asyncio
+import atexit
+import json
 import logging
-from typing import Any, Callable
+import queue
+import random
+import sys
+import zlib
+from logging.handlers import QueueHandler, QueueListener
+from typing import Any, Callable, Dict, Optional
 
-logging.basicConfig(
-    level=logging.INFO,
-    format="%(asctime)s - %(name)s - %(levelname)s - %(message)s"
-)
+from ..core.tracing import current_trace_fields
+
+"""
+로깅 설정
+
+- 요청 처리 경로에서는 로그를 큐에 넣기만 하고(QueueHandler), 포맷과 stdout 쓰기는 리스너 스레드에서 합니다.
+- log_event는 이벤트 이름과 필드를 그대로 넘기고, 출력할 때만 문자열(text) 또는 JSON으로 만듭니다.
+- 문장별 단계 결과(검색 결과, LLM 출력 등) 같은 상세 로그는 요청 단위로 샘플링합니다. (stage_dump_enabled)
+"""
+
+TEXT_FORMAT = "%(asctime)s - %(name)s - %(levelname)s - [%(request_id)s:%(sentence_id)s] %(message)s"
+
+# 필드 값을 문자열로 만들 때의 최대 길이 (LLM 출력, 검색 결과 목록 등)
+MAX_FIELD_LENGTH = 500
+
+
+class TraceContextFilter(logging.Filter):
+    """로그 레코드에 현재 요청 ID와 문장 ID를 붙입니다. (요청 밖에서는 "-")"""
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        fields = current_trace_fields()
+        record.request_id = fields["request_id"] or "-"
+        sentence_id = fields["sentence_id"]
+        record.sentence_id = "-" if sentence_id is None else sentence_id
+        return True
+
+
+class StructuredMessage:
+    """이벤트 이름과 필드. 출력할 때(리스너 스레드)에만 문자열로 만듭니다."""
+
+    __slots__ = ("event", "fields")
+
+    def __init__(self, event: str, fields: Dict[str, Any]) -> None:
+        self.event = event
+        self.fields = fields
+
+    def __str__(self) -> str:
+        if not self.fields:
+            return self.event
+        return self.event + " " + " ".join(f"{key}={_truncate(_render(value))}" for key, value in self.fields.items())
+
+
+def _render(value: Any) -> str:
+    if isinstance(value, str):
+        return json.dumps(value, ensure_ascii=False) if (" " in value or not value) else value
+    return json.dumps(value, ensure_ascii=False, default=str)
+
+
+def _truncate(text: str) -> str:
+    return text if len(text) <= MAX_FIELD_LENGTH else text[:MAX_FIELD_LENGTH] + "…"
+
+
+class JsonFormatter(logging.Formatter):
+    """한 줄에 JSON 객체 하나. StructuredMessage의 필드는 최상위 키로 펼칩니다."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        payload: Dict[str, Any] = {
+            "ts": self.formatTime(record),
+            "level": record.levelname,
+            "logger": record.name,
+            "request_id": getattr(record, "request_id", "-"),
+            "sentence_id": getattr(record, "sentence_id", "-"),
+        }
+        if isinstance(record.msg, StructuredMessage):
+            payload["event"] = record.msg.event
+            for key, value in record.msg.fields.items():
+                payload.setdefault(key, value)
+        else:
+            payload["message"] = record.getMessage()
+        if record.exc_info:
+            payload["exc"] = self.formatException(record.exc_info)
+        return json.dumps(payload, ensure_ascii=False, default=lambda v: _truncate(str(v)))
+
+
+class _DeferredQueueHandler(QueueHandler):
+    """
+    기본 QueueHandler는 큐에 넣기 전에 메시지를 포맷하므로, 포맷을 리스너 스레드로 미룹니다.
+    (같은 프로세스 안의 큐이므로 레코드를 직렬화할 필요가 없음. 필드에는 이후 바뀌지 않는 값만 넘겨야 함)
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        return record
+
+
+_queue_handler: Optional[_DeferredQueueHandler] = None
+_listener: Optional[QueueListener] = None
+_output_handler: Optional[logging.Handler] = None
+_stage_dump_sample_rate = 1.0
+
+
+def _install_default() -> None:
+    # 설정 전(도구, 임베딩 서버 등)에는 stdout에 바로 출력
+    logging.basicConfig(level=logging.INFO, format=TEXT_FORMAT)
+    for handler in logging.getLogger().handlers:
+        handler.addFilter(TraceContextFilter())
+
+
+def configure_logging(level: str = "INFO", fmt: str = "text", stage_dump_sample_rate: float = 1.0) -> None:
+    """
+    루트 로거의 출력을 큐 + 리스너 스레드로 바꿉니다. 앱을 가져올 때 한 번 호출합니다.
+    fmt는 text | json 입니다.
+    """
+    global _queue_handler, _output_handler, _stage_dump_sample_rate
+    if fmt not in ("text", "json"):
+        raise ValueError(f"지원하지 않는 로그 형식입니다: {fmt}")
+
+    stop_logging()
+    _stage_dump_sample_rate = stage_dump_sample_rate
+    _output_handler = logging.StreamHandler(sys.stdout)
+    _output_handler.setFormatter(JsonFormatter() if fmt == "json" else logging.Formatter(TEXT_FORMAT))
+
+    _queue_handler = _DeferredQueueHandler(queue.SimpleQueue())
+    # 요청 ID·문장 ID는 ContextVar에 있으므로 로그를 남기는 쪽(큐에 넣기 전)에서 붙임
+    _queue_handler.addFilter(TraceContextFilter())
+
+    root = logging.getLogger()
+    for handler in list(root.handlers):
+        root.removeHandler(handler)
+    root.addHandler(_queue_handler)
+    root.setLevel(level.upper())
+    _start_listener()
+
+
+def _start_listener() -> None:
+    global _listener
+    _listener = QueueListener(_queue_handler.queue, _output_handler, respect_handler_level=True)
+    _listener.start()
+
+
+def stop_logging() -> None:
+    """큐에 남은 로그를 모두 출력한 뒤 리스너 스레드를 멈춥니다."""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+
+def reinit_logging_after_fork() -> None:
+    """
+    fork한 자식 프로세스에서 호출합니다. (gunicorn 워커)
+    리스너 스레드는 자식으로 복사되지 않고, 부모의 큐는 잠긴 채로 복사될 수 있으므로 새로 만듭니다.
+    """
+    global _listener
+    if _queue_handler is None:
+        return
+    _queue_handler.queue = queue.SimpleQueue()
+    _listener = None
+    _start_listener()
+
+
+atexit.register(stop_logging)
+
+
+# ----------------------------------------------------------------------
+
+# 로그 남기기
+
+
+def log_event(log: logging.Logger, level: int, event: str, **fields: Any) -> None:
+    """레벨이 꺼져 있으면 아무것도 만들지 않고, 켜져 있으면 필드를 그대로 큐에 넣습니다."""
+    if log.isEnabledFor(level):
+        log.log(level, StructuredMessage(event, fields), stacklevel=2)
+
+
+def stage_dump_enabled(log: Optional[logging.Logger] = None) -> bool:
+    """
+    문장별 단계 결과를 상세히 남길지 여부. 요청 ID로 결정하므로 한 요청의 상세 로그는 모두 남거나 모두 빠집니다.
+    """
+    if not (log or logger).isEnabledFor(logging.INFO) or _stage_dump_sample_rate <= 0:
+        return False
+    if _stage_dump_sample_rate >= 1:
+        return True
+    request_id = current_trace_fields()["request_id"]
+    if request_id is None:
+        return random.random() < _stage_dump_sample_rate
+    return zlib.crc32(request_id.encode("utf-8")) / 2**32 < _stage_dump_sample_rate
+
+
+_install_default()
 
 logger = logging.getLogger(__name__)
 
@@ -14,33 +196,20 @@ DoneCallback = Callable[[asyncio.Task], None]
 def log_task_exception(task: asyncio.Task[Any]) -> None:
     """
     백그라운드 태스크의 완료를 확인하고, 발생한 예외를 안전하게 로깅하는 콜백 함수입니다.
-    
-    이 함수는 asyncio.Task.add_done_callback()에 등록되어, 
+
+    이 함수는 asyncio.Task.add_done_callback()에 등록되어,
     태스크가 완료되거나 실패했을 때 호출됩니다.
-    
+
     Args:
         task (asyncio.Task): 완료된 asyncio 태스크 객체.
     """
-    task_name = task.get_name() if task.get_name() else "Unnamed Task"
-    
-    print(f"\n[DEBUG_CB] Task '{task_name}' finished. Status: {task.done()}")
-
-    try:
-        # 1. 태스크가 성공적으로 완료되었는지 확인하고 결과를 가져옵니다. 
-        result = task.result()
-        print(f"[DEBUG_CB] Task '{task_name}' completed successfully. Result Type: {type(result)}")
-    except asyncio.CancelledError:
-        # 2. 태스크가 취소된 경우
-        print(f"[DEBUG_CB] WARNING: Task '{task_name}' was cancelled.")
-        logger.warning(f"Background task '{task.get_name()}' was cancelled.")
-    except Exception as e:
-        # 3. 태스크 실행 중 예외가 발생한 경우
-        print(f"[DEBUG_CB] ERROR: Task '{task_name}' failed with an exception!")
-        print(f"[DEBUG_CB] EXCEPTION TYPE: {type(e).__name__}")
-        print(f"[DEBUG_CB] EXCEPTION DETAILS: {e}")
-        logger.error(
-            f"!!! Background Task Failed: '{task.get_name()}' !!!", 
-            exc_info=e
-        )
-        
-        # TODO: 별도의 알림 시스템(Slack, Sentry) 연동 로직을 추가
\ No newline at end of file
+    if task.cancelled():
+        logger.warning("Background task '%s' was cancelled.", task.get_name())
+        return
+
+    exc = task.exception()
+    if exc is not None:
+        logger.error("!!! Background Task Failed: '%s' !!!", task.get_name(), exc_info=exc)
+        # TODO: 별도의 알림 시스템(Slack, Sentry) 연동 로직을 추가
+    elif logger.isEnabledFor(logging.DEBUG):
+        logger.debug("Background task '%s' completed.", task.get_name())
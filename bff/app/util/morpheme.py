@@ -1,8 +1,20 @@
+import threading
+from functools import lru_cache
 from konlpy.tag import Mecab
-from typing import List, Dict
+from typing import List, Dict, Tuple
 
-# Mecab 인스턴스를 모듈 레벨에서 한 번만 생성하여 재사용
-mecab = Mecab()
+# Mecab Tagger는 여러 스레드에서 동시에 쓸 수 없으므로 호출마다 잠금 (한 번에 문장 하나, 수십 µs~1ms)
+_mecab_lock = threading.Lock()
+
+@lru_cache(maxsize=1)
+def get_mecab() -> Mecab:
+    # Mecab 인스턴스를 처음 사용할 때 한 번만 생성하여 재사용 (앱 기동 시 미리 생성)
+    return Mecab()
+
+def mecab_pos(text: str) -> List[Tuple[str, str]]:
+    """공유 Mecab 인스턴스로 품사를 태깅합니다. 이벤트 루프와 작업 스레드(asyncio.to_thread) 어디서든 호출할 수 있습니다."""
+    with _mecab_lock:
+        return get_mecab().pos(text)
 
 def analyze_sentence_to_words(sentence: str) -> List[Dict]:
     """
@@ -26,7 +38,7 @@ def analyze_sentence_to_words(sentence: str) -> List[Dict]:
             continue
         
         # Mecab으로 어절 단위 형태소 분석
-        morphs_pos = mecab.pos(eojeol)
+        morphs_pos = mecab_pos(eojeol)
         
         morphs_data = [
             {"morph": morph, "pos": pos}
@@ -36,3 +48,42 @@ def analyze_sentence_to_words(sentence: str) -> List[Dict]:
         words_list.append({"morphs": morphs_data})
         
     return words_list
+
+def analyze_sentence_in_context(sentence: str) -> List[Dict]:
+    """
+    analyze_sentence_to_words와 같은 'words' 구조를 반환하지만,
+    어절마다 따로 분석하지 않고 문장 전체를 한 번에 분석한 뒤 형태소를 어절에 다시 배정합니다.
+    앞뒤 문맥이 있어야 '집로'처럼 잘못 쓴 조사가 명사 + 조사로 올바르게 분리됩니다.
+
+    Args:
+        sentence (str): 분석할 문장 문자열
+
+    Returns:
+        List[Dict]: 공백 기준 어절 순서와 일치하는 어절 리스트.
+    """
+    eojeol_spans = []
+    offset = 0
+    for eojeol in sentence.split():
+        start = sentence.index(eojeol, offset)
+        offset = start + len(eojeol)
+        eojeol_spans.append((start, offset))
+
+    words_list = [{"morphs": []} for _ in eojeol_spans]
+    if not words_list:
+        return words_list
+
+    cursor = 0
+    word_idx = 0
+    for morph, pos in mecab_pos(sentence):
+        found = sentence.find(morph, cursor)
+        if found < 0:
+            # 표면형이 원문과 다르면(드문 경우) 현재 어절에 그대로 배정
+            words_list[word_idx]["morphs"].append({"morph": morph, "pos": pos})
+            continue
+
+        cursor = found + len(morph)
+        while word_idx < len(eojeol_spans) - 1 and found >= eojeol_spans[word_idx][1]:
+            word_idx += 1
+        words_list[word_idx]["morphs"].append({"morph": morph, "pos": pos})
+
+    return words_list
@@ -0,0 +1,89 @@
+import asyncio
+import dataclasses
+from dataclasses import dataclass
+from typing import Awaitable, Callable, Dict, Hashable, Optional, TypeVar
+
+from ..core.metrics import SINGLEFLIGHT_COALESCED_TOTAL, SINGLEFLIGHT_INFLIGHT
+from ..core.request_context import DeadlineExceededError, RequestContext, bind_request_context, get_request_context
+
+T = TypeVar("T")
+
+@dataclass
+class _Call:
+    task: asyncio.Task
+    # 공유 태스크가 참조하는 요청 컨텍스트 (먼저 들어온 호출의 복사본, 마감 시각은 대기자 중 가장 늦은 값)
+    context: Optional[RequestContext] = None
+    waiters: int = 0
+
+class SingleFlight:
+    """
+    같은 키로 동시에 들어온 호출을 하나의 실행으로 합칩니다.
+    먼저 들어온 호출이 실제 작업을 태스크로 실행하고, 뒤이어 들어온 호출은 그 결과를 함께 기다립니다.
+
+    - 대기자 중 하나가 취소되어도 공유 태스크는 취소되지 않습니다 (asyncio.shield).
+    - 모든 대기자가 취소되면 결과를 받을 곳이 없으므로 공유 태스크도 취소합니다.
+    - 작업이 끝나면 키를 바로 제거하므로 결과를 캐시하지 않습니다.
+    - 공유 태스크는 먼저 들어온 호출의 요청 컨텍스트 복사본에서 실행하며, 마감 시각은 대기자 중 가장 늦은 값으로 늘립니다.
+      (먼저 들어온 요청의 마감 시각을 바꾸지 않고, 뒤에 들어온 요청이 더 짧은 마감 시각에 묶이지 않도록)
+    - 이미 시작한 대기의 시간 제한은 늘어나지 않으므로, 다른 요청의 마감 시각 때문에 DeadlineExceededError로 끝났고
+      자신은 시간이 남아 있으면 자기 마감 시각으로 다시 실행합니다.
+    - 속도 제한 순서(user_id), 요청 ID, 추적 span, 토큰 사용량은 먼저 들어온 호출의 것을 씁니다.
+      뒤에 들어온 호출은 슬롯과 토큰을 쓰지 않으므로 사용량은 실제로 호출을 보낸 요청에 한 번만 기록됩니다.
+    """
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+        self._calls: Dict[Hashable, _Call] = {}
+
+    def _forget(self, key: Hashable, call: _Call) -> None:
+        if self._calls.get(key) is call:
+            del self._calls[key]
+            SINGLEFLIGHT_INFLIGHT.labels(name=self.name).dec()
+
+    @staticmethod
+    def _extend_deadline(call: _Call, context: Optional[RequestContext]) -> None:
+        """대기자가 늘어날 때 공유 태스크의 마감 시각을 대기자 중 가장 늦은 값으로 맞춥니다. (None은 제한 없음)"""
+        if call.context is None or call.context.deadline is None:
+            return
+        if context is None or context.deadline is None:
+            call.context.deadline = None
+        else:
+            call.context.deadline = max(call.context.deadline, context.deadline)
+
+    def _start(self, key: Hashable, fn: Callable[[], Awaitable[T]]) -> _Call:
+        context = get_request_context()
+        if context is None:
+            call = _Call(task=asyncio.create_task(fn(), name=f"SingleFlight_{self.name}"))
+        else:
+            # 태스크는 생성 시점의 컨텍스트를 복사하므로, 복사본을 설정한 채로 생성
+            shared = dataclasses.replace(context)
+            with bind_request_context(shared):
+                call = _Call(task=asyncio.create_task(fn(), name=f"SingleFlight_{self.name}"), context=shared)
+        self._calls[key] = call
+        SINGLEFLIGHT_INFLIGHT.labels(name=self.name).inc()
+        call.task.add_done_callback(lambda _t, k=key, c=call: self._forget(k, c))
+        return call
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[T]]) -> T:
+        call = self._calls.get(key)
+        owner = call is None
+        if owner:
+            call = self._start(key, fn)
+        else:
+            SINGLEFLIGHT_COALESCED_TOTAL.labels(name=self.name).inc()
+            self._extend_deadline(call, get_request_context())
+
+        call.waiters += 1
+        try:
+            return await asyncio.shield(call.task)
+        except DeadlineExceededError:
+            context = get_request_context()
+            remaining = context.remaining() if context else None
+            if owner or (remaining is not None and remaining <= 0):
+                raise
+            # 먼저 들어온 요청의 마감 시각 때문에 끝남: 남은 시간으로 다시 실행 (다른 대기자와 다시 합쳐질 수 있음)
+            return await self.do(key, fn)
+        finally:
+            call.waiters -= 1
+            if call.waiters == 0 and not call.task.done():
+                call.task.cancel()
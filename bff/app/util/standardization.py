@@ -61,6 +61,17 @@ def has_final_consonant(morph: str) -> bool:
     code = ord(last_char)
     return (code - 0xAC00) % 28 != 0
 
+def has_final_rieul(morph: str) -> bool:
+    """morph 마지막 글자의 받침이 'ㄹ'인지 판별합니다."""
+    if not morph:
+        return False
+    last_char = morph[-1]
+    if not ('가' <= last_char <= '힣'):
+        return False
+    # 종성 인덱스 8: ㄹ
+    code = ord(last_char)
+    return (code - 0xAC00) % 28 == 8
+
 def has_positive_vowel(morph: str) -> bool:
     """morph 마지막 글자의 모음이 'ㅏ, ㅗ'인지 판별합니다."""
     if not morph:
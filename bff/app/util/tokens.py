@@ -0,0 +1,27 @@
+import math
+import unicodedata
+
+# 토크나이저 없이 프롬프트 크기를 가늠하기 위한 문자 종류별 평균 토큰 수
+# (HyperCLOVA X는 한국어 어휘가 많아 한글 음절은 영문보다 토큰당 글자 수가 적음. 정확한 값은 응답의 usage를 사용)
+HANGUL_TOKENS_PER_CHAR = 0.6
+ASCII_TOKENS_PER_CHAR = 0.25
+OTHER_TOKENS_PER_CHAR = 1.0
+
+
+def estimate_tokens(text: str) -> int:
+    """문자열의 토큰 수 추정치. 공백은 세지 않고, 문자 종류(한글/ASCII/기타)별 평균 값을 합해 올림합니다."""
+    hangul = ascii_chars = other = 0
+    for ch in text:
+        if ch.isspace():
+            continue
+        if ch.isascii():
+            ascii_chars += 1
+        elif unicodedata.name(ch, "").startswith("HANGUL"):
+            hangul += 1
+        else:
+            other += 1
+    return math.ceil(
+        hangul * HANGUL_TOKENS_PER_CHAR
+        + ascii_chars * ASCII_TOKENS_PER_CHAR
+        + other * OTHER_TOKENS_PER_CHAR
+    )
@@ -0,0 +1,141 @@
+"""
+벤치마크용 고정 입력 데이터
+
+- 한국어 학습자 글을 흉내 낸 문장 묶음에서 seed를 고정해 문장을 뽑으므로, 실행할 때마다 같은 글이 만들어집니다.
+- Chroma/ES 검색 결과와 최종 응답도 실제 형식 그대로 만들어, 외부 서비스 없이 변환·직렬화 비용만 측정합니다.
+"""
+import json
+import random
+from typing import Any, Dict, List
+
+SEED = 20240601
+
+# 크기별 문장 수 (small: 짧은 일기, medium: 일반 과제, large: 문서 크기 한도에 가까운 글)
+ESSAY_SIZES = {"small": 5, "medium": 30, "large": 100}
+
+SENTENCE_BANK = [
+    "저는 작년 봄에 한국에 처음 왔습니다.",
+    "한국어를 공부한 지 벌써 삼 년이 되었어요.",
+    "처음에는 한국 음식이 너무 매워서 먹기 힘들었다.",
+    "친구하고 같이 시장에 가서 떡볶이를 먹었어요.",
+    "비가 와서 우산을 가지고 나갔는데 바람이 많이 불었다.",
+    "저는 집로 돌아가서 숙제를 했습니다.",
+    "그 영화는 생각보다 재미있어서 다시 보고 싶었습니다.",
+    "내일은 시험이 있기 때문에 오늘 밤에 늦게까지 공부할 거예요.",
+    "주말에 가족들이랑 바닷가에 가서 맛있는 음식을 먹었다.",
+    "선생님께서 저에게 한국의 역사에 대해 설명해 주셨습니다.",
+    "나는 친구가 학교를 갔다.",
+    "요즘 날씨가 추워져서 감기에 걸리는 사람이 많습니다.",
+    "도서관에서 책을 빌렸는데 아직 다 못 읽었어요.",
+    "한국 사람들은 정이 많다고 생각합니다.",
+    "지하철을 타면 사람들이 모두 휴대폰을 보고 있습니다.",
+    "저의 꿈은 한국 회사에서 일하는 것이에요.",
+    "어제 밤에 잠을 못 자서 오늘 아침에 너무 피곤하었어요.",
+    "김치찌개를 만들 때 돼지고기를 넣으면 더 맛있습니다.",
+    "외국인이 한국어를 배울 때 가장 어려운 것은 조사인 것 같다.",
+    "다음 달에 고향에 돌아가서 부모님을 만날 거예요.",
+    "한국의 대학교 생활은 우리 나라와 많이 달라서 처음에 적응하기가 어려웠지만 지금은 친구도 많이 생겼고 수업도 재미있어서 아주 만족하고 있습니다.",
+    "카페에서 아르바이트를 하면서 손님들과 이야기하는 것이 한국어 실력에 많이 도움이 되었다.",
+]
+
+ERROR_WORDS = [
+    {"text": "집로 -> 집으로", "error_location": "조사", "error_aspect": "대치", "error_level": "형태"},
+    {"text": "친구가 -> 친구는", "error_location": "조사", "error_aspect": "대치", "error_level": "형태"},
+    {"text": "피곤하었어요 -> 피곤했어요", "error_location": "어미", "error_aspect": "대치", "error_level": "형태"},
+    {"text": "학교를 -> 학교에", "error_location": "조사", "error_aspect": "대치", "error_level": "형태"},
+]
+
+
+def essay(size: str) -> str:
+    rng = random.Random(f"{SEED}-{size}")
+    count = ESSAY_SIZES[size]
+    sentences = [rng.choice(SENTENCE_BANK) for _ in range(count)]
+    # 문단 구분(빈 줄)과 줄바꿈을 섞어 실제 제출 글과 비슷하게
+    paragraphs = [" ".join(sentences[i:i + 5]) for i in range(0, count, 5)]
+    return "\n\n".join(paragraphs)
+
+
+def essay_sentences(size: str) -> List[str]:
+    rng = random.Random(f"{SEED}-{size}")
+    return [rng.choice(SENTENCE_BANK) for _ in range(ESSAY_SIZES[size])]
+
+
+def words_for(sentence: str) -> List[Dict[str, Any]]:
+    """analyze_sentence_to_words와 같은 구조. 형태소 분석기 없이 standardize_word를 측정하기 위한 고정 분석 결과"""
+    rng = random.Random(sentence)
+    tags = ["NNG", "NNP", "NP", "VV", "VA", "JKS", "JKO", "JKB", "JX", "EP", "EF", "EC", "ETM", "NNB", "VX", "MAG"]
+    words = []
+    for eojeol in sentence.split():
+        morphs = [{"morph": eojeol[: max(1, len(eojeol) - 1)], "pos": rng.choice(tags[:5])}]
+        if len(eojeol) > 1:
+            morphs.append({"morph": eojeol[-1], "pos": rng.choice(tags[5:])})
+        words.append({"morphs": morphs})
+    return words
+
+
+def chroma_results(n_results: int = 5, metadata_as_json: bool = True) -> Dict[str, Any]:
+    """collection.query(include=['documents', 'metadatas', 'distances'])의 결과 형식 (쿼리 1개)"""
+    rng = random.Random(f"{SEED}-chroma-{n_results}")
+    documents, metadatas, distances = [], [], []
+    for i in range(n_results):
+        error_words = rng.sample(ERROR_WORDS, k=rng.randint(1, 3))
+        documents.append(rng.choice(SENTENCE_BANK))
+        metadatas.append({"error_words": json.dumps(error_words, ensure_ascii=False) if metadata_as_json else error_words})
+        distances.append(round(0.2 + i * 0.05, 4))
+    return {"documents": [documents], "metadatas": [metadatas], "distances": [distances]}
+
+
+def es_hits(count: int = 5) -> List[Dict[str, Any]]:
+    """AsyncElasticsearch.search 응답의 hits.hits 형식"""
+    rng = random.Random(f"{SEED}-es-{count}")
+    hits = []
+    for i in range(count):
+        error_words = rng.sample(ERROR_WORDS, k=rng.randint(1, 3))
+        hits.append({
+            "_id": f"doc-{i}",
+            "_score": round(10.0 - i, 2),
+            "_source": {
+                "original_text": rng.choice(SENTENCE_BANK),
+                "normalized_tags": "NNG_O 는 VV_X_N 었 다",
+                "metadata": {"error_words": json.dumps(error_words, ensure_ascii=False)},
+            },
+        })
+    return hits
+
+
+def error_examples(count: int = 5) -> List[Dict[str, Any]]:
+    """1차 LLM 입력의 error_examples (ErrorExample.model_dump() 형식)"""
+    rng = random.Random(f"{SEED}-examples-{count}")
+    return [
+        {"original_sentence": rng.choice(SENTENCE_BANK), "error_words": rng.sample(ERROR_WORDS, k=rng.randint(1, 3))}
+        for _ in range(count)
+    ]
+
+
+def feedback_response(size: str) -> Dict[str, Any]:
+    """FeedbackResponse 형식의 최종 응답. 오류 후보 비율은 실제 서비스와 비슷하게 약 30%"""
+    rng = random.Random(f"{SEED}-response-{size}")
+    sentences = []
+    for idx, text in enumerate(essay_sentences(size)):
+        grammar_feedback = None
+        if rng.random() < 0.3:
+            grammar_feedback = {
+                "corrected_sentence": text,
+                "feedbacks": [
+                    {
+                        "corrects": ew["text"],
+                        "reason": "받침이 있는 명사 뒤에는 '으로'를 씁니다. 방향을 나타낼 때 자주 쓰는 조사입니다.",
+                    }
+                    for ew in rng.sample(ERROR_WORDS, k=rng.randint(1, 2))
+                ],
+            }
+        sentences.append({
+            "sentence_id": idx,
+            "original_sentence": text,
+            "is_error": grammar_feedback is not None,
+            "grammar_feedback": grammar_feedback,
+        })
+    return {
+        "context_feedback": {"feedback": "글의 흐름이 자연스럽고 주제가 분명합니다. " * 10},
+        "sentences": sentences,
+    }
@@ -0,0 +1,299 @@
+"""
+CPU 구간 마이크로 벤치마크 (외부 서비스 없이 실행)
+
+- 문장 분리(KSS), 오류 점수 계산·형태소 분석(Mecab), 어절 표준화, 오류 예시 프롬프트 포맷,
+  ES/Chroma 검색 결과 → ErrorExample 변환, 최종 응답(FeedbackResponse) 직렬화를 측정합니다.
+- 입력은 benchmarks/fixtures.py의 고정된 합성 글(small/medium/large)이므로 실행할 때마다 같습니다.
+- 항목마다 예열 후 한 라운드가 0.2초 이상 되도록 반복 횟수를 정하고, 여러 라운드의 호출당 시간(중앙값·최솟값·p95)을 기록합니다.
+  (timeit과 같이 측정 중에는 GC를 끔)
+- Mecab, KSS가 설치되지 않은 환경에서는 해당 항목을 건너뛰고 이유를 함께 기록합니다.
+- 결과는 JSON으로 저장하고, 기준 결과(--baseline)와 비교해 중앙값이 허용 범위(--tolerance)보다 느려진 항목이 있으면 종료 코드 1을 반환합니다.
+  기준 결과는 측정한 기기에 따라 다르므로 저장소에 넣지 않고, 같은 기기에서 만들어 비교합니다.
+  --baseline-ref를 주면 해당 git 커밋을 임시 worktree로 꺼내 같은 조건으로 기준 결과를 먼저 기록합니다.
+
+실행 예 (bff 디렉터리):
+    python benchmarks/run.py --baseline-ref main
+    python benchmarks/run.py --save-baseline benchmarks/baseline.json
+    python benchmarks/run.py --baseline benchmarks/baseline.json --output benchmarks/result.json
+    python benchmarks/run.py --size large --filter mecab --rounds 10
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import timeit
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+BFF_DIR = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(BFF_DIR))
+
+import fixtures  # noqa: E402  (benchmarks 디렉터리가 sys.path[0])
+
+# 설정 모듈이 필수 값을 요구하므로, .env가 없는 환경에서도 가져올 수 있도록 자리표시 값을 채움 (외부 연결은 하지 않음)
+for _key in ("CLOVA_API_KEY", "CHROMA_HOST", "CHROMA_COLLECTION_NAME", "ELASTICSEARCH_HOST"):
+    os.environ.setdefault(_key, "benchmark")
+
+
+class BenchmarkSkipped(Exception):
+    pass
+
+
+# ----------------------------------------------------------------------
+
+# 측정 항목: (글 크기) -> 측정할 함수. 크기와 무관한 항목은 sized=False
+
+def _sentence_service():
+    try:
+        from app.services.sentence_service import SentenceService
+        from app.util.morpheme import get_mecab
+        get_mecab()
+    except Exception as e:
+        raise BenchmarkSkipped(f"Mecab을 사용할 수 없습니다: {e}")
+    return SentenceService()
+
+
+def bench_kss_split(size: str) -> Callable[[], Any]:
+    service = _sentence_service()
+    try:
+        import kss  # noqa: F401
+    except Exception as e:
+        raise BenchmarkSkipped(f"KSS를 사용할 수 없습니다: {e}")
+    contents = fixtures.essay(size)
+    return lambda: service.split_into_sentences(contents)
+
+
+def bench_mecab_score(size: str) -> Callable[[], Any]:
+    service = _sentence_service()
+    sentences = fixtures.essay_sentences(size)
+    return lambda: [service._calculate_error_score(s) for s in sentences]
+
+
+def bench_mecab_analyze(size: str) -> Callable[[], Any]:
+    _sentence_service()
+    from app.util.morpheme import analyze_sentence_to_words
+    sentences = fixtures.essay_sentences(size)
+    return lambda: [analyze_sentence_to_words(s) for s in sentences]
+
+
+def bench_standardize(size: str) -> Callable[[], Any]:
+    from app.util.standardization import standardize_word
+    words = [word for s in fixtures.essay_sentences(size) for word in fixtures.words_for(s)]
+    return lambda: [standardize_word(w) for w in words]
+
+
+def bench_format_examples(size: str) -> Callable[[], Any]:
+    from app.clients.grammar_llm_client import GrammarLLMClient
+    client = GrammarLLMClient(llm=None)
+    examples = fixtures.error_examples(5)
+    return lambda: client._format_error_examples(examples)
+
+
+def bench_es_parse(size: str) -> Callable[[], Any]:
+    from app.services.grammar_service import GrammarService
+    hits = fixtures.es_hits(5)
+    return lambda: GrammarService._es_hits_to_examples(hits)
+
+
+def bench_chroma_parse(size: str) -> Callable[[], Any]:
+    from app.services.grammar_service import GrammarService
+    results = fixtures.chroma_results(5)
+    return lambda: GrammarService._chroma_results_to_examples(results)
+
+
+def bench_response_serialize(size: str) -> Callable[[], Any]:
+    from app.schemas.feedback_response import FeedbackResponse
+    response = FeedbackResponse.model_validate(fixtures.feedback_response(size))
+    return lambda: response.model_dump_json()
+
+
+BENCHMARKS: List[Tuple[str, Callable[[str], Callable[[], Any]], bool]] = [
+    ("kss_split", bench_kss_split, True),
+    ("mecab_score", bench_mecab_score, True),
+    ("mecab_analyze", bench_mecab_analyze, True),
+    ("standardize_word", bench_standardize, True),
+    ("format_error_examples", bench_format_examples, False),
+    ("es_hits_to_examples", bench_es_parse, False),
+    ("chroma_results_to_examples", bench_chroma_parse, False),
+    ("feedback_response_json", bench_response_serialize, True),
+]
+
+
+# ----------------------------------------------------------------------
+
+# 측정
+
+def measure(func: Callable[[], Any], rounds: int, warmup: int) -> Dict[str, Any]:
+    for _ in range(warmup):
+        func()
+    timer = timeit.Timer(func)
+    # 한 라운드가 0.2초 이상이 되는 첫 반복 횟수(1, 2, 5, 10, 20, ...)
+    number, _ = timer.autorange()
+    per_call = [t / number for t in timer.repeat(repeat=rounds, number=number)]
+    per_call.sort()
+    return {
+        "median_us": round(statistics.median(per_call) * 1e6, 3),
+        "min_us": round(per_call[0] * 1e6, 3),
+        "p95_us": round(per_call[min(len(per_call) - 1, int(len(per_call) * 0.95))] * 1e6, 3),
+        "rounds": rounds,
+        "calls_per_round": number,
+    }
+
+
+def run(sizes: List[str], rounds: int, warmup: int, name_filter: Optional[str]) -> Dict[str, Dict[str, Any]]:
+    results: Dict[str, Dict[str, Any]] = {}
+    for name, setup, sized in BENCHMARKS:
+        if name_filter and name_filter not in name:
+            continue
+        for size in (sizes if sized else ["fixed"]):
+            key = f"{name}[{size}]"
+            try:
+                func = setup(size)
+                results[key] = measure(func, rounds, warmup)
+            except BenchmarkSkipped as e:
+                results[key] = {"skipped": str(e)}
+            _print_row(key, results[key])
+    return results
+
+
+def environment() -> Dict[str, Any]:
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=BFF_DIR, capture_output=True, text=True, timeout=5,
+        ).stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        commit = None
+    return {
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "cpu_count": os.cpu_count(),
+        "git_commit": commit,
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+    }
+
+
+# ----------------------------------------------------------------------
+
+# 기준 결과와 비교
+
+def compare(current: Dict[str, Dict[str, Any]], baseline: Dict[str, Dict[str, Any]], tolerance: float) -> List[str]:
+    regressions = []
+    print(f"\n{'항목':<42} {'기준(us)':>12} {'현재(us)':>12} {'변화':>8}")
+    for key, result in current.items():
+        base = baseline.get(key)
+        if "median_us" not in result or not base or "median_us" not in base:
+            continue
+        ratio = result["median_us"] / base["median_us"] if base["median_us"] else 1.0
+        mark = ""
+        if ratio > 1 + tolerance:
+            mark = "  ← 느려짐"
+            regressions.append(key)
+        print(f"{key:<42} {base['median_us']:>12.1f} {result['median_us']:>12.1f} {(ratio - 1) * 100:>+7.1f}%{mark}")
+    return regressions
+
+
+def _print_row(key: str, result: Dict[str, Any]) -> None:
+    if "skipped" in result:
+        print(f"{key:<42} 건너뜀: {result['skipped']}")
+    else:
+        print(
+            f"{key:<42} 중앙값 {result['median_us']:>12.1f}us  최소 {result['min_us']:>12.1f}us  "
+            f"p95 {result['p95_us']:>12.1f}us  ({result['rounds']}×{result['calls_per_round']}회)"
+        )
+
+
+def record_baseline_at(ref: str, path: str, options: List[str]) -> None:
+    """git ref의 코드를 임시 worktree로 꺼내, 같은 측정 옵션으로 기준 결과를 path에 기록합니다."""
+    repo_root = Path(subprocess.run(
+        ["git", "rev-parse", "--show-toplevel"], cwd=BFF_DIR, capture_output=True, text=True, check=True,
+    ).stdout.strip())
+    with tempfile.TemporaryDirectory(prefix="bench-baseline-") as tmp:
+        worktree = Path(tmp) / "src"
+        subprocess.run(
+            ["git", "worktree", "add", "--detach", str(worktree), ref], cwd=repo_root, capture_output=True, text=True, check=True,
+        )
+        try:
+            print(f"기준 결과 기록: {ref} → {path}")
+            subprocess.run(
+                [sys.executable, "benchmarks/run.py", "--save-baseline", os.path.abspath(path), *options],
+                cwd=worktree / BFF_DIR.relative_to(repo_root), check=True,
+            )
+        finally:
+            subprocess.run(["git", "worktree", "remove", "--force", str(worktree)], cwd=repo_root, capture_output=True)
+
+
+def _write_json(path: str, payload: Dict[str, Any]) -> None:
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(payload, f, ensure_ascii=False, indent=2)
+        f.write("\n")
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--size", choices=sorted(fixtures.ESSAY_SIZES), action="append", help="측정할 글 크기 (여러 번 지정 가능, 기본: 전부)")
+    parser.add_argument("--filter", help="이름에 이 문자열이 들어간 항목만 측정")
+    parser.add_argument("--rounds", type=int, default=7, help="항목별 측정 라운드 수")
+    parser.add_argument("--warmup", type=int, default=3, help="측정 전 예열 호출 수")
+    parser.add_argument("--output", help="결과 JSON 저장 경로")
+    parser.add_argument("--baseline", help="비교할 기준 결과 JSON")
+    parser.add_argument("--save-baseline", metavar="PATH", help="이번 결과를 기준 결과로 저장")
+    parser.add_argument("--baseline-ref", metavar="REF", help="이 git 커밋에서 같은 조건으로 기준 결과를 기록한 뒤 비교 (--baseline이 있으면 그 경로에 저장)")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="중앙값이 기준보다 이 비율 이상 느려지면 실패 (기본 0.2 = 20%%)")
+    args = parser.parse_args()
+
+    if args.baseline_ref:
+        options = [f"--size={size}" for size in args.size or []]
+        options += [f"--rounds={args.rounds}", f"--warmup={args.warmup}"]
+        if args.filter:
+            options.append(f"--filter={args.filter}")
+        args.baseline = args.baseline or os.path.join(tempfile.mkdtemp(prefix="bench-"), "baseline.json")
+        try:
+            record_baseline_at(args.baseline_ref, args.baseline, options)
+        except subprocess.CalledProcessError as e:
+            print(f"{args.baseline_ref}에서 기준 결과를 기록하지 못했습니다: {(e.stderr or '').strip() or e}", file=sys.stderr)
+            return 2
+    elif args.baseline and not os.path.isfile(args.baseline):
+        # 측정을 시작하기 전에 실패 (기준 결과는 저장소에 없고 기기마다 따로 기록)
+        print(
+            f"기준 결과 파일이 없습니다: {args.baseline}\n"
+            f"변경 전 코드에서 먼저 기록하세요: python benchmarks/run.py --save-baseline {args.baseline}\n"
+            "또는 비교할 커밋을 지정하세요: python benchmarks/run.py --baseline-ref main",
+            file=sys.stderr,
+        )
+        return 2
+
+    sizes = args.size or sorted(fixtures.ESSAY_SIZES, key=fixtures.ESSAY_SIZES.get)
+    results = run(sizes, args.rounds, args.warmup, args.filter)
+    payload = {"environment": environment(), "results": results}
+
+    if args.output:
+        _write_json(args.output, payload)
+        print(f"\n결과 저장: {args.output}")
+    if args.save_baseline:
+        _write_json(args.save_baseline, payload)
+        print(f"기준 결과 저장: {args.save_baseline}")
+
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)
+        base_env = baseline.get("environment", {})
+        if base_env.get("machine") != payload["environment"]["machine"] or base_env.get("python") != payload["environment"]["python"]:
+            print(f"\n주의: 기준 결과와 측정 환경이 다릅니다. (기준: {base_env.get('python')} / {base_env.get('machine')})")
+        regressions = compare(results, baseline.get("results", {}), args.tolerance)
+        if regressions:
+            print(f"\n허용 범위({args.tolerance * 100:.0f}%)보다 느려진 항목: {', '.join(regressions)}")
+            return 1
+        print("\n기준 대비 느려진 항목이 없습니다.")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,52 @@
+"""
+여러 워커 프로세스로 실행하기 위한 gunicorn 설정
+
+    gunicorn -c gunicorn.conf.py
+
+- preload_app: 마스터가 앱을 가져오고 임베딩 모델·Mecab·KSS를 적재한 뒤 fork하므로,
+  워커들이 모델 가중치와 사전 페이지를 copy-on-write로 공유합니다.
+- 커넥션 풀·HTTP 클라이언트·Kafka 프로듀서 등은 워커마다 lifespan에서 새로 만듭니다.
+"""
+import multiprocessing
+import os
+
+wsgi_app = "app.main:app"
+bind = os.getenv("BIND", "0.0.0.0:8080")
+workers = int(os.getenv("WEB_CONCURRENCY", multiprocessing.cpu_count()))
+worker_class = "uvicorn_worker.UvicornWorker"
+preload_app = True
+
+# 워커 기동 시 Chroma·Postgres 연결과 임베딩 워밍업까지 끝내야 하므로 넉넉하게
+timeout = int(os.getenv("GUNICORN_TIMEOUT", 120))
+graceful_timeout = 30
+keepalive = 5
+
+
+def on_starting(server):
+    from app.core.dependencies import container
+
+    container.preload()
+    server.log.info("읽기 전용 자원을 마스터에서 적재했습니다. (워커가 copy-on-write로 공유)")
+
+
+def post_fork(server, worker):
+    from app.core.config import settings
+    from app.core.dependencies import container
+
+    torch_threads = settings.EMBEDDING_TORCH_THREADS or max(1, multiprocessing.cpu_count() // server.cfg.workers)
+    container.after_fork(torch_threads=torch_threads)
+
+
+def child_exit(server, worker):
+    # PROMETHEUS_MULTIPROC_DIR를 쓰는 경우 종료된 워커의 gauge 값을 집계에서 제외
+    if os.getenv("PROMETHEUS_MULTIPROC_DIR"):
+        from prometheus_client import multiprocess
+
+        multiprocess.mark_process_dead(worker.pid)
+
+
+def on_exit(server):
+    from app.core.dependencies import container
+
+    # 마스터가 띄운 임베딩 서버 종료 (EMBEDDING_SERVER_AUTOSTART)
+    container.stop_embedding_server()
@@ -0,0 +1,502 @@
+"""
+Clova Studio chat-completions v3 모의 서버 (장애 주입)
+
+- ClovaStudioClient가 보내는 요청을 그대로 받아, 같은 형식(status.code, result.message.content, result.usage)으로 응답합니다.
+  responseFormat(JSON 스키마)이 있으면 스키마에 맞는 JSON 문자열을, 없으면 짧은 한국어 문장을 content로 돌려줍니다.
+- Accept: text/event-stream 요청에는 token 이벤트를 나눠 보내고 마지막에 result 이벤트를 보냅니다.
+- Authorization 헤더가 없으면 401, messages가 없으면 400을 Clova와 같은 본문 형식으로 돌려줍니다.
+
+장애와 지연
+- 지연 분포(--latency, --token-latency): fixed:500 | uniform:200,800 | normal:500,100 | lognormal:500,0.5(중앙값, sigma) | exp:500
+- 429(--rate-limit-ratio)와 Retry-After, 429 연속 구간(--burst-every초마다 --burst-seconds초 동안 모든 요청을 429로)
+- 5xx(--server-error-ratio, --server-error-codes), JSON이 아닌 content(--malformed-ratio, responseFormat 요청만),
+  스트리밍 중간의 error 이벤트(--stream-error-ratio)
+
+결정성
+- 응답 내용과 장애 여부는 (seed, 프롬프트 해시, 같은 프롬프트의 몇 번째 요청인지)로 정하므로,
+  요청 순서가 섞여도 같은 요청에는 항상 같은 결과가 나옵니다. (429 연속 구간은 시간 기준이므로 예외)
+- --script로 프롬프트별 응답을 지정할 수 있습니다. 규칙은 위에서부터 처음 일치한 것을 사용하며,
+  responses 목록은 같은 프롬프트의 요청 순서대로 하나씩 쓰고 마지막 항목을 반복합니다.
+    [
+      {"match": "학교를 갔다", "responses": [{"status": 429, "retry_after": 1}, {"content": {"is_error": true, "corrected_sentence": "학교에 갔다", "errors": ["에"]}}]},
+      {"regex": "총평", "latency_ms": 3000, "content": "고정된 문맥 피드백"},
+      {"match": "깨진 응답", "malformed": true}
+    ]
+  응답 항목: content(문자열 또는 JSON 값), status(HTTP 상태), code(Clova status.code), retry_after, latency_ms, malformed, stream_error
+
+관리용 엔드포인트: GET /health, GET /_mock/stats(결과별 횟수), POST /_mock/reset(횟수와 요청 순번 초기화)
+
+실행 예 (bff 디렉터리):
+    python tools/clova_mock.py --port 9100 --latency lognormal:800,0.4 --rate-limit-ratio 0.05 --server-error-ratio 0.01
+    python tools/clova_mock.py --port 9100 --script data/clova_script.json --burst-every 30 --burst-seconds 5
+    CLOVA_URL=http://127.0.0.1:9100/v3/chat-completions/HCX-007 uvicorn app.main:app
+"""
+import argparse
+import asyncio
+import hashlib
+import json
+import math
+import random
+import re
+import threading
+import time
+from collections import Counter, defaultdict
+from typing import Any, Dict, List, Optional, Tuple
+
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, StreamingResponse
+
+STATUS_OK = {"code": "20000", "message": "OK"}
+STATUS_BY_HTTP = {
+    400: {"code": "40001", "message": "Invalid parameter"},
+    401: {"code": "40100", "message": "Unauthorized"},
+    429: {"code": "42901", "message": "Too many requests - rate exceeded"},
+    500: {"code": "50000", "message": "Internal server error"},
+    502: {"code": "50200", "message": "Bad gateway"},
+    503: {"code": "50300", "message": "Service unavailable"},
+    504: {"code": "50400", "message": "Gateway timeout"},
+}
+
+SAMPLE_TEXT = "전체적으로 글의 흐름이 자연스럽고 주제가 잘 드러납니다. 문장 사이의 연결 표현을 조금 더 다양하게 써 보세요."
+
+OUTCOME_OK = "ok"
+OUTCOME_RATE_LIMITED = "rate_limited"
+OUTCOME_RATE_LIMIT_BURST = "rate_limit_burst"
+OUTCOME_SERVER_ERROR = "server_error"
+OUTCOME_MALFORMED = "malformed"
+OUTCOME_STREAM_ERROR = "stream_error"
+OUTCOME_SCRIPTED = "scripted"
+
+
+# ----------------------------------------------------------------------
+
+# 지연 분포
+
+class Latency:
+    """'종류:인자' 형식의 지연 분포 (밀리초)"""
+
+    KINDS = ("fixed", "uniform", "normal", "lognormal", "exp")
+
+    def __init__(self, spec: str) -> None:
+        kind, _, raw = spec.partition(":")
+        if kind not in self.KINDS:
+            raise ValueError(f"지원하지 않는 지연 분포입니다: {spec!r} ({', '.join(self.KINDS)})")
+        params = [float(v) for v in raw.split(",") if v.strip()]
+        expected = {"fixed": 1, "uniform": 2, "normal": 2, "lognormal": 2, "exp": 1}[kind]
+        if len(params) != expected:
+            raise ValueError(f"'{kind}' 분포는 인자 {expected}개가 필요합니다: {spec!r}")
+        self.spec = spec
+        self.kind = kind
+        self.params = params
+
+    def sample(self, rng: random.Random) -> float:
+        p = self.params
+        if self.kind == "fixed":
+            value = p[0]
+        elif self.kind == "uniform":
+            value = rng.uniform(p[0], p[1])
+        elif self.kind == "normal":
+            value = rng.gauss(p[0], p[1])
+        elif self.kind == "lognormal":
+            value = p[0] * math.exp(rng.gauss(0, p[1])) if p[0] > 0 else 0.0
+        else:
+            value = rng.expovariate(1 / p[0]) if p[0] > 0 else 0.0
+        return max(0.0, value)
+
+
+class MockOptions:
+    def __init__(
+        self,
+        latency: str = "fixed:500",
+        token_latency: str = "fixed:20",
+        rate_limit_ratio: float = 0.0,
+        retry_after: int = 1,
+        burst_every: float = 0.0,
+        burst_seconds: float = 0.0,
+        server_error_ratio: float = 0.0,
+        server_error_codes: Tuple[int, ...] = (500, 503),
+        malformed_ratio: float = 0.0,
+        stream_error_ratio: float = 0.0,
+        script: Optional[List[Dict[str, Any]]] = None,
+        seed: int = 0,
+    ) -> None:
+        self.latency = Latency(latency)
+        self.token_latency = Latency(token_latency)
+        self.rate_limit_ratio = rate_limit_ratio
+        self.retry_after = retry_after
+        self.burst_every = burst_every
+        self.burst_seconds = burst_seconds
+        self.server_error_ratio = server_error_ratio
+        self.server_error_codes = server_error_codes
+        self.malformed_ratio = malformed_ratio
+        self.stream_error_ratio = stream_error_ratio
+        self.script = [ScriptRule(rule) for rule in (script or [])]
+        self.seed = seed
+
+
+class ScriptRule:
+    def __init__(self, rule: Dict[str, Any]) -> None:
+        self.match: Optional[str] = rule.get("match")
+        self.regex = re.compile(rule["regex"]) if rule.get("regex") else None
+        responses = rule.get("responses")
+        if responses is None:
+            responses = [{k: v for k, v in rule.items() if k not in ("match", "regex")}]
+        if not responses:
+            raise ValueError(f"responses가 비어 있는 규칙입니다: {rule}")
+        self.responses: List[Dict[str, Any]] = responses
+
+    def matches(self, prompt: str) -> bool:
+        if self.match is not None and self.match not in prompt:
+            return False
+        if self.regex is not None and not self.regex.search(prompt):
+            return False
+        return True
+
+    def response_for(self, attempt: int) -> Dict[str, Any]:
+        return self.responses[min(attempt, len(self.responses) - 1)]
+
+
+# ----------------------------------------------------------------------
+
+# 응답 내용
+
+def _prompt_text(payload: Dict[str, Any]) -> str:
+    return "\n".join(str(m.get("content", "")) for m in payload.get("messages", []) if isinstance(m, dict))
+
+
+def _digest(payload: Dict[str, Any]) -> bytes:
+    messages = json.dumps(payload.get("messages", []), ensure_ascii=False, sort_keys=True)
+    return hashlib.sha256(messages.encode("utf-8")).digest()
+
+
+def _resolve(schema: Dict[str, Any], root: Dict[str, Any]) -> Dict[str, Any]:
+    ref = schema.get("$ref")
+    if ref and ref.startswith("#/"):
+        node: Any = root
+        for part in ref[2:].split("/"):
+            node = node[part]
+        return _resolve(node, root)
+    if "anyOf" in schema:
+        # Optional[X]는 anyOf [X, null]로 표현되므로 null이 아닌 쪽을 사용
+        options = [s for s in schema["anyOf"] if s.get("type") != "null"]
+        return _resolve(options[0], root) if options else {"type": "null"}
+    return schema
+
+
+def value_for_schema(schema: Dict[str, Any], digest: bytes, root: Optional[Dict[str, Any]] = None, name: str = "") -> Any:
+    """JSON 스키마에 맞는 값을 만듭니다. 같은 digest에는 항상 같은 값"""
+    root = root or schema
+    schema = _resolve(schema, root)
+    kind = schema.get("type")
+    seed = digest[len(name) % len(digest)]
+
+    if "enum" in schema:
+        return schema["enum"][seed % len(schema["enum"])]
+    if kind == "object" or "properties" in schema:
+        return {
+            key: value_for_schema(prop, digest, root, f"{name}.{key}")
+            for key, prop in schema.get("properties", {}).items()
+        }
+    if kind == "array":
+        count = max(schema.get("minItems", 1), 1 + seed % 2)
+        return [value_for_schema(schema.get("items", {}), digest, root, f"{name}[{i}]") for i in range(count)]
+    if kind == "boolean":
+        return seed % 2 == 0
+    if kind == "integer":
+        return seed % 100
+    if kind == "number":
+        return round(seed / 255, 3)
+    if kind == "null":
+        return None
+    field = name.rsplit(".", 1)[-1]
+    return f"{field or '응답'} 예시 {seed % 10}"
+
+
+def _is_structured(payload: Dict[str, Any]) -> bool:
+    response_format = payload.get("responseFormat") or {}
+    return response_format.get("type") == "json" and bool(response_format.get("schema"))
+
+
+def build_content(payload: Dict[str, Any], digest: Optional[bytes] = None) -> str:
+    digest = digest or _digest(payload)
+    if _is_structured(payload):
+        return json.dumps(value_for_schema(payload["responseFormat"]["schema"], digest), ensure_ascii=False)
+    return SAMPLE_TEXT
+
+
+def _malformed(content: str) -> str:
+    # 닫는 괄호가 빠진 JSON (모델이 maxCompletionTokens에 걸려 중간에 끊긴 경우와 같은 형태)
+    return content[: max(1, len(content) * 2 // 3)]
+
+
+def _usage(payload: Dict[str, Any], content: str) -> Dict[str, int]:
+    # 실제 토크나이저 대신 글자 수로 근사 (한국어는 대략 1~2글자당 1토큰)
+    prompt_tokens = max(1, len(_prompt_text(payload)) // 2)
+    completion_tokens = max(1, len(content) // 2)
+    return {"promptTokens": prompt_tokens, "completionTokens": completion_tokens, "totalTokens": prompt_tokens + completion_tokens}
+
+
+def _result(payload: Dict[str, Any], content: str) -> Dict[str, Any]:
+    return {
+        "message": {"role": "assistant", "content": content},
+        "finishReason": "stop",
+        "created": int(time.time() * 1000),
+        "seed": 0,
+        "usage": _usage(payload, content),
+    }
+
+
+def _tokens(content: str, size: int = 4) -> List[str]:
+    return [content[i:i + size] for i in range(0, len(content), size)]
+
+
+def _error(http_status: int, retry_after: Optional[float] = None, code: Optional[str] = None) -> JSONResponse:
+    status = dict(STATUS_BY_HTTP.get(http_status, {"code": f"{http_status}00", "message": "Error"}))
+    if code:
+        status["code"] = code
+    headers = {"Retry-After": str(int(math.ceil(retry_after)))} if retry_after is not None else None
+    return JSONResponse(status_code=http_status, content={"status": status, "result": None}, headers=headers)
+
+
+# ----------------------------------------------------------------------
+
+# 요청별 결정
+
+class Plan:
+    """한 요청에 대해 정한 결과 (지연, 장애, 응답 내용)"""
+
+    def __init__(self) -> None:
+        self.outcome = OUTCOME_OK
+        self.http_status = 200
+        self.code: Optional[str] = None
+        self.retry_after: Optional[float] = None
+        self.latency_ms = 0.0
+        self.content: Optional[str] = None
+        self.malformed = False
+        self.stream_error = False
+
+
+class ClovaMock:
+    def __init__(self, options: MockOptions) -> None:
+        self.options = options
+        self.started = time.monotonic()
+        self.stats: Counter = Counter()
+        self._attempts: Dict[bytes, int] = defaultdict(int)
+
+    def reset(self) -> None:
+        self.started = time.monotonic()
+        self.stats.clear()
+        self._attempts.clear()
+
+    def _in_burst(self) -> Optional[float]:
+        """429 연속 구간이면 구간이 끝날 때까지 남은 시간(초)"""
+        o = self.options
+        if o.burst_every <= 0 or o.burst_seconds <= 0:
+            return None
+        offset = (time.monotonic() - self.started) % o.burst_every
+        return o.burst_seconds - offset if offset < o.burst_seconds else None
+
+    def plan(self, payload: Dict[str, Any]) -> Plan:
+        o = self.options
+        digest = _digest(payload)
+        attempt = self._attempts[digest]
+        self._attempts[digest] += 1
+        # 같은 프롬프트의 같은 순번 요청은 항상 같은 난수열
+        rng = random.Random(f"{o.seed}:{digest.hex()}:{attempt}")
+
+        plan = Plan()
+        plan.latency_ms = o.latency.sample(rng)
+
+        rule = next((r for r in o.script if r.matches(_prompt_text(payload))), None)
+        if rule is not None:
+            return self._scripted(plan, rule.response_for(attempt), payload, digest)
+
+        remaining = self._in_burst()
+        if remaining is not None:
+            plan.outcome, plan.http_status, plan.retry_after = OUTCOME_RATE_LIMIT_BURST, 429, remaining
+            return plan
+
+        # 장애 여부는 항상 같은 순서로 뽑아, 비율을 바꿔도 다른 장애의 발생 위치가 바뀌지 않도록
+        draws = [rng.random() for _ in range(4)]
+        if draws[0] < o.rate_limit_ratio:
+            plan.outcome, plan.http_status, plan.retry_after = OUTCOME_RATE_LIMITED, 429, o.retry_after
+        elif draws[1] < o.server_error_ratio:
+            plan.outcome = OUTCOME_SERVER_ERROR
+            plan.http_status = o.server_error_codes[int(draws[1] * 1e6) % len(o.server_error_codes)]
+        else:
+            plan.content = build_content(payload, digest)
+            if _is_structured(payload) and draws[2] < o.malformed_ratio:
+                plan.outcome, plan.malformed = OUTCOME_MALFORMED, True
+            elif draws[3] < o.stream_error_ratio:
+                # 스트리밍 요청에만 적용 (일반 요청은 정상 응답)
+                plan.stream_error = True
+        return plan
+
+    def _scripted(self, plan: Plan, response: Dict[str, Any], payload: Dict[str, Any], digest: bytes) -> Plan:
+        plan.outcome = OUTCOME_SCRIPTED
+        plan.http_status = int(response.get("status", 200))
+        plan.code = response.get("code")
+        plan.retry_after = response.get("retry_after")
+        if "latency_ms" in response:
+            plan.latency_ms = float(response["latency_ms"])
+        content = response.get("content")
+        if content is None:
+            plan.content = build_content(payload, digest)
+        else:
+            plan.content = content if isinstance(content, str) else json.dumps(content, ensure_ascii=False)
+        plan.malformed = bool(response.get("malformed"))
+        plan.stream_error = bool(response.get("stream_error"))
+        return plan
+
+
+# ----------------------------------------------------------------------
+
+# 서버
+
+def create_app(options: MockOptions) -> FastAPI:
+    app = FastAPI()
+    mock = ClovaMock(options)
+    app.state.mock = mock
+
+    @app.get("/health")
+    async def health() -> Dict[str, Any]:
+        return {"status": "ok", "requests": sum(mock.stats.values())}
+
+    @app.get("/_mock/stats")
+    async def stats() -> Dict[str, Any]:
+        return dict(mock.stats)
+
+    @app.post("/_mock/reset")
+    async def reset() -> Dict[str, Any]:
+        mock.reset()
+        return {"status": "ok"}
+
+    @app.post("/{path:path}")
+    async def chat_completions(path: str, request: Request):
+        if not request.headers.get("authorization", "").startswith("Bearer "):
+            mock.stats["unauthorized"] += 1
+            return _error(401)
+        try:
+            payload = await request.json()
+        except json.JSONDecodeError:
+            payload = None
+        if not isinstance(payload, dict) or not isinstance(payload.get("messages"), list):
+            mock.stats["bad_request"] += 1
+            return _error(400)
+
+        plan = mock.plan(payload)
+        stream = "text/event-stream" in request.headers.get("accept", "")
+        outcome = plan.outcome
+        if stream and plan.stream_error:
+            outcome = OUTCOME_STREAM_ERROR
+        mock.stats[outcome] += 1
+
+        if plan.latency_ms > 0:
+            await asyncio.sleep(plan.latency_ms / 1000)
+        if plan.http_status != 200:
+            return _error(plan.http_status, plan.retry_after, plan.code)
+        if plan.code and plan.code != STATUS_OK["code"]:
+            # HTTP 200이지만 본문 status.code가 오류인 응답
+            return {"status": {"code": plan.code, "message": "Scripted error"}, "result": None}
+
+        content = _malformed(plan.content) if plan.malformed else plan.content
+        if not stream:
+            return {"status": STATUS_OK, "result": _result(payload, content)}
+
+        token_rng = random.Random(f"{options.seed}:{content}")
+
+        async def events():
+            tokens = _tokens(content)
+            for i, token in enumerate(tokens):
+                if plan.stream_error and i == len(tokens) // 2:
+                    yield f"event: error\ndata: {json.dumps({'status': STATUS_BY_HTTP[500]})}\n\n"
+                    return
+                data = {"message": {"role": "assistant", "content": token}, "finishReason": None}
+                yield f"event: token\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+                delay = options.token_latency.sample(token_rng)
+                if delay > 0:
+                    await asyncio.sleep(delay / 1000)
+            yield f"event: result\ndata: {json.dumps(_result(payload, content), ensure_ascii=False)}\n\n"
+
+        return StreamingResponse(events(), media_type="text/event-stream")
+
+    return app
+
+
+class MockServerThread:
+    """테스트에서 모의 서버를 같은 프로세스의 별도 스레드로 띄웁니다. (with 문으로 사용)"""
+
+    def __init__(self, options: MockOptions, host: str = "127.0.0.1", port: int = 0) -> None:
+        import uvicorn
+
+        self.app = create_app(options)
+        self.server = uvicorn.Server(uvicorn.Config(self.app, host=host, port=port, log_level="warning"))
+        self._thread = threading.Thread(target=self.server.run, name="clova-mock", daemon=True)
+
+    @property
+    def mock(self) -> ClovaMock:
+        return self.app.state.mock
+
+    @property
+    def url(self) -> str:
+        host, port = self.server.servers[0].sockets[0].getsockname()[:2]
+        return f"http://{host}:{port}/v3/chat-completions/HCX-007"
+
+    def __enter__(self) -> "MockServerThread":
+        self._thread.start()
+        deadline = time.monotonic() + 10
+        while not self.server.started:
+            if time.monotonic() > deadline or not self._thread.is_alive():
+                raise RuntimeError("Clova 모의 서버를 시작하지 못했습니다.")
+            time.sleep(0.01)
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.server.should_exit = True
+        self._thread.join(timeout=5)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=9100)
+    parser.add_argument("--latency", default="fixed:500", help="응답(스트리밍은 첫 토큰)까지의 지연 분포 (ms)")
+    parser.add_argument("--token-latency", default="fixed:20", help="스트리밍 토큰 사이 간격 분포 (ms)")
+    parser.add_argument("--rate-limit-ratio", type=float, default=0.0, help="429로 응답할 요청 비율 (0~1)")
+    parser.add_argument("--retry-after", type=int, default=1, help="429 응답의 Retry-After(초)")
+    parser.add_argument("--burst-every", type=float, default=0.0, help="429 연속 구간 주기(초, 0이면 사용 안 함)")
+    parser.add_argument("--burst-seconds", type=float, default=0.0, help="429 연속 구간 길이(초)")
+    parser.add_argument("--server-error-ratio", type=float, default=0.0, help="5xx로 응답할 요청 비율")
+    parser.add_argument("--server-error-codes", default="500,503", help="5xx 상태 코드 목록 (쉼표 구분)")
+    parser.add_argument("--malformed-ratio", type=float, default=0.0, help="responseFormat 요청 중 JSON이 아닌 content를 돌려줄 비율")
+    parser.add_argument("--stream-error-ratio", type=float, default=0.0, help="스트리밍 중간에 error 이벤트를 보낼 비율")
+    parser.add_argument("--script", help="프롬프트별 응답 규칙 JSON 파일")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    import uvicorn
+
+    script = None
+    if args.script:
+        with open(args.script, encoding="utf-8") as f:
+            script = json.load(f)
+
+    options = MockOptions(
+        latency=args.latency,
+        token_latency=args.token_latency,
+        rate_limit_ratio=args.rate_limit_ratio,
+        retry_after=args.retry_after,
+        burst_every=args.burst_every,
+        burst_seconds=args.burst_seconds,
+        server_error_ratio=args.server_error_ratio,
+        server_error_codes=tuple(int(c) for c in args.server_error_codes.split(",") if c.strip()),
+        malformed_ratio=args.malformed_ratio,
+        stream_error_ratio=args.stream_error_ratio,
+        script=script,
+        seed=args.seed,
+    )
+    uvicorn.run(create_app(options), host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,137 @@
+"""
+임베딩 인코딩 방식별 처리량과 지연 시간(p50/p99) 비교
+
+- inprocess: 워커 프로세스마다 SentenceTransformer를 적재하고 요청마다 직접 인코딩 (기존 방식)
+- server:    임베딩 서버 하나가 모델을 소유하고, 워커들은 유닉스 소켓으로 요청 (동적 배치)
+
+워커 프로세스 수와 워커당 동시 요청 수를 실제 배포와 비슷하게 맞춰 실행합니다.
+
+실행 예 (bff 디렉터리):
+    python tools/embedding_benchmark.py --workers 4 --concurrency 8 --requests 200
+"""
+import argparse
+import asyncio
+import multiprocessing
+import os
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import List, Tuple
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+SAMPLE_SENTENCES = [
+    "저는 어제 친구와 함께 도서관에 갔습니다.",
+    "한국어를 공부한 지 벌써 삼 년이 되었어요.",
+    "비가 와서 우산을 가지고 나갔는데 바람이 많이 불었다.",
+    "그 영화는 생각보다 재미있어서 다시 보고 싶었습니다.",
+    "내일은 시험이 있기 때문에 오늘 밤에 늦게까지 공부할 거예요.",
+    "주말에 가족들이랑 바닷가에 가서 맛있는 음식을 먹었다.",
+]
+
+
+def _texts(worker_id: int, count: int) -> List[str]:
+    # 캐시 효과가 없도록 문장마다 번호를 붙임
+    return [f"{SAMPLE_SENTENCES[i % len(SAMPLE_SENTENCES)]} ({worker_id}-{i})" for i in range(count)]
+
+
+def _inprocess_worker(args: Tuple[int, int, str, multiprocessing.Barrier]) -> Tuple[List[float], float]:
+    worker_id, requests, model_name, barrier = args
+    from sentence_transformers import SentenceTransformer
+
+    model = SentenceTransformer(model_name)
+    model.encode("워밍업 문장입니다.")
+    texts = _texts(worker_id, requests)
+
+    barrier.wait()
+    latencies = []
+    started = time.perf_counter()
+    # 이벤트 루프에서 동기로 encode를 호출하던 기존 방식과 같이 한 번에 한 문장씩 인코딩
+    for text in texts:
+        t = time.perf_counter()
+        model.encode(text)
+        latencies.append(time.perf_counter() - t)
+    return latencies, time.perf_counter() - started
+
+
+def _server_worker(args: Tuple[int, int, int, str, multiprocessing.Barrier]) -> Tuple[List[float], float]:
+    worker_id, requests, concurrency, socket_path, barrier = args
+    from app.embedding.client import EmbeddingClient
+
+    async def run() -> Tuple[List[float], float]:
+        client = EmbeddingClient(socket_path, timeout=60)
+        await client.encode(["워밍업 문장입니다."])
+        texts = _texts(worker_id, requests)
+        queue: asyncio.Queue = asyncio.Queue()
+        for text in texts:
+            queue.put_nowait(text)
+        latencies: List[float] = []
+
+        async def loop() -> None:
+            while not queue.empty():
+                text = queue.get_nowait()
+                t = time.perf_counter()
+                await client.encode([text])
+                latencies.append(time.perf_counter() - t)
+
+        await asyncio.to_thread(barrier.wait)
+        started = time.perf_counter()
+        await asyncio.gather(*(loop() for _ in range(concurrency)))
+        elapsed = time.perf_counter() - started
+        await client.close()
+        return latencies, elapsed
+
+    return asyncio.run(run())
+
+
+def _report(mode: str, results: List[Tuple[List[float], float]]) -> None:
+    latencies = sorted(l for worker_latencies, _ in results for l in worker_latencies)
+    elapsed = max(e for _, e in results)
+    p99 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))]
+    print(
+        f"{mode:<10} 처리량 {len(latencies) / elapsed:8.1f} 문장/s  "
+        f"p50 {statistics.median(latencies) * 1000:7.1f}ms  p99 {p99 * 1000:7.1f}ms  (n={len(latencies)})"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="임베딩 인코딩 방식별 처리량·지연 시간 비교")
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--concurrency", type=int, default=8, help="server 모드에서 워커당 동시 요청 수")
+    parser.add_argument("--requests", type=int, default=200, help="워커당 요청 수")
+    parser.add_argument("--model", default=os.getenv("EMBEDDING_MODEL_NAME", "jhgan/ko-sroberta-multitask"))
+    parser.add_argument("--mode", choices=("inprocess", "server", "both"), default="both")
+    parser.add_argument("--max-batch", type=int, default=64)
+    parser.add_argument("--max-wait-ms", type=float, default=2.0)
+    args = parser.parse_args()
+
+    context = multiprocessing.get_context("spawn")
+
+    if args.mode in ("inprocess", "both"):
+        barrier = context.Manager().Barrier(args.workers)
+        with context.Pool(args.workers) as pool:
+            results = pool.map(_inprocess_worker, [(w, args.requests, args.model, barrier) for w in range(args.workers)])
+        _report("inprocess", results)
+
+    if args.mode in ("server", "both"):
+        from app.embedding.server import spawn_server_process
+
+        socket_path = os.path.join(tempfile.mkdtemp(), "embedding.sock")
+        server = spawn_server_process(socket_path, args.model, max_batch_size=args.max_batch, max_wait_ms=args.max_wait_ms)
+        try:
+            barrier = context.Manager().Barrier(args.workers)
+            with context.Pool(args.workers) as pool:
+                results = pool.map(
+                    _server_worker,
+                    [(w, args.requests, args.concurrency, socket_path, barrier) for w in range(args.workers)],
+                )
+            _report("server", results)
+        finally:
+            server.terminate()
+            server.wait(timeout=10)
+
+
+if __name__ == "__main__":
+    main()
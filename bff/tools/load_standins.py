@@ -0,0 +1,270 @@
+"""
+부하 테스트용 BFF 실행 (외부 의존성을 로컬 대역으로 대체)
+
+- Clova Studio는 HTTP 모의 서버(tools/clova_mock.py)를 CLOVA_URL로 가리켜, 실제 HTTP 클라이언트·속도 제한기 경로를 그대로 거칩니다.
+- 임베딩 모델, ChromaDB, Elasticsearch, PostgreSQL, Kafka는 프로세스 안의 대역 객체로 바꿉니다.
+  실제 클라이언트와 같은 메서드를 같은 방식(동기/비동기)으로 제공하고, 지정한 지연만큼 기다립니다.
+  (임베딩 encode와 Chroma query는 실제로도 이벤트 루프 스레드에서 동기로 실행되므로 대역도 루프를 막음)
+- Mecab, KSS는 실제 라이브러리를 사용합니다.
+- 검색 결과는 benchmarks/fixtures.py의 고정 데이터이며, 문장마다 해시로 Chroma 유사도를 정해
+  --es-fallback-ratio 비율의 문장은 ES 패턴 검색까지 실행합니다.
+
+tools/load_test.py가 자식 프로세스로 실행합니다. 직접 띄울 때 (bff 디렉터리):
+    python tools/clova_mock.py --port 9100 &
+    python tools/load_standins.py --port 8090 --clova-url http://127.0.0.1:9100/v3/chat-completions/HCX-007
+"""
+import argparse
+import asyncio
+import os
+import sys
+import tempfile
+import time
+import zlib
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+BFF_DIR = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(BFF_DIR))
+sys.path.insert(0, str(BFF_DIR / "benchmarks"))
+
+import fixtures  # noqa: E402
+
+EMBEDDING_DIM = 768
+
+
+class StandinOptions:
+    def __init__(
+        self,
+        embed_ms: float = 15.0,
+        chroma_ms: float = 10.0,
+        es_ms: float = 15.0,
+        postgres_ms: float = 3.0,
+        kafka_ms: float = 1.0,
+        es_fallback_ratio: float = 0.3,
+    ) -> None:
+        self.embed_ms = embed_ms
+        self.chroma_ms = chroma_ms
+        self.es_ms = es_ms
+        self.postgres_ms = postgres_ms
+        self.kafka_ms = kafka_ms
+        self.es_fallback_ratio = es_fallback_ratio
+
+
+def _busy_wait(ms: float) -> None:
+    """CPU를 쓰는 동기 작업 흉내 (sleep과 달리 GIL을 놓지 않음)"""
+    end = time.perf_counter() + ms / 1000
+    while time.perf_counter() < end:
+        pass
+
+
+# ----------------------------------------------------------------------
+
+# 대역 객체
+
+class _Vector(list):
+    def tolist(self) -> List[float]:
+        return list(self)
+
+
+class StandinEmbedder:
+    """SentenceTransformer.encode 대역. 첫 성분에 문장 해시를 넣어 Chroma 대역이 유사도를 정하는 데 사용"""
+
+    def __init__(self, options: StandinOptions) -> None:
+        self.options = options
+
+    def encode(self, text: str) -> _Vector:
+        _busy_wait(self.options.embed_ms)
+        bucket = zlib.crc32(text.encode("utf-8")) % 1000 / 1000
+        return _Vector([bucket] + [0.0] * (EMBEDDING_DIM - 1))
+
+
+class StandinCollection:
+    """chromadb Collection.query 대역 (동기 호출)"""
+
+    def __init__(self, options: StandinOptions) -> None:
+        self.options = options
+        self._near = fixtures.chroma_results(5)
+        far = fixtures.chroma_results(5)
+        far["distances"] = [[0.55 + i * 0.05 for i in range(5)]]
+        self._far = far
+
+    def query(self, query_embeddings: List[List[float]], n_results: int = 5, include: Optional[List[str]] = None) -> Dict[str, Any]:
+        time.sleep(self.options.chroma_ms / 1000)
+        bucket = query_embeddings[0][0] if query_embeddings and query_embeddings[0] else 0.0
+        results = self._far if bucket < self.options.es_fallback_ratio else self._near
+        return {key: [value[0][:n_results]] for key, value in results.items()}
+
+
+class StandinElasticsearch:
+    """AsyncElasticsearch 대역 (ping, search, close)"""
+
+    def __init__(self, options: StandinOptions) -> None:
+        self.options = options
+        self._hits = fixtures.es_hits(15)
+
+    async def ping(self) -> bool:
+        return True
+
+    async def search(self, index: str, query: Dict[str, Any], size: int = 10, **kwargs: Any) -> Dict[str, Any]:
+        await asyncio.sleep(self.options.es_ms / 1000)
+        hits = self._hits[:size]
+        return {"hits": {"total": {"value": len(hits), "relation": "eq"}, "hits": hits}}
+
+    async def close(self) -> None:
+        pass
+
+
+class _StandinTransaction:
+    async def __aenter__(self) -> "_StandinTransaction":
+        return self
+
+    async def __aexit__(self, *exc: Any) -> None:
+        return None
+
+
+class _StandinConnection:
+    def __init__(self, options: StandinOptions) -> None:
+        self.options = options
+
+    def transaction(self) -> _StandinTransaction:
+        return _StandinTransaction()
+
+    @staticmethod
+    def _row(headword: str) -> Dict[str, Any]:
+        return {
+            "headword": headword,
+            "pos": "조사",
+            "topik": "초급",
+            "meaning": f"'{headword}'의 뜻을 설명하는 대역 데이터입니다.",
+            "form_info": "받침 유무에 따라 형태가 달라집니다.",
+            "constraints": None,
+        }
+
+    async def fetchrow(self, query: str, *args: Any) -> Dict[str, Any]:
+        await asyncio.sleep(self.options.postgres_ms / 1000)
+        return self._row(str(args[0]))
+
+    async def fetch(self, query: str, *args: Any) -> List[Dict[str, Any]]:
+        await asyncio.sleep(self.options.postgres_ms / 1000)
+        return [self._row(h) for h in (args[0] if args else [])]
+
+
+class _StandinAcquire:
+    def __init__(self, pool: "StandinPool") -> None:
+        self.pool = pool
+
+    async def __aenter__(self) -> _StandinConnection:
+        await self.pool._slots.acquire()
+        return _StandinConnection(self.pool.options)
+
+    async def __aexit__(self, *exc: Any) -> None:
+        self.pool._slots.release()
+
+
+class StandinPool:
+    """asyncpg Pool 대역. 실제 풀과 같이 동시에 대여할 수 있는 커넥션 수(max_size=20)를 제한"""
+
+    def __init__(self, options: StandinOptions, max_size: int = 20) -> None:
+        self.options = options
+        self._slots = asyncio.Semaphore(max_size)
+
+    def acquire(self) -> _StandinAcquire:
+        return _StandinAcquire(self)
+
+    async def close(self) -> None:
+        pass
+
+
+class StandinKafkaProducer:
+    """KafkaProducer 대역 (send, flush, close)"""
+
+    def __init__(self, options: StandinOptions) -> None:
+        self.options = options
+        self.sent = 0
+
+    def send(self, topic: str, value: Any = None, **kwargs: Any) -> None:
+        self.sent += 1
+
+    def flush(self, timeout: Optional[float] = None) -> None:
+        time.sleep(self.options.kafka_ms / 1000)
+
+    def close(self, timeout: Optional[float] = None) -> None:
+        pass
+
+
+# ----------------------------------------------------------------------
+
+# 컨테이너에 설치
+
+def install(container: Any, options: StandinOptions) -> None:
+    """AppContainer의 외부 의존성 적재 단계를 대역 객체로 바꿉니다. (startup 전에 호출)"""
+    from app.services.grammar_service import GrammarService
+
+    grammar_service = container.grammar_service
+    grammar_service.embedding_client = None
+    grammar_service.es_client = StandinElasticsearch(options)
+    loaders = container._loaders()
+
+    async def load_embedder() -> None:
+        grammar_service.embedder = StandinEmbedder(options)
+
+    async def connect_chroma() -> None:
+        grammar_service.collection = StandinCollection(options)
+
+    async def initialize_db_pool() -> None:
+        GrammarService._pool = StandinPool(options)
+
+    async def connect_kafka() -> None:
+        container._kafka_producer = StandinKafkaProducer(options)
+        container.collect_event_publisher.producer = container._kafka_producer
+
+    container._loaders = lambda: {
+        "mecab": loaders["mecab"],
+        "embedder": load_embedder,
+        "chroma": connect_chroma,
+        "postgres": initialize_db_pool,
+        "elasticsearch": grammar_service.ping_elasticsearch,
+        "kafka": connect_kafka,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8090)
+    parser.add_argument("--clova-url", required=True, help="Clova 모의 서버 주소 (CLOVA_URL)")
+    parser.add_argument("--embed-ms", type=float, default=15.0, help="임베딩 encode 1회의 CPU 시간 (루프를 막음)")
+    parser.add_argument("--chroma-ms", type=float, default=10.0, help="Chroma query 1회 지연 (루프를 막음)")
+    parser.add_argument("--es-ms", type=float, default=15.0, help="ES search 1회 지연")
+    parser.add_argument("--postgres-ms", type=float, default=3.0, help="Postgres 쿼리 1회 지연")
+    parser.add_argument("--kafka-ms", type=float, default=1.0, help="Kafka flush 1회 지연")
+    parser.add_argument("--es-fallback-ratio", type=float, default=0.3, help="Chroma 유사도가 낮아 ES 검색까지 하는 문장 비율")
+    args = parser.parse_args()
+
+    # 설정은 import 시점에 읽으므로 앱을 가져오기 전에 지정 (.env보다 환경 변수가 우선)
+    os.environ["CLOVA_URL"] = args.clova_url
+    for key in ("CLOVA_API_KEY", "CHROMA_HOST", "CHROMA_COLLECTION_NAME", "ELASTICSEARCH_HOST"):
+        os.environ.setdefault(key, "http://standin:1")
+    os.environ.setdefault("FEEDBACK_JOB_DB_PATH", os.path.join(tempfile.mkdtemp(prefix="bff-load-"), "jobs.db"))
+    os.environ["EMBEDDING_SERVER_SOCKET"] = ""
+    # 요청마다 남는 INFO 로그(httpx 등)가 측정에 섞이지 않도록 (LOG_LEVEL을 지정하면 그 값을 사용)
+    os.environ.setdefault("LOG_LEVEL", "WARNING")
+
+    import uvicorn
+
+    from app.core.dependencies import container
+    from app.main import app
+
+    install(container, StandinOptions(
+        embed_ms=args.embed_ms,
+        chroma_ms=args.chroma_ms,
+        es_ms=args.es_ms,
+        postgres_ms=args.postgres_ms,
+        kafka_ms=args.kafka_ms,
+        es_fallback_ratio=args.es_fallback_ratio,
+    ))
+    uvicorn.run(app, host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,492 @@
+"""
+피드백 API 부하 테스트 (네트워크 없이 노트북에서 실행)
+
+- Clova 모의 서버(tools/clova_mock.py)와 외부 의존성을 대역으로 바꾼 BFF(tools/load_standins.py)를 자식 프로세스로 띄운 뒤,
+  작업 파일(JSONL)의 요청을 지정한 도착률(--rate, 초당 요청 수, 포아송 도착)과 동시 요청 한도(--concurrency)로 재생합니다.
+  --target을 주면 이미 실행 중인 BFF에 보냅니다. (대역을 띄우지 않음)
+- 작업 파일은 한 줄에 요청 하나: {"title": ..., "contents": ..., "mode": "sync" | "stream", "user": "선택"}
+  지정하지 않으면 benchmarks/fixtures.py의 고정 합성 글(small/medium/large)로 만듭니다.
+- 지연은 예정된 도착 시각부터 잽니다. 동시 요청 한도에 막혀 늦게 보낸 시간도 포함되므로, 서버가 느려져도 지연이 작게 보이지 않습니다.
+- 결과: 처리량, 종단 지연 p50/p95/p99, 스트리밍 요청의 첫 문장 도달 시간(time-to-first-sentence), 오류율,
+  그리고 실행 전후 /metrics 차이로 계산한 단계별(feedback_stage_seconds) 횟수·평균·p95와 LLM 단계별 토큰 수(clova_tokens_total)
+- --baseline과 비교해 처리량·p95·첫 문장 p95·오류율이 허용 범위(--tolerance)를 벗어나면 종료 코드 1을 반환합니다.
+
+실행 예 (bff 디렉터리):
+    python tools/load_test.py --requests 200 --rate 5 --concurrency 32 --output data/load.json
+    python tools/load_test.py --workload data/essays.jsonl --duration 60 --rate 3 --clova-latency lognormal:1500,0.5 --clova-429-ratio 0.05
+    python tools/load_test.py --requests 200 --rate 5 --baseline data/load.json
+    python tools/load_test.py --target http://127.0.0.1:8080 --requests 50 --rate 1
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import re
+import socket
+import statistics
+import subprocess
+import sys
+import time
+from collections import defaultdict
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+import httpx
+
+BFF_DIR = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(BFF_DIR / "benchmarks"))
+
+import fixtures  # noqa: E402
+
+STAGE_METRIC = "feedback_stage_seconds"
+STAGE_TOTAL_METRIC = "feedback_stage_total"
+TOKENS_METRIC = "clova_tokens_total"
+
+
+@dataclass
+class RequestResult:
+    mode: str
+    status: int
+    latency: float
+    first_sentence: Optional[float] = None
+    error: Optional[str] = None
+    sentences: int = 0
+
+
+@dataclass
+class Workload:
+    items: List[Dict[str, Any]] = field(default_factory=list)
+
+    @classmethod
+    def load(cls, path: Optional[str], stream_ratio: float, seed: int) -> "Workload":
+        rng = random.Random(seed)
+        if path:
+            with open(path, encoding="utf-8") as f:
+                items = [json.loads(line) for line in f if line.strip()]
+        else:
+            # 실제 제출 분포와 비슷하게 짧은 글이 많고 긴 글이 가끔 섞이도록
+            sizes = ["small"] * 5 + ["medium"] * 4 + ["large"]
+            items = [{"title": f"합성 글 {i} ({size})", "contents": fixtures.essay(size)} for i, size in enumerate(sizes)]
+        for item in items:
+            item.setdefault("mode", "stream" if rng.random() < stream_ratio else "sync")
+        return cls(items)
+
+
+# ----------------------------------------------------------------------
+
+# 자식 프로세스 (Clova 모의 서버, 대역을 설치한 BFF)
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _wait_ready(url: str, process: subprocess.Popen, timeout: float) -> None:
+    started = time.monotonic()
+    while time.monotonic() - started < timeout:
+        if process.poll() is not None:
+            raise RuntimeError(f"{url} 서버 프로세스가 종료되었습니다. (exit code {process.returncode})")
+        try:
+            if httpx.get(url, timeout=1).status_code == 200:
+                return
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.1)
+    raise RuntimeError(f"{timeout:.0f}초 안에 {url}이 준비되지 않았습니다.")
+
+
+def start_standins(args: argparse.Namespace) -> Tuple[str, List[subprocess.Popen]]:
+    clova_port, bff_port = _free_port(), _free_port()
+    clova_command = [
+        sys.executable, str(BFF_DIR / "tools" / "clova_mock.py"), "--port", str(clova_port),
+        "--latency", args.clova_latency, "--rate-limit-ratio", str(args.clova_429_ratio),
+        "--server-error-ratio", str(args.clova_5xx_ratio), "--seed", str(args.seed),
+    ]
+    if args.clova_script:
+        clova_command += ["--script", args.clova_script]
+    bff_command = [
+        sys.executable, str(BFF_DIR / "tools" / "load_standins.py"), "--port", str(bff_port),
+        "--clova-url", f"http://127.0.0.1:{clova_port}/v3/chat-completions/HCX-007",
+        "--embed-ms", str(args.embed_ms), "--chroma-ms", str(args.chroma_ms), "--es-ms", str(args.es_ms),
+        "--postgres-ms", str(args.postgres_ms), "--es-fallback-ratio", str(args.es_fallback_ratio),
+    ]
+    env = dict(os.environ)
+    if args.clova_qpm is not None:
+        env["CLOVA_RATE_LIMIT_QPM"] = str(args.clova_qpm)
+        env["CLOVA_RATE_LIMIT_BURST"] = str(max(1, int(args.clova_qpm / 60)))
+
+    processes = [subprocess.Popen(clova_command, cwd=BFF_DIR, env=env)]
+    try:
+        _wait_ready(f"http://127.0.0.1:{clova_port}/health", processes[0], 30)
+        processes.append(subprocess.Popen(bff_command, cwd=BFF_DIR, env=env))
+        _wait_ready(f"http://127.0.0.1:{bff_port}/health/ready", processes[1], args.startup_timeout)
+    except Exception:
+        stop_processes(processes)
+        raise
+    return f"http://127.0.0.1:{bff_port}", processes
+
+
+def stop_processes(processes: List[subprocess.Popen]) -> None:
+    for process in reversed(processes):
+        process.terminate()
+        try:
+            process.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            process.kill()
+
+
+# ----------------------------------------------------------------------
+
+# 요청 보내기
+
+async def _send_sync(client: httpx.AsyncClient, url: str, item: Dict[str, Any], headers: Dict[str, str], scheduled: float) -> RequestResult:
+    resp = await client.post(f"{url}/api/feedback", json={"title": item["title"], "contents": item["contents"]}, headers=headers)
+    latency = time.perf_counter() - scheduled
+    if resp.status_code != 200:
+        return RequestResult("sync", resp.status_code, latency, error=resp.text[:200])
+    return RequestResult("sync", resp.status_code, latency, sentences=len(resp.json().get("sentences", [])))
+
+
+async def _send_stream(client: httpx.AsyncClient, url: str, item: Dict[str, Any], headers: Dict[str, str], scheduled: float) -> RequestResult:
+    first_sentence = None
+    sentences = 0
+    error = None
+    event = None
+    headers = {**headers, "Accept": "text/event-stream"}
+    async with client.stream(
+        "POST", f"{url}/api/feedback/stream", json={"title": item["title"], "contents": item["contents"]}, headers=headers,
+    ) as resp:
+        if resp.status_code != 200:
+            body = await resp.aread()
+            return RequestResult("stream", resp.status_code, time.perf_counter() - scheduled, error=body.decode("utf-8", "replace")[:200])
+        async for line in resp.aiter_lines():
+            if line.startswith("event:"):
+                event = line[len("event:"):].strip()
+            elif line.startswith("data:") and event == "sentence":
+                sentences += 1
+                if first_sentence is None:
+                    first_sentence = time.perf_counter() - scheduled
+            elif line.startswith("data:") and event == "error":
+                error = line[len("data:"):].strip()[:200]
+    return RequestResult("stream", resp.status_code, time.perf_counter() - scheduled, first_sentence, error, sentences)
+
+
+async def _run_one(client: httpx.AsyncClient, url: str, item: Dict[str, Any], scheduled: float, index: int) -> RequestResult:
+    headers = {"X-Request-ID": f"load-{index}"}
+    if item.get("user"):
+        headers["Cookie"] = f"user_session_id={item['user']}"
+    try:
+        if item["mode"] == "stream":
+            return await _send_stream(client, url, item, headers, scheduled)
+        return await _send_sync(client, url, item, headers, scheduled)
+    except httpx.HTTPError as e:
+        return RequestResult(item["mode"], 0, time.perf_counter() - scheduled, error=f"{type(e).__name__}: {e}")
+
+
+async def _run_limited(semaphore: asyncio.Semaphore, acquired: bool, *args: Any) -> RequestResult:
+    if not acquired:
+        await semaphore.acquire()
+    try:
+        return await _run_one(*args)
+    finally:
+        semaphore.release()
+
+
+async def generate_load(url: str, workload: Workload, args: argparse.Namespace) -> Tuple[List[RequestResult], float]:
+    rng = random.Random(args.seed)
+    semaphore = asyncio.Semaphore(args.concurrency)
+    limits = httpx.Limits(max_connections=args.concurrency, max_keepalive_connections=args.concurrency)
+    tasks: List[asyncio.Task] = []
+
+    async with httpx.AsyncClient(timeout=args.request_timeout, limits=limits) as client:
+        started = time.perf_counter()
+        next_arrival = started
+        index = 0
+        while True:
+            if args.requests and index >= args.requests:
+                break
+            if args.rate > 0:
+                if args.duration and next_arrival - started >= args.duration:
+                    break
+                delay = next_arrival - time.perf_counter()
+                if delay > 0:
+                    await asyncio.sleep(delay)
+                scheduled = next_arrival
+                next_arrival += rng.expovariate(args.rate)
+            else:
+                # rate가 0이면 닫힌 부하: 앞선 요청이 끝나 자리가 나면 바로 다음 요청을 보냄
+                await semaphore.acquire()
+                scheduled = time.perf_counter()
+                if args.duration and scheduled - started >= args.duration:
+                    semaphore.release()
+                    break
+            item = workload.items[index % len(workload.items)]
+            tasks.append(asyncio.create_task(
+                _run_limited(semaphore, args.rate <= 0, client, url, item, scheduled, index)
+            ))
+            index += 1
+        results = await asyncio.gather(*tasks)
+        elapsed = time.perf_counter() - started
+    return list(results), elapsed
+
+
+# ----------------------------------------------------------------------
+
+# /metrics 차이로 단계별 통계 계산
+
+_SAMPLE_PATTERN = re.compile(r"^([a-zA-Z_:][a-zA-Z0-9_:]*)(?:\{(.*)\})?\s+(\S+)$")
+_LABEL_PATTERN = re.compile(r'(\w+)="((?:[^"\\]|\\.)*)"')
+
+
+def scrape_metrics(url: str) -> Dict[Tuple[str, Tuple[Tuple[str, str], ...]], float]:
+    # 다른 호스트의 BFF(--target)는 OPS_TOKEN 환경 변수로 /metrics 접근 (로컬 대역은 허용 네트워크)
+    token = os.environ.get("OPS_TOKEN")
+    headers = {"Authorization": f"Bearer {token}"} if token else {}
+    try:
+        text = httpx.get(f"{url}/metrics", headers=headers, timeout=5).text
+    except httpx.HTTPError:
+        return {}
+    samples = {}
+    for line in text.splitlines():
+        if not line or line.startswith("#"):
+            continue
+        match = _SAMPLE_PATTERN.match(line)
+        if not match:
+            continue
+        name, labels, value = match.groups()
+        if not name.startswith("feedback_stage_") and name != TOKENS_METRIC:
+            continue
+        samples[(name, tuple(sorted(_LABEL_PATTERN.findall(labels or ""))))] = float(value)
+    return samples
+
+
+def _histogram_quantile(buckets: List[Tuple[float, float]], q: float) -> Optional[float]:
+    """누적 버킷 [(le, count)]에서 분위수를 선형 보간으로 추정합니다. (Prometheus histogram_quantile과 같은 방식)"""
+    buckets = sorted(buckets)
+    if not buckets or buckets[-1][1] <= 0:
+        return None
+    rank = q * buckets[-1][1]
+    lower_le, lower_count = 0.0, 0.0
+    for le, count in buckets:
+        if count >= rank:
+            if le == float("inf"):
+                return lower_le
+            return lower_le + (le - lower_le) * (rank - lower_count) / max(count - lower_count, 1e-9)
+        lower_le, lower_count = le, count
+    return lower_le
+
+
+def stage_breakdown(before: Dict, after: Dict) -> Dict[str, Dict[str, Any]]:
+    diff = {key: value - before.get(key, 0.0) for key, value in after.items()}
+    stages: Dict[str, Dict[str, Any]] = defaultdict(lambda: {"count": 0, "sum": 0.0, "buckets": defaultdict(float), "outcomes": {}})
+    for (name, labels), value in diff.items():
+        labels_dict = dict(labels)
+        stage = labels_dict.get("stage")
+        if stage is None:
+            continue
+        if name == f"{STAGE_METRIC}_count":
+            stages[stage]["count"] += value
+        elif name == f"{STAGE_METRIC}_sum":
+            stages[stage]["sum"] += value
+        elif name == f"{STAGE_METRIC}_bucket":
+            stages[stage]["buckets"][float(labels_dict["le"])] += value
+        elif name == STAGE_TOTAL_METRIC + "_total" or name == STAGE_TOTAL_METRIC:
+            if value:
+                stages[stage]["outcomes"][labels_dict.get("outcome", "-")] = int(value)
+
+    report = {}
+    for stage, data in stages.items():
+        if not data["count"] and not data["outcomes"]:
+            continue
+        p95 = _histogram_quantile(list(data["buckets"].items()), 0.95)
+        report[stage] = {
+            "count": int(data["count"]),
+            "mean_ms": round(data["sum"] / data["count"] * 1000, 1) if data["count"] else None,
+            "p95_ms": round(p95 * 1000, 1) if p95 is not None else None,
+            "total_seconds": round(data["sum"], 3),
+            "outcomes": data["outcomes"],
+        }
+    return dict(sorted(report.items(), key=lambda kv: -kv[1]["total_seconds"]))
+
+
+# ----------------------------------------------------------------------
+
+# 보고
+
+def token_usage(before: Dict, after: Dict, requests: int) -> Dict[str, Dict[str, Any]]:
+    """LLM 단계별 프롬프트·완성 토큰 합계와 요청당 평균"""
+    usage: Dict[str, Dict[str, Any]] = defaultdict(lambda: {"prompt": 0, "completion": 0})
+    for key, value in after.items():
+        name, labels = key
+        if name != TOKENS_METRIC:
+            continue
+        labels_dict = dict(labels)
+        usage[labels_dict.get("stage", "-")][labels_dict.get("kind", "-")] += int(value - before.get(key, 0.0))
+    for data in usage.values():
+        data["per_request"] = round((data["prompt"] + data["completion"]) / requests, 1) if requests else None
+    return dict(sorted(usage.items()))
+
+
+def _percentile(values: List[float], q: float) -> Optional[float]:
+    if not values:
+        return None
+    values = sorted(values)
+    return values[min(len(values) - 1, int(round(q * (len(values) - 1))))]
+
+
+def _ms(value: Optional[float]) -> Optional[float]:
+    return None if value is None else round(value * 1000, 1)
+
+
+def summarize(results: List[RequestResult], elapsed: float) -> Dict[str, Any]:
+    ok = [r for r in results if r.error is None and r.status == 200]
+    latencies = [r.latency for r in ok]
+    first_sentences = [r.first_sentence for r in ok if r.first_sentence is not None]
+    errors: Dict[str, int] = defaultdict(int)
+    for r in results:
+        if r.status != 200:
+            errors[str(r.status)] += 1
+        elif r.error is not None:
+            errors["stream_error"] += 1
+    return {
+        "requests": len(results),
+        "succeeded": len(ok),
+        "elapsed_seconds": round(elapsed, 2),
+        "throughput_rps": round(len(ok) / elapsed, 3) if elapsed else 0.0,
+        "error_rate": round(1 - len(ok) / len(results), 4) if results else 0.0,
+        "errors_by_status": dict(errors),
+        "latency_ms": {
+            "p50": _ms(_percentile(latencies, 0.50)),
+            "p95": _ms(_percentile(latencies, 0.95)),
+            "p99": _ms(_percentile(latencies, 0.99)),
+            "mean": _ms(statistics.fmean(latencies)) if latencies else None,
+        },
+        "time_to_first_sentence_ms": {
+            "p50": _ms(_percentile(first_sentences, 0.50)),
+            "p95": _ms(_percentile(first_sentences, 0.95)),
+            "p99": _ms(_percentile(first_sentences, 0.99)),
+        },
+        "by_mode": {
+            mode: {
+                "requests": sum(1 for r in results if r.mode == mode),
+                "p95_ms": _ms(_percentile([r.latency for r in ok if r.mode == mode], 0.95)),
+            }
+            for mode in sorted({r.mode for r in results})
+        },
+    }
+
+
+def print_report(summary: Dict[str, Any], stages: Dict[str, Dict[str, Any]], tokens: Dict[str, Dict[str, Any]]) -> None:
+    latency, ttfs = summary["latency_ms"], summary["time_to_first_sentence_ms"]
+    print("=" * 78)
+    print(f"요청 {summary['requests']}건 / 성공 {summary['succeeded']}건 / {summary['elapsed_seconds']}초")
+    print(f"처리량 {summary['throughput_rps']} req/s, 오류율 {summary['error_rate'] * 100:.2f}% {summary['errors_by_status'] or ''}")
+    print(f"종단 지연(ms)      p50 {latency['p50']}  p95 {latency['p95']}  p99 {latency['p99']}")
+    print(f"첫 문장 도달(ms)   p50 {ttfs['p50']}  p95 {ttfs['p95']}  p99 {ttfs['p99']}")
+    if stages:
+        print("-" * 78)
+        print(f"{'단계':<18} {'횟수':>7} {'평균(ms)':>10} {'p95(ms)':>10} {'합계(s)':>9}  결과")
+        for stage, data in stages.items():
+            outcomes = ", ".join(f"{k}={v}" for k, v in data["outcomes"].items())
+            print(f"{stage:<18} {data['count']:>7} {data['mean_ms'] or '-':>10} {data['p95_ms'] or '-':>10} {data['total_seconds']:>9}  {outcomes}")
+    if tokens:
+        print("-" * 78)
+        print(f"{'LLM 단계':<18} {'프롬프트':>10} {'완성':>10} {'요청당':>10}")
+        for stage, data in tokens.items():
+            print(f"{stage:<18} {data['prompt']:>10} {data['completion']:>10} {data['per_request'] or '-':>10}")
+    print("=" * 78)
+
+
+def compare(summary: Dict[str, Any], baseline: Dict[str, Any], tolerance: float) -> List[str]:
+    """기준 결과보다 처리량이 줄거나 지연·오류율이 늘어난 항목"""
+    checks = [
+        ("throughput_rps", summary["throughput_rps"], baseline.get("throughput_rps"), False),
+        ("latency_p95_ms", summary["latency_ms"]["p95"], baseline.get("latency_ms", {}).get("p95"), True),
+        ("first_sentence_p95_ms", summary["time_to_first_sentence_ms"]["p95"], baseline.get("time_to_first_sentence_ms", {}).get("p95"), True),
+    ]
+    regressions = []
+    for name, current, base, higher_is_worse in checks:
+        if current is None or not base:
+            continue
+        change = current / base - 1
+        worse = change > tolerance if higher_is_worse else change < -tolerance
+        print(f"{name:<24} 기준 {base:>10} → 현재 {current:>10} ({change * 100:+.1f}%){'  ← 나빠짐' if worse else ''}")
+        if worse:
+            regressions.append(name)
+    base_error = baseline.get("error_rate", 0.0)
+    if summary["error_rate"] > base_error + 0.01:
+        print(f"{'error_rate':<24} 기준 {base_error:>10} → 현재 {summary['error_rate']:>10}  ← 나빠짐")
+        regressions.append("error_rate")
+    return regressions
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--workload", help="요청 JSONL 파일 (없으면 합성 글)")
+    parser.add_argument("--requests", type=int, default=0, help="보낼 요청 수 (0이면 --duration까지)")
+    parser.add_argument("--duration", type=float, default=0.0, help="부하를 거는 시간(초)")
+    parser.add_argument("--rate", type=float, default=2.0, help="초당 도착 요청 수 (포아송). 0이면 동시 요청 한도만큼 계속 보냄")
+    parser.add_argument("--concurrency", type=int, default=32, help="동시에 보내는 요청 수 한도")
+    parser.add_argument("--stream-ratio", type=float, default=0.5, help="작업 파일에 mode가 없을 때 스트리밍으로 보낼 비율")
+    parser.add_argument("--request-timeout", type=float, default=120.0)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--target", help="이미 실행 중인 BFF 주소 (지정하면 대역을 띄우지 않음)")
+    parser.add_argument("--startup-timeout", type=float, default=120.0, help="대역 BFF 준비 대기 시간 (Mecab·KSS 적재 포함)")
+
+    standins = parser.add_argument_group("대역 설정")
+    standins.add_argument("--clova-latency", default="lognormal:800,0.3", help="Clova 응답 지연 분포 (tools/clova_mock.py --latency)")
+    standins.add_argument("--clova-429-ratio", type=float, default=0.0)
+    standins.add_argument("--clova-5xx-ratio", type=float, default=0.0)
+    standins.add_argument("--clova-script", help="Clova 모의 서버의 프롬프트별 응답 규칙 (tools/clova_mock.py --script)")
+    standins.add_argument("--clova-qpm", type=float, help="BFF의 CLOVA_RATE_LIMIT_QPM (지정하지 않으면 설정값 그대로)")
+    standins.add_argument("--embed-ms", type=float, default=15.0)
+    standins.add_argument("--chroma-ms", type=float, default=10.0)
+    standins.add_argument("--es-ms", type=float, default=15.0)
+    standins.add_argument("--postgres-ms", type=float, default=3.0)
+    standins.add_argument("--es-fallback-ratio", type=float, default=0.3)
+
+    parser.add_argument("--output", help="결과 JSON 저장 경로")
+    parser.add_argument("--baseline", help="비교할 이전 결과 JSON")
+    parser.add_argument("--tolerance", type=float, default=0.1, help="처리량·p95가 이 비율 이상 나빠지면 실패 (기본 0.1)")
+    args = parser.parse_args()
+
+    if not args.requests and not args.duration:
+        parser.error("--requests 또는 --duration을 지정하세요.")
+
+    workload = Workload.load(args.workload, args.stream_ratio, args.seed)
+    processes: List[subprocess.Popen] = []
+    url = args.target
+    if url is None:
+        url, processes = start_standins(args)
+    try:
+        before = scrape_metrics(url)
+        results, elapsed = asyncio.run(generate_load(url, workload, args))
+        after = scrape_metrics(url)
+        stages = stage_breakdown(before, after)
+    finally:
+        stop_processes(processes)
+
+    summary = summarize(results, elapsed)
+    tokens = token_usage(before, after, summary["succeeded"])
+    print_report(summary, stages, tokens)
+
+    if args.output:
+        os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump({"config": vars(args), **summary, "stages": stages, "tokens": tokens}, f, ensure_ascii=False, indent=2)
+        print(f"결과 저장: {args.output}")
+
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            regressions = compare(summary, json.load(f), args.tolerance)
+        if regressions:
+            print(f"기준 대비 나빠진 항목: {', '.join(regressions)}")
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
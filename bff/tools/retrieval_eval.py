@@ -0,0 +1,476 @@
+"""
+오류 예문 검색 조건 평가 (Chroma만 / ES만 / 혼합)
+
+- processed_corpus.jsonl에서 문장 해시로 고정한 일부(--holdout 비율, 최대 --limit개)를 질의 문장으로 떼어 내고,
+  실제 임베딩 모델·ChromaDB·Elasticsearch로 검색해 조건 조합마다 다음을 보고합니다.
+  - recall@k: 상위 k개 예문 중 질의 문장과 같은 오류 패턴(error_words)을 가진 예문의 비율
+    (말뭉치에 같은 패턴의 예문이 k개보다 적으면 그 수로 나눔, 같은 패턴의 예문이 없는 질의는 제외)
+  - 검색 지연 p50/p95 (임베딩·형태소 분석 포함), ES 보강 비율, 평균 예문 수, 1차 교정 프롬프트의 추정 토큰 수
+- 오류 패턴은 error_words 항목마다 정합니다.
+  fine: (오류 위치, 오류 양상, 바뀐 부분)  예) '집로 -> 집으로'는 ('', '으')
+  coarse: (오류 위치, 오류 양상, 오류 층위)
+- 색인에는 질의 문장도 들어 있으므로 같은 문장은 결과에서 빼고 평가합니다. (그만큼 한 건 더 조회)
+- 질의마다 백엔드별로 가장 큰 조건으로 한 번씩 검색하고, 작은 조건은 상위 결과를 잘라 재현합니다.
+  지연도 같은 질의의 측정값을 조건에 맞게 합산합니다. (ES 2차 검색은 최소 일치 비율마다 따로 측정)
+- 운영 경로인 hybrid 조건 중 recall@(가장 큰 k)가 최고값에서 --quality-tolerance 이내이면서
+  프롬프트 토큰이 가장 적은 조건을 추천하고, 그대로 쓸 수 있는 RETRIEVAL_* 설정 값을 출력합니다.
+
+실행 예 (bff 디렉터리, .env의 CHROMA_*, ELASTICSEARCH_HOST, EMBEDDING_* 설정 사용):
+    python tools/retrieval_eval.py --limit 200
+    python tools/retrieval_eval.py --backend hybrid --n-results 3,5,8 --sim-threshold 0.5,0.6,0.7 --output eval.json
+"""
+import argparse
+import asyncio
+import itertools
+import json
+import os
+import statistics
+import sys
+import time
+import zlib
+from dataclasses import dataclass, field
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Dict, FrozenSet, Iterable, List, Optional, Set, Tuple
+
+BFF_DIR = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(BFF_DIR))
+
+from app.clients.grammar_llm_client import GrammarLLMClient  # noqa: E402
+from app.services.grammar_service import GrammarService, RetrievalConfig  # noqa: E402
+from app.util.tokens import estimate_tokens  # noqa: E402
+
+CORPUS_PATH = Path(os.getenv("CORPUS_PATH", BFF_DIR.parent / "data" / "processed" / "processed_corpus.jsonl"))
+BACKENDS = ("chroma", "es", "hybrid")
+
+PatternKey = Tuple[Optional[str], ...]
+
+
+# ----------------------------------------------------------------------
+
+# 말뭉치와 오류 패턴
+
+def _normalize(sentence: str) -> str:
+    return " ".join(sentence.split())
+
+
+def _error_words(raw: Any) -> List[Dict[str, Any]]:
+    if isinstance(raw, str):
+        try:
+            raw = json.loads(raw)
+        except json.JSONDecodeError:
+            return []
+    return [ew for ew in (raw or []) if isinstance(ew, dict)]
+
+
+def changed_part(text: str) -> Tuple[str, str]:
+    """'오류 -> 교정'에서 앞뒤 공통 부분을 뺀 바뀐 부분. 예) '친구을 -> 친구를'은 ('을', '를')"""
+    if "->" not in text:
+        return text.strip(), ""
+    wrong, right = (part.strip() for part in text.split("->", 1))
+    prefix = len(os.path.commonprefix([wrong, right]))
+    wrong, right = wrong[prefix:], right[prefix:]
+    suffix = len(os.path.commonprefix([wrong[::-1], right[::-1]]))
+    return wrong[:len(wrong) - suffix], right[:len(right) - suffix]
+
+
+def pattern_keys(error_words: Iterable[Dict[str, Any]], mode: str) -> FrozenSet[PatternKey]:
+    keys: Set[PatternKey] = set()
+    for ew in error_words:
+        if mode == "coarse":
+            keys.add((ew.get("error_location"), ew.get("error_aspect"), ew.get("error_level")))
+        else:
+            keys.add((ew.get("error_location"), ew.get("error_aspect")) + changed_part(ew.get("text") or ""))
+    return frozenset(keys)
+
+
+@dataclass
+class Corpus:
+    sentences: List[str]
+    keys: List[FrozenSet[PatternKey]]
+    by_key: Dict[PatternKey, Set[int]]
+
+    def relevant_count(self, index: int) -> int:
+        """index 문장과 오류 패턴을 하나 이상 공유하는 다른 문장 수 (같은 문장은 제외)"""
+        relevant: Set[int] = set()
+        for key in self.keys[index]:
+            relevant |= self.by_key.get(key, set())
+        query = self.sentences[index]
+        return sum(1 for i in relevant if self.sentences[i] != query)
+
+
+def load_corpus(path: Path, mode: str) -> Corpus:
+    sentences: List[str] = []
+    keys: List[FrozenSet[PatternKey]] = []
+    by_key: Dict[PatternKey, Set[int]] = {}
+    with path.open(encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            record = json.loads(line)
+            sentence = record.get("original_sentence")
+            if not sentence:
+                continue
+            record_keys = pattern_keys(_error_words(record.get("error_words")), mode)
+            index = len(sentences)
+            sentences.append(_normalize(sentence))
+            keys.append(record_keys)
+            for key in record_keys:
+                by_key.setdefault(key, set()).add(index)
+    return Corpus(sentences, keys, by_key)
+
+
+def holdout_indices(corpus: Corpus, ratio: float, limit: int) -> List[int]:
+    """오류가 있는 문장 중 해시로 고른 일부. 말뭉치가 같으면 항상 같은 문장을 고름"""
+    scale = 10000
+    picked = [
+        (zlib.crc32(sentence.encode("utf-8")) % scale, i)
+        for i, sentence in enumerate(corpus.sentences)
+        if corpus.keys[i]
+    ]
+    picked = sorted(p for p in picked if p[0] < ratio * scale)
+    seen: Set[str] = set()
+    indices: List[int] = []
+    for _, i in picked:
+        if corpus.sentences[i] in seen:
+            continue
+        seen.add(corpus.sentences[i])
+        indices.append(i)
+        if len(indices) >= limit:
+            break
+    return indices
+
+
+# ----------------------------------------------------------------------
+
+# 질의별 검색 (백엔드마다 가장 큰 조건으로 한 번)
+
+@dataclass
+class QueryRun:
+    sentence: str
+    keys: FrozenSet[PatternKey]
+    total_relevant: int
+    chroma: Dict[str, List[List[Any]]] = field(default_factory=dict)
+    es_exact: List[Dict[str, Any]] = field(default_factory=list)
+    es_ngram: Dict[str, List[Dict[str, Any]]] = field(default_factory=dict)
+    timings_ms: Dict[str, float] = field(default_factory=dict)
+
+
+def _without_self_chroma(results: Dict[str, Any], sentence: str) -> Dict[str, List[List[Any]]]:
+    columns = ("documents", "metadatas", "distances")
+    rows = [
+        row for row in zip(*(results.get(c, [[]])[0] for c in columns))
+        if _normalize(row[0] or "") != sentence
+    ]
+    return {c: [[row[j] for row in rows]] for j, c in enumerate(columns)}
+
+
+def _without_self_hits(hits: List[Dict[str, Any]], sentence: str) -> List[Dict[str, Any]]:
+    return [h for h in hits if _normalize((h.get("_source") or {}).get("original_text") or "") != sentence]
+
+
+async def _timed(timings: Dict[str, float], name: str, coro):
+    started = time.perf_counter()
+    result = await coro
+    timings[name] = (time.perf_counter() - started) * 1000
+    return result
+
+
+async def run_query(service: GrammarService, run: QueryRun, grid: "Grid") -> None:
+    from app.util.morpheme import analyze_sentence_to_words
+
+    timings = run.timings_ms
+    if grid.uses("chroma"):
+        embedding = await _timed(timings, "embedding", service._embed(run.sentence))
+        started = time.perf_counter()
+        results = service.collection.query(
+            query_embeddings=[embedding],
+            n_results=max(grid.n_results) + 1,
+            include=["documents", "metadatas", "distances"],
+        )
+        timings["chroma_query"] = (time.perf_counter() - started) * 1000
+        run.chroma = _without_self_chroma(results, run.sentence)
+
+    if grid.uses("es"):
+        started = time.perf_counter()
+        normalized_query = service._normalized_query(analyze_sentence_to_words(run.sentence))
+        timings["morpheme"] = (time.perf_counter() - started) * 1000
+        if not normalized_query:
+            return
+        resp = await _timed(timings, "es_exact", service.es_client.search(
+            index=service.es_index, query=service._es_exact_query(normalized_query), size=max(grid.es_max_results) + 1,
+        ))
+        run.es_exact = _without_self_hits(resp.get("hits", {}).get("hits", []) or [], run.sentence)
+        ngram_size = max(grid.es_max_results) * max(grid.overfetch) + 1
+        for msm in grid.min_should_match:
+            resp = await _timed(timings, f"es_ngram[{msm}]", service.es_client.search(
+                index=service.es_index, query=service._es_ngram_query(normalized_query, msm), size=ngram_size,
+            ))
+            run.es_ngram[msm] = _without_self_hits(resp.get("hits", {}).get("hits", []) or [], run.sentence)
+
+
+# ----------------------------------------------------------------------
+
+# 조건 조합 재현
+
+@dataclass
+class Grid:
+    backends: List[str]
+    n_results: List[int]
+    sim_thresholds: List[float]
+    es_max_results: List[int]
+    min_should_match: List[str]
+    overfetch: List[int]
+
+    def uses(self, source: str) -> bool:
+        return any(b in (source, "hybrid") for b in self.backends)
+
+    def settings(self) -> Iterable[Tuple[str, RetrievalConfig]]:
+        """백엔드마다 결과에 영향을 주는 값만 바꿔 가며 조합 (나머지는 첫 값으로 고정)"""
+        for backend in self.backends:
+            n_results = self.n_results if backend != "es" else self.n_results[:1]
+            thresholds = self.sim_thresholds if backend == "hybrid" else self.sim_thresholds[:1]
+            es_grid = (
+                itertools.product(self.es_max_results, self.min_should_match, self.overfetch)
+                if backend != "chroma"
+                else [(self.es_max_results[0], self.min_should_match[0], self.overfetch[0])]
+            )
+            for n, threshold, (m, msm, overfetch) in itertools.product(n_results, thresholds, list(es_grid)):
+                yield backend, RetrievalConfig(
+                    chroma_n_results=n,
+                    chroma_sim_threshold=threshold,
+                    es_max_results=m,
+                    es_ngram_min_should_match=msm,
+                    es_ngram_overfetch=overfetch,
+                )
+
+
+def simulate(run: QueryRun, backend: str, config: RetrievalConfig) -> Tuple[list, float, bool]:
+    """운영 경로(GrammarService._attach_grammar_feedback)와 같은 규칙으로 예문 목록·지연·ES 보강 여부를 재현"""
+    examples: list = []
+    latency = 0.0
+    used_es = False
+
+    if backend != "es":
+        truncated = {c: [rows[0][:config.chroma_n_results]] for c, rows in run.chroma.items()}
+        examples, best_similarity = GrammarService._chroma_results_to_examples(truncated)
+        latency += run.timings_ms.get("embedding", 0.0) + run.timings_ms.get("chroma_query", 0.0)
+        if backend == "chroma":
+            return examples, latency, used_es
+        if not GrammarService._needs_es_examples(examples, best_similarity, config.chroma_sim_threshold):
+            return examples, latency, used_es
+
+    used_es = True
+    m = config.es_max_results
+    first_hits = run.es_exact[:m]
+    needed = m - len(first_hits)
+    latency += run.timings_ms.get("morpheme", 0.0) + run.timings_ms.get("es_exact", 0.0)
+    ngram_hits: List[Dict[str, Any]] = []
+    if needed > 0:
+        ngram_hits = run.es_ngram.get(config.es_ngram_min_should_match, [])[:needed * config.es_ngram_overfetch]
+        latency += run.timings_ms.get(f"es_ngram[{config.es_ngram_min_should_match}]", 0.0)
+    es_examples = GrammarService._es_hits_to_examples(GrammarService._merge_es_hits(first_hits, ngram_hits, m))
+    return GrammarService._merge_examples(examples, es_examples), latency, used_es
+
+
+def _percentile(values: List[float], q: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * q))] if ordered else 0.0
+
+
+def evaluate(runs: List[QueryRun], grid: Grid, ks: List[int], mode: str) -> List[Dict[str, Any]]:
+    llm_client = GrammarLLMClient(llm=None)
+    count_tokens = lru_cache(maxsize=256)(estimate_tokens)
+    rows = []
+    for backend, config in grid.settings():
+        recalls: Dict[int, List[float]] = {k: [] for k in ks}
+        latencies: List[float] = []
+        tokens: List[int] = []
+        example_counts: List[int] = []
+        es_used = 0
+        for run in runs:
+            examples, latency, used_es = simulate(run, backend, config)
+            latencies.append(latency)
+            es_used += used_es
+            example_counts.append(len(examples))
+            messages = llm_client.build_correction_messages({
+                "original_sentence": run.sentence,
+                "error_examples": [ex.model_dump() for ex in examples],
+            })
+            tokens.append(sum(count_tokens(m["content"]) for m in messages))
+            if not run.total_relevant:
+                continue
+            hits = [
+                bool(pattern_keys([ew.model_dump() for ew in ex.error_words], mode) & run.keys)
+                for ex in examples
+            ]
+            for k in ks:
+                recalls[k].append(sum(hits[:k]) / min(k, run.total_relevant))
+
+        rows.append({
+            "backend": backend,
+            "config": config.__dict__.copy(),
+            "recall": {k: round(statistics.mean(v), 4) if v else None for k, v in recalls.items()},
+            "latency_p50_ms": round(_percentile(latencies, 0.5), 2),
+            "latency_p95_ms": round(_percentile(latencies, 0.95), 2),
+            "es_rate": round(es_used / len(runs), 3) if runs else 0.0,
+            "examples_mean": round(statistics.mean(example_counts), 2) if runs else 0.0,
+            "prompt_tokens_mean": round(statistics.mean(tokens), 1) if runs else 0.0,
+        })
+    return rows
+
+
+def recommend(rows: List[Dict[str, Any]], k: int, tolerance: float) -> Optional[Dict[str, Any]]:
+    """hybrid 조건 중 recall@k가 최고값에서 tolerance 이내이면서 프롬프트 토큰, 그다음 지연이 가장 적은 조건"""
+    scored = [r for r in rows if r["backend"] == "hybrid" and r["recall"].get(k) is not None]
+    if not scored:
+        return None
+    best = max(r["recall"][k] for r in scored)
+    keeps = [r for r in scored if r["recall"][k] >= best - tolerance]
+    return min(keeps, key=lambda r: (r["prompt_tokens_mean"], r["latency_p50_ms"]))
+
+
+# ----------------------------------------------------------------------
+
+# 출력
+
+def _describe(row: Dict[str, Any]) -> str:
+    c = row["config"]
+    parts = []
+    if row["backend"] != "es":
+        parts.append(f"n={c['chroma_n_results']}")
+    if row["backend"] == "hybrid":
+        parts.append(f"sim<{c['chroma_sim_threshold']}")
+    if row["backend"] != "chroma":
+        parts.append(f"es={c['es_max_results']} msm={c['es_ngram_min_should_match']} x{c['es_ngram_overfetch']}")
+    return f"{row['backend']:<7} {' '.join(parts)}"
+
+
+def print_table(rows: List[Dict[str, Any]], ks: List[int]) -> None:
+    recall_header = " ".join(f"{'R@' + str(k):>6}" for k in ks)
+    print(f"\n{'조건':<46} {recall_header} {'p50(ms)':>8} {'p95(ms)':>8} {'ES':>5} {'예문':>5} {'토큰':>7}")
+    for row in rows:
+        recall = " ".join(
+            f"{row['recall'][k]:>6.3f}" if row["recall"][k] is not None else f"{'-':>6}" for k in ks
+        )
+        print(
+            f"{_describe(row):<46} {recall} {row['latency_p50_ms']:>8.1f} {row['latency_p95_ms']:>8.1f} "
+            f"{row['es_rate']:>5.2f} {row['examples_mean']:>5.1f} {row['prompt_tokens_mean']:>7.0f}"
+        )
+
+
+def _settings_env(row: Dict[str, Any]) -> str:
+    c = row["config"]
+    return "\n".join([
+        f"RETRIEVAL_CHROMA_N_RESULTS={c['chroma_n_results']}",
+        f"RETRIEVAL_CHROMA_SIM_THRESHOLD={c['chroma_sim_threshold']}",
+        f"RETRIEVAL_ES_MAX_RESULTS={c['es_max_results']}",
+        f"RETRIEVAL_ES_NGRAM_MIN_SHOULD_MATCH={c['es_ngram_min_should_match']}",
+        f"RETRIEVAL_ES_NGRAM_OVERFETCH={c['es_ngram_overfetch']}",
+    ])
+
+
+def _ints(value: str) -> List[int]:
+    return [int(v) for v in value.split(",") if v.strip()]
+
+
+def _floats(value: str) -> List[float]:
+    return [float(v) for v in value.split(",") if v.strip()]
+
+
+def _strings(value: str) -> List[str]:
+    return [v.strip() for v in value.split(",") if v.strip()]
+
+
+async def collect(grid: Grid, corpus: Corpus, indices: List[int]) -> List[QueryRun]:
+    service = GrammarService(client=GrammarLLMClient(llm=None))
+    try:
+        if grid.uses("chroma"):
+            await asyncio.to_thread(service.connect_chroma)
+            await service.prepare_embedder()
+        if grid.uses("es"):
+            await service.ping_elasticsearch()
+
+        runs = []
+        for n, index in enumerate(indices, start=1):
+            run = QueryRun(
+                sentence=corpus.sentences[index],
+                keys=corpus.keys[index],
+                total_relevant=corpus.relevant_count(index),
+            )
+            await run_query(service, run, grid)
+            runs.append(run)
+            if n % 50 == 0:
+                print(f"  {n}/{len(indices)}개 질의 완료", file=sys.stderr)
+        return runs
+    finally:
+        await service.close()
+
+
+def main() -> int:
+    defaults = RetrievalConfig.from_settings()
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--corpus", type=Path, default=CORPUS_PATH, help="processed_corpus.jsonl 경로 (기본: CORPUS_PATH)")
+    parser.add_argument("--holdout", type=float, default=0.05, help="질의로 떼어 낼 비율 (기본 0.05)")
+    parser.add_argument("--limit", type=int, default=200, help="질의 문장 최대 수")
+    parser.add_argument("--pattern", choices=("fine", "coarse"), default="fine", help="같은 오류 패턴으로 볼 기준")
+    parser.add_argument("--backend", choices=BACKENDS, action="append", help="평가할 백엔드 (여러 번 지정 가능, 기본: 전부)")
+    parser.add_argument("--k", type=_ints, default=[1, 3, 5], help="recall@k의 k 목록 (쉼표 구분)")
+    parser.add_argument("--n-results", type=_ints, default=sorted({3, 5, 8, defaults.chroma_n_results}))
+    parser.add_argument("--sim-threshold", type=_floats, default=sorted({0.5, 0.6, 0.7, defaults.chroma_sim_threshold}))
+    parser.add_argument("--es-max-results", type=_ints, default=sorted({3, 5, defaults.es_max_results}))
+    parser.add_argument("--min-should-match", type=_strings, default=list(dict.fromkeys(["30%", "50%", "70%", defaults.es_ngram_min_should_match])))
+    parser.add_argument("--overfetch", type=_ints, default=sorted({2, 3, defaults.es_ngram_overfetch}))
+    parser.add_argument("--quality-tolerance", type=float, default=0.02, help="추천 조건이 최고 recall보다 낮아도 되는 폭")
+    parser.add_argument("--output", help="결과 JSON 저장 경로")
+    args = parser.parse_args()
+
+    if not args.corpus.exists():
+        print(f"말뭉치를 찾을 수 없습니다: {args.corpus} (--corpus 또는 CORPUS_PATH로 지정)", file=sys.stderr)
+        return 2
+
+    grid = Grid(
+        backends=args.backend or list(BACKENDS),
+        n_results=args.n_results,
+        sim_thresholds=args.sim_threshold,
+        es_max_results=args.es_max_results,
+        min_should_match=args.min_should_match,
+        overfetch=args.overfetch,
+    )
+    ks = sorted(args.k)
+
+    corpus = load_corpus(args.corpus, args.pattern)
+    indices = holdout_indices(corpus, args.holdout, args.limit)
+    print(f"말뭉치 {len(corpus.sentences)}문장 중 질의 {len(indices)}문장 (오류 패턴: {args.pattern})")
+
+    runs = asyncio.run(collect(grid, corpus, indices))
+    rows = evaluate(runs, grid, ks, args.pattern)
+    print_table(rows, ks)
+
+    skipped = sum(1 for run in runs if not run.total_relevant)
+    if skipped:
+        print(f"\n같은 오류 패턴의 예문이 말뭉치에 없어 recall에서 제외한 질의: {skipped}개")
+
+    pick = recommend(rows, ks[-1], args.quality_tolerance)
+    if pick:
+        print(f"\n추천 (hybrid 중 R@{ks[-1]} 최고값 - {args.quality_tolerance} 이내에서 토큰이 가장 적은 조건): {_describe(pick)}")
+        print(_settings_env(pick))
+
+    if args.output:
+        os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump({
+                "corpus": str(args.corpus),
+                "queries": len(runs),
+                "pattern": args.pattern,
+                "results": rows,
+                "recommended": pick,
+            }, f, ensure_ascii=False, indent=2)
+            f.write("\n")
+        print(f"\n결과 저장: {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
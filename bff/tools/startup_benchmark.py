@@ -0,0 +1,116 @@
+"""
+서버 프로세스를 띄운 시점부터 요청을 받을 준비가 될 때까지의 시간을 측정합니다.
+
+- /health/ready가 200을 반환하면 준비 완료로 봅니다.
+- /health/ready가 없는 이전 버전(--baseline-ref)은 어떤 HTTP 응답이든 처음 받은 시점을 준비 완료로 봅니다.
+  (이전 버전은 import 시점에 모든 자원을 적재하므로 첫 응답이 곧 준비 완료)
+
+실행 예 (bff 디렉터리, .env와 의존 서비스가 준비된 상태에서):
+    python tools/startup_benchmark.py --runs 5
+    python tools/startup_benchmark.py --runs 5 --baseline-ref HEAD~1
+"""
+import argparse
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.error
+import urllib.request
+from pathlib import Path
+from typing import List, Optional
+
+BFF_DIR = Path(__file__).resolve().parents[1]
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _probe(url: str) -> Optional[int]:
+    try:
+        with urllib.request.urlopen(url, timeout=1) as response:
+            return response.status
+    except urllib.error.HTTPError as e:
+        return e.code
+    except (urllib.error.URLError, ConnectionError, socket.timeout):
+        return None
+
+
+def measure_once(app_dir: Path, timeout: float) -> float:
+    port = _free_port()
+    command = [sys.executable, "-m", "uvicorn", "app.main:app", "--host", "127.0.0.1", "--port", str(port)]
+    ready_url = f"http://127.0.0.1:{port}/health/ready"
+
+    started = time.perf_counter()
+    process = subprocess.Popen(command, cwd=app_dir, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    try:
+        while time.perf_counter() - started < timeout:
+            if process.poll() is not None:
+                raise RuntimeError(f"서버 프로세스가 종료되었습니다. (exit code {process.returncode})")
+
+            status = _probe(ready_url)
+            # 200: 준비 완료 / 404: readiness 엔드포인트가 없는 이전 버전이 응답을 시작함
+            if status in (200, 404):
+                return time.perf_counter() - started
+            time.sleep(0.05)
+        raise TimeoutError(f"{timeout}초 안에 준비되지 않았습니다.")
+    finally:
+        process.terminate()
+        try:
+            process.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            process.kill()
+
+
+def measure(app_dir: Path, runs: int, timeout: float) -> List[float]:
+    return [measure_once(app_dir, timeout) for _ in range(runs)]
+
+
+def _summary(label: str, samples: List[float]) -> str:
+    return (
+        f"{label:<10} median {statistics.median(samples):6.2f}s  "
+        f"min {min(samples):6.2f}s  max {max(samples):6.2f}s  (n={len(samples)})"
+    )
+
+
+def _measure_ref(ref: str, runs: int, timeout: float) -> List[float]:
+    """git worktree로 지정한 커밋을 임시 디렉터리에 꺼내 측정합니다. (.env는 현재 디렉터리 것을 복사)"""
+    repo_root = Path(subprocess.check_output(["git", "rev-parse", "--show-toplevel"], cwd=BFF_DIR, text=True).strip())
+    with tempfile.TemporaryDirectory() as tmp:
+        worktree = Path(tmp) / "baseline"
+        subprocess.run(["git", "worktree", "add", "--detach", str(worktree), ref], cwd=repo_root, check=True)
+        try:
+            app_dir = worktree / BFF_DIR.relative_to(repo_root)
+            env_file = BFF_DIR / ".env"
+            if env_file.exists():
+                (app_dir / ".env").write_bytes(env_file.read_bytes())
+            return measure(app_dir, runs, timeout)
+        finally:
+            subprocess.run(["git", "worktree", "remove", "--force", str(worktree)], cwd=repo_root, check=False)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="서버 기동 시간(import → ready) 측정")
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--timeout", type=float, default=300.0)
+    parser.add_argument("--baseline-ref", default=None, help="비교할 git 커밋 (예: HEAD~1)")
+    args = parser.parse_args()
+
+    os.environ.setdefault("PYTHONUNBUFFERED", "1")
+
+    results = {}
+    if args.baseline_ref:
+        results[args.baseline_ref] = _measure_ref(args.baseline_ref, args.runs, args.timeout)
+    results["current"] = measure(BFF_DIR, args.runs, args.timeout)
+
+    for label, samples in results.items():
+        print(_summary(label, samples))
+
+
+if __name__ == "__main__":
+    main()
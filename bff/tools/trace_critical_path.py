@@ -0,0 +1,139 @@
+"""
+요청 하나의 추적 기록(span)으로 임계 경로(critical path)를 출력
+
+TRACE_EXPORTER=jsonl로 기록한 파일에서 요청 ID(X-Request-ID 응답 헤더 또는 비동기 작업 ID)에 해당하는 span을 모아,
+요청 전체 시간 중 실제로 응답을 늦춘 구간이 어느 문장의 어느 단계(임베딩, Chroma, ES, Postgres, Clova 등)였는지 보여줍니다.
+
+- 임계 경로: 부모 span의 끝에서부터 거꾸로, 그 시점 이전에 가장 늦게 끝난 자식을 고르는 과정을 반복해 얻습니다.
+  (병렬로 실행된 문장 중 가장 늦게 끝난 문장과, 그 문장 안에서 순서대로 실행된 단계들이 선택됨)
+- 자식으로 설명되지 않는 시간은 "(자체)"로 표시합니다.
+
+실행 예 (bff 디렉터리):
+    python tools/trace_critical_path.py 3f2c9a... --file data/traces.jsonl
+    python tools/trace_critical_path.py --last
+"""
+import argparse
+import json
+import sys
+from collections import defaultdict
+from typing import Any, Dict, List, Optional, Tuple
+
+Span = Dict[str, Any]
+
+
+def load_spans(path: str, trace_id: Optional[str]) -> List[Span]:
+    spans = []
+    last_root: Optional[Span] = None
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                span = json.loads(line)
+            except json.JSONDecodeError:
+                continue
+            if trace_id is None:
+                spans.append(span)
+                if span.get("parent_id") is None:
+                    last_root = span
+            elif span.get("trace_id") == trace_id:
+                spans.append(span)
+
+    if trace_id is None:
+        # --last: 가장 마지막에 끝난 요청
+        if last_root is None:
+            return []
+        return [s for s in spans if s.get("trace_id") == last_root["trace_id"]]
+    return spans
+
+
+def _end(span: Span) -> float:
+    return span["start_time"] + span["duration_ms"] / 1000
+
+
+def critical_path(span: Span, children: Dict[str, List[Span]]) -> List[Tuple[Span, List]]:
+    """span 아래의 임계 경로를 (자식 span, 그 자식의 임계 경로) 목록으로 시간 순서대로 반환합니다."""
+    cursor = _end(span)
+    path = []
+    candidates = sorted(children.get(span["span_id"], []), key=_end, reverse=True)
+    for child in candidates:
+        # 커서 이전에 끝난 자식 중 가장 늦게 끝난 것 (시계 오차를 감안해 1ms 여유)
+        if _end(child) <= cursor + 0.001 and child["start_time"] < cursor:
+            path.append((child, critical_path(child, children)))
+            cursor = child["start_time"]
+    path.reverse()
+    return path
+
+
+def _label(span: Span) -> str:
+    attributes = span.get("attributes") or {}
+    details = [f"{k}={attributes[k]}" for k in ("sentence_id", "stage", "attempt") if k in attributes]
+    status = "" if span.get("status") == "ok" else f" [{span.get('status')}]"
+    return span["name"] + (f" ({', '.join(details)})" if details else "") + status
+
+
+def print_path(
+    span: Span,
+    path: List,
+    root_ms: float,
+    totals: Dict[str, float],
+    depth: int = 0,
+) -> None:
+    duration = span["duration_ms"]
+    print(f"{'  ' * depth}{_label(span):<50} {duration:9.1f}ms {duration / root_ms * 100:6.1f}%")
+    self_ms = duration - sum(child["duration_ms"] for child, _ in path)
+    if not path:
+        totals[span["name"]] += duration
+        return
+    for child, child_path in path:
+        print_path(child, child_path, root_ms, totals, depth + 1)
+    if self_ms >= 0.1:
+        print(f"{'  ' * (depth + 1)}{'(자체)':<50} {self_ms:9.1f}ms {self_ms / root_ms * 100:6.1f}%")
+        totals[f"{span['name']} (자체)"] += self_ms
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="요청 추적 기록의 임계 경로 출력")
+    parser.add_argument("request_id", nargs="?", help="요청 ID (trace_id)")
+    parser.add_argument("--file", default="data/traces.jsonl")
+    parser.add_argument("--last", action="store_true", help="파일에서 가장 마지막에 끝난 요청")
+    parser.add_argument("--top", type=int, default=5, help="느린 문장 출력 개수")
+    args = parser.parse_args()
+
+    if not args.request_id and not args.last:
+        parser.error("request_id 또는 --last를 지정해야 합니다.")
+
+    spans = load_spans(args.file, None if args.last else args.request_id)
+    roots = [s for s in spans if s.get("parent_id") is None]
+    if not roots:
+        print("해당 요청의 최상위 span을 찾을 수 없습니다. (샘플링에서 제외되었거나 아직 끝나지 않은 요청)")
+        sys.exit(1)
+
+    root = roots[0]
+    children: Dict[str, List[Span]] = defaultdict(list)
+    for span in spans:
+        if span.get("parent_id"):
+            children[span["parent_id"]].append(span)
+
+    root_ms = root["duration_ms"] or 1e-9
+    print(f"요청 {root['trace_id']}  전체 {root['duration_ms']:.1f}ms  (span {len(spans)}개)\n")
+    print("[임계 경로]")
+    totals: Dict[str, float] = defaultdict(float)
+    print_path(root, critical_path(root, children), root_ms, totals)
+
+    print("\n[임계 경로 단계별 합계]")
+    for name, ms in sorted(totals.items(), key=lambda item: item[1], reverse=True):
+        print(f"  {name:<40} {ms:9.1f}ms {ms / root_ms * 100:6.1f}%")
+
+    sentences = sorted((s for s in spans if s["name"] == "sentence"), key=lambda s: s["duration_ms"], reverse=True)
+    if sentences:
+        print(f"\n[느린 문장 상위 {min(args.top, len(sentences))}개]")
+        for span in sentences[: args.top]:
+            stages = sorted(children.get(span["span_id"], []), key=lambda s: s["start_time"])
+            breakdown = ", ".join(f"{s['name']} {s['duration_ms']:.0f}ms" for s in stages)
+            print(f"  sentence_id={span['attributes'].get('sentence_id')}  {span['duration_ms']:.1f}ms  ({breakdown})")
+
+
+if __name__ == "__main__":
+    main()
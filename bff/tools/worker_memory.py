@@ -0,0 +1,154 @@
+"""
+여러 워커로 실행했을 때 프로세스별 메모리(RSS/PSS)를 측정해 실행 방식을 비교합니다. (Linux 전용)
+
+- uvicorn:  uvicorn --workers N  (워커마다 모델·사전을 따로 적재하는 기존 방식)
+- gunicorn: gunicorn -c gunicorn.conf.py  (마스터에서 적재 후 fork, copy-on-write 공유)
+
+RSS는 공유 페이지를 프로세스마다 중복해서 세므로 합계가 실제 사용량보다 큽니다.
+PSS는 공유 페이지를 공유한 프로세스 수로 나눠 세므로, PSS 합계가 실제로 차지하는 메모리에 가깝습니다.
+
+실행 예 (bff 디렉터리, .env와 의존 서비스가 준비된 상태에서):
+    python tools/worker_memory.py --workers 4
+    python tools/worker_memory.py --workers 8 --mode gunicorn --settle 30
+"""
+import argparse
+import os
+import socket
+import subprocess
+import sys
+import time
+import urllib.error
+import urllib.request
+from pathlib import Path
+from typing import Dict, List
+
+BFF_DIR = Path(__file__).resolve().parents[1]
+FIELDS = ("Rss", "Pss", "Shared_Clean", "Shared_Dirty", "Private_Clean", "Private_Dirty")
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _command(mode: str, workers: int, port: int) -> List[str]:
+    if mode == "uvicorn":
+        return [sys.executable, "-m", "uvicorn", "app.main:app",
+                "--host", "127.0.0.1", "--port", str(port), "--workers", str(workers)]
+    return [sys.executable, "-m", "gunicorn", "-c", "gunicorn.conf.py",
+            "--bind", f"127.0.0.1:{port}", "--workers", str(workers)]
+
+
+def _descendants(root_pid: int) -> List[int]:
+    children: Dict[int, List[int]] = {}
+    for entry in os.listdir("/proc"):
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f"/proc/{entry}/stat") as f:
+                # 두 번째 필드(comm)에 공백이 있을 수 있으므로 마지막 ')' 뒤에서 분리
+                ppid = int(f.read().rsplit(")", 1)[1].split()[1])
+        except (OSError, IndexError, ValueError):
+            continue
+        children.setdefault(ppid, []).append(int(entry))
+
+    result, stack = [], [root_pid]
+    while stack:
+        pid = stack.pop()
+        result.append(pid)
+        stack.extend(children.get(pid, []))
+    return result
+
+
+def _smaps_rollup(pid: int) -> Dict[str, int]:
+    """/proc/<pid>/smaps_rollup의 메모리 항목을 kB 단위로 읽습니다."""
+    values = {}
+    with open(f"/proc/{pid}/smaps_rollup") as f:
+        for line in f:
+            key, _, rest = line.partition(":")
+            if key in FIELDS:
+                values[key] = int(rest.split()[0])
+    return values
+
+
+def _wait_ready(port: int, workers: int, timeout: float) -> None:
+    """readiness가 워커 수의 두 배만큼 연속으로 200을 반환할 때까지 기다립니다. (요청이 여러 워커에 분산되도록)"""
+    url = f"http://127.0.0.1:{port}/health/ready"
+    deadline = time.monotonic() + timeout
+    streak = 0
+    while time.monotonic() < deadline:
+        try:
+            with urllib.request.urlopen(url, timeout=2) as response:
+                streak = streak + 1 if response.status == 200 else 0
+        except (urllib.error.URLError, ConnectionError, socket.timeout):
+            streak = 0
+        if streak >= workers * 2:
+            return
+        time.sleep(0.2)
+    raise TimeoutError(f"{timeout}초 안에 모든 워커가 준비되지 않았습니다.")
+
+
+def measure(mode: str, workers: int, settle: float, timeout: float) -> List[Dict]:
+    port = _free_port()
+    process = subprocess.Popen(_command(mode, workers, port), cwd=BFF_DIR,
+                               stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    try:
+        _wait_ready(port, workers, timeout)
+        # 워밍업 이후 메모리가 안정될 때까지 대기
+        time.sleep(settle)
+
+        rows = []
+        for pid in _descendants(process.pid):
+            try:
+                with open(f"/proc/{pid}/cmdline", "rb") as f:
+                    cmdline = f.read().replace(b"\0", b" ").decode(errors="replace").strip()
+                memory = _smaps_rollup(pid)
+            except OSError:
+                continue
+            role = "master" if pid == process.pid else "worker"
+            rows.append({"pid": pid, "role": role, "cmdline": cmdline, **memory})
+        return rows
+    finally:
+        process.terminate()
+        try:
+            process.wait(timeout=30)
+        except subprocess.TimeoutExpired:
+            process.kill()
+
+
+def _print_report(mode: str, rows: List[Dict]) -> None:
+    mb = lambda kb: f"{kb / 1024:9.1f}"
+    print(f"\n[{mode}] (MB)")
+    print(f"{'pid':>8} {'role':<7} {'RSS':>9} {'PSS':>9} {'shared':>9} {'private':>9}")
+    for row in rows:
+        shared = row.get("Shared_Clean", 0) + row.get("Shared_Dirty", 0)
+        private = row.get("Private_Clean", 0) + row.get("Private_Dirty", 0)
+        print(f"{row['pid']:>8} {row['role']:<7} {mb(row.get('Rss', 0))} {mb(row.get('Pss', 0))} {mb(shared)} {mb(private)}")
+
+    workers = [row for row in rows if row["role"] == "worker"]
+    total_rss = sum(row.get("Rss", 0) for row in rows)
+    total_pss = sum(row.get("Pss", 0) for row in rows)
+    print(f"total    RSS {total_rss / 1024:.1f} MB / PSS {total_pss / 1024:.1f} MB")
+    if workers:
+        print(f"worker 평균 PSS {sum(row.get('Pss', 0) for row in workers) / len(workers) / 1024:.1f} MB")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="워커 프로세스별 RSS/PSS 비교")
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--mode", choices=("uvicorn", "gunicorn", "both"), default="both")
+    parser.add_argument("--settle", type=float, default=10.0, help="준비 완료 후 측정 전 대기 시간(초)")
+    parser.add_argument("--timeout", type=float, default=600.0)
+    args = parser.parse_args()
+
+    if not os.path.exists("/proc/self/smaps_rollup"):
+        sys.exit("/proc/<pid>/smaps_rollup을 지원하는 Linux(4.14 이상)에서만 실행할 수 있습니다.")
+
+    modes = ("uvicorn", "gunicorn") if args.mode == "both" else (args.mode,)
+    for mode in modes:
+        _print_report(mode, measure(mode, args.workers, args.settle, args.timeout))
+
+
+if __name__ == "__main__":
+    main()
@@ -14,7 +14,10 @@ CSV_FIELDS = [
     "sentenceId",
     "originalText",
     "correctedText",
-    "feedbacks"
+    "feedbacks",
+    "requestId",
+    "llmUsage",
+    "requestLlmUsage"
 ]
 
 def ensure_csv_header(path: Path):
@@ -23,6 +26,26 @@ def ensure_csv_header(path: Path):
         with path.open("w", newline="", encoding="utf-8") as f:
             writer = csv.DictWriter(f, fieldnames=CSV_FIELDS)
             writer.writeheader()
+        return
+
+    with path.open(newline="", encoding="utf-8") as f:
+        header = next(csv.reader(f), [])
+    if header == CSV_FIELDS:
+        return
+
+    # 열이 추가되기 전에 만든 파일은 새 헤더로 다시 씀 (없던 열은 빈 값)
+    with path.open(newline="", encoding="utf-8") as f:
+        rows = list(csv.DictReader(f))
+    tmp_path = path.with_suffix(path.suffix + ".tmp")
+    with tmp_path.open("w", newline="", encoding="utf-8") as f:
+        writer = csv.DictWriter(f, fieldnames=CSV_FIELDS, restval="", extrasaction="ignore")
+        writer.writeheader()
+        writer.writerows(rows)
+    tmp_path.replace(path)
+    print(f"[collector] Migrated CSV header of {path} ({len(rows)} rows)")
+
+def to_json_column(value) -> str:
+    return json.dumps(value, ensure_ascii=False) if value is not None else ""
 
 def main():
     csv_path = Path(CSV_PATH)
@@ -71,7 +94,10 @@ def main():
                             "sentenceId": event.get("sentenceId", ""),
                             "originalText": event.get("originalText", ""),
                             "correctedText": event.get("correctedText", ""),
-                            "feedbacks": feedback_str
+                            "feedbacks": feedback_str,
+                            "requestId": event.get("requestId") or "",
+                            "llmUsage": to_json_column(event.get("llmUsage")),
+                            "requestLlmUsage": to_json_column(event.get("requestLlmUsage"))
                         }
                         writer.writerow(row)
             